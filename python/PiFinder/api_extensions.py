@@ -15,14 +15,20 @@ Usage:
 Dependencies: No additional dependencies. Reuses PiFinder's existing Flask / PIL / shared state.
 """
 
-import io
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
 
 from flask import request, session, Response
 from PIL import Image
 
+from PiFinder import image_encoding
+from PiFinder.image_encoding import EncodedImage, EncodedImageCache
 from PiFinder.optics import OpticalTrainResolver
+from PiFinder.screen_mirror import ScreenMirrorReader
 
 logger = logging.getLogger("PiFinderAPI")
 
@@ -30,6 +36,14 @@ logger = logging.getLogger("PiFinderAPI")
 # resolver only rebuilds when the sensor or lens actually changes.
 _API_OPTICAL_TRAIN = OpticalTrainResolver()
 
+# Encoded /api/camera/raw frames, shared by every client polling it
+_CAMERA_RAW_ENCODES = EncodedImageCache(maxsize=4)
+
+# Streaming responses open at once, across every streaming endpoint. Each
+# holds a waitress worker thread for as long as its page is open, so this
+# must stay well below the server's thread count (server._SERVER_THREADS).
+MAX_OPEN_STREAMS = 4
+
 
 def _json_response(data, status=200):
     """Unified JSON response format"""
@@ -40,16 +54,133 @@ def _json_response(data, status=200):
     )
 
 
-def _pil_to_png_bytes(img: Image.Image) -> bytes:
-    """Convert a PIL Image to PNG bytes"""
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return buf.getvalue()
-
-
 def _png_response(img: Image.Image) -> Response:
     """Wrap a PIL Image in a Flask PNG response"""
-    return Response(_pil_to_png_bytes(img), content_type="image/png")
+    return _image_response(image_encoding.encode(img, "png"))
+
+
+def _image_response(encoded: EncodedImage, etag=None) -> Response:
+    """Wrap an encoded image, with its format's headers and an ETag."""
+    response = Response(encoded.data, content_type=encoded.content_type)
+    response.headers.update(encoded.headers)
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _format_error(e: ValueError) -> Response:
+    return _json_response({"error": str(e)}, 400)
+
+
+class StreamLimiter:
+    """Caps the number of streaming responses open at once.
+
+    ``open(make_response)`` builds the response only if a slot is free and
+    frees the slot when the server closes the response (the stream ended
+    or its client went away); beyond the limit it answers ``503``, so a
+    few forgotten browser tabs can't take every worker from the API.
+    """
+
+    def __init__(self, limit: int):
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def open(self, make_response: Callable[[], Response]) -> Response:
+        if not self._slots.acquire(blocking=False):
+            response = _json_response({"error": "Too many open streams"}, 503)
+            response.headers["Retry-After"] = "10"
+            return response
+        try:
+            response = make_response()
+        except BaseException:
+            self._slots.release()
+            raise
+        if not response.is_streamed:
+            # An error answered up front, e.g. a bad format
+            self._slots.release()
+        else:
+            response.call_on_close(self._slots.release)
+        return response
+
+
+stream_limiter = StreamLimiter(MAX_OPEN_STREAMS)
+
+
+def screen_image_response(reader: ScreenMirrorReader) -> Response:
+    """The current screen in the requested ``format`` (PNG by default).
+
+    The mirror frame and format form the ETag: a client revalidating with
+    ``If-None-Match`` gets ``304`` until the screen actually changes, and
+    each frame is encoded once per format however many clients poll it.
+    """
+    try:
+        fmt = image_encoding.parse_format(request.args.get("format"))
+    except ValueError as e:
+        return _format_error(e)
+    encoded = reader.encoded(fmt)
+    if encoded is None:
+        empty = Image.new("RGB", (128, 128), color=(0, 0, 0))
+        return _image_response(image_encoding.encode(empty, fmt))
+    frame, image = encoded
+    etag = f'"{frame}-{fmt}"' if frame else None
+    if etag and request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers={"ETag": etag})
+    return _image_response(image, etag)
+
+
+def screen_stream_response(reader: ScreenMirrorReader) -> Response:
+    """A ``multipart/x-mixed-replace`` image stream of the screen.
+
+    Browsers render it in a plain ``<img>``, replacing the picture as each
+    part arrives. A part is sent when the screen changes, and at least every
+    ``keepalive`` seconds so a dead client is noticed by the failed write.
+    Parts are PNG unless ``format`` asks for ``png1`` or ``jpeg``; the
+    latter makes this an MJPEG stream.
+    """
+    boundary = "pifinder-screen"
+    keepalive = 10.0
+    # The shared-state fallback has no frame counter to wait on (its frame
+    # is always 0), so it is polled and compared by content instead.
+    fallback_poll = 0.5
+    try:
+        fmt = image_encoding.parse_format(request.args.get("format"))
+    except ValueError as e:
+        return _format_error(e)
+    if fmt == "raw":
+        return _format_error(ValueError("format raw cannot be streamed"))
+
+    def frames():
+        sent_frame = 0
+        sent_data = None
+        sent_at = float("-inf")
+        while True:
+            encoded = reader.encoded(fmt)
+            now = time.monotonic()
+            if encoded is not None:
+                frame, image = encoded
+                changed = frame != sent_frame if frame else image.data != sent_data
+                if changed or now - sent_at >= keepalive:
+                    sent_frame, sent_data, sent_at = frame, image.data, now
+                    yield (
+                        (
+                            f"--{boundary}\r\nContent-Type: {image.content_type}\r\n"
+                            f"Content-Length: {len(image.data)}\r\n\r\n"
+                        ).encode()
+                        + image.data
+                        + b"\r\n"
+                    )
+                    continue
+            if encoded is not None and encoded[0]:
+                reader.wait_for_change(sent_frame, keepalive - (now - sent_at))
+            else:
+                # Nothing published yet, or the shared-state fallback
+                time.sleep(fallback_poll)
+
+    return Response(
+        frames(),
+        mimetype=f"multipart/x-mixed-replace; boundary={boundary}",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 def _pointing_to_dict(p):
@@ -242,24 +373,14 @@ def register_api_routes(app, server_instance, require_auth=False):
                 try:
                     from PiFinder.calc_utils import sf_utils
 
-                    ts = sf_utils.ts
-                    dt = ss.datetime()
+                    location = ss.location()
                     aligned = sol.pointing.aligned.estimate
-                    ra_h = float(aligned.RA) / 15.0
-                    dec_d = float(aligned.Dec)
-                    from skyfield.positionlib import position_of_radec
-
-                    p = position_of_radec(
-                        ra_hours=ra_h, dec_degrees=dec_d, epoch=ts.J2000
-                    )
-                    alt, az, _ = p.altaz(
-                        observer=sf_utils.topos(
-                            ss.location().lat, ss.location().lon, ss.location().altitude
-                        ),
-                        epoch=ts.from_datetime(dt),
+                    sf_utils.set_location(location.lat, location.lon, location.altitude)
+                    alt, az = sf_utils.radec_to_altaz(
+                        float(aligned.RA), float(aligned.Dec), ss.datetime()
                     )
-                    payload["Alt"] = alt.degrees
-                    payload["Az"] = az.degrees
+                    payload["Alt"] = alt
+                    payload["Az"] = az
                 except Exception:
                     pass
 
@@ -309,6 +430,10 @@ def register_api_routes(app, server_instance, require_auth=False):
                 Whether to include the PiFinder-rendered star chart as a base64 PNG.
                 Default is false.
 
+            image_format:
+                Encoding of the included chart: png (default), png1, jpeg or
+                raw (see image_encoding). raw adds width, height and mode.
+
             use_camera_solve:
                 Whether to prefer the camera-axis plate-solve
                 (pointing.camera.solve) over the aligned estimate.
@@ -398,6 +523,12 @@ def register_api_routes(app, server_instance, require_auth=False):
 
             include_image_q = str(request.args.get("include_image", "false")).lower()
             include_image = include_image_q in ("1", "true", "yes", "on")
+            try:
+                image_format = image_encoding.parse_format(
+                    request.args.get("image_format")
+                )
+            except ValueError as e:
+                return _format_error(e)
 
             use_camera_solve_q = str(
                 request.args.get("use_camera_solve", "true")
@@ -444,38 +575,22 @@ def register_api_routes(app, server_instance, require_auth=False):
                 dec = float(aligned.Dec)
                 roll = float(aligned.Roll)
 
-            # --------------------------------------------------
-            # 4. Get the API-specific Starfield object
-            # --------------------------------------------------
-            #
-            # This relies on the helper function you added earlier:
-            #
-            #     _get_api_starfield(...)
-            #
-            # It creates and caches PiFinder.plot.Starfield.
-            # This avoids the need to look for the align app's starfield inside server_instance.
-            #
-            starfield = _get_api_starfield(
-                server_instance,
-                resolution=(render_size, render_size),
-                mag_limit=7,
-                fov=fov,
-            )
-
             # The frustum marks what the camera images, so it follows the
-            # fitted optical train. Passed per render rather than held on the
-            # Starfield: that object is cached and shared across requests, and
-            # waitress serves them on several threads, so anything set on it
-            # between one request's resolve and its render belongs to whoever
-            # got there last.
+            # fitted optical train.
             camera_fov = _API_OPTICAL_TRAIN.resolve(
                 ss.camera_type(), ss.camera_lens()
             ).fov_degrees
 
             # --------------------------------------------------
-            # 5. Call PiFinder's native star chart rendering logic
+            # 4-5. Render with PiFinder's native star chart logic
             # --------------------------------------------------
-            image_obj, visible_stars = starfield.plot_starfield(
+            #
+            # Starfields come from a small per-resolution LRU (see
+            # _render_api_starfield), all sharing one star catalog.
+            #
+            image_obj, visible_stars = _render_api_starfield(
+                (render_size, render_size),
+                fov,
                 ra,
                 dec,
                 roll,
@@ -662,12 +777,18 @@ def register_api_routes(app, server_instance, require_auth=False):
             }
 
             if include_image:
-                png_bytes = _pil_to_png_bytes(image_obj)
+                encoded = image_encoding.encode(image_obj, image_format)
                 data["image"] = {
-                    "format": "png",
+                    "format": image_format,
                     "encoding": "base64",
-                    "data": base64.b64encode(png_bytes).decode("ascii"),
+                    "data": base64.b64encode(encoded.data).decode("ascii"),
                 }
+                if image_format == "raw":
+                    data["image"].update(
+                        width=image_obj.width,
+                        height=image_obj.height,
+                        mode=image_obj.mode,
+                    )
 
             return _json_response(data)
 
@@ -675,6 +796,30 @@ def register_api_routes(app, server_instance, require_auth=False):
             logger.exception("api/visible_stars error")
             return _json_response({"success": False, "error": str(e)}, 500)
 
+    @app.route("/api/solver/schedule")
+    def api_solver_schedule():
+        """Adaptive solve scheduler counters (see solve_scheduler.py)."""
+        try:
+            schedule = server_instance.shared_state.solve_schedule()
+            if schedule:
+                return _json_response(schedule)
+            return _json_response({"note": "Solver not running yet"}, 503)
+        except Exception as e:
+            logger.error("api/solver/schedule error: %s", e)
+            return _json_response({"error": str(e)}, 500)
+
+    @app.route("/api/perf")
+    def api_perf():
+        """UI render budget per screen module (see render_profiler.py)."""
+        try:
+            perf = server_instance.shared_state.render_perf()
+            if perf:
+                return _json_response(perf)
+            return _json_response({"note": "UI not running yet"}, 503)
+        except Exception as e:
+            logger.error("api/perf error: %s", e)
+            return _json_response({"error": str(e)}, 500)
+
     @app.route("/api/imu")
     def api_imu():
         try:
@@ -705,34 +850,48 @@ def register_api_routes(app, server_instance, require_auth=False):
     def api_screen():
         """Return the current screen display as a 128x128 PNG, equivalent to /image"""
         try:
-            img = server_instance.shared_state.screen()
-            if img is None:
-                img = Image.new("RGB", (128, 128), color=(0, 0, 0))
-            return _png_response(img)
+            return screen_image_response(server_instance.screen_mirror)
         except Exception as e:
             logger.error("api/screen error: %s", e)
             empty = Image.new("RGB", (128, 128), color=(73, 109, 137))
             return _png_response(empty)
 
+    @app.route("/api/screen/stream")
+    def api_screen_stream():
+        """Push the screen as a multipart PNG stream, one part per change"""
+        return stream_limiter.open(
+            lambda: screen_stream_response(server_instance.screen_mirror)
+        )
+
     @app.route("/api/camera/raw")
     def api_camera_raw():
-        """Return the raw CMOS image, if available"""
+        """Return the raw CMOS image, if available.
+
+        Encoded once per camera frame (keyed on the sequence number stored
+        with it) and format, whichever client asks first; see image_encoding.
+        """
         try:
-            raw = server_instance.shared_state.cam_raw()
-            if raw is None:
-                return _json_response({"note": "No raw image available"}, 503)
-            # raw may be a PIL Image or a NumPy array
-            if hasattr(raw, "save"):
-                img = raw.convert("RGB") if raw.mode != "RGB" else raw
-            else:
-                import numpy as np
-
-                arr = np.asarray(raw)
-                if arr.ndim == 2:
-                    img = Image.fromarray(arr, mode="L").convert("RGB")
-                else:
-                    img = Image.fromarray(arr)
-            return _png_response(img)
+            fmt = image_encoding.parse_format(request.args.get("format"))
+        except ValueError as e:
+            return _format_error(e)
+        try:
+            ss = server_instance.shared_state
+
+            def raw_frame():
+                sequence, raw = ss.cam_raw_frame()
+                if raw is None:
+                    raise LookupError("No raw image available")
+                # raw may be a PIL Image or a NumPy array
+                if not hasattr(raw, "save"):
+                    import numpy as np
+
+                    raw = np.asarray(raw)
+                return sequence, raw
+
+            _, encoded = _CAMERA_RAW_ENCODES.latest(ss.cam_raw_sequence, fmt, raw_frame)
+            return _image_response(encoded)
+        except LookupError as e:
+            return _json_response({"note": str(e)}, 503)
         except Exception as e:
             logger.error("api/camera/raw error: %s", e)
             return _json_response({"error": str(e)}, 500)
@@ -963,48 +1122,76 @@ class _ApiGrayColors:
         return (v, v, v)
 
 
-def _get_api_starfield(
-    server_instance,
-    resolution=(1088, 1088),
-    mag_limit=7,
-    fov=10.2,
-):
-    """
-    Get or create the API-specific Starfield object.
+#: Render resolutions kept by the /api/visible_stars Starfield LRU.
+_API_STARFIELD_CACHE_SIZE = 4
 
-    Why cache it?
-        Starfield initialization loads the Hipparcos catalog and constellation line data,
-        so recreating it for every request would be relatively slow.
 
-    Why not look for it in server_instance?
-        PiFinder's Web Server object usually does not directly hold the align app's starfield,
-        so creating one in the API layer is more stable.
-    """
-    cache_key = (
-        int(resolution[0]),
-        int(resolution[1]),
-        float(mag_limit),
-        float(fov),
-    )
+class _StarfieldEntry:
+    __slots__ = ("lock", "starfield")
 
-    cached_key = getattr(server_instance, "_api_starfield_cache_key", None)
-    cached_obj = getattr(server_instance, "_api_starfield_cache", None)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.starfield = None
 
-    if cached_key == cache_key and cached_obj is not None:
-        return cached_obj
 
-    from PiFinder.plot import Starfield
+class _StarfieldCache:
+    """
+    Bounded LRU of API Starfields, keyed by render resolution.
+
+    The expensive part of a Starfield (Hipparcos, Skyfield positions,
+    constellation edges) is the process-wide plot.StarCatalog, built once.
+    What remains per entry is the resolution-sized state: marker images and
+    the last projection. Zoom is not part of the key; it is set on the
+    entry for each render, so clients alternating zoom levels reuse one
+    Starfield.
+
+    A Starfield holds per-render state, so each entry has a lock held for
+    the whole set-zoom-and-plot step. Requests at different resolutions
+    render concurrently; requests at the same resolution take turns.
+    """
 
-    colors = _ApiGrayColors()
+    def __init__(self, maxsize=_API_STARFIELD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def entry(self, resolution):
+        """The entry for ``resolution``, marked most recently used."""
+        key = (int(resolution[0]), int(resolution[1]))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _StarfieldEntry()
+                while len(self._entries) > self.maxsize:
+                    # An evicted entry still being rendered finishes normally
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def render(self, resolution, fov, ra, dec, roll, *args, **kwargs):
+        entry = self.entry(resolution)
+        with entry.lock:
+            if entry.starfield is None:
+                from PiFinder.plot import Starfield
+
+                entry.starfield = Starfield(
+                    colors=_ApiGrayColors(),
+                    resolution=(int(resolution[0]), int(resolution[1])),
+                    fov=fov,
+                )
+            starfield = entry.starfield
+            starfield.set_fov(fov)
+            return starfield.plot_starfield(ra, dec, roll, *args, **kwargs)
 
-    starfield = Starfield(
-        colors=colors,
-        resolution=resolution,
-        mag_limit=mag_limit,
-        fov=fov,
-    )
 
-    server_instance._api_starfield_cache_key = cache_key
-    server_instance._api_starfield_cache = starfield
+_API_STARFIELDS = _StarfieldCache()
 
-    return starfield
+
+def _render_api_starfield(resolution, fov, ra, dec, roll, *args, **kwargs):
+    """
+    Render the /api/visible_stars chart; returns ``(image, visible_stars)``.
+
+    Arguments after ``roll`` go to ``Starfield.plot_starfield``.
+    """
+    return _API_STARFIELDS.render(resolution, fov, ra, dec, roll, *args, **kwargs)
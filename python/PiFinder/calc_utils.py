@@ -1,3 +1,5 @@
+import bisect
+import functools
 import math
 import numpy as np
 from typing import Tuple, Optional
@@ -5,14 +7,12 @@ from typing import Tuple, Optional
 import erfa  # type: ignore[import-untyped]
 from skyfield.api import (
     wgs84,
-    Loader,
-    Angle,
     position_of_radec,
-    load_constellation_map,
 )
 from skyfield.constants import T0 as J2000, B1950
-from skyfield.magnitudelib import planetary_magnitude
-import PiFinder.utils as utils
+from skyfield.timelib import julian_date_of_besselian_epoch
+from PiFinder import skyfield_cache, timez
+from PiFinder.planet_ephemeris import PlanetEphemeris, PlanetPositions, PlanetTrack
 import json
 import hashlib
 import logging
@@ -185,6 +185,84 @@ def epoch_to_epoch(ep_from, ep_to, ra_hours, dec_deg):
     return RA_h, Dec
 
 
+# Epoch [TT JD] of the constellation boundaries
+B1875 = julian_date_of_besselian_epoch(1875)
+
+# How often the J2000 -> date rotation used by j2000_to_jnow() is rebuilt.
+# Precession moves a position about 0.001" per minute.
+PRECESSION_REFRESH_SECONDS = 60.0
+
+
+@functools.lru_cache(maxsize=64)
+def epoch_matrix(jd_tt: float) -> np.ndarray:
+    """
+    ERFA bias-precession-nutation matrix (IAU 2006/2000A) rotating ICRS
+    vectors to the true equator and equinox of ``jd_tt``. This is the
+    same model Skyfield applies for ``radec(epoch=...)``.
+    """
+    matrix = erfa.pnm06a(jd_tt, 0.0)
+    matrix.flags.writeable = False
+    return matrix
+
+
+@functools.lru_cache(maxsize=64)
+def epoch_rotation(jd_from: float, jd_to: float) -> np.ndarray:
+    """
+    Rotation taking unit vectors from the equinox of ``jd_from`` to that of
+    ``jd_to`` (both TT Julian dates); the matrix form of epoch_to_epoch().
+    """
+    matrix = epoch_matrix(jd_to) @ epoch_matrix(jd_from).T
+    matrix.flags.writeable = False
+    return matrix
+
+
+@functools.lru_cache(maxsize=4)
+def _jnow_rotation(bucket: int) -> np.ndarray:
+    dt = timez.utc_from_timestamp(bucket * PRECESSION_REFRESH_SECONDS)
+    return epoch_rotation(J2000, sf_utils.ts.from_datetime(dt).tt)
+
+
+def jnow_rotation(dt) -> np.ndarray:
+    """
+    J2000 -> JNow rotation for the timezone-aware ``dt``, cached per
+    PRECESSION_REFRESH_SECONDS.
+    """
+    return _jnow_rotation(int(dt.timestamp() // PRECESSION_REFRESH_SECONDS))
+
+
+def rotate_radec(matrix: np.ndarray, ra_deg, dec_deg):
+    """
+    Apply a 3x3 rotation to RA/Dec in degrees. Accepts scalars (returns
+    floats) or arrays (returns arrays).
+    """
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    x, y, z = np.tensordot(
+        matrix, np.array([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)]), 1
+    )
+    ra_out = np.degrees(np.arctan2(y, x)) % 360.0
+    dec_out = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    if np.ndim(ra_out) == 0:
+        return float(ra_out), float(dec_out)
+    return ra_out, dec_out
+
+
+def j2000_to_jnow(ra_deg, dec_deg, dt):
+    """
+    Precess J2000 RA/Dec (degrees) to the equinox of ``dt``, the JNow
+    coordinates LX200 clients such as SkySafari expect.
+    """
+    return rotate_radec(jnow_rotation(dt), ra_deg, dec_deg)
+
+
+def jnow_to_j2000(ra_deg, dec_deg, dt):
+    """
+    Inverse of j2000_to_jnow().
+    """
+    return rotate_radec(jnow_rotation(dt).T, ra_deg, dec_deg)
+
+
 def b1950_to_j2000(ra_hours, dec_deg):
     """
     Convert B1950 to j2000
@@ -192,6 +270,114 @@ def b1950_to_j2000(ra_hours, dec_deg):
     return epoch_to_epoch(B1950, J2000, ra_hours, dec_deg)
 
 
+class TopocentricFrame:
+    """
+    Scalar ICRS RA/Dec -> apparent Alt/Az for one observer, built once per
+    second of time.
+
+    Same chain as erfa.atco13 (and Skyfield's observe/apparent/altaz):
+    annual aberration, IAU 2006/2000A bias-precession-nutation, apparent
+    sidereal time, diurnal aberration and refraction with ERFA's refco
+    constants for the standard atmosphere. Everything that doesn't depend on
+    the target is computed in __init__, so radec_to_altaz() is a handful of
+    plain-Python trig calls. Earth rotation since the frame's epoch is
+    applied per call; the rest drifts by well under 0.01" in a second.
+    Omitted against atco13: gravitational light deflection (milliarcsec
+    away from the Sun) and polar motion / UT1-UTC, which atco13 is called
+    without here too.
+    """
+
+    # Earth rotation [rad/s of UT1] and the observer's rotation speed over c
+    # at the equator [rad] (0.32"), WGS84 equatorial radius
+    _EARTH_ROTATION = 2.0 * math.pi * 1.00273781191135448 / erfa.DAYSEC
+    _DIURNAL_ABERRATION = _EARTH_ROTATION * 6378137.0 / erfa.CMPS
+    # Speed of light [au/day]
+    _C_AU_DAY = erfa.DAYSEC * erfa.CMPS / erfa.DAU
+    # Standard atmosphere: pressure [hPa], temperature [C], RH, wavelength [um]
+    _ATMOSPHERE = (1010.0, 10.0, 0.5, 0.55)
+    # Limits of erfa.atioq's refraction: horizontal component, sin(alt)
+    _CELMIN = 1e-6
+    _SELMIN = 0.05
+
+    def __init__(self, lat, lon, altitude, timestamp: float):
+        self.lat = lat
+        self.lon = lon
+        self.altitude = altitude
+        self.timestamp = timestamp
+
+        self._sin_lat = math.sin(math.radians(lat))
+        self._cos_lat = math.cos(math.radians(lat))
+
+        # UTC -> TT; UT1 taken as UTC (dut1 = 0), as radec_to_altaz always has.
+        utc2 = timestamp / 86400.0
+        tai1, tai2 = erfa.utctai(2440587.5, utc2)
+        tt1, tt2 = erfa.taitt(tai1, tai2)
+
+        # Earth's barycentric velocity over c, ICRS axes
+        _pvh, pvb = erfa.epv00(tt1, tt2)
+        self._velocity = (pvb[1] / self._C_AU_DAY).tolist()
+        rnpb = erfa.pnm06a(tt1, tt2)
+        self._rnpb = rnpb.tolist()
+        self._last = erfa.gst06(2440587.5, utc2, tt1, tt2, rnpb) + math.radians(lon)
+        self._diurnal = self._DIURNAL_ABERRATION * self._cos_lat
+        self._refa, self._refb = erfa.refco(*self._ATMOSPHERE)
+
+    def radec_to_altaz(
+        self, ra, dec, timestamp: Optional[float] = None, atmos=True
+    ) -> Tuple[float, float]:
+        """
+        Apparent alt/az in degrees of J2000 ``ra``/``dec`` (degrees) at
+        ``timestamp`` (POSIX seconds, default the frame's epoch), with
+        refraction if ``atmos``.
+        """
+        ra_rad = math.radians(ra)
+        dec_rad = math.radians(dec)
+        cos_dec = math.cos(dec_rad)
+        vx, vy, vz = self._velocity
+        # Annual aberration; first order is good to a few milliarcsec.
+        px = cos_dec * math.cos(ra_rad) + vx
+        py = cos_dec * math.sin(ra_rad) + vy
+        pz = math.sin(dec_rad) + vz
+        (xx, xy, xz), (yx, yy, yz), (zx, zy, zz) = self._rnpb
+        x = xx * px + xy * py + xz * pz
+        y = yx * px + yy * py + yz * pz
+        z = zx * px + zy * py + zz * pz
+
+        # Local apparent sidereal time -> hour angle frame
+        last = self._last
+        if timestamp is not None:
+            last += self._EARTH_ROTATION * (timestamp - self.timestamp)
+        cos_last = math.cos(last)
+        sin_last = math.sin(last)
+        ha_x = cos_last * x + sin_last * y  # cos(dec) cos(HA)
+        east = cos_last * y - sin_last * x  # -cos(dec) sin(HA)
+
+        north = z * self._cos_lat - ha_x * self._sin_lat
+        up = z * self._sin_lat + ha_x * self._cos_lat
+        east += self._diurnal
+        norm = math.sqrt(north * north + east * east + up * up)
+        north /= norm
+        east /= norm
+        up /= norm
+
+        if atmos:
+            # erfa.atioq's refraction
+            r = max(math.sqrt(north * north + east * east), self._CELMIN)
+            zc = max(up, self._SELMIN)
+            tz = r / zc
+            w = self._refb * tz * tz
+            delta = (self._refa + w) * tz / (1.0 + (self._refa + 3.0 * w) / (zc * zc))
+            cos_delta = 1.0 - delta * delta / 2.0
+            f = cos_delta - delta * zc / r
+            north *= f
+            east *= f
+            up = cos_delta * up + delta * r
+
+        alt_deg = math.degrees(math.atan2(up, math.sqrt(north * north + east * east)))
+        az_deg = math.degrees(math.atan2(east, north)) % 360.0
+        return alt_deg, az_deg
+
+
 def aim_degrees(shared_state, mount_type, screen_direction, target):
     """
     Returns degrees in either
@@ -241,16 +427,8 @@ def calc_object_altitude(shared_state, obj) -> Optional[float]:
     location = shared_state.location()
     dt = shared_state.datetime()
     if location and dt and solution:
-        aa = FastAltAz(
-            location.lat,
-            location.lon,
-            dt,
-        )
-        alt, _ = aa.radec_to_altaz(
-            obj.ra,
-            obj.dec,
-            alt_only=True,
-        )
+        sf_utils.set_location(location.lat, location.lon, location.altitude)
+        alt, _ = sf_utils.radec_to_altaz(obj.ra, obj.dec, dt)
         return alt
 
     return None
@@ -328,14 +506,23 @@ class Skyfield_utils:
     """
 
     def __init__(self):
-        load = Loader(utils.astro_data_dir)
-        self.eph = load("de421.bsp")
+        # Shared with the other processes through the page cache, see
+        # skyfield_cache
+        self.eph = skyfield_cache.ephemeris()
         self.earth = self.eph["earth"]
         self.observer_loc = None  # Barycenter used to calculate the target pos
         self._observer_geoid = None  # To get geographic position (lat, long)
-        self._last_location = None  # (lat, lon, altitude) of last set_location
-        self.constellation_map = load_constellation_map()
-        self.ts = load.timescale()
+        # (lat, lon, altitude) of the last set_location
+        self._last_location: Optional[Tuple[float, float, float]] = None
+        self._planet_ephemeris: Optional[PlanetEphemeris] = None
+        self._planet_track: Optional[PlanetTrack] = None
+        self._altaz_frame: Optional[TopocentricFrame] = None
+        self._constellations = skyfield_cache.constellation_arrays()
+        # For the scalar path of radec_to_constellation()
+        self._to_b1875 = epoch_matrix(B1875).tolist()
+        self._constellation_ra = self._constellations["sorted_ra"].tolist()
+        self._constellation_dec = self._constellations["sorted_dec"].tolist()
+        self.ts = skyfield_cache.timescale()
         self._set_planet_names()
 
     def _set_planet_names(self):
@@ -373,6 +560,11 @@ class Skyfield_utils:
         # Note: We can't get this info from self.observer_loc
         self._observer_geoid = wgs84.latlon(lat, lon, altitude)
         self._last_location = (lat, lon, altitude)
+        self._planet_ephemeris = PlanetEphemeris(
+            self.planets, self.planet_names, self.observer_loc, self._observer_geoid
+        )
+        self._planet_track = None
+        self._altaz_frame = None
 
     def get_lat_lon_alt(self):
         """Returns the observer latitude & longitude in degrees"""
@@ -394,49 +586,31 @@ class Skyfield_utils:
         ra, dec, _distance = a.radec(epoch=t)
         return ra._degrees, dec._degrees
 
+    def altaz_frame(self, dt) -> TopocentricFrame:
+        """
+        The TopocentricFrame of the current location for the second of
+        ``dt`` (timezone-aware), reused until the second or location changes.
+        """
+        if self._last_location is None:
+            raise RuntimeError("radec_to_altaz: set_location() must be called first")
+        second = math.floor(dt.timestamp())
+        frame = self._altaz_frame
+        if frame is None or frame.timestamp != second:
+            frame = TopocentricFrame(*self._last_location, second)
+            self._altaz_frame = frame
+        return frame
+
     def radec_to_altaz(self, ra, dec, dt, atmos=True):
         """
         returns the apparent ALT/AZ of a specific RA/DEC at the given time.
 
-        Implemented via erfa.atco13 (ICRS -> observed), which runs the same
-        precession / nutation / aberration / diurnal-aberration chain
-        skyfield uses, but in C; ~20x faster than the skyfield call and
-        accurate to ~arcsec for finder use. Refraction is included when
-        `atmos` is True (standard atmosphere: 1010 hPa, 10 C, 50 % RH).
+        Evaluated in the cached altaz_frame() for the second of ``dt``; it
+        agrees with erfa.atco13 (the full ICRS -> observed chain Skyfield
+        also runs) to a fraction of an arcsec, at a few microseconds per
+        call. Refraction is included when `atmos` is True (standard
+        atmosphere: 1010 hPa, 10 C, 50 % RH).
         """
-        if self._last_location is None:
-            raise RuntimeError("radec_to_altaz: set_location() must be called first")
-        lat, lon, altitude = self._last_location
-
-        # POSIX UTC seconds -> Julian Date, split into two parts to preserve
-        # precision over short intervals.
-        utc1 = 2440587.5
-        utc2 = dt.timestamp() / 86400.0
-
-        phpa = 1010.0 if atmos else 0.0  # 0 hPa disables refraction in atco13.
-        aob, zob, _hob, _dob, _rob, _eo = erfa.atco13(
-            math.radians(ra),
-            math.radians(dec),
-            0.0,
-            0.0,
-            0.0,
-            0.0,  # pmRA, pmDec, parallax, RV (unused)
-            utc1,
-            utc2,
-            0.0,  # dut1 (UT1-UTC) -- sub-arcsec impact
-            math.radians(lon),
-            math.radians(lat),
-            altitude,
-            0.0,
-            0.0,  # polar motion (unused)
-            phpa,
-            10.0,
-            0.5,
-            0.55,  # pressure, T(C), RH, wavelength(um)
-        )
-        alt_deg = 90.0 - math.degrees(zob)
-        az_deg = math.degrees(aob) % 360.0
-        return alt_deg, az_deg
+        return self.altaz_frame(dt).radec_to_altaz(ra, dec, dt.timestamp(), atmos)
 
     def get_lst_hrs(self, dt):
         """
@@ -512,45 +686,78 @@ class Skyfield_utils:
         """
         Take a ra/dec and return the constellation
         """
-        sky_pos = position_of_radec(Angle(degrees=ra)._hours, dec)
-        return self.constellation_map(sky_pos)
+        # radec_to_constellations() for one position, in plain Python:
+        # several times faster than NumPy on scalars.
+        ra_rad = math.radians(ra)
+        dec_rad = math.radians(dec)
+        cos_dec = math.cos(dec_rad)
+        v = (cos_dec * math.cos(ra_rad), cos_dec * math.sin(ra_rad), math.sin(dec_rad))
+        x, y, z = (r[0] * v[0] + r[1] * v[1] + r[2] * v[2] for r in self._to_b1875)
+        ra_1875 = math.degrees(math.atan2(y, x)) % 360.0
+        dec_1875 = math.degrees(math.atan2(z, math.hypot(x, y)))
+        i = bisect.bisect_left(self._constellation_ra, ra_1875 / 15.0)
+        j = bisect.bisect_right(self._constellation_dec, dec_1875)
+        tables = self._constellations
+        return str(tables["indexed_abbreviations"][tables["radec_to_index"][i, j]])
+
+    def radec_to_constellations(self, ra, dec) -> np.ndarray:
+        """
+        Constellation abbreviations of J2000 ``ra``/``dec`` in degrees,
+        for arrays (or scalars) of any shape at once.
+
+        Skyfield's constellation map is a grid over B1875 RA/Dec whose
+        cells index the abbreviations; its lookup precesses each position
+        with a new Time. Here the rotation to B1875 is one cached matrix,
+        so any number of positions costs a rotation, two searchsorted
+        calls and a table read.
+        """
+        ra_1875, dec_1875 = rotate_radec(epoch_matrix(B1875), ra, dec)
+        tables = self._constellations
+        i = np.searchsorted(tables["sorted_ra"], np.asarray(ra_1875) / 15.0)
+        j = np.searchsorted(tables["sorted_dec"], dec_1875, side="right")
+        return tables["indexed_abbreviations"][tables["radec_to_index"][i, j]]
+
+    def planet_positions(self, dt) -> Optional[PlanetPositions]:
+        """
+        Positions of every body in ``planet_names`` at ``dt`` (a datetime),
+        or None without an observer location.
+
+        Evaluated from a Chebyshev track of the next few hours, refit when
+        ``dt`` leaves it or the location changes (see planet_ephemeris).
+        """
+        ephemeris = self._planet_ephemeris
+        if ephemeris is None:
+            return None
+        t = self.ts.from_datetime(dt)
+        track = self._planet_track
+        if track is None or track.ephemeris is not ephemeris or not track.covers(t):
+            track = self._planet_track = ephemeris.track(t)
+        return track.positions(t)
 
     def calc_planets(self, dt):
         """Returns dictionary with all planet positions:
         {'SUN': {'radec': (279.05819685702846, -23.176809282384962),
                  'radec_pretty': ((18.0, 36.0, 14), (-23, 10, 36.51)),
-                 'altaz': (1.667930045300066, 228.61434416619613)},
+                 'altaz': (1.667930045300066, 228.61434416619613),
+                 'mag': '?',
+                 'const': 'Sgr'},
         }
         """
-        if not self.observer_loc:
+        positions = self.planet_positions(dt)
+        if positions is None:
             logger.warning("no observer location set")
             return {}
-        t = self.ts.from_datetime(dt)
-        observer = self.observer_loc.at(t)
+        constellations = self.radec_to_constellations(positions.ra, positions.dec)
         planet_dict = {}
-        for name, planet in zip(self.planet_names, self.planets):
-            astrometric = observer.observe(planet).apparent()
-            ra, dec, _ = astrometric.radec()
-            alt, az, _ = astrometric.altaz()
-            ra_dec = (ra._degrees, dec.degrees)
-            ra_dec_pretty = (ra_to_hms(ra._degrees), dec_to_dms(dec.degrees))
-            alt_az = (alt.degrees, az.degrees)
-            try:
-                mag = float(planetary_magnitude(astrometric))
-            except ValueError:
-                mag = float("nan")
-            if math.isnan(mag):
-                mag = "?"
-            else:
-                mag = "%.2f" % mag
-
-            if "BARYCENTER" in name:
-                name = name.replace("_BARYCENTER", "")
+        for i, name in enumerate(positions.names):
+            ra, dec = float(positions.ra[i]), float(positions.dec[i])
+            mag = positions.mag[i]
             planet_dict[name] = {
-                "radec": ra_dec,
-                "radec_pretty": ra_dec_pretty,
-                "altaz": alt_az,
-                "mag": mag,
+                "radec": (ra, dec),
+                "radec_pretty": (ra_to_hms(ra), dec_to_dms(dec)),
+                "altaz": (float(positions.alt[i]), float(positions.az[i])),
+                "mag": "?" if math.isnan(mag) else "%.2f" % mag,
+                "const": str(constellations[i]),
             }
         return planet_dict
 
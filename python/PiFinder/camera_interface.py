@@ -22,6 +22,7 @@ import threading
 import logging
 
 from PiFinder import state_utils, timez, utils
+from PiFinder.imu_ring import ImuRingReader
 import PiFinder.pointing_model.quaternion_transforms as qt
 from PiFinder.auto_exposure import (
     ExposurePIDController,
@@ -125,6 +126,24 @@ def sweep_frame_record(index, exp_us, driver_metadata, cropped_frame, bit_depth)
     return record
 
 
+def _imu_fallback(imu_ring, shared_state):
+    """The shared-state IMU sample, read now, for when the IMU ring can't
+    supply the sample at an exposure's start afterwards. Taken before the
+    exposure; read after it, it would equal the end sample and hide any
+    motion during the exposure."""
+    return None if imu_ring.count() else shared_state.imu()
+
+
+def _imu_at(imu_ring, shared_state, t, fallback=None):
+    """The IMU sample at time ``t`` from the IMU ring. Without the ring,
+    ``fallback`` (see _imu_fallback) or else the current shared-state
+    sample."""
+    sample = imu_ring.sample_at(t)
+    if sample is not None:
+        return sample
+    return fallback if fallback is not None else shared_state.imu()
+
+
 # Software rotation applied to each raw capture before it reaches the solver
 # and the preview, keyed by screen_direction. Each entry is paired with that
 # variant's q_imu2cam in pointing_model/imu_dead_reckoning.py -- the camera
@@ -299,6 +318,8 @@ class CameraInterface:
         try:
             # Store shared_state for access by capture() methods
             self.shared_state = shared_state
+            # IMU orientation at the exact exposure start/end times
+            imu_ring = ImuRingReader()
 
             # Store camera type in shared state for SQM calibration
             camera_type_str = self.get_cam_type()  # e.g., "PI imx296", "PI hq"
@@ -364,7 +385,7 @@ class CameraInterface:
                     logger.info("Camera exiting low-power sleep mode")
                     was_sleeping = False
 
-                imu_start = shared_state.imu()
+                imu_start_fallback = _imu_fallback(imu_ring, shared_state)
                 image_start_time = time.time()
                 if self._camera_started:
                     if not test_mode_on:
@@ -391,7 +412,10 @@ class CameraInterface:
                         time.sleep(0.2)
                     image_end_time = time.time()
                     # check imu to make sure we're still static
-                    imu_end = shared_state.imu()
+                    imu_start = _imu_at(
+                        imu_ring, shared_state, image_start_time, imu_start_fallback
+                    )
+                    imu_end = _imu_at(imu_ring, shared_state, image_end_time)
 
                     # see if we moved during exposure
                     if imu_start and imu_end:
@@ -640,7 +664,7 @@ class CameraInterface:
                             # Capture one identified frame. Calibration waits on
                             # this timestamp, preventing it from analysing the
                             # preceding continuously captured frame.
-                            capture_imu_start = shared_state.imu()
+                            capture_imu_fallback = _imu_fallback(imu_ring, shared_state)
                             capture_start = time.time()
                             captured_image = self.capture().convert("L")
                             captured_image = captured_image.rotate(solve_rotation)
@@ -651,7 +675,15 @@ class CameraInterface:
                                     captured_raw = captured_raw.copy()
                             camera_image.paste(captured_image)
                             capture_end = time.time()
-                            capture_imu_end = shared_state.imu()
+                            capture_imu_start = _imu_at(
+                                imu_ring,
+                                shared_state,
+                                capture_start,
+                                capture_imu_fallback,
+                            )
+                            capture_imu_end = _imu_at(
+                                imu_ring, shared_state, capture_end
+                            )
                             if capture_imu_start and capture_imu_end:
                                 capture_pointing_diff = qt.get_quat_angular_diff(
                                     capture_imu_start.quat,
@@ -665,6 +697,9 @@ class CameraInterface:
                                     "exposure_end": capture_end,
                                     "imu": capture_imu_end,
                                     "imu_delta": np.rad2deg(capture_pointing_diff),
+                                    # Always solved: the requester waits on
+                                    # this frame (see solve_scheduler.py).
+                                    "requested": True,
                                     "exposure_time": self.exposure_time,
                                     "actual_exposure_us": (
                                         getattr(self, "last_frame_metadata", None) or {}
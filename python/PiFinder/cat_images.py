@@ -5,11 +5,12 @@ This module is used at runtime
 to handle catalog image loading
 """
 
+import functools
 import math
 import os
 from typing import List, Optional, Tuple
 from PIL import Image, ImageChops, ImageDraw
-from PiFinder import image_util
+from PiFinder import image_pyramid
 from PiFinder import utils
 import PiFinder.ui.ui_utils as ui_utils
 import logging
@@ -146,31 +147,21 @@ def vertex_overlay_points(
     return points
 
 
-def _orient_image(return_image, roll, flip_image, flop_image):
+@functools.lru_cache(maxsize=8)
+def _view_tint(colors, fov_res: int, circle: bool) -> Image.Image:
     """
-    Orient a source survey image to match the eyepiece view.
-
-    Applies the fixed 180° baseline rotation (plus the live solve roll),
-    then the active telescope's flip/flop mirrors:
-        flip_image -> top-to-bottom (vertical) mirror
-        flop_image -> left-to-right (horizontal) mirror
-
-    Mirrors are applied AFTER the rotation so a mirrored optical train
-    (e.g. a refractor/SCT with a star diagonal) correctly reverses the
-    apparent sense of roll. See ADR 0003.
+    The red tint for a grayscale view, combined with the FOV circle mask
+    (full brightness inside, half outside) when ``circle`` is set. Built
+    once per display and FOV size rather than on every redraw.
     """
-    # rotate for roll / newtonian orientation
-    image_rotate = 180
-    if roll is not None:
-        image_rotate += roll
-    return_image = return_image.rotate(image_rotate)
-
-    if flip_image:
-        return_image = return_image.transpose(Image.FLIP_TOP_BOTTOM)
-    if flop_image:
-        return_image = return_image.transpose(Image.FLIP_LEFT_RIGHT)
-
-    return return_image
+    tint = Image.new("RGB", (fov_res, fov_res), colors.get(255))
+    if circle:
+        _circle_dim = Image.new("RGB", (fov_res, fov_res), colors.get(127))
+        ImageDraw.Draw(_circle_dim).ellipse(
+            [2, 2, fov_res - 2, fov_res - 2], fill=colors.get(255)
+        )
+        tint = ImageChops.multiply(tint, _circle_dim)
+    return tint
 
 
 def get_display_image(
@@ -208,46 +199,28 @@ def get_display_image(
                 fill=display_class.colors.get(128),
             )
     else:
-        return_image = Image.open(object_image_path)
-
         image_rotate = 180
         if roll is not None:
             image_rotate += roll
 
-        # Orient to match the eyepiece view (see ADR 0003)
-        return_image = _orient_image(return_image, roll, flip_image, flop_image)
-
-        # FOV
-        fov_size = int(1024 * fov / 2)
-        return_image = return_image.crop(
-            (
-                512 - fov_size,
-                512 - fov_size,
-                512 + fov_size,
-                512 + fov_size,
-            )
-        )
-        return_image = return_image.resize(
-            (display_class.fov_res, display_class.fov_res), Image.LANCZOS
+        # Orient to match the eyepiece view (see ADR 0003) and crop to the
+        # FOV, from the image's decoded pyramid tiles
+        return_image = image_pyramid.oriented_view(
+            object_image_path,
+            fov,
+            image_rotate,
+            flip_image,
+            flop_image,
+            display_class.fov_res,
         )
 
-        # RED
-        return_image = image_util.make_red(return_image, display_class.colors)
+        # RED, dimmed outside the FOV circle when burning in
+        return_image = ImageChops.multiply(
+            return_image.convert("RGB"),
+            _view_tint(display_class.colors, display_class.fov_res, burn_in),
+        )
 
         if burn_in:
-            # circle
-            _circle_dim = Image.new(
-                "RGB",
-                (display_class.fov_res, display_class.fov_res),
-                display_class.colors.get(127),
-            )
-            _circle_draw = ImageDraw.Draw(_circle_dim)
-            _circle_draw.ellipse(
-                [2, 2, display_class.fov_res - 2, display_class.fov_res - 2],
-                fill=display_class.colors.get(255),
-            )
-            return_image = ImageChops.multiply(return_image, _circle_dim)
-
             ri_draw = ImageDraw.Draw(return_image)
             ri_draw.ellipse(
                 [2, 2, display_class.fov_res - 2, display_class.fov_res - 2],
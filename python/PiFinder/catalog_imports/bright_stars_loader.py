@@ -78,6 +78,7 @@ def load_bright_stars():
     from .catalog_import_utils import ObjectFinder
 
     shared_finder = ObjectFinder()
+    NewCatalogObject.find_constellations(objects_to_insert)
     NewCatalogObject.set_shared_finder(shared_finder)
 
     try:
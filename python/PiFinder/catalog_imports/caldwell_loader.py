@@ -79,6 +79,7 @@ def load_caldwell():
     from .catalog_import_utils import ObjectFinder
 
     shared_finder = ObjectFinder()
+    NewCatalogObject.find_constellations(objects_to_insert)
     NewCatalogObject.set_shared_finder(shared_finder)
 
     try:
@@ -6,8 +6,9 @@ This module contains common classes and functions used by all catalog loaders.
 
 import logging
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
+import numpy as np
 from tqdm import tqdm
 
 from PiFinder.composite_object import MagnitudeObject, SizeObject
@@ -34,6 +35,7 @@ class NewCatalogObject:
     description: str = ""
     aka_names: list[str] = field(default_factory=list)
     surface_brightness: float = 0.0
+    constellation: str = ""
 
     # Class-level shared finder for performance optimization
     _shared_finder: Optional["ObjectFinder"] = None
@@ -48,6 +50,19 @@ class NewCatalogObject:
         """Clear the shared ObjectFinder instance"""
         cls._shared_finder = None
 
+    @staticmethod
+    def find_constellations(objects: List["NewCatalogObject"]) -> None:
+        """Sets the constellation of all ``objects`` in one vectorized
+        lookup, so insert() doesn't look them up one at a time"""
+        if not objects:
+            return
+        constellations = calc_utils.sf_utils.radec_to_constellations(
+            np.array([obj.ra for obj in objects], dtype=float),
+            np.array([obj.dec for obj in objects], dtype=float),
+        )
+        for obj, constellation in zip(objects, constellations):
+            obj.constellation = str(constellation)
+
     def insert(self, find_object_id=True):
         """
         Inserts object into DB
@@ -68,7 +83,8 @@ class NewCatalogObject:
 
             if self.object_id == 0:
                 # Did not find a match, first insert object info
-                self.find_constellation()
+                if not self.constellation:
+                    self.find_constellation()
                 assert isinstance(self.mag, MagnitudeObject)
 
                 self.object_id = objects_db.insert_object(
@@ -118,6 +118,7 @@ def load_sac_asterisms():
 
     # Batch insert all objects
     objects_db.bulk_mode = True
+    NewCatalogObject.find_constellations(objects_to_insert)
     # Set up shared finder for performance
     NewCatalogObject.set_shared_finder(shared_finder)
     try:
@@ -222,6 +223,7 @@ def load_sac_multistars():
 
     # Batch insert all objects
     objects_db.bulk_mode = True
+    NewCatalogObject.find_constellations(objects_to_insert)
     # Set up shared finder for performance
     NewCatalogObject.set_shared_finder(shared_finder)
     try:
@@ -314,6 +316,7 @@ def load_sac_redstars():
 
     # Batch insert all objects
     objects_db.bulk_mode = True
+    NewCatalogObject.find_constellations(objects_to_insert)
     # Set up shared finder for performance
     NewCatalogObject.set_shared_finder(shared_finder)
     try:
@@ -207,6 +207,7 @@ def load_collinder():
     from .catalog_import_utils import ObjectFinder
 
     shared_finder = ObjectFinder()
+    NewCatalogObject.find_constellations(objects_to_insert)
     NewCatalogObject.set_shared_finder(shared_finder)
 
     try:
@@ -319,6 +320,7 @@ def load_taas200():
 
         # Batch insert all objects
         objects_db.bulk_mode = True
+        NewCatalogObject.find_constellations(objects_to_insert)
         # Set up shared finder for performance
         NewCatalogObject.set_shared_finder(shared_finder)
         try:
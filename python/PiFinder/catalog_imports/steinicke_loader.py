@@ -514,6 +514,7 @@ def load_ngc_catalog():
     from .catalog_import_utils import ObjectFinder
 
     shared_finder = ObjectFinder()
+    NewCatalogObject.find_constellations(prepared_objects)
     NewCatalogObject.set_shared_finder(shared_finder)
 
     try:
@@ -283,6 +283,7 @@ def load_wds():
         wds_dict[entry["Coordinates_2000"]].append(entry)
 
     seq = 1
+    objects_to_insert = []
     for key, value in tqdm(wds_dict.items(), total=len(wds_dict.items())):
         current_result = handle_multiples(key, value)
         wds_name = f"WDS J{current_result['name']}"
@@ -300,9 +301,13 @@ def load_wds():
             aka_names=[wds_name] + clean_discoverers,
             description=current_result["description"],
         )
-        new_object.insert(find_object_id=False)
+        objects_to_insert.append(new_object)
         seq += 1
 
+    NewCatalogObject.find_constellations(objects_to_insert)
+    for new_object in tqdm(objects_to_insert):
+        new_object.insert(find_object_id=False)
+
     insert_catalog_max_sequence(catalog)
 
     # Restore SQLite settings
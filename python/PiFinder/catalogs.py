@@ -72,7 +72,7 @@ class Names:
     names: DefaultDict[int, List[str]] = defaultdict(list)
 
     def __init__(self):
-        self.db = ObjectsDatabase()
+        self.db = ObjectsDatabase(read_only=True)
         self.id_to_names = self.db.get_object_id_to_names()
         self.name_to_id = self.db.get_name_to_object_id(self.id_to_names)
         self._sort_names()
@@ -713,7 +713,6 @@ class PlanetCatalog(Catalog):
     def add_planet(self, sequence: int, name: str, planet: Dict[str, Dict[str, float]]):
         try:
             ra, dec = planet["radec"]
-            constellation = sf_utils.radec_to_constellation(ra, dec)
 
             obj = CompositeObject.from_dict(
                 {
@@ -721,7 +720,7 @@ class PlanetCatalog(Catalog):
                     "obj_type": "Pla",
                     "ra": ra,
                     "dec": dec,
-                    "const": constellation,
+                    "const": planet["const"],
                     "size": SizeObject([]),
                     "mag": MagnitudeObject([planet["mag"]]),
                     "names": [name.capitalize()],
@@ -756,11 +755,12 @@ class PlanetCatalog(Catalog):
             for obj in self._get_objects():
                 try:
                     name = obj.names[0]
-                    if name in planet_dict:
-                        planet = planet_dict[name]
+                    # Objects carry the capitalized name ("Mars")
+                    planet = planet_dict.get(name.upper())
+                    if planet:
                         obj.ra, obj.dec = planet["radec"]
                         obj.mag = MagnitudeObject([planet["mag"]])
-                        obj.const = sf_utils.radec_to_constellation(obj.ra, obj.dec)
+                        obj.const = planet["const"]
                         obj.mag_str = obj.mag.calc_two_mag_representation()
                 except (KeyError, ValueError) as e:
                     logger.error(f"Error updating planet {name}: {e}")
@@ -948,7 +948,7 @@ class CatalogBuilder:
             self._background_loader = None
             self._pending_catalogs_ref = all_catalogs
         else:
-            db: Database = ObjectsDatabase()
+            db: Database = ObjectsDatabase(read_only=True)
 
             # list of dicts, one dict for each entry in the catalog_objects table
             catalog_objects: List[Dict] = [
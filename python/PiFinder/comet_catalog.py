@@ -4,6 +4,7 @@ import time
 import datetime
 import pytz
 import threading
+import numpy as np
 from typing import Dict, Optional
 from PiFinder.catalog_base import (
     CatalogStatus,
@@ -247,19 +248,28 @@ class CometCatalog(Catalog):
             self.calculation_progress = None
             return
 
+        radecs = np.array([comet["radec"] for comet in comet_dict.values()])
+        constellations = sf_utils.radec_to_constellations(radecs[:, 0], radecs[:, 1])
         for sequence, (name, comet) in enumerate(comet_dict.items()):
-            self.add_comet(sequence, name, comet)
+            self.add_comet(sequence, name, comet, str(constellations[sequence]))
 
         self._virtual_id_manager.mint_ids(self)
 
         self.initialized = True
         self.calculation_progress = None  # Clear progress after completion
 
-    def add_comet(self, sequence: int, name: str, comet: Dict[str, Dict[str, float]]):
+    def add_comet(
+        self,
+        sequence: int,
+        name: str,
+        comet: Dict[str, Dict[str, float]],
+        constellation: Optional[str] = None,
+    ):
         """Add a single comet to the catalog"""
         try:
             ra, dec = comet["radec"]
-            constellation = sf_utils.radec_to_constellation(ra, dec)
+            if constellation is None:
+                constellation = sf_utils.radec_to_constellation(ra, dec)
             desc = f"Distance to\nEarth: {comet['earth_distance']:.2f} AU\nSun: {comet['sun_distance']:.2f} AU"
 
             mag = MagnitudeObject([comet.get("mag", [])])
@@ -1,11 +1,140 @@
-from typing import Tuple
-from sqlite3 import Connection, Cursor, Error
+"""
+SQLite access shared by the objects and observations databases.
+
+Read-only connections come from a per-process, per-thread pool instead
+of being opened by every ``Database`` instance. The UI opens several
+read-only ``ObjectsDatabase`` handles; with the pool they all reuse one
+connection per thread, so the pragmas run once and the statement cache
+(``CACHED_STATEMENTS`` prepared statements per connection) stays warm.
+
+* Read-only connections (``read_only=True``) open the file with
+  ``mode=ro`` and ``query_only``, for the runtime catalog lookups. They
+  never write, so sharing one between handles is safe.
+* Writable connections are never pooled: each writable handle gets its
+  own, and ``close()`` closes it. Callers commit and roll back on
+  ``conn``, and on a shared connection one handle's rollback would
+  discard another's work.
+* ``wal=True`` switches a writable connection's file to WAL, so readers
+  in other processes and threads are not blocked while it writes. The
+  observations database uses it. The objects database keeps its journal
+  mode, since the shipped file is opened read-only and a WAL file would
+  need its -wal/-shm companions beside it.
+* Every connection memory-maps up to 256MB of the file and keeps
+  temporary data in RAM.
+
+sqlite3 connections may not cross threads, and must not survive a fork,
+so the pool is thread-local and starts empty in a forked child. A pooled
+connection is reopened when its file has been replaced on disk; handles
+still holding the old one keep using it, on the file they opened.
+"""
+
 import logging
+import os
 import sqlite3
+import threading
 from pathlib import Path
+from sqlite3 import Connection, Cursor, Error
+from typing import Dict, Tuple
 
 logger = logging.getLogger("Database")
 
+CACHED_STATEMENTS = 256
+
+_COMMON_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456;",  # 256MB memory mapping
+    "PRAGMA cache_size = -64000;",  # 64MB cache (negative = KB)
+    "PRAGMA temp_store = MEMORY;",  # Keep temporary data in RAM
+)
+_READ_ONLY_PRAGMAS = ("PRAGMA query_only = ON;",)
+_WAL_PRAGMAS = ("PRAGMA journal_mode = WAL;",)
+_WRITABLE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL;",  # Balanced safety/performance
+    "PRAGMA busy_timeout = 5000;",
+)
+
+
+def _file_id(db_path) -> Tuple[int, int]:
+    try:
+        st = os.stat(db_path)
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_dev, st.st_ino)
+
+
+def open_connection(db_path, read_only: bool = False, wal: bool = False):
+    """A new connection to ``db_path`` with the pragmas described above."""
+    logger.debug("Opening DB %s%s", db_path, " (read-only)" if read_only else "")
+    if read_only:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=CACHED_STATEMENTS)
+    else:
+        conn = sqlite3.connect(db_path, cached_statements=CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    pragmas = list(_COMMON_PRAGMAS)
+    if read_only:
+        pragmas += _READ_ONLY_PRAGMAS
+    else:
+        if wal:
+            pragmas += _WAL_PRAGMAS
+        pragmas += _WRITABLE_PRAGMAS
+    for pragma in pragmas:
+        try:
+            conn.execute(pragma)
+        except Error:
+            # e.g. WAL is unavailable on read-only media; the
+            # default journal still works
+            logger.warning("DB %s: %s failed", db_path, pragma, exc_info=True)
+    return conn
+
+
+class ConnectionPool(threading.local):
+    """One read-only connection per file for the calling thread."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.connections: Dict[str, Tuple[Connection, tuple]] = {}
+
+    def get(self, db_path) -> Connection:
+        if self.pid != os.getpid():
+            # Forked: the parent's connections belong to the parent
+            self.pid = os.getpid()
+            self.connections = {}
+
+        key = str(db_path)
+        entry = self.connections.get(key)
+        if entry is not None:
+            conn, file_id = entry
+            if file_id == _file_id(db_path):
+                return conn
+            # Handles opened before the swap keep their connection (to
+            # the old file) until they go away; new handles get the new one.
+            logger.debug("DB %s replaced on disk, reopening", db_path)
+
+        conn = open_connection(db_path, read_only=True)
+        self.connections[key] = (conn, _file_id(db_path))
+        return conn
+
+    def holds(self, conn: Connection) -> bool:
+        return any(pooled is conn for pooled, _ in self.connections.values())
+
+    def close_all(self) -> None:
+        for conn, _ in self.connections.values():
+            conn.close()
+        self.connections = {}
+
+
+_pool = ConnectionPool()
+
+
+def pooled_connection(db_path) -> Connection:
+    """The calling thread's shared read-only connection to ``db_path``."""
+    return _pool.get(db_path)
+
+
+def close_pooled_connections() -> None:
+    """Close the calling thread's pooled connections."""
+    _pool.close_all()
+
 
 class Database:
     conn: Connection
@@ -20,15 +149,25 @@ class Database:
     def get_conn_cursor(self) -> Tuple[Connection, Cursor]:
         return self.conn, self.cursor
 
-    def get_database(self, db_path) -> Tuple[Connection, Cursor]:
+    def get_database(
+        self, db_path, read_only=False, wal=False
+    ) -> Tuple[Connection, Cursor]:
         try:
-            # open the DB
-            logger.debug("Opening DB %s", db_path)
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            if read_only:
+                conn = pooled_connection(db_path)
+            else:
+                conn = open_connection(db_path, wal=wal)
             db_c = conn.cursor()
         except Error as e:
             logger.exception("Error connecting to database")
             raise e
 
         return conn, db_c
+
+    def close(self):
+        """Release this handle. A writable handle's connection is closed;
+        a pooled read-only one stays open for the next handle in this
+        thread (see close_pooled_connections())."""
+        self.cursor.close()
+        if not _pool.holds(self.conn):
+            self.conn.close()
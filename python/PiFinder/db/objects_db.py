@@ -1,31 +1,40 @@
 import PiFinder.utils as utils
 from sqlite3 import Connection, Cursor
-from typing import Tuple, DefaultDict, List, Dict
-from PiFinder.db.db import Database
+from typing import Tuple, DefaultDict, List, Dict, Iterable, Iterator
+from PiFinder.db.db import Database, open_connection
 from collections import defaultdict
 import logging
 import time
 
+# Ids per "IN (...)" query of the batch lookups; SQLite builds before 3.32
+# allow at most 999 parameters.
+BATCH_SIZE = 500
+
+
+def _batches(values: Iterable) -> Iterator[list]:
+    values = list(dict.fromkeys(values))
+    for start in range(0, len(values), BATCH_SIZE):
+        yield values[start : start + BATCH_SIZE]
+
 
 class ObjectsDatabase(Database):
-    def __init__(self, db_path=utils.pifinder_db):
-        conn, cursor = self.get_database(db_path)
-        super().__init__(conn, cursor, db_path)
+    """
+    The catalog objects DB.
 
-        # Performance optimizations for Pi/SD card environments
-        logging.info("Applying database performance optimizations...")
-        self.cursor.execute("PRAGMA foreign_keys = ON;")
-        self.cursor.execute("PRAGMA mmap_size = 268435456;")  # 256MB memory mapping
-        self.cursor.execute("PRAGMA cache_size = -64000;")  # 64MB cache (negative = KB)
-        self.cursor.execute("PRAGMA temp_store = MEMORY;")  # Keep temporary data in RAM
-        self.cursor.execute(
-            "PRAGMA synchronous = NORMAL;"
-        )  # Balanced safety/performance
-        logging.info("Database optimizations applied")
+    The runtime only reads it and should pass ``read_only=True``; the
+    catalog import tools open it writable. Read-only connections are pooled
+    (see PiFinder/db/db.py), so creating a read-only instance is cheap; a
+    writable one opens a connection of its own.
+    """
 
-        self.conn.commit()
+    def __init__(self, db_path=utils.pifinder_db, read_only=False):
+        conn, cursor = self.get_database(db_path, read_only)
+        super().__init__(conn, cursor, db_path)
+        self.read_only = read_only
         self.bulk_mode = False  # Flag to disable commits during bulk operations
 
+        if not read_only:
+            self.cursor.execute("PRAGMA foreign_keys = ON;")
         self._ensure_catalog_object_indexes()
 
     def _ensure_catalog_object_indexes(self) -> None:
@@ -63,11 +72,19 @@ class ObjectsDatabase(Database):
 
             logging.info("Building catalog_objects indexes (one time)...")
             start = time.time()
-            # Another process may be building them right now; wait rather than
-            # failing outright.
-            self.cursor.execute("PRAGMA busy_timeout = 30000;")
-            self.create_catalog_object_indexes()
-            self.conn.commit()
+            # A read-only handle builds them on a short-lived writable
+            # connection of its own, in the file's existing journal mode.
+            conn = open_connection(self.db_path) if self.read_only else self.conn
+            try:
+                # Another process may be building them right now; wait rather
+                # than failing outright.
+                conn.execute("PRAGMA busy_timeout = 30000;")
+                self.create_catalog_object_indexes(conn.cursor())
+                conn.execute("PRAGMA busy_timeout = 5000;")
+                conn.commit()
+            finally:
+                if conn is not self.conn:
+                    conn.close()
             logging.info("Built catalog_objects indexes in %.1fs", time.time() - start)
         except Exception:
             logging.warning(
@@ -163,7 +180,7 @@ class ObjectsDatabase(Database):
         # Commit changes to the database
         self.conn.commit()
 
-    def create_catalog_object_indexes(self) -> None:
+    def create_catalog_object_indexes(self, cursor=None) -> None:
         """
         Creates the catalog_objects lookup indexes.
 
@@ -175,13 +192,14 @@ class ObjectsDatabase(Database):
         ~151k rows -- ~6ms on a laptop and far worse on a Pi's SD card, paid
         per call.
         """
-        self.cursor.execute(
+        cursor = cursor or self.cursor
+        cursor.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_catalog_objects_object_id
             ON catalog_objects(object_id);
             """
         )
-        self.cursor.execute(
+        cursor.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_catalog_objects_code_sequence
             ON catalog_objects(catalog_code, sequence);
@@ -373,6 +391,31 @@ class ObjectsDatabase(Database):
         )
         return self.cursor.fetchone()
 
+    def get_object_ids_by_listings(
+        self, listings: Iterable[Tuple[str, int]]
+    ) -> Dict[Tuple[str, int], int]:
+        """
+        Batch form of get_catalog_object_by_sequence(): maps each
+        (catalog_code, sequence) listing that exists to its object_id.
+        """
+        by_catalog: DefaultDict[str, List[int]] = defaultdict(list)
+        for catalog_code, sequence in listings:
+            by_catalog[catalog_code].append(sequence)
+
+        result = {}
+        for catalog_code, sequences in by_catalog.items():
+            for batch in _batches(sequences):
+                placeholders = ",".join("?" * len(batch))
+                for row in self.cursor.execute(
+                    f"""
+                    SELECT sequence, object_id FROM catalog_objects
+                    WHERE catalog_code = ? AND sequence IN ({placeholders});
+                    """,
+                    [catalog_code, *batch],
+                ):
+                    result[(catalog_code, row["sequence"])] = row["object_id"]
+        return result
+
     def get_catalog_objects_by_catalog_code(self, catalog_code):
         self.cursor.execute(
             "SELECT * FROM catalog_objects WHERE catalog_code = ?;", (catalog_code,)
@@ -418,6 +461,3 @@ class ObjectsDatabase(Database):
             "DELETE FROM catalogs WHERE catalog_code = ?;", (catalog_code,)
         )
         self.conn.commit()
-
-    def close(self):
-        self.conn.close()
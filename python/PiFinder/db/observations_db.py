@@ -1,7 +1,7 @@
 import json
 import logging
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlite3 import Connection, Cursor
 from PiFinder.db.db import Database
 import PiFinder.utils as utils
@@ -16,7 +16,8 @@ class ObservationsDatabase(Database):
         new_db = False
         if not db_path.exists():
             new_db = True
-        conn, cursor = self.get_database(db_path)
+        # WAL: the web server reads the log while the UI writes it
+        conn, cursor = self.get_database(db_path, wal=True)
         super().__init__(conn, cursor, db_path)
         if new_db:
             self.create_tables()
@@ -33,7 +34,7 @@ class ObservationsDatabase(Database):
         if self._objects_db is None:
             from PiFinder.db.objects_db import ObjectsDatabase
 
-            self._objects_db = ObjectsDatabase()
+            self._objects_db = ObjectsDatabase(read_only=True)
         return self._objects_db
 
     def _resolve_object_id(self, catalog: str, sequence: int) -> Optional[int]:
@@ -54,6 +55,22 @@ class ObservationsDatabase(Database):
             return None
         return None if row is None else row["object_id"]
 
+    def _resolve_object_ids(
+        self, listings: Iterable[Tuple[str, int]]
+    ) -> Dict[Tuple[str, int], int]:
+        """
+        Batch form of _resolve_object_id(); listings that don't resolve
+        are left out.
+        """
+        try:
+            return self._get_objects_db().get_object_ids_by_listings(listings)
+        except Exception:
+            logger.warning(
+                "Objects DB unavailable; observed status stays per listing",
+                exc_info=True,
+            )
+            return {}
+
     def _resolve_listings(self, object_id: int) -> List[Tuple[str, int]]:
         """
         Maps an objects-table id to all of its catalog listings (the
@@ -104,7 +121,7 @@ class ObservationsDatabase(Database):
         self.conn.commit()
 
     def get_observations_database(self) -> Tuple[Connection, Cursor]:
-        return self.get_database(utils.observations_db)
+        return self.get_database(utils.observations_db, wal=True)
 
     def create_obs_session(self, start_time, lat, lon, timezone, uuid):
         q = """
@@ -208,11 +225,13 @@ class ObservationsDatabase(Database):
         self.observed_objects_cache: set[tuple[str, int]] = {
             (x["catalog"], x["sequence"]) for x in self.get_observed_objects()
         }
-        self.observed_object_ids: set[int] = set()
-        for catalog, sequence in self.observed_objects_cache:
-            object_id = self._resolve_object_id(catalog, sequence)
-            if object_id is not None and object_id >= 0:
-                self.observed_object_ids.add(object_id)
+        self.observed_object_ids: set[int] = {
+            object_id
+            for object_id in self._resolve_object_ids(
+                self.observed_objects_cache
+            ).values()
+            if object_id is not None and object_id >= 0
+        }
 
     def check_logged(self, obj_record: CompositeObject):
         """
@@ -264,9 +283,6 @@ class ObservationsDatabase(Database):
 
         return logs
 
-    def close(self):
-        self.conn.close()
-
     def get_sessions(self, session_uid=None):
         """
         returns a list of observing session dictionaries
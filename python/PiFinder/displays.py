@@ -11,6 +11,7 @@ from luma.oled.device import ssd1351
 from luma.lcd.device import st7789
 
 from PiFinder import ssd1333_device
+from PiFinder.oled_framebuffer import DirtyRectangleMixin
 from PiFinder.ssd1333_device import ssd1333
 
 from PiFinder.ui.fonts import Fonts
@@ -131,13 +132,17 @@ class DisplayPygame_320(Layout320, DisplayBase):
         super().__init__()
 
 
+class _ssd1351(DirtyRectangleMixin, ssd1351):
+    """luma's SSD1351 driver, sending only changed windows of each frame."""
+
+
 class DisplaySSD1351(DisplayBase):
     resolution = (128, 128)
 
     def __init__(self):
         # init display  (SPI hardware)
         serial = spi(device=0, port=0, bus_speed_hz=40000000)
-        device_serial = ssd1351(serial, rotate=0, bgr=True)
+        device_serial = _ssd1351(serial, rotate=0, bgr=True)
 
         device_serial.capabilities(
             width=self.resolution[0], height=self.resolution[1], rotate=0, mode="RGB"
@@ -510,7 +515,7 @@ class DisplayHeadless(DisplayBase):
     (e.g. a CI box or a headless dev session) without pulling in pygame.
 
     Nothing here feeds the API directly: the UI render loop already calls
-    ``shared_state.set_screen()`` right beside ``device.display()``, so the
+    ``screen_mirror.publish()`` right beside ``device.display()``, so the
     current screen stays available over ``GET /api/screen`` no matter which
     display driver is active. This driver simply makes the hardware-facing
     half of that pair a no-op.
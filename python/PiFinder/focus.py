@@ -18,15 +18,23 @@ display-stretched copy, so the reported HFD never depends on how the image looks
 
 Pure numpy/scipy only -- no PIL/display or UIModule dependencies -- so it is
 unit-testable against synthetic blobs of known width.
+
+``FocusWorker`` runs the measurement on a background thread of the UI process,
+always on the newest submitted frame, so the Focus screen's key handling and
+redraws never wait for it.
 """
 
+import logging
+import threading
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
 
 import numpy as np
 from scipy import ndimage
 from scipy.optimize import linear_sum_assignment
 
+logger = logging.getLogger("Focus")
+
 
 @dataclass
 class Blob:
@@ -85,12 +93,32 @@ def _estimate_background_noise(np_image: np.ndarray) -> Tuple[float, float]:
     to hot pixels, so the threshold tracks the sky floor rather than the signal.
     A small floor on sigma avoids a zero threshold on a perfectly flat frame.
     """
-    background = float(np.median(np_image))
-    mad = float(np.median(np.abs(np_image - background)))
+    if np_image.dtype == np.uint8:
+        # Camera frames are 8-bit: both medians come from one histogram
+        # instead of two partial sorts of the whole frame.
+        counts = np.bincount(np_image.ravel(), minlength=256)
+        levels = np.arange(256, dtype=np.float64)
+        background = _histogram_median(levels, counts)
+        mad = _histogram_median(np.abs(levels - background), counts)
+    else:
+        background = float(np.median(np_image))
+        mad = float(np.median(np.abs(np_image - background)))
     sigma = 1.4826 * mad
     return background, max(sigma, 1.0)
 
 
+def _histogram_median(values: np.ndarray, counts: np.ndarray) -> float:
+    """Median of a sample given as distinct ``values`` and their ``counts``;
+    equal to ``np.median`` of the expanded sample."""
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    cumulative = np.cumsum(counts[order])
+    total = int(cumulative[-1])
+    low = ordered[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    high = ordered[np.searchsorted(cumulative, total // 2, side="right")]
+    return float((low + high) / 2.0)
+
+
 def _local_background(np_image: np.ndarray, cy: float, cx: float, extent: int) -> float:
     """Median of an annulus around (cy, cx), sized from the blob extent.
 
@@ -133,8 +161,11 @@ def _find_blobs(
     measure but still useful for the visual focus tiles. ``brightest_peak`` is
     the peak of the brightest blob of any size, or None when nothing was detected.
     """
-    img = np.asarray(np_image, dtype=np.float32)
-    background, sigma = _estimate_background_noise(img)
+    raw = np.asarray(np_image)
+    img = np.asarray(raw, dtype=np.float32)
+    background, sigma = _estimate_background_noise(
+        raw if raw.dtype == np.uint8 else img
+    )
     threshold = background + sigma_k * sigma
 
     # Detect on a lightly smoothed copy so per-pixel noise does not fragment a
@@ -147,57 +178,65 @@ def _find_blobs(
     if n_labels == 0:
         return [], [], background, None
 
+    # Per-label sums come from bincount over the labelled pixels, so the
+    # Python loop below only visits blobs that pass the size test; a noisy
+    # frame labels hundreds of one-pixel specks.
+    pixels = np.flatnonzero(mask)
+    pixel_labels = labeled.ravel()[pixels]
+    pixel_values = img.ravel()[pixels]
+    brightest_peak = float(pixel_values.max())
+    # Count pixels above threshold in the RAW frame (not the smoothed copy)
+    # so a single-pixel hot pixel -- which smoothing spreads into a small
+    # blob -- is still rejected as a one-pixel spike.
+    sizes = np.bincount(pixel_labels, pixel_values > threshold, n_labels + 1)
+    kept_labels = np.flatnonzero(sizes[1:] >= 2) + 1
+    if kept_labels.size == 0:
+        return [], [], background, brightest_peak
+
     slices = ndimage.find_objects(labeled)
+    peaks = {}
+    extents = {}
+    bbox_centers = {}
+    bbox_backgrounds = np.zeros(n_labels + 1)
+    for label_idx in kept_labels:
+        sl = slices[label_idx - 1]
+        peaks[label_idx] = float(img[sl][labeled[sl] == label_idx].max())
+        extent = int(max(sl[0].stop - sl[0].start, sl[1].stop - sl[1].start))
+        bbox_cy = (sl[0].start + sl[0].stop - 1) / 2.0
+        bbox_cx = (sl[1].start + sl[1].stop - 1) / 2.0
+        extents[label_idx] = extent
+        bbox_centers[label_idx] = (bbox_cy, bbox_cx)
+        bbox_backgrounds[label_idx] = _local_background(img, bbox_cy, bbox_cx, extent)
+
+    # Center the display crop on the star's flux, not on the geometric
+    # center of its thresholded bounding box. A one-pixel change at the
+    # threshold boundary otherwise becomes a conspicuous jump after the
+    # 10x focus enlargement. Weighted sums for every blob at once:
+    weights = np.clip(pixel_values - bbox_backgrounds[pixel_labels], 0.0, None)
+    rows, columns = np.divmod(pixels, img.shape[1])
+    total_weights = np.bincount(pixel_labels, weights, n_labels + 1)
+    row_sums = np.bincount(pixel_labels, weights * rows, n_labels + 1)
+    column_sums = np.bincount(pixel_labels, weights * columns, n_labels + 1)
 
     usable: List[Blob] = []
     oversized: List[Blob] = []
-    brightest_peak: Optional[float] = None
-
-    for label_idx, sl in enumerate(slices, start=1):
-        if sl is None:
-            continue
-        region_mask = labeled[sl] == label_idx
-
-        patch = img[sl]
-        peak = float(patch[region_mask].max())
-        if brightest_peak is None or peak > brightest_peak:
-            brightest_peak = peak
-
-        # Count pixels above threshold in the RAW frame (not the smoothed copy)
-        # so a single-pixel hot pixel -- which smoothing spreads into a small
-        # blob -- is still rejected as a one-pixel spike.
-        size_px = int(((patch > threshold) & region_mask).sum())
-        if size_px < 2:
-            continue
-
-        height = sl[0].stop - sl[0].start
-        width = sl[1].stop - sl[1].start
-        extent = int(max(height, width))
-
-        bbox_cy = (sl[0].start + sl[0].stop - 1) / 2.0
-        bbox_cx = (sl[1].start + sl[1].stop - 1) / 2.0
-        local_bg = _local_background(img, bbox_cy, bbox_cx, extent)
-
-        # Center the display crop on the star's flux, not on the geometric
-        # center of its thresholded bounding box. A one-pixel change at the
-        # threshold boundary otherwise becomes a conspicuous jump after the
-        # 10x focus enlargement.
-        weights = np.clip(patch - local_bg, 0.0, None) * region_mask
-        total_weight = float(weights.sum())
+    for label_idx in kept_labels:
+        extent = extents[label_idx]
+        total_weight = total_weights[label_idx]
         if total_weight > 0.0:
-            patch_y, patch_x = np.indices(patch.shape)
-            cy = sl[0].start + float((patch_y * weights).sum() / total_weight)
-            cx = sl[1].start + float((patch_x * weights).sum() / total_weight)
+            cy = float(row_sums[label_idx] / total_weight)
+            cx = float(column_sums[label_idx] / total_weight)
             local_bg = _local_background(img, cy, cx, extent)
         else:
-            cy, cx = bbox_cy, bbox_cx
+            cy, cx = bbox_centers[label_idx]
+            local_bg = float(bbox_backgrounds[label_idx])
         blob = Blob(
             y=cy,
             x=cx,
-            peak=peak,
+            peak=peaks[label_idx],
             background=local_bg,
             extent=extent,
-            size_px=size_px,
+            size_px=int(sizes[label_idx]),
         )
 
         if extent > max_blob_px:
@@ -497,3 +536,95 @@ def focus_hfd(
         median_fwhm=float(np.median(fwhms)) if fwhms else None,
         blobs=display_blobs,
     )
+
+
+@dataclass(frozen=True)
+class FocusSnapshot:
+    """A published measurement: ``result`` for the frame submitted as ``seq``.
+
+    Attributes:
+        seq: submission sequence number; increases with every submit.
+        frame_time: the frame's exposure end time, as given to ``submit``.
+        image: the submitted frame itself, so the UI can draw the blobs on
+            the pixels they were measured on.
+        result: the measurement of that frame.
+    """
+
+    seq: int
+    frame_time: float
+    image: np.ndarray
+    result: FocusResult
+
+
+class FocusWorker:
+    """Measure focus on a background thread so the UI loop never waits.
+
+    The UI submits each new raw frame and picks up the newest finished
+    snapshot on a later update. Only the latest submitted frame is kept: a
+    frame that arrives while another is being measured replaces any frame
+    still waiting, so a slow measurement never builds a backlog of stale
+    frames. The thread starts on the first submit and idles between frames.
+    """
+
+    def __init__(self, measure: Callable[[np.ndarray], FocusResult] = focus_hfd):
+        self._measure = measure
+        self._condition = threading.Condition()
+        self._pending: Optional[Tuple[int, float, np.ndarray]] = None
+        self._snapshot: Optional[FocusSnapshot] = None
+        self._seq = 0
+        self._reset_seq = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, frame_time: float, np_image: np.ndarray) -> int:
+        """Queue a frame for measurement, dropping any frame still waiting;
+        returns its sequence number."""
+        with self._condition:
+            self._seq += 1
+            self._pending = (self._seq, frame_time, np_image)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="FocusWorker", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+            return self._seq
+
+    def latest(self) -> Optional[FocusSnapshot]:
+        """The newest finished measurement, or None."""
+        with self._condition:
+            return self._snapshot
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Block until submission ``seq`` (or a newer one) is measured."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._snapshot is not None and self._snapshot.seq >= seq,
+                timeout,
+            )
+
+    def reset(self) -> None:
+        """Forget the waiting frame and the last snapshot."""
+        with self._condition:
+            self._pending = None
+            self._snapshot = None
+            self._reset_seq = self._seq
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                pending = self._pending
+                self._pending = None
+            if pending is None:
+                continue
+            seq, frame_time, np_image = pending
+            try:
+                result = self._measure(np_image)
+            except Exception:
+                logger.exception("Focus measurement failed")
+                continue
+            with self._condition:
+                # A reset() while measuring makes this frame stale
+                if seq > self._reset_seq:
+                    self._snapshot = FocusSnapshot(seq, frame_time, np_image, result)
+                self._condition.notify_all()
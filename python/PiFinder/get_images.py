@@ -11,7 +11,7 @@ from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Tuple
 
-from PiFinder import cat_images
+from PiFinder import cat_images, image_pyramid
 from PiFinder.db.objects_db import ObjectsDatabase
 
 
@@ -22,7 +22,7 @@ def check_missing_images() -> List[str]:
 
     Returns list of missing image names.
     """
-    objects_db = ObjectsDatabase()
+    objects_db = ObjectsDatabase(read_only=True)
     _, cursor = objects_db.get_conn_cursor()
 
     # Get all image names directly from object_images table
@@ -85,6 +85,12 @@ def fetch_images_for_object(
     poss_success, poss_error = download_image_from_url(session, poss_url, poss_path)
     if not poss_success:
         errors.append(f"POSS: {poss_error}")
+    else:
+        try:
+            image_pyramid.build_pyramid(poss_path)
+        except Exception as e:
+            # Built on first view instead
+            errors.append(f"POSS pyramid: {e}")
 
     # Download SDSS image
     sdss_filename = f"{image_name}_SDSS.jpg"
@@ -167,6 +173,10 @@ def main():
     else:
         print("All images already downloaded!")
 
+    print("Building image pyramids...")
+    built = image_pyramid.build_missing(cat_images.BASE_IMAGE_PATH)
+    print(f"Built {built} image pyramids")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,193 @@
+"""
+Encoded-image cache and selectable output formats for the web image
+endpoints.
+
+Before this module, ``/image``, ``/api/screen``, ``/api/camera/raw`` and
+``/api/visible_stars?include_image=1`` each encoded a PNG in the waitress
+worker for every request. With several browser tabs and a phone app
+polling, the same frame was encoded once per client.
+
+* ``EncodedImageCache`` keys encodes on ``(source frame sequence,
+  format)``. The first request for a key encodes it. Requests arriving
+  while that encode is running wait for its result instead of starting
+  their own, and later requests get the stored bytes. Only the latest
+  few keys are kept, because polled frames are superseded quickly.
+  ``latest()`` serves a source that moves on by itself (the screen, the
+  camera): a cheap sequence read answers a hit, and the pixels are
+  fetched only on a miss, together with the sequence they belong to.
+* ``encode()`` produces one of ``FORMATS``. Clients choose with the
+  ``format`` query parameter (``parse_format()``):
+
+  - ``png``: the default, unchanged for existing clients.
+  - ``png1``: PNG at zlib level 1, several times faster to encode for a
+    slightly larger file.
+  - ``jpeg``: lossy, the cheapest to encode and send.
+  - ``raw``: the pixel bytes with ``X-Width``, ``X-Height``, ``X-Mode``
+    (and ``X-Dtype`` for arrays) headers, for clients that draw pixels
+    themselves.
+
+Camera frames arrive as 16-bit NumPy arrays. ``array_image()`` keeps
+them as 16-bit grayscale for PNG. It shifts them to 8 bits only for
+JPEG, rather than converting every frame to RGB first.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+#: ``format`` query values understood by the image endpoints
+FORMATS = ("png", "png1", "jpeg", "raw")
+DEFAULT_FORMAT = "png"
+
+JPEG_QUALITY = 85
+
+
+class EncodedImage(NamedTuple):
+    data: bytes
+    content_type: str
+    headers: Dict[str, str]
+
+
+def parse_format(value) -> str:
+    """Normalise a ``format`` query parameter; raises ValueError if unknown."""
+    fmt = (value or DEFAULT_FORMAT).lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def array_image(array: np.ndarray, fmt: str = DEFAULT_FORMAT) -> Image.Image:
+    """A PIL image of a camera array, suited to ``fmt``.
+
+    16-bit frames stay 16-bit for the lossless formats; JPEG gets the top
+    eight significant bits.
+    """
+    array = np.asarray(array)
+    if array.dtype == np.uint16 and array.ndim == 2:
+        if fmt != "jpeg":
+            return Image.fromarray(array, mode="I;16")
+        shift = max(0, int(array.max()).bit_length() - 8)
+        return Image.fromarray((array >> shift).astype(np.uint8), mode="L")
+    return Image.fromarray(array)
+
+
+#: What encode() accepts: a PIL image or a camera array
+Pixels = Union[Image.Image, np.ndarray]
+
+
+def encode(image: Pixels, fmt: str) -> EncodedImage:
+    """Encode ``image`` (PIL or camera array) as ``fmt``."""
+    if fmt == "raw" and isinstance(image, np.ndarray):
+        array = np.ascontiguousarray(image)
+        return EncodedImage(
+            array.tobytes(),
+            "application/octet-stream",
+            {
+                "X-Width": str(array.shape[1]),
+                "X-Height": str(array.shape[0]),
+                "X-Dtype": array.dtype.str,
+            },
+        )
+    if isinstance(image, np.ndarray):
+        image = array_image(image, fmt)
+
+    if fmt == "raw":
+        return EncodedImage(
+            image.tobytes(),
+            "application/octet-stream",
+            {
+                "X-Width": str(image.width),
+                "X-Height": str(image.height),
+                "X-Mode": image.mode,
+            },
+        )
+
+    buf = io.BytesIO()
+    if fmt == "jpeg":
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        image.save(buf, format="JPEG", quality=JPEG_QUALITY)
+        return EncodedImage(buf.getvalue(), "image/jpeg", {})
+    if fmt == "png1":
+        image.save(buf, format="PNG", compress_level=1)
+    else:
+        image.save(buf, format="PNG")
+    return EncodedImage(buf.getvalue(), "image/png", {})
+
+
+class EncodedImageCache:
+    """Single-flight cache of encoded frames (see module doc).
+
+    ``get(key, fmt, source)`` returns the encoding of ``source()`` as
+    ``fmt``. ``source`` is called only when ``(key, fmt)`` has not been
+    encoded yet, so a caller whose pixels are costly to fetch (e.g.
+    through the shared-state proxy) pays for it once per frame too.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fmt: str, source) -> EncodedImage:
+        cache_key = (key, fmt)
+        future: Future = Future()
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is None:
+                self._entries[cache_key] = future
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(cache_key)
+        if cached is not None:
+            return cached.result()
+
+        try:
+            encoded = encode(source(), fmt)
+        except BaseException as e:
+            # Don't cache failures; the next request tries again
+            with self._lock:
+                if self._entries.get(cache_key) is future:
+                    del self._entries[cache_key]
+            future.set_exception(e)
+            raise
+        future.set_result(encoded)
+        return encoded
+
+    def latest(
+        self,
+        sequence: Callable[[], Hashable],
+        fmt: str,
+        fetch: Callable[[], Optional[Tuple[Hashable, Pixels]]],
+    ) -> Optional[Tuple[Hashable, EncodedImage]]:
+        """``(key, encoding)`` of a changing source's newest frame, or None.
+
+        ``sequence()`` is the key of the source's current frame, cheap to
+        read; ``fetch()`` returns ``(key, pixels)`` read together (or None
+        when there is no frame). Only a miss fetches pixels, and they are
+        cached under the key they came with, which may be newer than the
+        one looked up. A falsy key marks a frame that can't be cached.
+        """
+        key = sequence()
+        if key:
+            with self._lock:
+                future = self._entries.get((key, fmt))
+                if future is not None:
+                    self._entries.move_to_end((key, fmt))
+            if future is not None:
+                return key, future.result()
+        fetched = fetch()
+        if fetched is None:
+            return None
+        key, pixels = fetched
+        if not key:
+            return key, encode(pixels, fmt)
+        return key, self.get(key, fmt, lambda: pixels)
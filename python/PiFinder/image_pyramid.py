@@ -0,0 +1,378 @@
+"""
+Tiled grayscale pyramids of the POSS catalog images.
+
+The object details screen used to open the full 1024x1024 POSS JPEG on
+every redraw, rotate all of it, crop the eyepiece field and LANCZOS-resize
+that to the screen. Scrolling through objects or zooming with +/- paid
+for all of it each time.
+
+Each ``<name>_POSS.jpg`` now gets a ``<name>_POSS.pyr`` next to it:
+
+* Levels at full, 1/2, 1/4 ... resolution, down to one tile.
+* Each level is cut into ``TILE`` x ``TILE`` grayscale tiles, stored as
+  individual JPEGs, so the container is about the size of the source.
+* A small header indexes the tiles. The file is memory-mapped and a
+  tile is decoded only when a view needs it. Decoded tiles are kept in
+  a process-wide LRU (``TileCache``), so zooming and re-entering an
+  object reuse them.
+
+``oriented_view()`` picks the coarsest level that still has at least
+one source pixel per screen pixel. It then rotates, mirrors, crops and
+resizes only the few tiles around the centre.
+
+Containers are built by ``get_images`` after each download, or by running
+this module (``python -m PiFinder.image_pyramid``). An image viewed
+without one gets it built on a background thread, and is drawn from the
+full JPEG until it's ready. When the image directory isn't writable, the
+container is built in memory instead.
+"""
+
+import io
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger("Catalog.Images")
+
+MAGIC = b"PFPYR1\0\0"
+TILE = 128
+TILE_QUALITY = 90
+
+# magic, tile size, level count
+_HEADER = struct.Struct("<8sHH")
+# width, height of one level
+_LEVEL = struct.Struct("<HH")
+# offset, length of one tile
+_INDEX = struct.Struct("<II")
+
+
+def pyramid_path(image_path: str) -> str:
+    return os.path.splitext(image_path)[0] + ".pyr"
+
+
+def _levels(image: Image.Image) -> List[Image.Image]:
+    levels = [image]
+    while max(levels[-1].size) > TILE:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+def encode_pyramid(image: Image.Image) -> bytes:
+    """The container bytes for ``image`` (converted to grayscale)."""
+    levels = _levels(image.convert("L"))
+    tiles: List[bytes] = []
+    level_headers = b""
+    for level in levels:
+        width, height = level.size
+        level_headers += _LEVEL.pack(width, height)
+        for top in range(0, height, TILE):
+            for left in range(0, width, TILE):
+                buf = io.BytesIO()
+                level.crop((left, top, left + TILE, top + TILE)).save(
+                    buf, format="JPEG", quality=TILE_QUALITY
+                )
+                tiles.append(buf.getvalue())
+
+    offset = _HEADER.size + len(level_headers) + _INDEX.size * len(tiles)
+    index = b""
+    for tile in tiles:
+        index += _INDEX.pack(offset, len(tile))
+        offset += len(tile)
+    return (
+        _HEADER.pack(MAGIC, TILE, len(levels)) + level_headers + index + b"".join(tiles)
+    )
+
+
+def build_pyramid(image_path: str) -> str:
+    """Write the container for ``image_path``; returns its path."""
+    with Image.open(image_path) as image:
+        data = encode_pyramid(image)
+    path = pyramid_path(image_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def build_missing(image_dir: str) -> int:
+    """Build containers for every POSS image under ``image_dir`` that lacks
+    an up-to-date one; returns how many were built."""
+    built = 0
+    for root, _dirs, files in os.walk(image_dir):
+        for name in files:
+            if not name.endswith("_POSS.jpg"):
+                continue
+            image_path = os.path.join(root, name)
+            if _is_current(image_path):
+                continue
+            try:
+                build_pyramid(image_path)
+                built += 1
+            except Exception:
+                logger.warning("Could not build pyramid for %s", image_path)
+    return built
+
+
+def _is_current(image_path: str) -> bool:
+    try:
+        return os.path.getmtime(pyramid_path(image_path)) >= os.path.getmtime(
+            image_path
+        )
+    except OSError:
+        return False
+
+
+class Pyramid:
+    """Read access to one container, on a memory map or in-memory bytes."""
+
+    def __init__(self, data: Union[bytes, mmap.mmap], key: Hashable):
+        self._data = data
+        self.key = key
+        magic, self.tile, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a PiFinder image pyramid")
+        self.sizes: List[Tuple[int, int]] = []
+        self._first_tile: List[int] = []
+        pos = _HEADER.size
+        tiles = 0
+        for _ in range(count):
+            width, height = _LEVEL.unpack_from(data, pos)
+            pos += _LEVEL.size
+            self.sizes.append((width, height))
+            self._first_tile.append(tiles)
+            tiles += self._columns(width) * -(-height // self.tile)
+        self._index_start = pos
+
+    @classmethod
+    def open(cls, path: str) -> "Pyramid":
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, (path, os.path.getmtime(path)))
+
+    def _columns(self, width: int) -> int:
+        return -(-width // self.tile)
+
+    def tile_bytes(self, level: int, column: int, row: int) -> bytes:
+        number = (
+            self._first_tile[level] + row * self._columns(self.sizes[level][0]) + column
+        )
+        offset, length = _INDEX.unpack_from(
+            self._data, self._index_start + number * _INDEX.size
+        )
+        return self._data[offset : offset + length]
+
+    def region(self, level: int, left: int, top: int, size: int) -> np.ndarray:
+        """A ``size`` x ``size`` block of ``level`` with its top left at
+        (left, top); parts outside the image are black."""
+        width, height = self.sizes[level]
+        out = np.zeros((size, size), dtype=np.uint8)
+        x0, y0 = max(left, 0), max(top, 0)
+        x1, y1 = min(left + size, width), min(top + size, height)
+        if x0 >= x1 or y0 >= y1:
+            return out
+        for row in range(y0 // self.tile, (y1 - 1) // self.tile + 1):
+            for column in range(x0 // self.tile, (x1 - 1) // self.tile + 1):
+                tile = tile_cache.get(self, level, column, row)
+                tx, ty = column * self.tile, row * self.tile
+                ax0, ay0 = max(x0, tx), max(y0, ty)
+                ax1 = min(x1, tx + tile.shape[1])
+                ay1 = min(y1, ty + tile.shape[0])
+                out[ay0 - top : ay1 - top, ax0 - left : ax1 - left] = tile[
+                    ay0 - ty : ay1 - ty, ax0 - tx : ax1 - tx
+                ]
+        return out
+
+
+class TileCache:
+    """LRU of decoded tiles, shared by all pyramids in the process."""
+
+    def __init__(self, maxsize: int = 96):
+        self.maxsize = maxsize
+        self._tiles: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pyramid: Pyramid, level: int, column: int, row: int) -> np.ndarray:
+        key = (pyramid.key, level, column, row)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        with Image.open(io.BytesIO(pyramid.tile_bytes(level, column, row))) as image:
+            tile = np.asarray(image.convert("L"))
+        with self._lock:
+            self._tiles[key] = tile
+            while len(self._tiles) > self.maxsize:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+
+
+tile_cache = TileCache()
+
+_PYRAMIDS: "OrderedDict[str, Pyramid]" = OrderedDict()
+_PYRAMIDS_MAX = 8
+_PYRAMIDS_LOCK = threading.Lock()
+
+
+_BUILDING: Set[str] = set()
+
+
+def _memory_key(image_path: str) -> Tuple[str, float]:
+    return (image_path, os.path.getmtime(image_path))
+
+
+def _cache_pyramid(image_path: str, pyramid: Pyramid) -> None:
+    with _PYRAMIDS_LOCK:
+        _PYRAMIDS[image_path] = pyramid
+        while len(_PYRAMIDS) > _PYRAMIDS_MAX:
+            _PYRAMIDS.popitem(last=False)
+
+
+def _build(image_path: str) -> None:
+    try:
+        try:
+            build_pyramid(image_path)
+        except OSError:
+            # Read-only image directory: keep the container in memory
+            with Image.open(image_path) as image:
+                data = encode_pyramid(image)
+            _cache_pyramid(image_path, Pyramid(data, _memory_key(image_path)))
+    except Exception:
+        logger.warning("Could not build pyramid for %s", image_path)
+    finally:
+        with _PYRAMIDS_LOCK:
+            _BUILDING.discard(image_path)
+
+
+def build_in_background(image_path: str) -> Optional[threading.Thread]:
+    """Start building the container for ``image_path`` unless a build is
+    already running; returns the started thread."""
+    with _PYRAMIDS_LOCK:
+        if image_path in _BUILDING:
+            return None
+        _BUILDING.add(image_path)
+    thread = threading.Thread(
+        target=_build, args=(image_path,), name="ImagePyramid", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def load_pyramid(image_path: str) -> Optional[Pyramid]:
+    """
+    The pyramid for ``image_path``, or None while its container is being
+    built in the background.
+    """
+    with _PYRAMIDS_LOCK:
+        pyramid = _PYRAMIDS.get(image_path)
+    if pyramid is not None and (
+        _is_current(image_path) or pyramid.key == _memory_key(image_path)
+    ):
+        with _PYRAMIDS_LOCK:
+            if image_path in _PYRAMIDS:
+                _PYRAMIDS.move_to_end(image_path)
+        return pyramid
+
+    if not _is_current(image_path):
+        build_in_background(image_path)
+        return None
+
+    pyramid = Pyramid.open(pyramid_path(image_path))
+    _cache_pyramid(image_path, pyramid)
+    return pyramid
+
+
+def _full_image_view(
+    image_path: str,
+    fov: float,
+    image_rotate: float,
+    flip_image: bool,
+    flop_image: bool,
+    resolution: int,
+) -> Image.Image:
+    """``oriented_view`` from the full JPEG, for images without a container."""
+    with Image.open(image_path) as image:
+        view = image.convert("L").rotate(image_rotate)
+    if flip_image:
+        view = view.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    if flop_image:
+        view = view.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    width, height = view.size
+    half = int(width * fov / 2)
+    box = (width // 2 - half, height // 2 - half, width // 2 + half, height // 2 + half)
+    return view.crop(box).resize((resolution, resolution), Image.Resampling.LANCZOS)
+
+
+def oriented_view(
+    image_path: str,
+    fov: float,
+    image_rotate: float,
+    flip_image: bool,
+    flop_image: bool,
+    resolution: int,
+) -> Image.Image:
+    """
+    The eyepiece view of a POSS image as a ``resolution`` square grayscale
+    image: rotated by ``image_rotate`` degrees (counterclockwise, as PIL's
+    ``rotate``), mirrored (flip = top-to-bottom, flop = left-to-right),
+    cropped to ``fov`` (the fraction of the full image width) and resized.
+    """
+    pyramid = load_pyramid(image_path)
+    if pyramid is None:
+        return _full_image_view(
+            image_path, fov, image_rotate, flip_image, flop_image, resolution
+        )
+    full_width = pyramid.sizes[0][0]
+    crop = max(2, 2 * int(full_width * fov / 2))
+
+    # Coarsest level with at least one pixel per output pixel
+    level = 0
+    while level + 1 < len(pyramid.sizes) and crop / 2 ** (level + 1) >= resolution:
+        level += 1
+    scale = pyramid.sizes[level][0] / full_width
+    crop_l = crop * scale
+
+    # The unrotated block that covers the rotated crop, centred on the
+    # image centre like the full-image rotation it replaces
+    size = 2 * math.ceil(crop_l * math.sqrt(2) / 2) + 2
+    cx = pyramid.sizes[level][0] / 2
+    cy = pyramid.sizes[level][1] / 2
+    left, top = round(cx - size / 2), round(cy - size / 2)
+    block = Image.fromarray(pyramid.region(level, left, top, size))
+
+    block = block.rotate(image_rotate, resample=Image.Resampling.BILINEAR)
+    if flip_image:
+        block = block.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    if flop_image:
+        block = block.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+
+    # The crop box in block coordinates; the block is centred on (cx, cy)
+    bx = cx - left
+    by = cy - top
+    box = (bx - crop_l / 2, by - crop_l / 2, bx + crop_l / 2, by + crop_l / 2)
+    return block.resize((resolution, resolution), Image.Resampling.LANCZOS, box=box)
+
+
+def main() -> None:
+    from PiFinder.cat_images import BASE_IMAGE_PATH
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Building image pyramids under %s", BASE_IMAGE_PATH)
+    logger.info("Built %d image pyramids", build_missing(BASE_IMAGE_PATH))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ This module is for IMU related functions
 
 import time
 from PiFinder import config
+from PiFinder.imu_ring import ImuRingWriter
 from PiFinder.multiproclogging import MultiprocLogging
 from PiFinder.types.positioning import ImuSample
 import board
@@ -18,6 +19,10 @@ logger = logging.getLogger("IMU.pi")
 
 QUEUE_LEN = 10
 
+# Every sample goes to the IMU ring; shared_state.imu() is refreshed at this
+# period (and whenever moving/calibration changes) for the UI and web.
+SHARED_STATE_PERIOD = 0.1
+
 
 class Imu:
     """
@@ -191,12 +196,19 @@ def imu_monitor(shared_state, console_queue, log_queue):
     )
 
     # update() already throttles the I2C reads to imu_sample_frequency (30 Hz),
-    # but the loop body still runs every iteration — publishing the sample via
-    # set_imu(), a Manager-proxy pickle. Without pacing this spins thousands/sec
-    # (~19% CPU) and the per-publish pickle leaks. Capture the period once; the
-    # fake-IMU fallback has no such attr (and self-throttles), hence the default.
+    # but the loop body still runs every iteration. Without pacing this spins
+    # thousands/sec (~19% CPU). Capture the period once; the fake-IMU fallback
+    # has no such attr (and self-throttles), hence the default.
     sample_period = getattr(imu, "imu_sample_frequency", 1 / 30)
 
+    # Each new read goes to the shared-memory ring (integrator, camera).
+    # The Manager-proxy copy is only refreshed every SHARED_STATE_PERIOD,
+    # unless the ring is unavailable.
+    ring = ImuRingWriter()
+    last_ring_time = 0.0
+    last_publish = 0.0
+    published_flags = None
+
     while True:
         loop_start = time.monotonic()
         imu.update()
@@ -229,8 +241,20 @@ def imu_monitor(shared_state, console_queue, log_queue):
                 imu_calibrated = True
                 console_queue.put("IMU: NDOF Calibrated!")
 
-        if shared_state is not None and imu_calibrated:
-            shared_state.set_imu(imu_sample)
+        if imu_calibrated:
+            ring_ok = True
+            if imu_sample.timestamp != last_ring_time:
+                last_ring_time = imu_sample.timestamp
+                ring_ok = ring.append(imu_sample)
+            flags = (imu_sample.status, imu_sample.moving)
+            if shared_state is not None and (
+                not ring_ok
+                or flags != published_flags
+                or loop_start - last_publish >= SHARED_STATE_PERIOD
+            ):
+                shared_state.set_imu(imu_sample)
+                published_flags = flags
+                last_publish = loop_start
 
         # Pace the loop to the IMU sample rate: sleep only the remainder of the
         # sample period (period minus the work already done this iteration), so
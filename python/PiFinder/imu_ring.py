@@ -0,0 +1,273 @@
+"""
+Shared-memory ring of timestamped IMU samples.
+
+The IMU process used to publish only its latest :class:`ImuSample`
+through ``shared_state.set_imu()``: a Manager-proxy pickle per sample,
+while the integrator and the camera read whatever happened to be current
+when they looked. Samples between two integrator ticks were lost, and the
+solve anchor was whichever sample was current when the capture call
+returned.
+
+The ring keeps the last ``CAPACITY`` samples instead:
+
+* ``ImuRingWriter`` (IMU process) appends every sensor read to a POSIX
+  shared-memory segment. Each slot carries its own sequence word (odd
+  while writing, ``2 * n + 2`` once sample ``n`` is complete), so readers
+  detect a torn or overwritten slot without any lock.
+* ``ImuRingReader`` (integrator, camera) maps the same segment read-only.
+  ``samples_since()`` returns every sample after a cursor, and
+  ``sample_at()`` interpolates the orientation at an exact time, e.g. the
+  end of an exposure.
+
+``shared_state.imu()`` is still published, at a lower rate, for the UI.
+When the segment cannot be created (no ``/dev/shm``), the writer reports
+it and the IMU process falls back to publishing every sample there, and
+readers return nothing so callers use ``shared_state.imu()``.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+import quaternion  # numpy-quaternion
+
+from PiFinder.types.positioning import ImuSample
+
+logger = logging.getLogger("IMU.Ring")
+
+IMU_RING_SHMEM_NAME = "pifinder_imu_ring"
+
+# About 17 s of samples at the 30 Hz read rate
+CAPACITY = 512
+
+# samples written so far
+_HEADER = struct.Struct("<Q")
+# seq, timestamp, quat (w, x, y, z), gyro, accel, status, moving,
+# has gyro, has accel
+_SLOT = struct.Struct("<Qd4d3d3d4B")
+_SEGMENT_SIZE = _HEADER.size + CAPACITY * _SLOT.size
+
+_NO_VECTOR = (0.0, 0.0, 0.0)
+
+
+def _segment_path() -> str:
+    return f"/dev/shm/{IMU_RING_SHMEM_NAME}"
+
+
+def _segment_inode() -> Optional[int]:
+    try:
+        return os.stat(_segment_path()).st_ino
+    except OSError:
+        return None
+
+
+def _slot_offset(n: int) -> int:
+    return _HEADER.size + (n % CAPACITY) * _SLOT.size
+
+
+class ImuRingWriter:
+    """Writer side: owns the segment and appends samples."""
+
+    def __init__(self):
+        self._shmem: Optional[shared_memory.SharedMemory] = None
+        self._inode: Optional[int] = None
+        self._count = 0
+
+    def _ensure_segment(self) -> bool:
+        if self._shmem is not None and _segment_inode() == self._inode:
+            return True
+        if not os.path.isdir("/dev/shm"):
+            return False
+        if self._shmem is not None:
+            logger.warning("IMU ring segment vanished, re-creating it")
+            self._shmem = None
+        try:
+            try:
+                self._shmem = shared_memory.SharedMemory(
+                    name=IMU_RING_SHMEM_NAME, create=True, size=_SEGMENT_SIZE
+                )
+            except FileExistsError:
+                # Left behind by a previous run that did not exit cleanly
+                stale = shared_memory.SharedMemory(name=IMU_RING_SHMEM_NAME)
+                stale.close()
+                stale.unlink()
+                self._shmem = shared_memory.SharedMemory(
+                    name=IMU_RING_SHMEM_NAME, create=True, size=_SEGMENT_SIZE
+                )
+        except OSError as e:
+            logger.warning("IMU ring unavailable (%s), using shared state", e)
+            self._shmem = None
+            return False
+        self._inode = _segment_inode()
+        self._count = 0
+        return True
+
+    def append(self, sample: ImuSample) -> bool:
+        """Append ``sample``; False when the ring is unavailable."""
+        shmem = self._shmem if self._ensure_segment() else None
+        if shmem is None:
+            return False
+        n = self._count
+        offset = _slot_offset(n)
+        buf = shmem.buf
+        buf[offset : offset + 8] = struct.pack("<Q", 2 * n + 1)
+        _SLOT.pack_into(
+            buf,
+            offset,
+            2 * n + 2,
+            sample.timestamp,
+            *quaternion.as_float_array(sample.quat),
+            *(sample.gyro if sample.gyro is not None else _NO_VECTOR),
+            *(sample.accel if sample.accel is not None else _NO_VECTOR),
+            sample.status,
+            sample.moving,
+            sample.gyro is not None,
+            sample.accel is not None,
+        )
+        self._count = n + 1
+        _HEADER.pack_into(buf, 0, self._count)
+        return True
+
+    def close(self) -> None:
+        if self._shmem is not None:
+            self._shmem.close()
+            try:
+                self._shmem.unlink()
+            except FileNotFoundError:
+                pass
+            self._shmem = None
+
+
+class ImuRingReader:
+    """Reader side, used by the integrator and the camera.
+
+    Not thread-safe; each consumer keeps its own reader.
+    """
+
+    def __init__(self):
+        self._map: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+
+    def _attach(self) -> Optional[mmap.mmap]:
+        """The mapped segment, remapped after a writer restart; None when
+        there is none."""
+        inode = _segment_inode()
+        if self._map is not None and inode in (self._inode, None):
+            return self._map
+        self._map = None
+        if inode is None:
+            return None
+        # Mapped straight from /dev/shm, not through SharedMemory, whose
+        # resource tracker may unlink the segment when this process exits
+        try:
+            fd = os.open(_segment_path(), os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            self._map = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+            self._inode = os.fstat(fd).st_ino
+        except (OSError, ValueError):
+            return None
+        finally:
+            os.close(fd)
+        return self._map
+
+    def count(self) -> int:
+        """Samples written so far; 0 when the ring is unavailable."""
+        buf = self._attach()
+        if buf is None:
+            return 0
+        return _HEADER.unpack_from(buf)[0]
+
+    def _read(self, n: int) -> Optional[ImuSample]:
+        buf = self._map
+        if buf is None:
+            return None
+        offset = _slot_offset(n)
+        fields = _SLOT.unpack_from(buf, offset)
+        if fields[0] != 2 * n + 2:
+            return None
+        # Still the same sample after the copy: not overwritten meanwhile
+        if struct.unpack_from("<Q", buf, offset)[0] != fields[0]:
+            return None
+        _, timestamp, w, x, y, z = fields[:6]
+        gyro, accel = fields[6:9], fields[9:12]
+        status, moving, has_gyro, has_accel = fields[12:]
+        return ImuSample(
+            quat=quaternion.quaternion(w, x, y, z),
+            timestamp=timestamp,
+            status=status,
+            moving=bool(moving),
+            gyro=gyro if has_gyro else None,
+            accel=accel if has_accel else None,
+        )
+
+    def samples_since(self, cursor: int) -> Tuple[List[ImuSample], int]:
+        """Samples written after ``cursor``, oldest first, and the cursor
+        to pass next time. Samples the ring has already overwritten are
+        skipped; a cursor from before a writer restart starts over."""
+        count = self.count()
+        if cursor > count:
+            cursor = 0
+        samples = []
+        for n in range(max(cursor, count - CAPACITY), count):
+            sample = self._read(n)
+            if sample is not None:
+                samples.append(sample)
+        return samples, count
+
+    def latest(self) -> Optional[ImuSample]:
+        count = self.count()
+        return self._read(count - 1) if count else None
+
+    def sample_at(self, t: float) -> Optional[ImuSample]:
+        """The orientation at time ``t``, interpolated between the samples
+        around it.
+
+        Before the oldest or after the newest sample in the ring, that
+        sample is returned as-is: orientation is not extrapolated. None
+        when the ring is empty or unavailable.
+        """
+        count = self.count()
+        later: Optional[ImuSample] = None
+        for n in range(count - 1, max(count - CAPACITY, 0) - 1, -1):
+            sample = self._read(n)
+            if sample is None:
+                break
+            if sample.timestamp <= t:
+                if later is None or sample.timestamp == t:
+                    return sample
+                return interpolate(sample, later, t)
+            later = sample
+        return later
+
+
+def interpolate(earlier: ImuSample, later: ImuSample, t: float) -> ImuSample:
+    """Slerp between two samples at time ``t`` (between their timestamps).
+
+    Status and raw readings come from the later sample; the result counts
+    as moving if either sample was.
+    """
+    span = later.timestamp - earlier.timestamp
+    fraction = (t - earlier.timestamp) / span if span > 0 else 1.0
+    q0, q1 = earlier.quat, later.quat
+    if q0.norm() == 0 or q1.norm() == 0:
+        # The IMU process starts from an all-zero placeholder quaternion
+        quat = q1
+    else:
+        # +q and -q are the same rotation; take the short way round
+        if np.dot(quaternion.as_float_array(q0), quaternion.as_float_array(q1)) < 0:
+            q1 = -q1
+        quat = quaternion.slerp_evaluate(q0, q1, fraction)
+    return ImuSample(
+        quat=quat,
+        timestamp=t,
+        status=later.status,
+        moving=earlier.moving or later.moving,
+        gyro=later.gyro,
+        accel=later.accel,
+    )
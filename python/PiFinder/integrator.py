@@ -35,7 +35,7 @@ same ``_apply_*`` / ``_advance_with_imu`` paths as live data.
 
 from __future__ import annotations
 
-import copy
+import datetime
 import logging
 import queue
 import time
@@ -47,6 +47,7 @@ import quaternion  # numpy-quaternion
 import PiFinder.calc_utils as calc_utils
 from PiFinder import config
 from PiFinder import state_utils
+from PiFinder.imu_ring import ImuRingReader
 from PiFinder.multiproclogging import MultiprocLogging
 from PiFinder.pointing_model.imu_dead_reckoning import ImuDeadReckoning
 import PiFinder.pointing_model.quaternion_transforms as qt
@@ -67,6 +68,9 @@ logger = logging.getLogger("IMU.Integrator")
 # Use IMU tracking if the angle moved is above this deadband.
 IMU_MOVED_ANG_THRESHOLD = np.deg2rad(0.06)
 
+# How often the published alt/az re-reads location and time from shared_state
+OBSERVER_REFRESH_SECONDS = 1.0
+
 
 def integrator(
     shared_state,
@@ -98,9 +102,14 @@ def integrator(
         last_published_time = time.time()
 
         was_replaying = False
+        # Every IMU sample since the previous tick comes off the IMU ring
+        imu_ring = ImuRingReader()
+        imu_cursor = imu_ring.count()
+        live_imu: Optional[ImuSample] = None
         telemetry = TelemetryManager(
             cfg, shared_state, console_queue, camera_command_queue
         )
+        observer = _Observer(shared_state)
 
         while True:
             state_utils.sleep_for_framerate(shared_state)
@@ -145,6 +154,10 @@ def integrator(
                     solve_result, predicted=estimate.pointing.aligned.estimate
                 )
                 estimate = _apply_successful_solve(estimate, solve_result, idr)
+                # Matches go out once per solve, ahead of the estimate that
+                # references them, instead of riding every publish.
+                if solve_result.matches is not None:
+                    shared_state.set_solve_matches(solve_result.matches)
                 pointing_updated = True
             elif isinstance(solve_result, FailedSolve):
                 telemetry.record_solve(
@@ -156,17 +169,25 @@ def integrator(
                 # cells are preserved, so once anchored this keeps solve_state
                 # True and the last pointing visible; the IMU advance below
                 # progresses it when motion exceeds the deadband.
-                shared_state.set_solution(copy.deepcopy(estimate))
-
-            # 2. Pull the current IMU sample — from the replay stream when
-            #    replaying — and record it. Recording happens before the
-            #    anchor gate so sessions capture IMU data from the start,
-            #    not only once the first solve has anchored dead-reckoning.
-            #    (record_imu dedupes on sample timestamp and is a no-op
-            #    while replaying or when recording is off.)
-            imu = replay_imu if telemetry.replaying else shared_state.imu()
-            if imu:
-                telemetry.record_imu(imu)
+                shared_state.set_solution(estimate.snapshot())
+
+            # 2. Pull the IMU samples since the last tick — from the replay
+            #    stream when replaying — and record each one. Recording
+            #    happens before the anchor gate so sessions capture IMU data
+            #    from the start, not only once the first solve has anchored
+            #    dead-reckoning. (record_imu dedupes on sample timestamp and
+            #    is a no-op while replaying or when recording is off.)
+            #    Dead-reckoning then uses the newest sample.
+            if telemetry.replaying:
+                imu_samples = [replay_imu] if replay_imu else []
+                imu = replay_imu
+            else:
+                imu_samples, imu_cursor = _read_imu(imu_ring, imu_cursor, shared_state)
+                if imu_samples:
+                    live_imu = imu_samples[-1]
+                imu = live_imu
+            for sample in imu_samples:
+                telemetry.record_imu(sample)
 
             # 2b. Record the camera-side radiometer sample (exposure, sky
             #     background, MAD, quadrant gradient). record_radio dedupes
@@ -198,13 +219,10 @@ def integrator(
                 aligned = estimate.pointing.aligned.estimate
                 estimate.constellation = _get_constellation(aligned.RA, aligned.Dec)
                 estimate.Alt, estimate.Az = _get_alt_az(
-                    aligned.RA,
-                    aligned.Dec,
-                    shared_state.location(),
-                    shared_state.datetime(),
+                    aligned.RA, aligned.Dec, *observer.location_and_datetime()
                 )
 
-                shared_state.set_solution(copy.deepcopy(estimate))
+                shared_state.set_solution(estimate.snapshot())
                 last_published_time = estimate.estimate_time
 
             telemetry.flush()
@@ -246,9 +264,6 @@ def _apply_successful_solve(
     estimate.last_solve_success = result.last_solve_success
     estimate.diagnostics = result.diagnostics
     estimate.alignment = result.alignment
-    estimate.matched_centroids = result.matched_centroids
-    estimate.matched_stars = result.matched_stars
-    estimate.matched_catID = result.matched_catID
 
     # Reseed the dead-reckoner from the new anchor. camera/aligned are
     # always present on a SuccessfulSolve, so no None-guard is needed.
@@ -328,6 +343,46 @@ def _advance_with_imu(
     return True
 
 
+def _read_imu(
+    imu_ring: ImuRingReader, cursor: int, shared_state
+) -> tuple[list[ImuSample], int]:
+    """IMU samples written since ``cursor``, oldest first, and the next
+    cursor. Falls back to the current shared-state sample while the ring
+    is unavailable or still empty."""
+    samples, cursor = imu_ring.samples_since(cursor)
+    if cursor == 0:
+        sample = shared_state.imu()
+        samples = [sample] if sample else []
+    return samples, cursor
+
+
+class _Observer:
+    """
+    ``shared_state.location()`` and ``datetime()`` for the alt/az of each
+    publish. Both are manager round-trips, so they are read once every
+    OBSERVER_REFRESH_SECONDS; in between the datetime is carried forward on
+    the local clock, as ``SharedStateObj.datetime()`` itself does.
+    """
+
+    def __init__(self, shared_state):
+        self._shared_state = shared_state
+        self._location = None
+        self._datetime: Optional[datetime.datetime] = None
+        self._read_at: Optional[float] = None
+
+    def location_and_datetime(self):
+        now = time.time()
+        if self._read_at is None or now - self._read_at >= OBSERVER_REFRESH_SECONDS:
+            self._location = self._shared_state.location()
+            self._datetime = self._shared_state.datetime()
+            self._read_at = now
+        if self._datetime is None:
+            return self._location, None
+        return self._location, self._datetime + datetime.timedelta(
+            seconds=now - self._read_at
+        )
+
+
 def _get_constellation(ra_deg, dec_deg) -> str:
     if ra_deg is None or dec_deg is None:
         return ""
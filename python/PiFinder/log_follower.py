@@ -0,0 +1,295 @@
+"""
+Shared tail follower for the web log viewer.
+
+``/logs/stream`` used to reopen ``pifinder.log`` for every poll from every
+open log page, seek to the client's byte position and ``readlines()``. The
+disk work grew with the number of viewers and their poll rate.
+
+``LogFollower`` is a single reader instead:
+
+* One daemon thread keeps the log open and checks it for growth every
+  ``poll_interval`` seconds (a ``stat``, then a read of only the new
+  bytes). The log is rotated by ``RotatingFileHandler``, so a changed
+  inode or a shrunken file means the follower reopens it from the start.
+* New lines go into a bounded ring. Each line gets a cursor id, and ids
+  increase for the life of the follower. Lines written before the
+  follower started are seeded from the last ``tail_bytes`` of the file.
+* Clients ask for the lines after a cursor. ``/logs/stream`` long-polls
+  through ``wait()``. ``/logs/events`` is a Server-Sent Events stream
+  whose event ids are cursors, so a reconnecting ``EventSource`` resumes
+  where it left off. Neither touches the disk.
+* A minimum ``level`` and a ``logger`` name filter are applied on the
+  server. Each line is parsed once, when it is read. Traceback
+  continuation lines take the level and logger of the record they belong
+  to.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import BinaryIO, Deque, List, NamedTuple, Optional, Tuple
+
+from flask import Response, jsonify, request
+
+logger = logging.getLogger("Server.Logs")
+
+# "<date> <time> <processName>-<logger>:<LEVEL>:<message>", the format of
+# every logconf_*.json
+_RECORD = re.compile(
+    r"^\S+ \S+ (?P<source>\S+?):(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL):"
+)
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# Longest a /logs/stream long-poll is held open
+MAX_WAIT = 20.0
+# Comment lines keep an idle /logs/events connection from timing out, and
+# let the server notice a closed page through the failed write
+KEEPALIVE = 15.0
+
+
+class LogLine(NamedTuple):
+    cursor: int
+    text: str
+    level: int
+    source: str  # "<processName>-<logger>"
+
+
+def _logger_matches(source: str, name: str) -> bool:
+    """Whether a record's ``processName-logger`` source is from ``name``
+    or one of its child loggers."""
+    return re.search(rf"-{re.escape(name)}(\.|$)", source) is not None
+
+
+class LogFollower:
+    """Follows one log file for all clients (see module doc)."""
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 2000,
+        poll_interval: float = 0.5,
+        tail_bytes: int = 100 * 1024,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.tail_bytes = tail_bytes
+        self._lines: Deque[LogLine] = deque(maxlen=capacity)
+        self._next_cursor = 1
+        self._level = LEVELS["INFO"]
+        self._source = ""
+        self._partial = b""
+        self._file: Optional[BinaryIO] = None
+        self._inode: Optional[int] = None
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.file_found = False
+
+    # --- reader side ---------------------------------------------------
+
+    def start(self) -> None:
+        """Start the reader thread, once; clients call this freely."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self.read_available()
+            self._thread = threading.Thread(
+                target=self._run, name="LogFollower", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.read_available()
+            except Exception:
+                logger.exception("Log follower failed reading %s", self.path)
+
+    def _open(self, seed_tail: bool) -> bool:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self.file_found = False
+            return False
+        st = os.fstat(f.fileno())
+        self._inode = st.st_ino
+        if seed_tail and st.st_size > self.tail_bytes:
+            f.seek(st.st_size - self.tail_bytes)
+            f.readline()  # drop the partial first line
+        self._file = f
+        self._partial = b""
+        self.file_found = True
+        return True
+
+    def read_available(self) -> int:
+        """Read whatever was appended since the last call; returns the
+        number of new lines."""
+        if self._file is None:
+            if not self._open(seed_tail=self._next_cursor == 1):
+                return 0
+        else:
+            try:
+                st = os.stat(self.path)
+                rotated = st.st_ino != self._inode or st.st_size < self._file.tell()
+            except FileNotFoundError:
+                rotated = True
+            if rotated and not self._open(seed_tail=False):
+                return 0
+
+        f = self._file
+        if f is None:
+            return 0
+        chunk = f.read()
+        if not chunk:
+            return 0
+        head, newline, self._partial = (self._partial + chunk).rpartition(b"\n")
+        if not newline:
+            return 0
+        return self._append(head.decode("utf-8", errors="replace").split("\n"))
+
+    def _append(self, texts: List[str]) -> int:
+        with self._changed:
+            for text in texts:
+                match = _RECORD.match(text)
+                if match:
+                    self._level = LEVELS[match["level"]]
+                    self._source = match["source"]
+                self._lines.append(
+                    LogLine(self._next_cursor, text, self._level, self._source)
+                )
+                self._next_cursor += 1
+            self._changed.notify_all()
+        return len(texts)
+
+    # --- client side ---------------------------------------------------
+
+    @property
+    def cursor(self) -> int:
+        """Cursor of the newest line (0 before any)."""
+        return self._next_cursor - 1
+
+    def lines_after(
+        self,
+        cursor: int,
+        level: Optional[str] = None,
+        logger_name: Optional[str] = None,
+        limit: int = 1000,
+    ) -> Tuple[List[str], int]:
+        """Lines newer than ``cursor`` passing the filters, and the cursor
+        to ask from next time.
+
+        A cursor of 0 means "from the oldest line still in the ring";
+        older lines than that are gone. A cursor from before a server
+        restart (newer than any line) is treated as 0.
+        """
+        min_level = LEVELS.get((level or "").upper(), 0)
+        with self._changed:
+            if cursor > self._next_cursor - 1:
+                cursor = 0
+            newer = [line for line in self._lines if line.cursor > cursor]
+        if len(newer) > limit:
+            newer = newer[-limit:]
+        texts = [
+            line.text
+            for line in newer
+            if line.level >= min_level
+            and (not logger_name or _logger_matches(line.source, logger_name))
+        ]
+        return texts, (newer[-1].cursor if newer else cursor)
+
+    def wait(self, cursor: int, timeout: float) -> bool:
+        """Block until there are lines after ``cursor`` (or ``cursor`` is
+        stale, see lines_after), or ``timeout``."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._next_cursor - 1 != cursor, timeout
+            )
+
+
+def _int_arg(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def log_stream_response(follower: LogFollower) -> Response:
+    """``/logs/stream``: long-poll for lines after ``cursor``.
+
+    Query parameters: ``cursor`` (0 or absent for the recent tail),
+    ``wait`` (seconds to hold the request while there is nothing new,
+    capped at ``MAX_WAIT``; default 0), ``level`` and ``logger``.
+
+    Clients written for the byte-offset endpoint this replaces send
+    ``position`` and read it back, so it is accepted as an alias for
+    ``cursor`` and echoed in the reply. A byte offset is past any cursor,
+    which restarts such a client from the recent tail.
+    """
+    follower.start()
+    cursor = max(
+        0,
+        _int_arg(request.args.get("cursor", request.args.get("position")), 0),
+    )
+    try:
+        wait = min(MAX_WAIT, max(0.0, float(request.args.get("wait", 0))))
+    except ValueError:
+        wait = 0.0
+    if wait and cursor:
+        follower.wait(cursor, wait)
+    logs, cursor = follower.lines_after(
+        cursor, request.args.get("level"), request.args.get("logger")
+    )
+    result = {"logs": logs, "cursor": cursor, "position": cursor}
+    if not follower.file_found:
+        result["file_not_found"] = True
+    return jsonify(result)
+
+
+def log_events_response(follower: LogFollower) -> Response:
+    """``/logs/events``: a Server-Sent Events stream of log lines.
+
+    Each event's data is a JSON list of lines and its id the cursor after
+    them. A reconnecting ``EventSource`` sends the last id as
+    ``Last-Event-ID`` and resumes there; a new page can pass ``cursor``.
+    ``level`` and ``logger`` filter as for ``/logs/stream``.
+    """
+    follower.start()
+    cursor = _int_arg(
+        request.headers.get("Last-Event-ID"),
+        _int_arg(request.args.get("cursor"), 0),
+    )
+    level = request.args.get("level")
+    logger_name = request.args.get("logger")
+
+    def events():
+        nonlocal cursor
+        # Sent once so a page learns about a missing file
+        if not follower.file_found:
+            yield "event: file_not_found\ndata: {}\n\n"
+        first = True
+        while True:
+            if not first and not follower.wait(cursor, KEEPALIVE):
+                yield ": keepalive\n\n"
+                continue
+            first = False
+            logs, cursor = follower.lines_after(cursor, level, logger_name)
+            if logs:
+                yield f"id: {cursor}\ndata: {json.dumps(logs)}\n\n"
+            else:
+                # Everything new was filtered out; still advance the id
+                yield f"id: {cursor}\n\n"
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -17,6 +17,15 @@ import os
 # skyfield performance fix, see: https://rhodesmill.org/skyfield/accuracy-efficiency.html
 os.environ["OPENBLAS_NUM_THREADS"] = "1"
 os.environ["MKL_NUM_THREADS"] = "1"
+import sys
+
+from PiFinder import startup_timeline
+
+if "--profile-startup" in sys.argv:
+    # Before the imports below, so they show up in the timeline
+    startup_timeline.enable()
+    startup_timeline.mark("Imports")
+
 import time
 import queue
 import datetime
@@ -25,17 +34,15 @@ import uuid
 import logging
 import argparse
 import pickle
+import importlib
 from pathlib import Path
 from PIL import Image, ImageOps
 from multiprocessing import Process, Queue
 from multiprocessing.managers import BaseManager
 
 import PiFinder.i18n  # noqa: F401
-from PiFinder import solver
 from PiFinder import config
-from PiFinder import pos_server
 from PiFinder import utils
-from PiFinder import server
 from PiFinder import timez
 from PiFinder import keyboard_interface
 import PiFinder.sound as sound
@@ -48,6 +55,7 @@ from PiFinder.battery_bq25895 import (
 from PiFinder.multiproclogging import MultiprocLogging
 from PiFinder.catalogs import CatalogBuilder, CatalogFilter, Catalogs
 from PiFinder.calc_utils import sf_utils
+from PiFinder.plot import star_catalog
 from PiFinder.state_utils import sleep_for_framerate
 
 from PiFinder.ui.console import UIConsole
@@ -248,6 +256,19 @@ class PowerManager:
         self.display_device.device.show()
 
 
+def run_subsystem(target: str, *args, **kwargs) -> None:
+    """
+    Process target given as ``"module:function"``, imported in the child.
+
+    The solver (tetra3, scipy), web server (flask) and SkySafari server are
+    only ever run in their own processes, so main doesn't import them:
+    that keeps ~1.5s of imports off the start-up critical path, and the
+    children import them in parallel.
+    """
+    module_name, function = target.split(":")
+    getattr(importlib.import_module(module_name), function)(*args, **kwargs)
+
+
 def start_profiling():
     """Start profiling for performance analysis"""
     import cProfile
@@ -357,6 +378,7 @@ def main(
     Get this show on the road!
     """
     global display_device, display_hardware
+    startup_timeline.mark("Setup")
 
     # init queues
     console_queue: Queue = Queue()
@@ -453,6 +475,7 @@ def main(
         logger.info("Starting ....")
 
         # spawn gps service....
+        startup_timeline.mark("GPS")
         console.write("   GPS")
         console.update()
         logger.info("   GPS")
@@ -469,6 +492,7 @@ def main(
         console.set_shared_state(shared_state)
 
         # spawn keyboard service....
+        startup_timeline.mark("Keyboard")
         console.write("   Keyboard")
         logger.info("   Keyboard")
         console.update()
@@ -488,14 +512,16 @@ def main(
             p.start()
 
         # Web server
+        startup_timeline.mark("Webserver")
         console.write("   Webserver")
         logger.info("   Webserver")
         console.update()
 
         server_process = Process(
             name="Webserver",
-            target=server.run_server,
+            target=run_subsystem,
             args=(
+                "PiFinder.server:run_server",
                 keyboard_queue,
                 ui_queue,
                 gps_queue,
@@ -506,6 +532,7 @@ def main(
         )
         server_process.start()
 
+        startup_timeline.mark("Camera")
         console.write("   Camera")
         logger.info("   Camera")
         console.update()
@@ -525,6 +552,7 @@ def main(
         time.sleep(1)
 
         # IMU
+        startup_timeline.mark("IMU")
         console.write("   IMU")
         logger.info("   IMU")
         console.update()
@@ -537,6 +565,7 @@ def main(
 
         # Battery monitor (rev4 BQ25895 only; read-only telemetry)
         if capabilities.has_bq25895:
+            startup_timeline.mark("Battery")
             console.write("   Battery")
             logger.info("   Battery")
             console.update()
@@ -553,6 +582,7 @@ def main(
         sound_queue: Optional[Queue] = None
         sound_process = None
         if capabilities.has_buzzer and hardware_platform == "Pi":
+            startup_timeline.mark("Sound")
             console.write("   Sound")
             logger.info("   Sound")
             console.update()
@@ -570,13 +600,15 @@ def main(
             sound.request(sound_queue, Earcon.STARTUP)
 
         # Solver
+        startup_timeline.mark("Solver")
         console.write("   Solver")
         logger.info("   Solver")
         console.update()
         solver_process = Process(
             name="Solver",
-            target=solver.solver,
+            target=run_subsystem,
             args=(
+                "PiFinder.solver:solver",
                 shared_state,
                 solver_queue,
                 camera_image,
@@ -591,6 +623,7 @@ def main(
         solver_process.start()
 
         # Integrator
+        startup_timeline.mark("Integrator")
         console.write("   Integrator")
         logger.info("   Integrator")
         console.update()
@@ -612,23 +645,37 @@ def main(
         integrator_process.start()
 
         # Server
+        startup_timeline.mark("POS Server")
         console.write("  POS Server")
         logger.info("  POS Server")
         console.update()
         posserver_process = Process(
             name="SkySafariServer",
-            target=pos_server.run_server,
-            args=(shared_state, ui_queue, posserver_logqueue),
+            target=run_subsystem,
+            args=(
+                "PiFinder.pos_server:run_server",
+                shared_state,
+                ui_queue,
+                posserver_logqueue,
+            ),
         )
         posserver_process.start()
 
         # Initialize Catalogs
+        startup_timeline.mark("Catalogs")
         console.write("   Catalogs")
         logger.info("   Catalogs")
         console.update()
 
-        # Start profiling (uncomment to enable performance analysis)
-        # profiler, startup_profile_start = start_profiling()
+        if profile_startup:
+            profiler, startup_profile_start = start_profiling()
+
+        # The menus need the chart's star catalog (Hipparcos + Skyfield),
+        # which doesn't depend on the catalogs: build both at once. The
+        # menus wait for it through star_catalog()'s lock. All subsystem
+        # processes are forked by now, so the thread can't leave a held
+        # lock behind in a child.
+        startup_timeline.run_concurrently("Star catalog", star_catalog)
 
         # Initialize Catalogs (pass ui_queue for background loading completion signal)
         catalogs: Catalogs = CatalogBuilder().build(shared_state, ui_queue)
@@ -637,6 +684,7 @@ def main(
         _new_filter = CatalogFilter(shared_state=shared_state)
         _new_filter.load_from_config(cfg)
         catalogs.set_catalog_filter(_new_filter)
+        startup_timeline.mark("Menus")
         console.write("   Menus")
         console.update()
 
@@ -654,12 +702,14 @@ def main(
         power_manager = PowerManager(cfg, shared_state, display_device)
 
         # Start main event loop
+        startup_timeline.mark("Event Loop")
         console.write("   Event Loop")
         logger.info("   Event Loop")
         console.update()
 
-        # Stop profiling (uncomment to analyze startup performance)
-        # stop_profiling(profiler, startup_profile_start)
+        if profile_startup:
+            stop_profiling(profiler, startup_profile_start)
+            startup_timeline.finish(utils.data_dir)
 
         # Pygame can only read keyboard events from the process that owns the
         # display window, and pynput/PyHotKey (keyboard_local) can't read the
@@ -1237,7 +1287,8 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--profile-startup",
-        help="Profile startup performance (catalog/menu loading)",
+        help="Profile startup: phase and import timeline, plus cProfile of "
+        "catalog/menu loading (written to the data dir)",
         default=False,
         action="store_true",
         required=False,
@@ -1247,8 +1298,6 @@ if __name__ == "__main__":
     if args.verbose:
         rlogger.setLevel(logging.DEBUG)
 
-    import importlib
-
     if args.fakehardware:
         hardware_platform = "Fake"
         display_hardware = "pg_128"
@@ -7,18 +7,26 @@ Due to `logging` not being compatible out of the box with concurrency using proc
 the approach implemented here: A single process that is fed log records using `Queue`s.
 """
 
+import copy
 import multiprocessing.queues
 from pathlib import Path
 from multiprocessing import Queue, Process
-import multiprocessing
+from multiprocessing.connection import wait
 from queue import Empty
-from time import sleep
+from time import monotonic
 from typing import TextIO, List, Optional
 import json5
 import logging
 import logging.config
 import logging.handlers
 
+# Records taken from one queue before moving on to the next ready one
+BATCH_SIZE = 256
+# Records held by the sink before they are written out regardless
+BUFFER_CAPACITY = 512
+# Longest time a buffered record waits before it is written [s]
+FLUSH_INTERVAL = 1.0
+
 
 class MultiprocLogging:
     """
@@ -60,8 +68,18 @@ class MultiprocLogging:
 
     The class calls the respective loggers `handle()`  method, so in order to avoid an endless logging loop (where calling `handle` results in a new entry in the queue),
     all handlers propagated from the main process are discarded in the logging process and only the filehandler is used.
+
+    The sink blocks until one of the queues has records (no polling), takes up to `BATCH_SIZE` records from each ready queue, and
+    writes through a `MemoryHandler`: records reach the file once `BUFFER_CAPACITY` are buffered, when one of level ERROR or above
+    arrives, or at the latest `FLUSH_INTERVAL` seconds later. Console-only logging is written after every batch.
+
+    The logging configuration is parsed once, when this class reads it in the main process; processes forked afterwards inherit
+    the parsed dict and `configurer()` applies it without reading the file again.
     """
 
+    # Last configuration read by read_config(), inherited by forked processes
+    _config: Optional[dict] = None
+
     def __init__(
         self,
         log_conf: Optional[Path] = None,
@@ -145,24 +163,42 @@ class MultiprocLogging:
         h.setFormatter(f)
         rLogger.addHandler(h)
 
+        # Buffer in front of the output, so a burst is written in one go
+        # instead of a write and flush per record
+        buffered = logging.handlers.MemoryHandler(
+            BUFFER_CAPACITY, flushLevel=logging.ERROR, target=h
+        )
+        rLogger.removeHandler(h)
+        rLogger.addHandler(buffered)
+        flush_interval = 0.0 if output is None else FLUSH_INTERVAL
+
         # import logging_tree
         # logging_tree.printout()
 
-        # Consume log messages and store them in output log file
-        nqueues = len(queues)
+        # Consume log messages and store them in output log file. The
+        # queues' pipe ends are what becomes readable when records arrive.
+        readers = {q._reader: q for q in queues}  # type: ignore[attr-defined]
+        last_flush = monotonic()
         while True:
-            empties = 0
-            for q in queues:
-                try:
-                    rec = q.get(block=False)
+            timeout = None  # nothing buffered: sleep until a record arrives
+            if buffered.buffer:
+                timeout = max(0.0, last_flush + flush_interval - monotonic())
+            for reader in wait(list(readers), timeout):
+                q = readers[reader]
+                for _ in range(BATCH_SIZE):
+                    try:
+                        rec = q.get(block=False)
+                    except Empty:
+                        break
                     if rec is None:  # Received End Marker
+                        buffered.close()
+                        h.close()
                         return
                     logger = logging.getLogger(rec.name)
                     logger.handle(rec)
-                except Empty:
-                    empties += 1
-            if empties == nqueues:
-                sleep(0.1)  # No log messages in any queue, so sleep 100 ms.
+            if buffered.buffer and monotonic() - last_flush >= flush_interval:
+                buffered.flush()
+                last_flush = monotonic()
 
     def get_queue(self):
         """
@@ -176,12 +212,15 @@ class MultiprocLogging:
         return new_queue
 
     @staticmethod
-    def configurer(queue: Queue):
+    def configurer(queue: Queue, config: Optional[dict] = None):
         """
         Setup the passed queue as target for log messages
 
         This method needs to be called once in each process, so that log records get forwarded to the single process writing
         log messages.
+
+        `config` is the logging configuration to apply. By default that is the one parsed by the main process (see
+        `read_config()`); only when there is none is `pifinder_logconf.json` read here.
         """
         import os
 
@@ -190,10 +229,14 @@ class MultiprocLogging:
             queue, multiprocessing.queues.Queue
         ), "That's not a Queue! You have to pass a queue"
 
-        log_conf_file = Path("pifinder_logconf.json")
-        with open(log_conf_file, "r") as logconf:
-            config = json5.load(logconf)
-            logging.config.dictConfig(config)
+        if config is None:
+            config = MultiprocLogging._config
+        if config is None:
+            log_conf_file = Path("pifinder_logconf.json")
+            with open(log_conf_file, "r") as logconf:
+                config = json5.load(logconf)
+        # dictConfig consumes parts of the dict it is given
+        logging.config.dictConfig(copy.deepcopy(config))
 
         root = logging.getLogger()
         if os.environ.get("PIFINDER_DEBUG_NO_FILE_LOGS"):
@@ -222,6 +265,9 @@ class MultiprocLogging:
     def read_config(self, file: TextIO):
         """
         Read logging configuration from the specified file handle and apply it.
+
+        The parsed configuration is kept for `configurer()` in processes started later.
         """
         config = json5.load(file)
-        logging.config.dictConfig(config)
+        MultiprocLogging._config = config
+        logging.config.dictConfig(copy.deepcopy(config))
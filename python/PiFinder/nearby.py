@@ -2,7 +2,6 @@ from PiFinder.catalogs import CompositeObject
 from typing import List
 import time
 import numpy as np
-from sklearn.neighbors import BallTree
 import logging
 
 logger = logging.getLogger("Catalog.Nearby")
@@ -80,6 +79,10 @@ class ClosestObjectsFinder:
         object_radecs = np.array(
             [[np.deg2rad(x.ra), np.deg2rad(x.dec)] for x in deduplicated_objects]
         )
+        # sklearn takes ~0.3s to import; only pay for it once there are
+        # objects to index rather than while the UI modules load.
+        from sklearn.neighbors import BallTree
+
         self._objects = np.array(deduplicated_objects)
         self._objects_balltree = BallTree(
             object_radecs, leaf_size=20, metric="haversine"
@@ -26,9 +26,10 @@ from PiFinder.calc_utils import (
     J2000,
     dec_to_dms_exact,
     dms_to_dec,
-    epoch_to_epoch,
+    epoch_rotation,
     ra_to_deg,
     ra_to_hms_exact,
+    rotate_radec,
 )
 from PiFinder.composite_object import MagnitudeObject, SizeObject
 
@@ -1028,9 +1029,7 @@ def _precess_to_j2000(ra_deg: float, dec_deg: float, from_jd: float) -> tuple:
     """Precess (ra_deg, dec_deg) from given epoch to J2000."""
     if from_jd == J2000:
         return ra_deg, dec_deg
-    ra_h_from = ra_deg / 15.0
-    ra_h, dec = epoch_to_epoch(from_jd, J2000, ra_h_from, dec_deg)
-    return ra_h._degrees, dec.degrees
+    return rotate_radec(epoch_rotation(from_jd, J2000), ra_deg, dec_deg)
 
 
 class PiFinderFormatError(ValueError):
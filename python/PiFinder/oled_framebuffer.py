@@ -0,0 +1,117 @@
+"""
+Dirty-rectangle updates for the SSD13xx colour OLEDs.
+
+luma's ``color_device.display()`` diffs frames with PIL over a fixed 2x2
+grid, then packs every pixel of each changed quadrant into RGB565 in a
+Python loop. On the PiFinder a title-bar FPS tick or the rotating
+constellation/SQM text touches a quadrant of the screen each frame, so
+most of a 176x176 frame is repacked and pushed over SPI for a few changed
+glyphs.
+
+``DirtyRectangleMixin`` replaces that path for the SSD1333 and SSD1351:
+
+* The device keeps the frame it last sent, in device orientation, as a
+  NumPy array. ``changed_windows()`` finds the rows that differ and
+  groups them into bands (bridging short unchanged gaps, where one more
+  window's addressing costs more than resending the rows). Each band is
+  narrowed to the columns that changed within it.
+* Each window is addressed with the controller's ``_set_position`` and
+  only its pixels are sent, packed by ``rgb565()`` in one vectorised step
+  into the same 65k format 1 bytes luma produces.
+
+An unchanged frame sends nothing. The first frame, and any frame after
+``invalidate()``, is sent whole. Running the controller's init sequence
+(on construction or a re-init) invalidates, since it resets the panel.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+#: Unchanged rows between two changed ones that are resent rather than
+#: starting a new window. Each window costs three addressing commands.
+MERGE_GAP_ROWS = 4
+
+Window = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+def changed_windows(
+    previous: np.ndarray, current: np.ndarray, merge_gap: int = MERGE_GAP_ROWS
+) -> List[Window]:
+    """Bounding windows of the pixels that differ between two RGB frames.
+
+    Both frames are ``(height, width, 3)`` arrays of the same shape.
+    """
+    changed = np.any(previous != current, axis=2)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if rows.size == 0:
+        return []
+    # Split wherever the gap to the next changed row is too wide to bridge
+    breaks = np.flatnonzero(np.diff(rows) > merge_gap + 1)
+    starts = np.concatenate((rows[:1], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], rows[-1:])) + 1
+
+    windows = []
+    for top, bottom in zip(starts.tolist(), ends.tolist()):
+        cols = np.flatnonzero(changed[top:bottom].any(axis=0))
+        windows.append((int(cols[0]), top, int(cols[-1]) + 1, bottom))
+    return windows
+
+
+def rgb565(pixels: np.ndarray) -> np.ndarray:
+    """Pack ``(h, w, 3)`` RGB bytes as the controllers' 65k format 1.
+
+    Two bytes per pixel, big end first, matching luma's per-pixel packing.
+    """
+    r = pixels[..., 0]
+    g = pixels[..., 1]
+    b = pixels[..., 2]
+    packed = np.empty(pixels.shape[:2] + (2,), dtype=np.uint8)
+    packed[..., 0] = (r & 0xF8) | (g >> 5)
+    packed[..., 1] = ((g << 3) & 0xE0) | (b >> 3)
+    return packed.reshape(-1)
+
+
+class DirtyRectangleMixin:
+    """Sends only the changed windows of each frame (see module doc).
+
+    Mixed in ahead of a luma ``color_device`` subclass, whose
+    ``_set_position`` and ``_apply_offsets`` it uses.
+    """
+
+    #: Last frame sent, in device orientation. A class attribute so that
+    #: display() works during luma's constructor, which clears the screen.
+    _sent_frame: Optional[np.ndarray] = None
+
+    def invalidate(self):
+        """Forget the panel contents; the next frame is sent whole."""
+        self._sent_frame = None
+
+    def _init_sequence(self):
+        # The controller comes back blank or with stale RAM after a reset;
+        # drivers that define their own sequence chain here with super().
+        self.invalidate()
+        super()._init_sequence()
+
+    def display(self, image):
+        """
+        Renders a 24-bit RGB image, sending only what changed since the
+        previous one.
+        """
+        assert image.mode == self.mode
+        assert image.size == self.size
+
+        frame = np.asarray(self.preprocess(image))
+        previous = self._sent_frame
+        if previous is None or previous.shape != frame.shape:
+            height, width = frame.shape[:2]
+            windows = [(0, 0, width, height)]
+        else:
+            windows = changed_windows(previous, frame)
+
+        for left, top, right, bottom in windows:
+            pixels = frame[top:bottom, left:right]
+            left, top, right, bottom = self._apply_offsets((left, top, right, bottom))
+            self._set_position(top, right, bottom, left)
+            self.data(rgb565(pixels).tolist())
+        self._sent_frame = frame
@@ -7,6 +7,7 @@ and constelleations
 
 import logging
 import os
+import threading
 import numpy as np
 import pandas
 from pathlib import Path
@@ -30,6 +31,9 @@ _FRUSTUM_MIN_RATIO = 0.99
 
 _RAW_STARS_DF = None
 
+_STAR_CATALOG = None
+_STAR_CATALOG_LOCK = threading.Lock()
+
 
 def frustum_box(
     render_size: Tuple[int, int], fov: float, camera_fov: Optional[float]
@@ -98,48 +102,36 @@ def _load_raw_stars():
     return _RAW_STARS_DF
 
 
-class Starfield:
+class StarCatalog:
     """
-    Plots a starfield at the
-    specified RA/DEC + roll
+    The parts of a Starfield that don't depend on render size or zoom: the
+    bright-star table, its astrometric positions and the constellation
+    edges.
+
+    Building it loads Hipparcos and runs Skyfield's ``observe`` over every
+    star, so it is built once per process (``star_catalog()``) and shared
+    by every Starfield. Nothing mutates it after construction, so sharing
+    it across threads is safe.
     """
 
-    def __init__(self, colors, resolution, mag_limit=7, fov=10.2):
-        self.colors = colors
-        self.resolution = resolution
+    def __init__(self):
         utctime = timez.utc(2023, 1, 1, 2, 0, 0)
-        ts = sf_utils.ts
-        self.t = ts.from_datetime(utctime)
+        self.t = sf_utils.ts.from_datetime(utctime)
         # An ephemeris from the JPL provides Sun and Earth positions.
-
         self.earth = sf_utils.earth.at(self.t)
 
         # The Hipparcos mission provides our star catalog.
         self.raw_stars = _load_raw_stars()
 
-        # Image size stuff
-        self.render_size = resolution
-        self.render_center = (
-            int(self.render_size[0] / 2),
-            int(self.render_size[1] / 2),
-        )
-
-        self.set_mag_limit(mag_limit)
         # Prefilter here for mag 7.5, just to make sure we have enough
         # for any plot.  Actual mag limit is enforced at plot time.
         bright_stars = self.raw_stars.magnitude <= 7.5
         self.stars = self.raw_stars[bright_stars].copy()
-
         # Per-frame projection math runs on numpy arrays (much cheaper than
-        # the equivalent pandas .assign() chain). Cache the catalog's
-        # magnitude column once; the projected x/y arrays are refreshed in
-        # plot_starfield().
-        self._star_magnitudes = self.stars["magnitude"].to_numpy(dtype=np.float64)
-        self._stars_x = None
-        self._stars_y = None
-
+        # the equivalent pandas .assign() chain), so cache the catalog's
+        # magnitude column once.
+        self.star_magnitudes = self.stars["magnitude"].to_numpy(dtype=np.float64)
         self.star_positions = self.earth.observe(Star.from_dataframe(self.stars))
-        self.set_fov(fov)
 
         # constellations data ===========================
         const_path = Path(utils.astro_data_dir, "constellationship.fab")
@@ -149,13 +141,6 @@ class Starfield:
         const_start_stars = [star1 for star1, star2 in edges]
         const_end_stars = [star2 for star1, star2 in edges]
 
-        # Constellation start/end positions are projected per-frame; their
-        # x/y arrays live as instance attributes (initialised lazily).
-        self._const_sx = None
-        self._const_sy = None
-        self._const_ex = None
-        self._const_ey = None
-
         # We need position lists for both start/end of constellation lines
         self.const_start_star_positions = self.earth.observe(
             Star.from_dataframe(self.stars.loc[const_start_stars])
@@ -164,6 +149,61 @@ class Starfield:
             Star.from_dataframe(self.stars.loc[const_end_stars])
         )
 
+
+def star_catalog() -> StarCatalog:
+    """The process-wide StarCatalog, built on first use."""
+    global _STAR_CATALOG
+    with _STAR_CATALOG_LOCK:
+        if _STAR_CATALOG is None:
+            _STAR_CATALOG = StarCatalog()
+        return _STAR_CATALOG
+
+
+class Starfield:
+    """
+    Plots a starfield at the
+    specified RA/DEC + roll
+
+    Catalog data comes from the shared StarCatalog; a Starfield only holds
+    its render size, zoom, marker images and the last projection. That
+    per-render state makes a Starfield unsafe to plot from two threads at
+    once.
+    """
+
+    def __init__(self, colors, resolution, mag_limit=7, fov=10.2):
+        self.colors = colors
+        self.resolution = resolution
+
+        catalog = star_catalog()
+        self.t = catalog.t
+        self.earth = catalog.earth
+        self.raw_stars = catalog.raw_stars
+        self.stars = catalog.stars
+        self._star_magnitudes = catalog.star_magnitudes
+        self.star_positions = catalog.star_positions
+        self.constellations = catalog.constellations
+        self.const_start_star_positions = catalog.const_start_star_positions
+        self.const_end_star_positions = catalog.const_end_star_positions
+
+        # Image size stuff
+        self.render_size = resolution
+        self.render_center = (
+            int(self.render_size[0] / 2),
+            int(self.render_size[1] / 2),
+        )
+
+        self.set_mag_limit(mag_limit)
+        self.set_fov(fov)
+
+        # Star and constellation start/end positions are projected
+        # per-frame in plot_starfield(); their x/y arrays live here.
+        self._stars_x = None
+        self._stars_y = None
+        self._const_sx = None
+        self._const_sy = None
+        self._const_ex = None
+        self._const_ey = None
+
         marker_path = Path(utils.pifinder_dir, "markers")
         pointer_image_path = Path(marker_path, "pointer.png")
         _pointer_image = Image.open(str(pointer_image_path)).crop(
@@ -6,141 +6,196 @@ server to accept socket connections
 and report telescope position
 Protocol based on Meade LX200
 
-This is used by SkySafari (iOS, iPadOS)
+This is used by SkySafari (iOS, iPadOS) and Stellarium
+
+The server runs on asyncio, so several planetarium apps (say SkySafari on
+a phone and Stellarium on a laptop) can be connected at once. Each
+connection buffers what it receives and answers every complete command in
+it; a command split across two reads is completed by the next one.
+
+SkySafari polls ``:GR#`` and ``:GD#`` about once a second per client.
+Both are answered from one shared ``JNowPosition``, which reads the
+solution through the shared-state proxy at most every ``max_age`` seconds
+and precesses it to the current epoch once per solution update, with the
+cached rotation from ``calc_utils.j2000_to_jnow``.
+
+Answering a command may call ``shared_state`` Manager proxies, each a
+blocking round trip to the manager process, so commands are answered on a
+single worker thread rather than on the event loop: a slow proxy call
+delays only the replies queued behind it, never the reads and writes of
+other clients. One worker also keeps ``JNowPosition`` and the goto
+sequence free of races.
 """
 
-import socket
+import asyncio
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Queue
-from typing import Tuple, Union
-from PiFinder.calc_utils import ra_to_deg, dec_to_deg, dec_to_dms_exact, sf_utils
+from typing import List, Optional, Tuple, Union
+from PiFinder.calc_utils import (
+    ra_to_deg,
+    dec_to_deg,
+    dec_to_dms_exact,
+    ra_to_hms_exact,
+    j2000_to_jnow,
+    jnow_to_j2000,
+    sf_utils,
+)
+from PiFinder import timez
 from PiFinder.composite_object import CompositeObject, MagnitudeObject, SizeObject
 from PiFinder.multiproclogging import MultiprocLogging
-from skyfield.positionlib import position_of_radec
 import sys
 import time
 
 logger = logging.getLogger("PosServer")
 
-sr_result = None
+PORT = 4030
+# A client that sends nothing for this long is dropped
+CLIENT_TIMEOUT = 60
+# Longest unterminated command kept while waiting for its "#"
+MAX_PENDING = 256
+
 sequence = 0
 ui_queue: Queue
-is_stellarium = False
 
-# shortcut for skyfield timescale
-ts = sf_utils.ts
+# Answer to GR/GD when there is no pointing
+NO_POSITION = "+00*00'01"
 
+# Runs every command, and so every shared_state proxy call (see module doc)
+_state_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PosServer")
 
-def get_telescope_ra(shared_state, _):
-    """
-    Extract RA from current solution
-    format for LX200 protocol
-    RA = HH:MM:SS
+
+class JNowPosition:
+    """The current pointing as LX200 ``(ra, dec)`` strings in JNow.
+
+    Shared by every connection. ``shared_state.solution()`` is fetched at
+    most every ``max_age`` seconds, so a GR/GD pair and other clients'
+    polls reuse one proxy round trip. The J2000 to JNow precession runs
+    only when the solution itself changes.
     """
-    solution = shared_state.solution()
-    dt = shared_state.datetime()
-    if not solution or not dt or not solution.has_pointing():
-        return "+00*00'01"
 
-    aligned = solution.pointing.aligned.estimate
-    # Convert from J2000 to now epoch
-    try:
-        RA_deg = float(aligned.RA)
-        Dec_deg = float(aligned.Dec)
-    except TypeError:
-        hh = 0
-        mm = 0
-        ss = 0
-        ra_result = f"{hh:02.0f}:{mm:02.0f}:{ss:02.0f}"
-        logger.warning("get_telescope_ra: Type Error")
-        return ra_result
+    def __init__(self, max_age: float = 0.25):
+        self.max_age = max_age
+        self._fetched = -float("inf")
+        self._key: Optional[tuple] = None
+        self._strings: Optional[Tuple[str, str]] = None
+
+    def get(self, shared_state) -> Optional[Tuple[str, str]]:
+        now = time.monotonic()
+        if now - self._fetched >= self.max_age:
+            self._fetched = now
+            self._refresh(shared_state)
+        return self._strings
+
+    def _refresh(self, shared_state) -> None:
+        solution = shared_state.solution()
+        if not solution or not solution.has_pointing():
+            self._key = self._strings = None
+            return
+        aligned = solution.pointing.aligned.estimate
+        key = (aligned.RA, aligned.Dec, solution.estimate_time)
+        if key == self._key:
+            return
+        dt = shared_state.datetime()
+        if not dt:
+            self._key = self._strings = None
+            return
+        try:
+            RA_deg = float(aligned.RA)
+            Dec_deg = float(aligned.Dec)
+        except TypeError:
+            logger.warning("JNowPosition: Type error in coords")
+            self._key, self._strings = key, ("00:00:00", "+00*00'00")
+            return
+
+        # Convert from J2000 to now epoch
+        ra_now, dec_now = j2000_to_jnow(RA_deg, Dec_deg, dt)
 
-    _p = position_of_radec(ra_hours=RA_deg / 15.0, dec_degrees=Dec_deg, epoch=ts.J2000)
+        hh, mm, ss = ra_to_hms_exact(ra_now)
+        sign, d, m, s = dec_to_dms_exact(dec_now)
+        self._key = key
+        self._strings = (
+            f"{hh:02.0f}:{mm:02.0f}:{ss:02.0f}",
+            f"{sign}{d:02d}*{m:02d}'{round(s):02d}",
+        )
+        logger.debug("JNowPosition: %s %s", *self._strings)
 
-    RA_h, _Dec, _dist = _p.radec(epoch=ts.from_datetime(dt))
 
-    hh, mm, ss = RA_h.hms()
-    ra_result = f"{hh:02.0f}:{mm:02.0f}:{ss:02.0f}"
-    logger.debug("get_telescope_ra: RA result: %s", ra_result)
-    return ra_result
+jnow_position = JNowPosition()
 
 
-def get_telescope_dec(shared_state, _):
+class ClientSession:
+    """Per-connection protocol state."""
+
+    def __init__(self, shared_state):
+        self.shared_state = shared_state
+        # Stellarium identifies itself with an ACK and sends J2000 gotos
+        self.is_stellarium = False
+        # RA of a goto, set by Sr and used by the following Sd
+        self.sr_result: Optional[Tuple[int, int, int]] = None
+
+
+def get_telescope_ra(session: ClientSession, _):
     """
-    Extract DEC from current solution
+    Extract RA from current solution
     format for LX200 protocol
-    DEC = +/- DD*MM'SS
+    RA = HH:MM:SS
     """
-    solution = shared_state.solution()
-    dt = shared_state.datetime()
-    if not solution or not dt or not solution.has_pointing():
-        return "+00*00'01"
-
-    aligned = solution.pointing.aligned.estimate
-    # Convert from J2000 to now epoch
-    try:
-        RA_deg = float(aligned.RA)
-        Dec_deg = float(aligned.Dec)
-    except TypeError:
-        sign = "+"
-        hh = 0
-        mm = 0
-        ss = 0
-        dec_result = f"{sign}{hh:02.0f}*{mm:02.0f}'{ss:02.0f}"
-        logger.warning("get_telescope_dec: Type error in coords")
-        return dec_result
-
-    _p = position_of_radec(ra_hours=RA_deg / 15.0, dec_degrees=Dec_deg, epoch=ts.J2000)
+    position = jnow_position.get(session.shared_state)
+    return position[0] if position else NO_POSITION
 
-    _RA_h, Dec, _dist = _p.radec(epoch=ts.from_datetime(dt))
 
-    sign, d, m, s = dec_to_dms_exact(Dec.degrees)
-    dec_result = f"{sign}{d:02d}*{m:02d}'{round(s):02d}"
-    logger.debug("get_telescope_dec: Dec result: %s", dec_result)
-    return dec_result
+def get_telescope_dec(session: ClientSession, _):
+    """
+    Extract DEC from current solution
+    format for LX200 protocol
+    DEC = +/- DD*MM'SS
+    """
+    position = jnow_position.get(session.shared_state)
+    return position[1] if position else NO_POSITION
 
 
-def get_distance_bars(_shared_state, _input_str):
+def get_distance_bars(_session, _input_str):
     return "\x7f"
 
 
-def get_firmware_date(_shared_state, _input_str):
+def get_firmware_date(_session, _input_str):
     return "Jan 28 2026"
 
 
-def get_firmware_version(_shared_state, _input_str):
+def get_firmware_version(_session, _input_str):
     return "01.0"
 
 
-def get_product(_shared_state, _input_str):
+def get_product(_session, _input_str):
     return "PiFinder"
 
 
-def get_firmware_time(_shared_state, _input_str):
+def get_firmware_time(_session, _input_str):
     return "17:25:00"
 
 
-def get_status(_shared_state, _input_str):
+def get_status(_session, _input_str):
     # Indicates alt-az mode, tracking, and 1-star aligned
     return "AT1"
 
 
-def respond_none(shared_state, input_str):
+def respond_none(session, input_str):
     return None
 
 
-def respond_zero(shared_state, input_str):
+def respond_zero(session, input_str):
     return "0"
 
 
-def respond_one(shared_state, input_str):
+def respond_one(session, input_str):
     return "1"
 
 
-def not_implemented(shared_state, input_str):
+def not_implemented(session, input_str):
     # return "not implemented"
-    return respond_none(shared_state, input_str)
+    return respond_none(session, input_str)
 
 
 def _match_to_hms(pattern: str, input_str: str) -> Union[Tuple[int, int, int], None]:
@@ -154,41 +209,39 @@ def _match_to_hms(pattern: str, input_str: str) -> Union[Tuple[int, int, int], N
         return None
 
 
-def parse_sr_command(_, input_str: str):
-    global sr_result
+def parse_sr_command(session: ClientSession, input_str: str):
     pattern = r":Sr([-+]?\d{2}):(\d{2}):(\d{2})#"
     match = _match_to_hms(pattern, input_str)
     logger.debug("Parsing sr command, match: %s", match)
     if match:
-        sr_result = match
+        session.sr_result = match
         return "1"
     else:
         return "0"
 
 
-def parse_sd_command(shared_state, input_str: str):
-    global sr_result
+def parse_sd_command(session: ClientSession, input_str: str):
     pattern = r":Sd([-+]?\d{2})\*(\d{2}):(\d{2})#"
     match = _match_to_hms(pattern, input_str)
-    logger.debug("Parsing sd command, match: %s, sr_result: %s", match, sr_result)
-    if match and sr_result:
-        return handle_goto_command(shared_state, sr_result, match)
+    logger.debug(
+        "Parsing sd command, match: %s, sr_result: %s", match, session.sr_result
+    )
+    if match and session.sr_result:
+        return handle_goto_command(session, session.sr_result, match)
     else:
         return "0"
 
 
-def handle_goto_command(shared_state, ra_parsed, dec_parsed):
-    global sequence, ui_queue, is_stellarium
+def handle_goto_command(session: ClientSession, ra_parsed, dec_parsed):
+    global sequence, ui_queue
+    shared_state = session.shared_state
     ra = ra_to_deg(*ra_parsed)
     dec = dec_to_deg(*dec_parsed)
-    if is_stellarium:
+    if session.is_stellarium:
         comp_ra, comp_dec = ra, dec
     else:
         logger.debug("handle_goto_command: ra,dec in deg, JNOW: %s, %s", ra, dec)
-        _p = position_of_radec(ra_hours=ra / 15, dec_degrees=dec, epoch=ts.now())
-        ra_h, dec_d, _ = _p.radec(epoch=ts.J2000)
-        comp_ra = float(ra_h._degrees)
-        comp_dec = float(dec_d.degrees)
+        comp_ra, comp_dec = jnow_to_j2000(ra, dec, timez.utc_now())
     sequence += 1
     logger.debug("Goto ra,dec in deg, J2000: %s, %s", comp_ra, comp_dec)
     constellation = sf_utils.radec_to_constellation(comp_ra, comp_dec)
@@ -237,67 +290,107 @@ lx_command_dict = {
     "Sr": parse_sr_command,  # Set RA
 }
 
+ACK = "\x06"
+# A complete command: the bare ACK, or ":<command>...#"
+_COMMAND = re.compile(r"\x06|:[^#\x06]*#")
 
-def setup_server_socket():
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server_socket.bind(("", 4030))
-    server_socket.listen(1)
-    return server_socket
 
+def split_commands(buffer: str) -> Tuple[List[str], str]:
+    """Split received text into complete commands and the unfinished rest.
 
-def handle_client(client_socket, shared_state):
-    global is_stellarium
-    client_socket.settimeout(60)
-    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-    is_stellarium = False
+    Stellarium leads every command with "#", and only ACK comes without
+    a ":...#" frame. Anything that is not part of a command is dropped.
+    """
+    commands = []
+    end = 0
+    for match in _COMMAND.finditer(buffer):
+        commands.append(match.group())
+        end = match.end()
+    rest = buffer[end:]
+    start = rest.find(":")
+    rest = rest[start:] if start >= 0 else ""
+    return commands, rest[-MAX_PENDING:]
+
+
+def respond(session: ClientSession, command: str) -> Optional[str]:
+    """The reply to one complete command, or None for no reply."""
+    # Special case for the ACK command in the LX200 protocol sent by Stellarium
+    if command == ACK:
+        session.is_stellarium = True
+        # A indicates alt-az mode
+        return "A"
+    name = extract_command(command)
+    if not name:
+        return None
+    out_data = lx_command_dict.get(name, not_implemented)(session, command)
+    if not out_data:
+        return None
+    return out_data if out_data in ("0", "1", "AT1") else out_data + "#"
 
-    while True:
-        try:
-            in_data = client_socket.recv(1024).decode()
+
+def respond_all(session: ClientSession, commands: List[str]) -> str:
+    """The replies to ``commands``, concatenated in order."""
+    return "".join(filter(None, (respond(session, command) for command in commands)))
+
+
+async def handle_client(reader, writer, shared_state):
+    address = writer.get_extra_info("peername")
+    logger.debug("New connection from %s", address)
+    loop = asyncio.get_running_loop()
+    session = ClientSession(shared_state)
+    pending = ""
+    try:
+        while True:
+            in_data = await asyncio.wait_for(reader.read(1024), CLIENT_TIMEOUT)
             if not in_data:
                 break
 
-            logging.debug("Received from skysafari: %s", in_data)
-            command = extract_command(in_data)
-            if command:
-                command_handler = lx_command_dict.get(command, not_implemented)
-                out_data = command_handler(shared_state, in_data)
-                if out_data:
-                    response = (
-                        out_data if out_data in ("0", "1", "AT1") else out_data + "#"
-                    )
-                    client_socket.send(response.encode())
-            # Special case for the ACK command in the LX200 protocol sent by Stellarium
-            # No leading : for the ACK command but Stellarium leads all commands with #
-            elif in_data.endswith("\x06"):
-                is_stellarium = True
-                # A indicates alt-az mode
-                client_socket.send("A".encode())
-        except socket.timeout:
-            logging.warning("Connection timed out.")
-            break
-        except ConnectionResetError:
-            logging.warning("Client disconnected unexpectedly.")
-            break
-
-    client_socket.close()
+            logger.debug("Received from %s: %s", address, in_data)
+            commands, pending = split_commands(
+                pending + in_data.decode(errors="replace")
+            )
+            if commands:
+                response = await loop.run_in_executor(
+                    _state_executor, respond_all, session, commands
+                )
+                writer.write(response.encode())
+            await writer.drain()
+    except asyncio.TimeoutError:
+        logger.warning("Connection from %s timed out.", address)
+    except ConnectionError:
+        logger.warning("Client %s disconnected unexpectedly.", address)
+    except Exception:
+        logger.exception("Error handling client %s", address)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+        logger.debug("Connection from %s closed", address)
+
+
+async def serve(shared_state, host: str = "", port: int = PORT):
+    """Accept clients until cancelled."""
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, shared_state),
+        host,
+        port,
+        reuse_address=True,
+    )
+    logger.info("SkySafari server started and listening")
+    async with server:
+        await server.serve_forever()
 
 
 def run_server(shared_state, p_ui_queue, log_queue):
     MultiprocLogging.configurer(log_queue)
     global ui_queue
     ui_queue = p_ui_queue
-    logger = logging.getLogger(__name__)
 
     while True:
         try:
-            with setup_server_socket() as server_socket:
-                logger.info("SkySafari server started and listening")
-                while True:
-                    client_socket, address = server_socket.accept()
-                    logger.debug("New connection from %s", address)
-                    handle_client(client_socket, shared_state)
+            asyncio.run(serve(shared_state))
         except Exception:
             logger.exception("Unexpected server error")
             logger.info("Attempting to restart server in 5 seconds...")
@@ -0,0 +1,142 @@
+"""
+Per-module render budget profiler for the UI loop.
+
+Each pass of ``MenuManager.update()`` is one frame. The frame is split into
+phases:
+
+* ``update``: the top ``UIModule.update()``, minus the phases below that it
+  calls into.
+* ``overlay``: ``UIModule.screen_update()``, the title bar and status icons.
+* ``convert``: converting the composed screen to the device's mode.
+* ``display``: ``device.display()``. This covers the SSD1333 gray-scale
+  LUT, the dirty-window diff and the SPI write.
+* ``publish``: handing the frame to the web screen mirror.
+
+Phases nest: time spent in an inner phase is not counted again in the
+outer one, so the phases of a frame add up to its total.
+
+The last ``window`` frames of each ``UIModule`` class are kept in a ring
+buffer. ``summary()`` reduces them to p50/p95/max per phase in
+milliseconds. The UI publishes that summary to ``shared_state.render_perf()``
+once a second. The web server serves it at ``/api/perf``, and the "Render
+Perf" dev tools screen shows it on the device.
+
+Profiling is always on. Keeping it running costs a few ``perf_counter()``
+calls per frame and one small dict per frame in each ring buffer.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import numpy as np
+
+PHASES = ("update", "overlay", "convert", "display", "publish")
+
+#: Frame budget of the main loop's 30 fps limiter (state_utils), in ms.
+FRAME_BUDGET_MS = 1000.0 / 30.0
+
+#: Frames kept per module.
+DEFAULT_WINDOW = 300
+
+#: Seconds between summaries published to shared state.
+PUBLISH_INTERVAL = 1.0
+
+
+def _stats(samples_ms: List[float]) -> Dict[str, float]:
+    p50, p95 = np.percentile(samples_ms, (50, 95))
+    return {
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "max_ms": round(max(samples_ms), 2),
+    }
+
+
+class RenderProfiler:
+    """Records frame phases and aggregates them per module (see module doc)."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._frames: Dict[str, Deque[Dict[str, float]]] = {}
+        self._frame: Optional[Dict[str, float]] = None
+        self._module = ""
+        self._frame_start = 0.0
+        # Time spent in nested phases, one entry per open phase
+        self._nested: List[float] = []
+        self._last_publish = 0.0
+
+    def begin_frame(self, module: str) -> None:
+        self._module = module
+        self._frame = {}
+        self._nested = []
+        self._frame_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name``; a no-op outside a frame."""
+        if self._frame is None:
+            yield
+            return
+        start = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = self._nested.pop()
+            frame = self._frame
+            if frame is not None:
+                frame[name] = frame.get(name, 0.0) + elapsed - inner
+                if self._nested:
+                    self._nested[-1] += elapsed
+
+    def end_frame(self) -> None:
+        frame = self._frame
+        if frame is None:
+            return
+        frame["total"] = time.perf_counter() - self._frame_start
+        self._frame = None
+        frames = self._frames.get(self._module)
+        if frames is None:
+            frames = self._frames[self._module] = deque(maxlen=self.window)
+        frames.append(frame)
+
+    def summary(self) -> dict:
+        """p50/p95/max per module and phase, slowest module (by p95) first."""
+        modules = {}
+        for module, frames in self._frames.items():
+            if not frames:
+                continue
+            totals = [frame["total"] * 1000 for frame in frames]
+            phases = {}
+            for name in PHASES:
+                samples = [frame.get(name, 0.0) * 1000 for frame in frames]
+                if any(samples):
+                    phases[name] = _stats(samples)
+            stats: Dict[str, Any] = _stats(totals)
+            stats["frames"] = len(frames)
+            stats["over_budget"] = sum(t > FRAME_BUDGET_MS for t in totals)
+            stats["phases"] = phases
+            modules[module] = stats
+        ordered = sorted(modules.items(), key=lambda kv: -kv[1]["p95_ms"])
+        return {
+            "budget_ms": round(FRAME_BUDGET_MS, 2),
+            "window": self.window,
+            "modules": dict(ordered),
+        }
+
+    def maybe_publish(self, shared_state, now: Optional[float] = None) -> None:
+        """Publish ``summary()`` to shared state at most once a second."""
+        now = time.monotonic() if now is None else now
+        if shared_state is None or now - self._last_publish < PUBLISH_INTERVAL:
+            return
+        self._last_publish = now
+        shared_state.set_render_perf(self.summary())
+
+    def reset(self) -> None:
+        self._frames.clear()
+
+
+#: The UI process's profiler, shared by the menu manager and UI modules.
+profiler = RenderProfiler()
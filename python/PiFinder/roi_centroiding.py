@@ -0,0 +1,204 @@
+"""
+Region-of-interest centroiding for the solver while tracking.
+
+A full-frame centroid pass (Cedar or ``tetra3.get_centroids_from_image``)
+scans all 512x512 pixels and is the largest fixed cost of a solve on the
+Pi Zero 2. While the scope is tracking one field, though, the stars of the
+next frame are the stars the last solve just matched, shifted by however
+far the scope turned since. ``RoiCentroider`` keeps the last solve's
+``matched_centroids`` and the IMU quaternion of that frame, and for the
+next frame:
+
+* bounds the shift from the IMU: the rotation since the reference frame,
+  divided by the plate scale, is the furthest any star can have moved.
+  Rotation about the boresight moves stars less than the same angle of
+  slew does, so this is a conservative bound in every direction;
+* if that bound is small, centroids only ``(2 * half + 1)``-pixel windows
+  around the reference stars (the window grows with the bound);
+* otherwise, or every ``full_frame_every``-th frame, or without an IMU
+  reading, asks for a full-frame pass instead.
+
+The windowed centroids are the same stars in the same brightness order,
+so the solver follows up with a verification-style solve: tetra3 gets a
+tight FOV gate around the last solved FOV and a short timeout. A failed
+ROI solve drops the reference, so the next frame goes full-frame.
+"""
+
+import logging
+from typing import List, Optional
+
+import numpy as np
+from scipy import ndimage
+
+import PiFinder.pointing_model.quaternion_transforms as qt
+
+logger = logging.getLogger("Solver.ROI")
+
+
+def window_centroids(
+    image: np.ndarray,
+    centers: np.ndarray,
+    half: int,
+    sigma: float = 5.0,
+    min_pixels: int = 2,
+) -> np.ndarray:
+    """Intensity-weighted star centroids inside square windows.
+
+    ``centers`` is an (N, 2) array of (y, x) in tetra3's convention
+    ((0.5, 0.5) is the centre of the top-left pixel). Each window is
+    background-subtracted by its median and thresholded at ``sigma`` times
+    its MAD noise. Only the connected group of above-threshold pixels
+    nearest the window centre is weighted, so a neighbouring star or hot
+    pixel elsewhere in the window doesn't pull the centroid towards it.
+    Windows whose group has fewer than ``min_pixels`` pixels are dropped,
+    as are windows that would cross the image edge. All windows are
+    processed as one (N, size, size) stack.
+
+    Returns an (M, 2) array of (y, x), brightest first, with centroids
+    closer than two pixels to a brighter one removed (overlapping windows
+    around a close pair can both lock onto the brighter star).
+    """
+    if len(centers) == 0:
+        return np.empty((0, 2))
+    height, width = image.shape
+    cy = np.floor(centers[:, 0]).astype(np.intp)
+    cx = np.floor(centers[:, 1]).astype(np.intp)
+    inside = (cy >= half) & (cy < height - half) & (cx >= half) & (cx < width - half)
+    cy, cx = cy[inside], cx[inside]
+    if len(cy) == 0:
+        return np.empty((0, 2))
+
+    offsets = np.arange(-half, half + 1)
+    rows = (cy[:, None] + offsets)[:, :, None]
+    cols = (cx[:, None] + offsets)[:, None, :]
+    stack = image[rows, cols].astype(np.float32)
+
+    flat = stack.reshape(len(stack), -1)
+    background = np.median(flat, axis=1)
+    noise = 1.4826 * np.median(np.abs(flat - background[:, None]), axis=1)
+    signal = stack - background[:, None, None]
+    mask = signal > sigma * np.maximum(noise, 1.0)[:, None, None]
+    mask = _central_components(mask, offsets)
+    weights = np.where(mask, signal, 0.0)
+
+    total = weights.sum(axis=(1, 2))
+    found = (mask.sum(axis=(1, 2)) >= min_pixels) & (total > 0)
+    if not np.any(found):
+        return np.empty((0, 2))
+    weights, total = weights[found], total[found]
+    y = cy[found] + 0.5 + (weights.sum(axis=2) @ offsets) / total
+    x = cx[found] + 0.5 + (weights.sum(axis=1) @ offsets) / total
+
+    order = np.argsort(-total)
+    centroids = np.column_stack((y[order], x[order]))
+    keep: List[int] = []
+    for i, point in enumerate(centroids):
+        if all(np.hypot(*(point - centroids[j])) >= 2.0 for j in keep):
+            keep.append(i)
+    return centroids[keep]
+
+
+# 8-connected within a window, never across windows of the stack
+_WINDOW_PLANE = np.zeros((3, 3, 3), dtype=bool)
+_WINDOW_PLANE[1] = True
+
+
+def _central_components(mask: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Keep, per window of an (N, size, size) mask stack, only the
+    connected component containing (or else nearest to) the centre."""
+    labels, count = ndimage.label(mask, structure=_WINDOW_PLANE)
+    if count == 0:
+        return mask
+    index = np.arange(1, count + 1)
+    centre_dist = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    label_dist = ndimage.minimum(
+        np.broadcast_to(centre_dist, mask.shape), labels, index
+    )
+    label_window = ndimage.minimum(
+        np.broadcast_to(np.arange(len(mask))[:, None, None], mask.shape),
+        labels,
+        index,
+    ).astype(np.intp)
+    # Nearest component first within each window, then the first per window
+    order = np.lexsort((label_dist, label_window))
+    windows, first = np.unique(label_window[order], return_index=True)
+    chosen = np.zeros(len(mask), dtype=labels.dtype)
+    chosen[windows] = index[order[first]]
+    return (labels == chosen[:, None, None]) & (chosen > 0)[:, None, None]
+
+
+class RoiCentroider:
+    """Decides between windowed and full-frame centroiding per frame.
+
+    The solver calls ``window_for()`` before extraction; a ``None`` result
+    means "run the full-frame extractor". After every attempt it calls
+    ``set_reference()`` (successful solve with matches) or ``reset()``.
+    """
+
+    def __init__(
+        self,
+        full_frame_every: int = 10,
+        star_half: int = 4,
+        max_shift_px: int = 24,
+        min_stars: int = 6,
+    ):
+        self.full_frame_every = full_frame_every
+        self.star_half = star_half
+        self.max_shift_px = max_shift_px
+        self.min_stars = min_stars
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the reference field; the next frame goes full-frame."""
+        self._centroids: Optional[np.ndarray] = None
+        self._quat = None
+        self._deg_per_px = 0.0
+        self._fov = 0.0
+        self._roi_frames = 0
+
+    @property
+    def fov(self) -> float:
+        """Solved FOV of the reference frame in degrees (0 without one)."""
+        return self._fov
+
+    def set_reference(
+        self, centroids: np.ndarray, imu_quat, fov_degrees: float, width_px: int
+    ) -> None:
+        """Record the matched centroids of a successful solve.
+
+        ``imu_quat`` is the IMU quaternion stamped on that frame (``None``
+        without an IMU, which disables ROI mode) and ``fov_degrees`` the
+        solved horizontal field across ``width_px`` pixels.
+        """
+        if imu_quat is None or len(centroids) < self.min_stars or not fov_degrees:
+            self.reset()
+            return
+        self._centroids = np.asarray(centroids, dtype=np.float64)
+        self._quat = imu_quat
+        self._fov = fov_degrees
+        self._deg_per_px = fov_degrees / width_px
+
+    def window_for(self, imu_quat) -> Optional[int]:
+        """Half-size of the ROI windows for this frame, or ``None``.
+
+        Counts ROI frames so that every ``full_frame_every``-th frame is a
+        full-frame pass, which picks up stars that drifted in from the
+        edges and refreshes the reference set.
+        """
+        if self._centroids is None or imu_quat is None:
+            return None
+        if self._roi_frames >= self.full_frame_every - 1:
+            self._roi_frames = 0
+            return None
+        shift_deg = np.rad2deg(qt.get_quat_angular_diff(self._quat, imu_quat))
+        shift_px = int(np.ceil(shift_deg / self._deg_per_px))
+        if shift_px > self.max_shift_px:
+            return None
+        self._roi_frames += 1
+        return self.star_half + shift_px
+
+    def extract(self, image: np.ndarray, half: int) -> np.ndarray:
+        """Windowed centroids around the reference stars (see ``window_for``)."""
+        if self._centroids is None:
+            return np.empty((0, 2))
+        return window_centroids(image, self._centroids, half)
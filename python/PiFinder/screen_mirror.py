@@ -0,0 +1,272 @@
+"""
+Change-driven mirror of the device screen for the web server.
+
+The UI used to push every rendered frame into ``SharedStateObj`` with
+``set_screen()``: a pickled PIL image through the Manager, several times
+a second, even while the screen sat on one unchanged page. The web
+server then re-encoded a PNG for every poll of ``/image`` and
+``/api/screen``, which the remote page issues ten times a second.
+
+The mirror replaces that path:
+
+* ``publish()`` (UI process) hashes each displayed frame and, only when it
+  changed, copies its pixels into a POSIX shared-memory segment and bumps
+  a frame counter. A sequence word around the copy (odd while writing)
+  lets readers detect and retry a torn read without any lock.
+* ``ScreenMirrorReader`` (server process) maps the same segment. Reading
+  the frame counter is free, so the server keys its encodes on it: each
+  frame is encoded once per format, served with the counter as its
+  ``ETag``, answered with ``304`` on a matching ``If-None-Match``, and
+  pushed to streaming clients (``/api/screen/stream``) only when it
+  changes.
+
+If the segment cannot be created (no ``/dev/shm``), ``publish()`` falls
+back to the old ``shared_state.set_screen()`` path for changed frames, and
+readers fall back to ``shared_state.screen()``.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from PiFinder.image_encoding import DEFAULT_FORMAT, EncodedImage, EncodedImageCache
+
+logger = logging.getLogger("ScreenMirror")
+
+SCREEN_SHMEM_NAME = "pifinder_screen"
+
+# seq, frame, width, height, mode (PIL mode string, NUL padded)
+_HEADER = struct.Struct("<QQHH8s")
+# Largest screen any display driver renders, as RGB.
+_MAX_PIXEL_BYTES = 320 * 320 * 3
+_SEGMENT_SIZE = _HEADER.size + _MAX_PIXEL_BYTES
+
+
+def _segment_path() -> str:
+    return f"/dev/shm/{SCREEN_SHMEM_NAME}"
+
+
+def _segment_inode() -> Optional[int]:
+    """Inode of the named segment in /dev/shm, or None if it is gone.
+
+    systemd-logind's ``RemoveIPC`` can unlink the segment at SSH logout
+    (see PFCedarDetectClient._del_shmem); both sides use this to notice
+    and re-create or re-attach.
+    """
+    try:
+        return os.stat(_segment_path()).st_ino
+    except OSError:
+        return None
+
+
+class ScreenMirror:
+    """Writer side: owns the segment and publishes changed frames."""
+
+    def __init__(self):
+        self._shmem: Optional[shared_memory.SharedMemory] = None
+        self._inode: Optional[int] = None
+        self._digest: Optional[bytes] = None
+        self._seq = 0
+        # Frame numbers double as HTTP ETags, so start from the clock: a
+        # restarted UI must not reissue numbers a browser has cached.
+        self._frame = int(time.time() * 1000)
+        self.latest: Optional[Image.Image] = None
+
+    def _ensure_segment(self) -> bool:
+        if self._shmem is not None and _segment_inode() == self._inode:
+            return True
+        if not os.path.isdir("/dev/shm"):
+            # Readers map the segment through /dev/shm (see
+            # ScreenMirrorReader); without it, use the shared-state path.
+            return False
+        if self._shmem is not None:
+            # Unlinked behind our back: keep the old mapping alive for any
+            # reader still on it, publish into a fresh segment.
+            logger.warning("Screen mirror segment vanished, re-creating it")
+            self._shmem = None
+        try:
+            try:
+                self._shmem = shared_memory.SharedMemory(
+                    name=SCREEN_SHMEM_NAME, create=True, size=_SEGMENT_SIZE
+                )
+            except FileExistsError:
+                # Left behind by a previous run that did not exit cleanly
+                stale = shared_memory.SharedMemory(name=SCREEN_SHMEM_NAME)
+                stale.close()
+                stale.unlink()
+                self._shmem = shared_memory.SharedMemory(
+                    name=SCREEN_SHMEM_NAME, create=True, size=_SEGMENT_SIZE
+                )
+        except OSError as e:
+            logger.warning("Screen mirror unavailable (%s), using shared state", e)
+            self._shmem = None
+            return False
+        self._inode = _segment_inode()
+        self._seq = 0
+        return True
+
+    def publish(self, image: Image.Image, shared_state=None) -> bool:
+        """Publish ``image`` if it differs from the last published frame.
+
+        Returns True when the frame was new.
+        """
+        pixels = image.tobytes()
+        digest = hashlib.blake2b(pixels, digest_size=16).digest()
+        if digest == self._digest:
+            return False
+        self._digest = digest
+        self.latest = image
+        self._frame += 1
+
+        fits = len(pixels) <= _MAX_PIXEL_BYTES
+        segment = self._shmem if fits and self._ensure_segment() else None
+        if segment is None:
+            if shared_state is not None:
+                shared_state.set_screen(image)
+            return True
+
+        buf = segment.buf
+        self._seq += 1  # odd: write in progress
+        buf[:8] = struct.pack("<Q", self._seq)
+        buf[_HEADER.size : _HEADER.size + len(pixels)] = pixels
+        self._seq += 1
+        buf[: _HEADER.size] = _HEADER.pack(
+            self._seq,
+            self._frame,
+            image.width,
+            image.height,
+            image.mode.encode(),
+        )
+        return True
+
+    def close(self) -> None:
+        if self._shmem is not None:
+            self._shmem.close()
+            try:
+                self._shmem.unlink()
+            except FileNotFoundError:
+                pass
+            self._shmem = None
+
+
+_mirror: Optional[ScreenMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def publish(shared_state, image: Image.Image) -> bool:
+    """Publish a displayed frame from the UI process (see module doc)."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = ScreenMirror()
+        return _mirror.publish(image, shared_state)
+
+
+def latest_screen(shared_state=None) -> Optional[Image.Image]:
+    """Last frame published from this process (e.g. for screenshots)."""
+    if _mirror is not None and _mirror.latest is not None:
+        return _mirror.latest
+    return shared_state.screen() if shared_state is not None else None
+
+
+class ScreenMirrorReader:
+    """Reader side, used by the web server.
+
+    ``frame()`` is the current frame counter (0 when nothing has been
+    published or the segment is missing). ``read()`` copies the pixels out
+    as a PIL image; ``encoded()`` returns the frame in one of the
+    image_encoding formats, encoding each frame and format at most once
+    however many clients ask.
+    """
+
+    def __init__(self, shared_state=None):
+        self._shared_state = shared_state
+        self._map: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self._encoded = EncodedImageCache()
+        self._lock = threading.Lock()
+
+    def _attach(self) -> Optional[mmap.mmap]:
+        """The current segment's mapping, or None without one."""
+        inode = _segment_inode()
+        if self._map is not None and inode in (self._inode, None):
+            # Same segment, or ours was unlinked and the writer has not
+            # re-created it yet: it still writes to the mapping we hold.
+            return self._map
+        self._map = None
+        if inode is None:
+            return None
+        # Mapped read-only straight from /dev/shm rather than through
+        # SharedMemory, which (before Python 3.13) registers the segment
+        # with a resource tracker that may unlink it when this process exits.
+        try:
+            fd = os.open(_segment_path(), os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            self._map = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+            self._inode = os.fstat(fd).st_ino
+        except (OSError, ValueError):
+            return None
+        finally:
+            os.close(fd)
+        return self._map
+
+    def frame(self) -> int:
+        with self._lock:
+            buf = self._attach()
+            if buf is None:
+                return 0
+            return _HEADER.unpack_from(buf)[1]
+
+    def read(self) -> Optional[Tuple[int, Image.Image]]:
+        with self._lock:
+            buf = self._attach()
+            if buf is not None:
+                for _ in range(5):
+                    seq, frame, width, height, mode = _HEADER.unpack_from(buf)
+                    if frame == 0:
+                        break
+                    if seq % 2:
+                        time.sleep(0.001)
+                        continue
+                    mode = mode.rstrip(b"\0").decode()
+                    size = len(Image.new(mode, (1, 1)).tobytes()) * width * height
+                    pixels = bytes(buf[_HEADER.size : _HEADER.size + size])
+                    if _HEADER.unpack_from(buf)[0] == seq:
+                        return frame, Image.frombytes(mode, (width, height), pixels)
+        if self._shared_state is None:
+            return None
+        image = self._shared_state.screen()
+        return None if image is None else (0, image)
+
+    def encoded(self, fmt: str = DEFAULT_FORMAT) -> Optional[Tuple[int, EncodedImage]]:
+        """``(frame, encoded image)`` of the current screen, or None.
+
+        The frame counter is checked first, so a frame already encoded is
+        served without copying it out of shared memory. The shared-state
+        fallback has no frame number (0) and is encoded every time.
+        """
+        return self._encoded.latest(self.frame, fmt, self.read)
+
+    def png(self) -> Optional[Tuple[int, bytes]]:
+        """``(frame, PNG bytes)`` of the current screen, or None."""
+        result = self.encoded()
+        return None if result is None else (result[0], result[1].data)
+
+    def wait_for_change(self, last_frame: int, timeout: float) -> int:
+        """Block until the frame counter moves past ``last_frame``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.frame()
+            if current != last_frame or time.monotonic() >= deadline:
+                return current
+            time.sleep(0.05)
@@ -19,6 +19,17 @@ from PiFinder.db.observations_db import (
 from PiFinder.equipment import Telescope, Eyepiece
 from PiFinder.keyboard_interface import KeyboardInterface
 from PiFinder.multiproclogging import MultiprocLogging
+from PiFinder.api_extensions import (
+    screen_image_response,
+    screen_stream_response,
+    stream_limiter,
+)
+from PiFinder.screen_mirror import ScreenMirrorReader
+from PiFinder.log_follower import (
+    LogFollower,
+    log_events_response,
+    log_stream_response,
+)
 
 from flask import Flask, request, jsonify, send_file, redirect, session, make_response
 from urllib.parse import quote
@@ -42,7 +53,6 @@ class SignedIntConverter(IntegerConverter):
 sys_utils = utils.get_sys_utils()
 
 logger = logging.getLogger("Server")
-logs_logger = logging.getLogger("Server.Logs")
 
 # Generate a secret to validate the auth cookie
 SESSION_SECRET = str(uuid.uuid4())
@@ -101,6 +111,13 @@ def server_locale():
     return request.accept_languages.best_match(["en", "fr", "de", "es", "zh"]) or "en"
 
 
+# Each open screen stream (/image/stream) and log event stream
+# (/logs/events) holds a worker thread for as long as the page is open, so
+# leave room beyond waitress's default of four. Both are capped at
+# api_extensions.MAX_OPEN_STREAMS open at once.
+_SERVER_THREADS = 8
+
+
 class Server:
     def __init__(
         self,
@@ -115,6 +132,14 @@ class Server:
         self.ui_queue = ui_queue or multiprocessing.Queue()
         self.gps_queue = gps_queue or multiprocessing.Queue()
         self.shared_state = shared_state or MockSharedState()
+        # The UI publishes changed frames into shared memory; see
+        # PiFinder/screen_mirror.py.
+        self.screen_mirror = ScreenMirrorReader(self.shared_state)
+        # One reader of pifinder.log shared by every open log page; see
+        # PiFinder/log_follower.py. Started by the first request.
+        self.log_follower = LogFollower(
+            os.path.expanduser("~/PiFinder_data/pifinder.log")
+        )
         self.ki = KeyboardInterface()
         # gps info
         self.lat = None
@@ -929,55 +954,12 @@ class Server:
         @app.route("/logs/stream")
         @auth_required
         def stream_logs():
-            import time
-
-            TAIL_BYTES = 100 * 1024  # serve only the last 100 KB on first load
-            t0 = time.monotonic()
-            try:
-                position = int(request.args.get("position", 0))
-                log_file = os.path.expanduser("~/PiFinder_data/pifinder.log")
-
-                try:
-                    file_size = os.path.getsize(log_file)
-                    logs_logger.debug(
-                        "stream_logs: position=%d file_size=%d", position, file_size
-                    )
-
-                    # Reset when file shrank (rotation) or on first call; tail large files.
-                    if position > file_size or position == 0:
-                        position = max(0, file_size - TAIL_BYTES)
-
-                    t1 = time.monotonic()
-                    with open(log_file, "r") as f:
-                        f.seek(position)
-                        new_lines = f.readlines()
-                        new_position = f.tell()
-                    logs_logger.debug(
-                        "stream_logs: read %d lines (%d bytes) in %.3fs",
-                        len(new_lines),
-                        new_position - position,
-                        time.monotonic() - t1,
-                    )
-
-                    if new_position - position > 1024 * 1024:
-                        logs_logger.warning(
-                            "stream_logs: large response %.1f MB",
-                            (new_position - position) / 1e6,
-                        )
+            return log_stream_response(self.log_follower)
 
-                    if new_lines:
-                        return jsonify({"logs": new_lines, "position": new_position})
-                    else:
-                        return jsonify({"logs": [], "position": new_position})
-                except FileNotFoundError:
-                    logger.error(f"Log file not found: {log_file}")
-                    return jsonify({"logs": [], "position": 0, "file_not_found": True})
-
-            except Exception as e:
-                logger.error(f"Error streaming logs: {e}")
-                return jsonify({"logs": [], "position": position})
-            finally:
-                logger.debug("stream_logs: total %.3fs", time.monotonic() - t0)
+        @app.route("/logs/events")
+        @auth_required
+        def log_events():
+            return stream_limiter.open(lambda: log_events_response(self.log_follower))
 
         @app.route("/logs/download")
         @auth_required
@@ -1173,22 +1155,20 @@ class Server:
 
         @app.route("/image")
         def serve_pil_image():
-            empty_img = Image.new(
-                "RGB", (60, 30), color=(73, 109, 137)
-            )  # create an image using PIL
-            img = None
             try:
-                img = self.shared_state.screen()
+                return screen_image_response(self.screen_mirror)
             except (BrokenPipeError, EOFError):
-                pass
-
-            if img is None:
-                img = empty_img
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format="PNG")  # adjust for your image format
-            img_byte_arr.seek(0)
-
-            return send_file(img_byte_arr, mimetype="image/png")
+                empty_img = Image.new("RGB", (60, 30), color=(73, 109, 137))
+                img_byte_arr = io.BytesIO()
+                empty_img.save(img_byte_arr, format="PNG")
+                img_byte_arr.seek(0)
+                return send_file(img_byte_arr, mimetype="image/png")
+
+        @app.route("/image/stream")
+        def serve_image_stream():
+            return stream_limiter.open(
+                lambda: screen_stream_response(self.screen_mirror)
+            )
 
         # # If you want to see a log of all requests for debugging, you can uncomment this:
         # @app.after_request
@@ -1233,12 +1213,14 @@ class Server:
         # If the PiFinder software is running as a service
         # it can grab port 80.  If not, it needs to use 8080
         try:
-            waitress_serve(self.app, host="0.0.0.0", port=80)
+            waitress_serve(self.app, host="0.0.0.0", port=80, threads=_SERVER_THREADS)
             logger.info("Webserver started on port 80")
         except (PermissionError, OSError) as e:
             logger.debug(f"Permission denied on port 80, trying 8080. {e}")
             try:
-                waitress_serve(self.app, host="0.0.0.0", port=8080)
+                waitress_serve(
+                    self.app, host="0.0.0.0", port=8080, threads=_SERVER_THREADS
+                )
                 logger.info("Webserver started on port 8080")
             except Exception as e2:
                 logger.exception(f"Failed to start server on port 8080. {e2}")
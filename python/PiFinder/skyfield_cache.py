@@ -0,0 +1,132 @@
+"""
+Skyfield's ephemeris, timescale and constellation map, prepared once and
+shared by every PiFinder process.
+
+Each process that imports ``calc_utils`` needs all three: main, solver,
+integrator, the web and SkySafari servers, and the catalog loaders.
+
+* Ephemeris: jplephem memory-maps the SPK segments of ``de421.bsp``
+  read-only, so the processes already share its pages through the OS page
+  cache. ``ephemeris()`` just makes sure each process opens it once.
+* Timescale and constellation map: Skyfield ships these as compressed
+  ``.npz`` tables. Each process would otherwise decompress them and
+  rebuild the daily ∆T table. The prepared arrays are written once as
+  plain ``.npy`` files under ``~/PiFinder_data/cache/skyfield/`` and
+  memory-mapped read-only from then on. Start-up skips the parsing, and
+  the processes share one copy of the pages.
+
+The cache is keyed on the installed Skyfield version, since the tables come
+from its package data. It is built in a per-process staging directory and
+renamed into place, so processes starting together never read a partial
+cache. If the cache can't be written (full or read-only card) the tables
+are used straight from Skyfield, costing time and memory, not correctness.
+"""
+
+import functools
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import skyfield
+from skyfield.api import Loader
+from skyfield.functions import load_bundled_npy
+from skyfield.jpllib import SpiceKernel
+from skyfield.timelib import Timescale
+
+from PiFinder import utils
+
+logger = logging.getLogger("SkyfieldCache")
+
+EPHEMERIS = "de421.bsp"
+
+# Bump when the arrays written for a table change
+CACHE_VERSION = 1
+
+CACHE_DIR = utils.data_dir / "cache" / "skyfield"
+
+
+def _timescale_arrays() -> Dict[str, np.ndarray]:
+    # As Loader.timescale(builtin=True) prepares them
+    arrays = load_bundled_npy("iers.npz")
+    daily_tt = arrays["tt_jd_minus_arange"]
+    return {
+        "daily_tt": daily_tt + np.arange(len(daily_tt)),
+        "daily_delta_t": (arrays["delta_t_1e7"] / 1e7).round(7),
+        "leap_dates": arrays["leap_dates"],
+        "leap_offsets": arrays["leap_offsets"],
+    }
+
+
+def _constellation_arrays() -> Dict[str, np.ndarray]:
+    arrays = load_bundled_npy("constellations.npz")
+    return {name: arrays[name] for name in arrays.files}
+
+
+def _write_arrays(target: Path, arrays: Dict[str, np.ndarray]) -> None:
+    staging = target.with_name(f".{target.name}.{os.getpid()}.partial")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array)
+        try:
+            staging.rename(target)
+        except OSError:
+            # Another process got there first; its copy is as good.
+            if not target.is_dir():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _cached_arrays(
+    table: str, build: Callable[[], Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """The arrays of ``table``, memory-mapped from the cache, which is
+    written from ``build()`` on first use."""
+    target = CACHE_DIR / f"{table}-{skyfield.__version__}-{CACHE_VERSION}"
+    if not target.is_dir():
+        arrays = build()
+        try:
+            _write_arrays(target, arrays)
+        except OSError:
+            logger.exception("Cannot cache Skyfield %s table", table)
+            return arrays
+        logger.info("Cached Skyfield %s table in %s", table, target)
+    try:
+        return {
+            path.stem: np.load(path, mmap_mode="r") for path in target.glob("*.npy")
+        }
+    except (OSError, ValueError):
+        logger.exception("Skyfield %s cache unreadable, rebuilding", table)
+        shutil.rmtree(target, ignore_errors=True)
+        return build()
+
+
+@functools.lru_cache(maxsize=None)
+def ephemeris() -> SpiceKernel:
+    """The JPL ephemeris; its segments are memory-mapped on first use."""
+    return Loader(utils.astro_data_dir)(EPHEMERIS)
+
+
+@functools.lru_cache(maxsize=None)
+def timescale() -> Timescale:
+    """A ``Timescale`` equivalent to Skyfield's builtin ``load.timescale()``."""
+    arrays = _cached_arrays("timescale", _timescale_arrays)
+    return Timescale(
+        (arrays["daily_tt"], arrays["daily_delta_t"]),
+        arrays["leap_dates"],
+        arrays["leap_offsets"],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def constellation_arrays() -> Dict[str, np.ndarray]:
+    """Skyfield's constellation boundary lookup tables (at epoch B1875):
+    ``sorted_ra`` [hours], ``sorted_dec`` [degrees], ``radec_to_index``
+    and ``indexed_abbreviations``. See
+    ``Skyfield_utils.radec_to_constellations``."""
+    return _cached_arrays("constellations", _constellation_arrays)
@@ -0,0 +1,189 @@
+"""
+Adaptive plate-solve scheduling for the solver process.
+
+The solver used to attempt a solve on every new camera frame. That is the
+right thing while slewing, but during a long session at one object it burns
+a full centroid + tetra3 pass (and the battery that pays for it) on frames
+that can only confirm what the last few solves already said. The IMU keeps
+the published pointing current between solves, so the camera only has to
+re-anchor it occasionally once the scope has settled.
+
+``SolveScheduler`` decides per frame whether to solve it:
+
+* **Blurred frames are skipped.** A frame whose ``imu_delta`` (the turn
+  measured across the exposure) exceeds ``max_imu_ang_during_exposure``
+  smears stars into trails; solving it costs as much as a sharp frame and
+  usually fails. A blurred frame is still solved if nothing has been
+  attempted for ``max_skip_interval`` seconds, so a constant slow drive
+  never starves the integrator of camera anchors.
+* **Settled scopes back off.** Once ``settle_solves`` consecutive successful
+  solves agree to within ``agree_deg`` and the IMU reports no motion, only
+  one frame per ``idle_interval`` seconds is solved.
+* **Motion and target changes burst back up.** IMU motion, a failed solve,
+  a solve that disagrees with the previous one, or a new UI target resets
+  agreement and solves every frame for at least ``burst_seconds``.
+* **Requested frames are always solved.** Frames captured on demand
+  (``"capture"`` camera command, used by SQM calibration) carry
+  ``requested`` in their metadata and bypass scheduling, because the
+  requester waits on that exact frame's solve.
+
+Every decision is counted in ``SolveScheduleCounters``; the solver publishes
+them on ``shared_state.solve_schedule()`` and ``/api/solver/schedule``.
+"""
+
+import logging
+import math
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger("Solver.Scheduler")
+
+
+SOLVE = "solve"
+SKIP_BLURRED = "skip_blurred"
+SKIP_IDLE = "skip_idle"
+
+
+@dataclass
+class SolveScheduleCounters:
+    """Running totals of scheduler decisions, published for diagnostics."""
+
+    solved: int = 0
+    skipped_blurred: int = 0
+    skipped_idle: int = 0
+    bursts: int = 0
+    idle: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _angular_separation_deg(ra1: float, dec1: float, ra2: float, dec2: float) -> float:
+    """Great-circle distance between two RA/Dec positions, all in degrees."""
+    ra1, dec1, ra2, dec2 = map(math.radians, (ra1, dec1, ra2, dec2))
+    sin_ddec = math.sin((dec2 - dec1) / 2)
+    sin_dra = math.sin((ra2 - ra1) / 2)
+    h = sin_ddec**2 + math.cos(dec1) * math.cos(dec2) * sin_dra**2
+    return math.degrees(2 * math.asin(min(1.0, math.sqrt(h))))
+
+
+class SolveScheduler:
+    """Per-frame solve/skip decisions for the solver loop.
+
+    ``decide()`` is called once per new frame and returns ``SOLVE``,
+    ``SKIP_BLURRED`` or ``SKIP_IDLE``; ``record_result()`` is called after
+    every attempted solve. All times are in seconds on the caller's clock
+    (the solver passes frame ``exposure_end`` timestamps).
+    """
+
+    def __init__(
+        self,
+        max_imu_ang_during_exposure: float = 1.0,
+        idle_interval: float = 2.0,
+        burst_seconds: float = 3.0,
+        settle_solves: int = 3,
+        agree_deg: float = 0.1,
+        max_skip_interval: float = 2.0,
+    ):
+        self.max_imu_ang_during_exposure = max_imu_ang_during_exposure
+        self.idle_interval = idle_interval
+        self.burst_seconds = burst_seconds
+        self.settle_solves = settle_solves
+        self.agree_deg = agree_deg
+        self.max_skip_interval = max_skip_interval
+
+        self.counters = SolveScheduleCounters()
+        self._last_attempt: Optional[float] = None
+        self._burst_until = -math.inf
+        self._agreeing = 0
+        self._last_radec: Optional[Tuple[float, float]] = None
+        self._target_key: Any = None
+
+    @property
+    def idle(self) -> bool:
+        """True while settled solves are being rate-limited."""
+        return self._agreeing >= self.settle_solves
+
+    def _burst(self, now: float, reason: str) -> None:
+        if self.idle or now >= self._burst_until:
+            self.counters.bursts += 1
+            logger.debug("Solve burst: %s", reason)
+        self._agreeing = 0
+        self._burst_until = now + self.burst_seconds
+
+    def decide(
+        self,
+        now: float,
+        imu_delta: Optional[float] = None,
+        moving: bool = False,
+        target_key: Any = None,
+        requested: bool = False,
+    ) -> str:
+        """Decide whether the frame that ended at ``now`` should be solved.
+
+        ``imu_delta`` is the turn during the exposure in degrees (``None``
+        when no IMU is fitted), ``moving`` the IMU's motion flag at exposure
+        end and ``target_key`` any hashable identity of the current UI
+        target.
+        """
+        if target_key != self._target_key:
+            if self._target_key is not None or target_key is not None:
+                self._burst(now, "target changed")
+            self._target_key = target_key
+        if moving:
+            self._burst(now, "IMU motion")
+
+        overdue = (
+            self._last_attempt is None
+            or now - self._last_attempt >= self.max_skip_interval
+        )
+        if requested:
+            decision = SOLVE
+        elif (
+            imu_delta is not None
+            and abs(imu_delta) > self.max_imu_ang_during_exposure
+            and not overdue
+        ):
+            decision = SKIP_BLURRED
+        elif (
+            self.idle
+            and now >= self._burst_until
+            and self._last_attempt is not None
+            and now - self._last_attempt < self.idle_interval
+        ):
+            decision = SKIP_IDLE
+        else:
+            decision = SOLVE
+
+        if decision == SOLVE:
+            self._last_attempt = now
+            self.counters.solved += 1
+        elif decision == SKIP_BLURRED:
+            self.counters.skipped_blurred += 1
+        else:
+            self.counters.skipped_idle += 1
+        self.counters.idle = self.idle
+        return decision
+
+    def record_result(
+        self, now: float, ra: Optional[float] = None, dec: Optional[float] = None
+    ) -> None:
+        """Feed back the outcome of a solve attempt.
+
+        Pass the solved camera-centre ``ra``/``dec`` in degrees, or leave
+        them ``None`` for a failed attempt (which bursts back to full rate).
+        """
+        if ra is None or dec is None:
+            self._last_radec = None
+            self._burst(now, "solve failed")
+            self.counters.idle = self.idle
+            return
+        if self._last_radec is not None:
+            last_ra, last_dec = self._last_radec
+            separation = _angular_separation_deg(last_ra, last_dec, ra, dec)
+            if separation <= self.agree_deg:
+                self._agreeing += 1
+            else:
+                self._burst(now, "solve moved %.2f deg" % separation)
+        self._last_radec = (ra, dec)
+        self.counters.idle = self.idle
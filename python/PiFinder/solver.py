@@ -11,6 +11,7 @@ This module is the solver
 from PiFinder.multiproclogging import MultiprocLogging
 import queue
 import numpy as np
+from PIL import Image
 import time
 import logging
 import sys
@@ -28,6 +29,9 @@ from PiFinder import state_utils
 from PiFinder import utils
 from PiFinder import timez
 from PiFinder.optics import OpticalTrainResolver
+from PiFinder.roi_centroiding import RoiCentroider
+from PiFinder.solve_scheduler import SOLVE, SolveScheduler
+from PiFinder.solver_database import SolverDatabaseLoader
 from PiFinder.sqm import SQM as SQMCalculator
 
 from PiFinder.sqm.wings import WingEstimator
@@ -47,6 +51,7 @@ from PiFinder.types.positioning import (
     Pointing,
     ReloadSqmCalibration,
     SolveDiagnostics,
+    SolveMatches,
     SuccessfulSolve,
 )
 
@@ -61,6 +66,10 @@ SQM_CALCULATION_INTERVAL_SECONDS = 1.0
 # Solved stellar photometry is a slower transmission/cloud/dew diagnostic. It
 # need not track the five-second primary radiometer publication cadence.
 SQM_STELLAR_DIAGNOSTIC_INTERVAL_SECONDS = 10.0
+# A solve from ROI centroids re-identifies the stars of the previous solve,
+# so tetra3 can be held to the previous FOV and a short timeout.
+ROI_FOV_MAX_ERROR = 0.02
+ROI_SOLVE_TIMEOUT_MS = 200
 
 
 def create_sqm_calculator(shared_state):
@@ -84,6 +93,17 @@ def _extract_raw_photometry_image(raw, profile):
     return extract_photometry_image(raw, profile)
 
 
+def _stellar_diagnostic_due(now: float, last: float, roi_half) -> bool:
+    """Whether this frame should run the stellar SQM diagnostic.
+
+    Only full-frame centroids will do: sqm masks every detected star out of
+    the background annuli, and an ROI frame's centroids cover just the
+    windows around the reference stars. The ROI centroider forces a full
+    frame every few frames, so a due diagnostic waits at most that long.
+    """
+    return roi_half is None and now - last >= SQM_STELLAR_DIAGNOSTIC_INTERVAL_SECONDS
+
+
 def _scaled_photometry_radii(
     scale, aperture_radius=5, inner_radius=10, outer_radius=18
 ):
@@ -573,6 +593,27 @@ class CedarConnectionError(Exception):
 # /dev/shm, so the next run's create=True fails with FileExistsError.
 _CEDAR_DETECT_SHMEM_NAME = "/cedar_detect_image"
 
+# Every frame the solver sees is the 512x512 post-rotation camera image, so
+# the segment is created once at this size instead of on the first solve.
+_CEDAR_DETECT_FRAME_SHAPE = (512, 512)
+
+
+def _decode_star_candidates(star_candidates) -> np.ndarray:
+    """Decode Cedar ``StarCandidate`` messages into an ``(N, 2)`` float array
+    of ``(y, x)`` centroids -- the layout tetra3 ``solve_from_centroids`` and
+    the SQM photometry take directly."""
+    n = len(star_candidates)
+    flat = np.fromiter(
+        (
+            coord
+            for sc in star_candidates
+            for coord in (sc.centroid_position.y, sc.centroid_position.x)
+        ),
+        dtype=np.float64,
+        count=2 * n,
+    )
+    return flat.reshape(n, 2)
+
 
 class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
     def __init__(self, port=50551):
@@ -589,14 +630,18 @@ class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
         self._port = port
         self._subprocess = None
         # Will initialize on first use.
+        self._channel = None
         self._stub = None
         self._shmem = None
         self._shmem_size = 0
+        self._frame = None
+        self._retired_shmem = None
         # Try shared memory, fall back if an error occurs.
         self._use_shmem = True
         # A killed solver leaves its shmem segment behind; clear any stale one
         # so this run can re-create it instead of dying on FileExistsError.
         self._clear_stale_shmem()
+        self.frame_buffer(*_CEDAR_DETECT_FRAME_SHAPE)
         if self._server_reachable():
             # An external server (systemd service) is already running.
             time.sleep(2)
@@ -682,23 +727,62 @@ class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
         treat it as released.
         """
         try:
-            super()._del_shmem()
+            if self._frame is not None:
+                # The solver may still hold a frame_buffer() view of the
+                # current frame, and closing the segment would unmap the
+                # pixels out from under it. Release only the name; the
+                # mapping itself lives on until the client is torn down.
+                self._frame = None
+                self._retired_shmem = self._shmem
+                self._shmem = None
+                self._retired_shmem.unlink()
+            else:
+                super()._del_shmem()
         except FileNotFoundError:
             self._shmem = None
 
+    def _alloc_shmem(self, size):
+        if self._shmem is not None and size > self._shmem_size:
+            self._del_shmem()
+        super()._alloc_shmem(size)
+
+    def frame_buffer(self, height, width):
+        """Return a ``(height, width)`` uint8 array backed by the Cedar
+        shared-memory segment, or None once the shared-memory path is off.
+
+        The solver decodes each camera frame straight into this array, and
+        ``extract_centroids`` recognises it and skips its own copy. The view
+        is reused frame to frame, so it is only valid until the next frame
+        is written.
+        """
+        if not self._use_shmem:
+            return None
+        if self._frame is None or self._frame.shape != (height, width):
+            self._alloc_shmem(size=width * height)
+            self._frame = np.ndarray(
+                (height, width), dtype=np.uint8, buffer=self._shmem.buf
+            )
+        return self._frame
+
     def _get_stub(self):
+        # One channel for the life of the client: grpc reconnects it
+        # transparently if the server restarts.
         if self._stub is None:
-            channel = grpc.insecure_channel("127.0.0.1:%d" % self._port)
+            self._channel = grpc.insecure_channel("127.0.0.1:%d" % self._port)
             self._stub = cedar_detect_client.cedar_detect_pb2_grpc.CedarDetectStub(
-                channel
+                self._channel
             )
         return self._stub
 
     def extract_centroids(
         self, image, sigma, max_size, use_binned, detect_hot_pixels=True
     ):
-        """Override to raise CedarConnectionError on gRPC failure instead of returning empty list."""
-        import numpy as np
+        """Override to raise CedarConnectionError on gRPC failure instead of returning empty list.
+
+        Returns the centroids as an ``(N, 2)`` float array of ``(y, x)``.
+        An ``image`` obtained from :meth:`frame_buffer` is already in the
+        shared-memory segment and is not copied again.
+        """
         from tetra3 import cedar_detect_pb2
 
         np_image = np.asarray(image, dtype=np.uint8)
@@ -707,11 +791,9 @@ class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
 
         # Use shared memory path (same machine)
         if self._use_shmem:
-            self._alloc_shmem(size=width * height)
-            shimg = np.ndarray(
-                np_image.shape, dtype=np_image.dtype, buffer=self._shmem.buf
-            )
-            shimg[:] = np_image[:]
+            shimg = self.frame_buffer(height, width)
+            if shimg is not np_image:
+                shimg[...] = np_image
 
             im = cedar_detect_pb2.Image(
                 width=width, height=height, shmem_name=self._shmem.name
@@ -770,11 +852,9 @@ class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
                     f"Cedar gRPC failed: {err.details()}"
                 ) from err
 
-        tetra_centroids = []
-        if centroids_result is not None:
-            for sc in centroids_result.star_candidates:
-                tetra_centroids.append((sc.centroid_position.y, sc.centroid_position.x))
-        return tetra_centroids
+        if centroids_result is None:
+            return np.empty((0, 2), dtype=np.float64)
+        return _decode_star_candidates(centroids_result.star_candidates)
 
     def __del__(self):
         # __del__ can run on a partially-constructed instance (e.g. if __init__
@@ -782,9 +862,34 @@ class PFCedarDetectClient(cedar_detect_client.CedarDetectClient):
         subprocess_handle = getattr(self, "_subprocess", None)
         if subprocess_handle is not None:
             subprocess_handle.kill()
+        channel = getattr(self, "_channel", None)
+        if channel is not None:
+            channel.close()
+        self._frame = None
         self._del_shmem()
 
 
+def _load_solve_frame(img, cedar_detect) -> np.ndarray:
+    """Decode the grayscale solve frame, straight into Cedar's shared-memory
+    segment when that path is live so ``extract_centroids`` needn't copy it.
+    """
+    frame_buffer = (
+        cedar_detect.frame_buffer(img.height, img.width)
+        if cedar_detect is not None
+        else None
+    )
+    if frame_buffer is None:
+        return np.asarray(img, dtype=np.uint8)
+    # An "L" image mapped over the segment: pasting copies the pixels in
+    # once, where np.asarray() would first export them to a temporary.
+    # frombuffer() marks mapped images read-only, and paste() would then
+    # detach onto a private copy, so clear the flag.
+    segment = Image.frombuffer("L", img.size, frame_buffer, "raw", "L", 0, 1)
+    segment.readonly = 0
+    segment.paste(img)
+    return frame_buffer
+
+
 def _build_successful_solve(
     solution: dict,
     last_image_metadata: dict,
@@ -832,9 +937,12 @@ def _build_successful_solve(
             x_target=solution.get("x_target"),
             y_target=solution.get("y_target"),
         ),
-        matched_centroids=solution.get("matched_centroids"),
-        matched_stars=solution.get("matched_stars"),
-        matched_catID=solution.get("matched_catID"),
+        matches=(
+            SolveMatches.from_solution(last_solve_success, solution)
+            if solution.get("matched_centroids") is not None
+            and solution.get("matched_stars") is not None
+            else None
+        ),
     )
 
 
@@ -870,11 +978,34 @@ def solver(
 ):
     MultiprocLogging.configurer(log_queue)
     logger.debug("Starting Solver")
-    t3 = tetra3.Tetra3(str(utils.tetra3_dir / "data" / "default_database.npz"))
+    optical_train = OpticalTrainResolver()
+    # One pattern database per FOV range can ship in tetra3/data; the one
+    # matching the optical train is memory-mapped, and a lens change swaps
+    # it in the background. See PiFinder/solver_database.py.
+    solver_databases = SolverDatabaseLoader(
+        utils.tetra3_dir / "data", utils.data_dir / "solver_db_cache"
+    )
+    t3 = solver_databases.load_now(
+        optical_train.resolve(
+            shared_state.camera_type(), shared_state.camera_lens()
+        ).fov_degrees
+    )
     align_ra = 0
     align_dec = 0
     last_solve_attempt: float = 0.0
     last_solve_success = None  # exposure_end of most recent successful solve
+    # exposure_end of the last frame the scheduler saw, solved or skipped
+    last_frame_scheduled: float = 0.0
+
+    # Frames are solved at full rate while moving and throttled once the
+    # scope has settled; see PiFinder/solve_scheduler.py.
+    scheduler = SolveScheduler(max_imu_ang_during_exposure)
+    target_key = None
+    last_target_poll = 0.0
+    last_schedule_publish = 0.0
+    # While tracking, centroid only windows around the last matched stars;
+    # see PiFinder/roi_centroiding.py.
+    roi_centroider = RoiCentroider()
 
     centroids = []
     log_no_stars_found = True
@@ -902,7 +1033,6 @@ def solver(
     # still holds the pre-camera default. Resolving it lazily also means a lens
     # change takes effect on the next frame instead of the next boot. The
     # resolver only rebuilds when one of the two halves actually changes.
-    optical_train = OpticalTrainResolver()
     logged_train = None
 
     while True:
@@ -967,7 +1097,9 @@ def solver(
                     continue
 
                 # Check if we should process this image
-                is_new_image = last_image_metadata["exposure_end"] > last_solve_attempt
+                is_new_image = (
+                    last_image_metadata["exposure_end"] > last_frame_scheduled
+                )
 
                 if not is_new_image:
                     continue
@@ -992,6 +1124,12 @@ def solver(
                         train.fov_degrees,
                         *_fov_gate_bounds(train),
                     )
+                    solver_databases.request(train.fov_degrees)
+                    _warn_if_outside_solver_database(t3, train)
+                new_t3 = solver_databases.poll()
+                if new_t3 is not None:
+                    t3 = new_t3
+                    roi_centroider.reset()
                     _warn_if_outside_solver_database(t3, train)
 
                 # Every camera frame already carries a tiny radiometer sample
@@ -1021,10 +1159,35 @@ def solver(
                         field_width_degrees=train.fov_degrees,
                     )
 
+                # The UI target is a full catalog object behind the proxy;
+                # polling it once a second is plenty to catch a new target.
+                now = time.monotonic()
+                if now - last_target_poll >= 1.0:
+                    last_target_poll = now
+                    try:
+                        target = shared_state.ui_state().target()
+                        target_key = getattr(target, "object_id", None)
+                    except Exception:
+                        pass
+                frame_imu = last_image_metadata.get("imu")
+                last_frame_scheduled = last_image_metadata["exposure_end"]
+                decision = scheduler.decide(
+                    last_frame_scheduled,
+                    imu_delta=last_image_metadata.get("imu_delta"),
+                    moving=bool(getattr(frame_imu, "moving", False)),
+                    target_key=target_key,
+                    requested=bool(last_image_metadata.get("requested")),
+                )
+                if now - last_schedule_publish >= 1.0:
+                    last_schedule_publish = now
+                    shared_state.set_solve_schedule(scheduler.counters.to_dict())
+                if decision != SOLVE:
+                    continue
+
                 try:
                     img = camera_image.copy()
                     img = img.convert(mode="L")
-                    np_image = np.asarray(img, dtype=np.uint8)
+                    np_image = _load_solve_frame(img, cedar_detect)
 
                     # Mark that we're attempting a solve - use image exposure_end timestamp.
                     # This is more accurate than wall clock and ties the attempt to the
@@ -1032,25 +1195,39 @@ def solver(
                     last_solve_attempt = last_image_metadata["exposure_end"]
 
                     t0 = precision_timestamp()
-                    if cedar_detect is not None:
-                        # Try Cedar first
-                        try:
-                            centroids = cedar_detect.extract_centroids(
-                                np_image, sigma=8, max_size=10, use_binned=True
-                            )
-                        except CedarConnectionError as e:
-                            logger.warning(
-                                f"Cedar connection failed: {e}, falling back to tetra3"
-                            )
+                    frame_quat = getattr(frame_imu, "quat", None)
+                    roi_half = roi_centroider.window_for(frame_quat)
+                    if roi_half is not None:
+                        centroids = roi_centroider.extract(np_image, roi_half)
+                        if len(centroids) < roi_centroider.min_stars:
+                            # Lost the field (cloud, bump): full frame instead
+                            roi_half = None
+                            roi_centroider.reset()
+                    if roi_half is None:
+                        if cedar_detect is not None:
+                            # Try Cedar first
+                            try:
+                                centroids = cedar_detect.extract_centroids(
+                                    np_image, sigma=8, max_size=10, use_binned=True
+                                )
+                            except CedarConnectionError as e:
+                                logger.warning(
+                                    f"Cedar connection failed: {e}, falling back to tetra3"
+                                )
+                                centroids = tetra3.get_centroids_from_image(np_image)
+                        else:
+                            # Cedar not available, use tetra3
                             centroids = tetra3.get_centroids_from_image(np_image)
-                    else:
-                        # Cedar not available, use tetra3
-                        centroids = tetra3.get_centroids_from_image(np_image)
                     t_extract = (precision_timestamp() - t0) * 1000
 
                     logger.debug(
-                        "File %s, extracted %d centroids in %.2fms"
-                        % ("camera", len(centroids), t_extract)
+                        "File %s, extracted %d centroids (%s) in %.2fms"
+                        % (
+                            "camera",
+                            len(centroids),
+                            "full" if roi_half is None else f"ROI ±{roi_half}px",
+                            t_extract,
+                        )
                     )
 
                     solution: dict = {}
@@ -1071,6 +1248,14 @@ def solver(
                         # fitting, so this window has to describe the actual
                         # hardware or nothing solves. See docs/adr/0027.
                         fov_estimate, fov_max_error = train.solver_fov_params()
+                        solve_timeout = 1000
+                        if roi_half is not None:
+                            # Verification-style solve: the ROI centroids are
+                            # the stars of the last solve, so the field is
+                            # already known to within a couple of percent.
+                            fov_estimate = roi_centroider.fov
+                            fov_max_error = ROI_FOV_MAX_ERROR * fov_estimate
+                            solve_timeout = ROI_SOLVE_TIMEOUT_MS
                         solution = t3.solve_from_centroids(
                             centroids,
                             (512, 512),
@@ -1079,7 +1264,7 @@ def solver(
                             match_max_error=0.005,
                             return_matches=True,  # Required for SQM calculation
                             target_pixel=shared_state.target_pixel(),
-                            solve_timeout=1000,
+                            solve_timeout=solve_timeout,
                             **_solver_args,
                         )
 
@@ -1106,9 +1291,8 @@ def solver(
                         altitude_for_sqm = None
 
                         diagnostic_now = time.time()
-                        if (
-                            diagnostic_now - last_stellar_diagnostic
-                            >= SQM_STELLAR_DIAGNOSTIC_INTERVAL_SECONDS
+                        if _stellar_diagnostic_due(
+                            diagnostic_now, last_stellar_diagnostic, roi_half
                         ):
                             update_sqm(
                                 shared_state=shared_state,
@@ -1172,8 +1356,24 @@ def solver(
                             # the result has been consumed.
                             solve_result.alignment = AlignmentResult()
 
+                        scheduler.record_result(
+                            last_solve_attempt,
+                            solve_result.camera.RA,
+                            solve_result.camera.Dec,
+                        )
+                        if solve_result.matches is not None:
+                            roi_centroider.set_reference(
+                                solve_result.matches.centroids,
+                                frame_quat,
+                                solution.get("FOV"),
+                                512,
+                            )
+                        else:
+                            roi_centroider.reset()
                         solver_queue.put(solve_result)
                     else:
+                        scheduler.record_result(last_solve_attempt)
+                        roi_centroider.reset()
                         if solution:
                             logger.warning(
                                 f"Solve FAILED - {len(centroids)} centroids detected but "
@@ -1191,6 +1391,7 @@ def solver(
                         f"Exception during solve attempt: {e.__class__.__name__}: {str(e)}"
                     )
                     logger.exception(e)
+                    roi_centroider.reset()
                     last_solve_attempt = last_image_metadata["exposure_end"]
                     solver_queue.put(
                         _build_failed_solve(
@@ -0,0 +1,264 @@
+"""
+Pattern-database selection and loading for the solver.
+
+tetra3 databases are built for a field-of-view range and a star magnitude
+limit. A database tuned to the fitted lens has fewer patterns to search
+and a smaller catalogue to hold than one generic database stretched over
+every lens, so the solver can ship several and pick one per optical
+train:
+
+* ``discover_databases()`` lists every ``*.npz`` in the tetra3 data
+  directory, reading only each file's ``props_packed`` member.
+* ``select_database()`` picks, among the databases whose FOV range covers
+  the train's field, the one with the narrowest range (deepest magnitude
+  limit as a tie-break). Nothing covering the field falls back to the
+  database whose range is nearest, so a mis-set lens still gets the
+  existing "outside the solver database" log line rather than no solver.
+* ``load_tetra3()`` memory-maps the large arrays. tetra3 saves with
+  ``np.savez_compressed``, which cannot be mapped, so each database is
+  expanded once into a cache directory: the pattern catalogue (and its
+  largest-edge table) as plain ``.npy`` files, everything else as a small
+  ``.npz`` that tetra3 loads normally. The mapped arrays then replace the
+  empty placeholders. Pages are read on demand and can be dropped by the
+  kernel under memory pressure, instead of holding the whole catalogue in
+  the solver's heap. tetra3 has no public way to hand it arrays, so the
+  placeholders are swapped on its private attributes; a tetra3 that
+  doesn't expose them through its ``pattern_catalog`` /
+  ``pattern_largest_edge`` properties gets a normal full load instead.
+* ``SolverDatabaseLoader`` does the expand-and-load on a background thread
+  so a lens change doesn't stall the solve loop; the solver keeps solving
+  with the old database until ``poll()`` hands over the new one.
+"""
+
+import logging
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # Imported lazily: tetra3 lives in a submodule the solver puts on
+    # sys.path itself, after importing this module.
+    import tetra3
+
+logger = logging.getLogger("Solver.Database")
+
+# Database members that are mapped rather than loaded. Both scale with the
+# number of patterns; everything else (star table, properties) is small.
+_MAPPED_MEMBERS = ("pattern_catalog", "pattern_largest_edge")
+# Written last when expanding, so a half-written cache is never used.
+_STAMP = "source.stamp"
+
+
+@dataclass(frozen=True)
+class SolverDatabase:
+    """A tetra3 pattern database on disk and the range it was built for."""
+
+    path: Path
+    min_fov: float
+    max_fov: float
+    star_max_magnitude: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+    def covers(self, fov_degrees: float) -> bool:
+        return self.min_fov <= fov_degrees <= self.max_fov
+
+
+def read_database(path: Path) -> Optional[SolverDatabase]:
+    """Read a database's FOV range without loading its arrays.
+
+    Returns ``None`` for files that aren't tetra3 databases.
+    """
+    try:
+        with np.load(path) as data:
+            props = data["props_packed"]
+            max_fov = float(props["max_fov"][()])
+            try:
+                min_fov = float(props["min_fov"][()])
+            except ValueError:
+                min_fov = max_fov
+            try:
+                magnitude = float(props["star_max_magnitude"][()])
+            except ValueError:
+                magnitude = None
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning("Skipping %s: not a tetra3 database (%s)", path, e)
+        return None
+    return SolverDatabase(path, min_fov, max_fov, magnitude)
+
+
+def discover_databases(data_dir: Path) -> List[SolverDatabase]:
+    """All tetra3 databases in ``data_dir``, sorted by name."""
+    found = (read_database(path) for path in sorted(Path(data_dir).glob("*.npz")))
+    return [db for db in found if db is not None]
+
+
+def select_database(
+    databases: List[SolverDatabase], fov_degrees: float
+) -> Optional[SolverDatabase]:
+    """The database best suited to a ``fov_degrees`` field (see module doc)."""
+    covering = [db for db in databases if db.covers(fov_degrees)]
+    if covering:
+        return min(
+            covering,
+            key=lambda db: (db.max_fov - db.min_fov, -(db.star_max_magnitude or 0.0)),
+        )
+    if not databases:
+        return None
+    return min(
+        databases,
+        key=lambda db: min(
+            abs(db.min_fov - fov_degrees), abs(db.max_fov - fov_degrees)
+        ),
+    )
+
+
+def _expand_database(db: SolverDatabase, cache_dir: Path) -> Path:
+    """Expand ``db`` into ``cache_dir/<name>/`` once; returns that directory.
+
+    The expansion is keyed on the source file's size and mtime, so a
+    rebuilt database is re-expanded on next use.
+    """
+    target = cache_dir / db.name
+    stat = db.path.stat()
+    stamp = f"{stat.st_size} {stat.st_mtime_ns}"
+    stamp_path = target / _STAMP
+    if stamp_path.exists() and stamp_path.read_text() == stamp:
+        return target
+
+    logger.info("Expanding solver database %s for memory mapping", db.name)
+    staging = cache_dir / f".{db.name}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    small = {}
+    with np.load(db.path) as data:
+        for member in data.files:
+            array = data[member]
+            if member in _MAPPED_MEMBERS:
+                np.save(staging / f"{member}.npy", array)
+                # tetra3 still loads the member, so leave it a zero-length
+                # placeholder of the right dtype and row width.
+                array = np.empty((0,) + array.shape[1:], dtype=array.dtype)
+            small[member] = array
+    np.savez(staging / "database.npz", **small)
+    (staging / _STAMP).write_text(stamp)
+    shutil.rmtree(target, ignore_errors=True)
+    staging.rename(target)
+    return target
+
+
+def _mappable(t3: "tetra3.Tetra3") -> bool:
+    """Whether ``t3`` keeps each mapped member in the private attribute
+    behind its public property, as the tetra3 this was written for does."""
+    for member in _MAPPED_MEMBERS:
+        placeholder = getattr(t3, f"_{member}", None)
+        if placeholder is None or getattr(t3, member, None) is not placeholder:
+            return False
+    return True
+
+
+def load_tetra3(db: SolverDatabase, cache_dir: Path) -> "tetra3.Tetra3":
+    """A ``Tetra3`` on ``db`` with its pattern catalogue memory-mapped.
+
+    Falls back to a normal full load if the cache can't be written (e.g.
+    a full or read-only card), or if this tetra3 doesn't store the
+    catalogue where it can be swapped; that costs memory, not solves.
+    """
+    import tetra3
+
+    try:
+        expanded = _expand_database(db, cache_dir)
+    except OSError:
+        logger.exception("Cannot expand %s, loading it into memory", db.name)
+        return tetra3.Tetra3(db.path)
+
+    t3 = tetra3.Tetra3(expanded / "database.npz")
+    if not _mappable(t3):
+        logger.warning(
+            "This tetra3 can't use a mapped pattern catalogue, loading %s "
+            "into memory",
+            db.name,
+        )
+        return tetra3.Tetra3(db.path)
+    for member in _MAPPED_MEMBERS:
+        mapped = expanded / f"{member}.npy"
+        if mapped.exists():
+            setattr(t3, f"_{member}", np.load(mapped, mmap_mode="r"))
+    return t3
+
+
+class SolverDatabaseLoader:
+    """Keeps the solver's database matched to its optical train.
+
+    ``request(fov)`` starts a background load when a different database
+    suits the new field of view; ``poll()`` returns the loaded ``Tetra3``
+    once (and ``None`` otherwise). Requests made while a load is running
+    are remembered and served when it finishes.
+    """
+
+    def __init__(self, data_dir: Path, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.databases = discover_databases(data_dir)
+        self.current: Optional[SolverDatabase] = None
+        self._wanted: Optional[SolverDatabase] = None
+        self._loading: Optional[SolverDatabase] = None
+        self._loaded: Optional[Tuple[SolverDatabase, "tetra3.Tetra3"]] = None
+        self._lock = threading.Lock()
+
+    def load_now(self, fov_degrees: float) -> "tetra3.Tetra3":
+        """Blocking load for solver startup, before any frame needs solving."""
+        db = select_database(self.databases, fov_degrees)
+        if db is None:
+            raise FileNotFoundError("No tetra3 database found")
+        t3 = load_tetra3(db, self.cache_dir)
+        self.current = self._wanted = db
+        logger.info("Solver database: %s", db.name)
+        return t3
+
+    def request(self, fov_degrees: float) -> None:
+        db = select_database(self.databases, fov_degrees)
+        with self._lock:
+            if db is None or db == self._wanted:
+                return
+            self._wanted = db
+            if self._loading is None:
+                self._start(db)
+
+    def _start(self, db: SolverDatabase) -> None:
+        self._loading = db
+        threading.Thread(
+            target=self._load, args=(db,), name="SolverDatabaseLoader", daemon=True
+        ).start()
+
+    def _load(self, db: SolverDatabase) -> None:
+        logger.info("Loading solver database %s in the background", db.name)
+        try:
+            t3 = load_tetra3(db, self.cache_dir)
+        except Exception:
+            logger.exception("Loading solver database %s failed", db.name)
+            t3 = None
+        with self._lock:
+            self._loading = None
+            if t3 is not None:
+                self._loaded = (db, t3)
+            wanted = self._wanted
+            if wanted is not None and wanted not in (db, self.current):
+                self._start(wanted)
+
+    def poll(self) -> Optional["tetra3.Tetra3"]:
+        with self._lock:
+            if self._loaded is None:
+                return None
+            db, t3 = self._loaded
+            self._loaded = None
+            if db != self._wanted:
+                return None
+            self.current = db
+        logger.info("Solver database: %s", db.name)
+        return t3
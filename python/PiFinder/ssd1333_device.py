@@ -18,6 +18,8 @@ Command set reference (key differences from SSD1351):
 
 from luma.oled.device.color import color_device
 
+from PiFinder.oled_framebuffer import DirtyRectangleMixin
+
 #: Number of gray scale levels on the 5-bit color A and C channels. luma packs
 #: red as ``r & 0xF8``, so a red byte of 8*n selects gray level n.
 GRAY_SCALE_LEVELS = 31
@@ -27,7 +29,7 @@ GRAY_SCALE_LEVELS = 31
 MIN_GRAY_SCALE_LEVEL = 2
 
 
-class ssd1333(color_device):
+class ssd1333(DirtyRectangleMixin, color_device):
     """
     Serial interface to the 16-bit color (5-6-5 RGB) SSD1333 OLED display.
 
@@ -46,8 +48,8 @@ class ssd1333(color_device):
         no rotation, 1 is rotate 90° clockwise, 2 is 180° rotation and 3
         represents 270° rotation.
     :type rotate: int
-    :param framebuffer: Framebuffering strategy, currently instances of
-        ``diff_to_previous`` or ``full_frame`` are only supported.
+    :param framebuffer: Accepted for luma compatibility and unused: frames
+        are diffed by :class:`~PiFinder.oled_framebuffer.DirtyRectangleMixin`.
     :type framebuffer: str
     :param bgr: Set to ``True`` if device pixels are BGR order (rather than RGB).
     :type bgr: bool
@@ -100,6 +102,7 @@ class ssd1333(color_device):
         return [(176, 176)]
 
     def _init_sequence(self):
+        super(ssd1333, self)._init_sequence()
         self.command(0xFD, 0x12)  # Unlock IC MCU interface
         self.command(0xAE)  # Display OFF (sleep mode on)
         self.command(0xB3, 0xF1)  # Front clock: osc freq max (0xF), divide by 2
@@ -223,6 +226,7 @@ class ssd1333(color_device):
     def display(self, image):
         """
         Renders an image, capped at the gray scale ceiling if one is set.
+        Only the windows that changed since the last frame are sent.
         """
         if self._gray_scale_lut is not None:
             image = image.point(self._gray_scale_lut)
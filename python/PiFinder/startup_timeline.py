@@ -0,0 +1,253 @@
+"""
+Startup timeline for ``--profile-startup``.
+
+Records where the main process spends its time between launch and the
+event loop:
+
+* Phases: ``mark(name)`` closes the running phase and opens the next one,
+  so the main process's phases tile its startup. Work that runs next to
+  the critical path (``run_concurrently``) is recorded as its own phase
+  with the thread it ran on.
+* Imports: every module import in any thread, with its inclusive time and
+  its self time (inclusive minus the imports it triggered). This is what
+  ``python -X importtime`` reports, but for a real start-up with its
+  hardware, config and lazy imports rather than one import statement.
+
+``enable()`` has to run before the imports worth measuring, so
+``PiFinder.main`` calls it ahead of its own imports when the flag is on
+the command line. ``finish()`` stops the import timer and writes
+``startup_timeline.json`` and a text summary to the given directory.
+Subsystem processes forked in between drop the inherited timeline and its
+import timer as they start, since they outlive start-up and nothing would
+ever finish it.
+
+When the timeline is not enabled, ``mark`` and ``phase`` do nothing and
+``run_concurrently`` just starts its thread, so call sites need no checks.
+This module only uses the standard library so it can load before anything
+else.
+"""
+
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("Main.Startup")
+
+# The import machinery ships without type stubs
+_bootstrap: Any = importlib.import_module("importlib._bootstrap")
+
+#: Slowest imports listed in the summary.
+TOP_IMPORTS = 25
+
+
+class StartupTimeline:
+    """Phase and import timings relative to ``enable()`` (see module doc)."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.imports: List[Dict] = []
+        self._current: Optional[Tuple[str, float]] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._find_and_load: Optional[Callable] = None
+
+    def _ms(self, since: float, until: Optional[float] = None) -> float:
+        until = time.perf_counter() if until is None else until
+        return round((until - since) * 1000, 2)
+
+    def _record_phase(self, name: str, start: float, end: float, thread: str):
+        with self._lock:
+            self.phases.append(
+                {
+                    "name": name,
+                    "thread": thread,
+                    "start_ms": self._ms(self.origin, start),
+                    "duration_ms": self._ms(start, end),
+                }
+            )
+
+    def mark(self, name: str) -> None:
+        """Ends the running main-process phase and starts ``name``."""
+        now = time.perf_counter()
+        if self._current is not None:
+            running, start = self._current
+            self._record_phase(running, start, now, "MainThread")
+        self._current = (name, now)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times a block as a phase of the calling thread."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_phase(
+                name, start, time.perf_counter(), threading.current_thread().name
+            )
+
+    def install_import_timer(self) -> None:
+        # Every import statement and importlib.import_module() that isn't
+        # satisfied from sys.modules goes through _find_and_load.
+        if self._find_and_load is None:
+            self._find_and_load = _bootstrap._find_and_load
+            _bootstrap._find_and_load = self._timed_find_and_load
+
+    def remove_import_timer(self) -> None:
+        if self._find_and_load is not None:
+            _bootstrap._find_and_load = self._find_and_load
+            self._find_and_load = None
+
+    def _timed_find_and_load(self, name, import_):
+        # Per-thread stack of the time spent in nested imports, so each
+        # import's self time excludes the imports it triggered.
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        depth = len(stack)
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._find_and_load(name, import_)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.imports.append(
+                    {
+                        "module": name,
+                        "thread": threading.current_thread().name,
+                        "depth": depth,
+                        "start_ms": self._ms(self.origin, start),
+                        "total_ms": round(elapsed * 1000, 2),
+                        "self_ms": round((elapsed - nested) * 1000, 2),
+                    }
+                )
+
+    def finish(self) -> Dict:
+        """Closes the running phase, stops timing imports and returns the
+        timeline."""
+        if self._current is not None:
+            running, start = self._current
+            self._record_phase(running, start, time.perf_counter(), "MainThread")
+            self._current = None
+        self.remove_import_timer()
+        with self._lock:
+            return {
+                "total_ms": self._ms(self.origin),
+                "phases": sorted(self.phases, key=lambda p: p["start_ms"]),
+                "imports": sorted(self.imports, key=lambda i: i["start_ms"]),
+            }
+
+
+def summary(timeline: Dict, top: int = TOP_IMPORTS) -> str:
+    """Human-readable report: phases in order, then the slowest imports by
+    self time and the slowest top-level imports."""
+    lines = [f"=== STARTUP TIMELINE ({timeline['total_ms'] / 1000:.2f}s) ===", ""]
+    lines.append(f"{'start ms':>10} {'ms':>9}  phase")
+    for p in timeline["phases"]:
+        thread = "" if p["thread"] == "MainThread" else f"  [{p['thread']}]"
+        lines.append(
+            f"{p['start_ms']:>10.1f} {p['duration_ms']:>9.1f}  {p['name']}{thread}"
+        )
+
+    imports = timeline["imports"]
+    lines += ["", f"Slowest {top} imports by self time:"]
+    for i in sorted(imports, key=lambda i: i["self_ms"], reverse=True)[:top]:
+        lines.append(f"{i['self_ms']:>10.1f} ms  {i['module']}")
+    lines += ["", f"Slowest {top} top-level imports (including nested):"]
+    top_level = [i for i in imports if i["depth"] == 0]
+    for i in sorted(top_level, key=lambda i: i["total_ms"], reverse=True)[:top]:
+        lines.append(f"{i['total_ms']:>10.1f} ms  {i['module']}  [{i['thread']}]")
+    return "\n".join(lines) + "\n"
+
+
+_timeline: Optional[StartupTimeline] = None
+
+
+def enable() -> StartupTimeline:
+    """Starts the timeline and the import timer."""
+    global _timeline
+    if _timeline is None:
+        _timeline = StartupTimeline()
+        _timeline.install_import_timer()
+    return _timeline
+
+
+def _drop_in_child() -> None:
+    global _timeline
+    if _timeline is not None:
+        _timeline.remove_import_timer()
+        _timeline = None
+
+
+os.register_at_fork(after_in_child=_drop_in_child)
+
+
+def enabled() -> bool:
+    return _timeline is not None
+
+
+def mark(name: str) -> None:
+    """Starts the main-process phase ``name``; no-op unless enabled."""
+    if _timeline is not None:
+        _timeline.mark(name)
+
+
+def phase(name: str):
+    """Context manager timing a block; no-op unless enabled."""
+    if _timeline is None:
+        return nullcontext()
+    return _timeline.phase(name)
+
+
+def run_concurrently(name: str, func: Callable[[], object]) -> threading.Thread:
+    """Runs ``func`` on a daemon thread named ``name``, timed as a phase.
+
+    For start-up work that is off the critical path until its result is
+    first used. Exceptions are logged; the caller that later needs the
+    result repeats the work and sees the error itself.
+    """
+
+    def run():
+        try:
+            with phase(name):
+                func()
+        except Exception:
+            logger.exception("Concurrent start-up task %s failed", name)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def finish(directory: Path) -> Optional[Dict]:
+    """Stops the timeline and writes ``startup_timeline.json`` and
+    ``startup_timeline.txt`` to ``directory``. Returns the timeline, or
+    None if it wasn't enabled."""
+    global _timeline
+    if _timeline is None:
+        return None
+    timeline = _timeline.finish()
+    _timeline = None
+
+    directory = Path(directory)
+    (directory / "startup_timeline.json").write_text(json.dumps(timeline, indent=1))
+    report = summary(timeline)
+    (directory / "startup_timeline.txt").write_text(report)
+    logger.info(
+        "Startup took %.2fs, timeline saved to %s",
+        timeline["total_ms"] / 1000,
+        directory / "startup_timeline.txt",
+    )
+    for line in report.splitlines()[2:]:
+        logger.debug(line)
+    return timeline
@@ -13,7 +13,7 @@ from PiFinder import config
 import logging
 from typing import List
 from PiFinder.composite_object import CompositeObject
-from PiFinder.types.positioning import PointingEstimate
+from PiFinder.types.positioning import PointingEstimate, SolveMatches
 from typing import Optional
 from dataclasses import dataclass, asdict
 import json
@@ -287,6 +287,9 @@ class SharedStateObj:
             "imu_delta": 0.0,  # Angle between quaternion at start and end of exposure [deg]
         }
         self.__solution: PointingEstimate = PointingEstimate()
+        self.__solve_matches: Optional[SolveMatches] = None
+        self.__solve_schedule: dict = {}
+        self.__render_perf: dict = {}
         self.__sats = None
         self.__imu = None
         self.__battery = None
@@ -312,7 +315,9 @@ class SharedStateObj:
         # Degrees the camera process rotates the solve/display image relative
         # to the stored raw frame (PIL CCW). None until the camera reports.
         self.__solve_image_rotation = None
-        self.__cam_raw = None
+        # (sequence, raw frame): the sequence advances with every frame and
+        # is stored with it, so readers can key on it without a race
+        self.__cam_raw: tuple = (0, None)
         self.__sqm_radiometer_sample = None
         # Are we prepared to do alt/az math
         # We need gps lock and datetime
@@ -434,6 +439,32 @@ class SharedStateObj:
         # two can never drift and callers can't forget to update it.
         self.__solve_state = v.has_pointing()
 
+    def solve_matches(self) -> Optional[SolveMatches]:
+        """Matched stars of the last successful solve, or None.
+
+        Kept apart from :meth:`solution` so the estimate polled at frame
+        rate doesn't drag the match arrays through the proxy. Match
+        ``solve_time`` against the frame before use.
+        """
+        return self.__solve_matches
+
+    def set_solve_matches(self, v: Optional[SolveMatches]):
+        self.__solve_matches = v
+
+    def solve_schedule(self) -> dict:
+        """Solve scheduler counters (``SolveScheduleCounters.to_dict()``)."""
+        return self.__solve_schedule
+
+    def set_solve_schedule(self, v: dict):
+        self.__solve_schedule = v
+
+    def render_perf(self) -> dict:
+        """UI render budget summary (``RenderProfiler.summary()``)."""
+        return self.__render_perf
+
+    def set_render_perf(self, v: dict):
+        self.__render_perf = v
+
     def location(self):
         """Return the current location"""
         return self.__location
@@ -582,10 +613,18 @@ class SharedStateObj:
         self.__screen = v
 
     def cam_raw(self):
+        return self.__cam_raw[1]
+
+    def cam_raw_sequence(self) -> int:
+        """Sequence number of the current raw frame; 0 before the first."""
+        return self.__cam_raw[0]
+
+    def cam_raw_frame(self) -> tuple:
+        """``(sequence, raw frame)``, read together."""
         return self.__cam_raw
 
     def set_cam_raw(self, v):
-        self.__cam_raw = v
+        self.__cam_raw = (self.__cam_raw[0] + 1, v)
 
     def sqm_radiometer_sample(self):
         return self.__sqm_radiometer_sample
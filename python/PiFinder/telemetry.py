@@ -2,10 +2,11 @@
 Telemetry recording and replay for the integrator.
 
 Records IMU samples and plate solves with accurate timing to JSONL files
-in ~/PiFinder_data/telemetry/. Replay mode converts recorded events back
-into :class:`SolveResult` / :class:`ImuSample` messages that the
-integrator feeds through its normal apply/advance paths for bench
-testing.
+in ~/PiFinder_data/telemetry/, or to the binary container of
+:mod:`PiFinder.telemetry_binary` when ``telemetry_format`` is ``"binary"``.
+Replay mode converts recorded events back into :class:`SolveResult` /
+:class:`ImuSample` messages that the integrator feeds through its normal
+apply/advance paths for bench testing.
 """
 
 import copy
@@ -23,6 +24,7 @@ import quaternion as quaternion_module
 from PiFinder import calc_utils
 from PiFinder import utils
 from PiFinder import timez
+from PiFinder import telemetry_binary
 from PiFinder.types.positioning import (
     FailedSolve,
     ImuSample,
@@ -69,7 +71,7 @@ def _serialize_vec(v):
 
 class TelemetryRecorder:
     """
-    Records IMU and solve events to a JSONL file.
+    Records IMU and solve events to a JSONL file, or to a binary container.
 
     Uses a deque buffer flushed every 5 seconds by a background thread.
     When disabled, all methods are no-ops.
@@ -94,13 +96,17 @@ class TelemetryRecorder:
         self._header_cfg = None
         self._dt_recorded = False
         self._loc_recorded = False
+        self._binary = False
 
     def _append(self, record):
         """Serialize a record into the buffer, counting overflow drops."""
         if len(self._buffer) == self._buffer.maxlen:
             # deque(maxlen) silently evicts the oldest entry on append.
             self._dropped_events += 1
-        self._buffer.append(json.dumps(record) + "\n")
+        if self._binary:
+            self._buffer.append(telemetry_binary.encode_event(record))
+        else:
+            self._buffer.append(json.dumps(record) + "\n")
 
     def start(self, cfg, shared_state):
         """Start a new recording session."""
@@ -111,9 +117,13 @@ class TelemetryRecorder:
         timestamp = timez.local_now().strftime("%Y%m%d_%H%M%S")
         self._session_dir = TELEMETRY_DIR / timestamp
         self._session_dir.mkdir(parents=True, exist_ok=True)
-        session_file = self._session_dir / "session.jsonl"
-
-        self._file = open(session_file, "a")
+        self._binary = cfg.get_option("telemetry_format") == "binary"
+        if self._binary:
+            session_file = self._session_dir / f"session{telemetry_binary.SUFFIX}"
+            self._file = telemetry_binary.BinaryWriter(session_file)
+        else:
+            session_file = self._session_dir / "session.jsonl"
+            self._file = open(session_file, "a")
         self.enabled = True
         self._last_flush = time.time()
 
@@ -389,19 +399,53 @@ class TelemetryRecorder:
 
 class TelemetryPlayer:
     """
-    Reads a recorded JSONL session and replays events with original timing.
+    Reads a recorded session and replays events with original timing.
+
+    JSONL sessions are parsed up front into ``events``. Binary sessions
+    (``session.pftl``) stay memory-mapped in ``_reader`` and each event
+    is decoded when it comes up, so ``events`` stays empty for them.
     """
 
     def __init__(self, path):
         self.path = Path(path)
         self.events = []
         self.header = None
+        self._reader = None
         self._index = 0
+        # Binary sessions: offset of the next record, and its event once
+        # decoded (get_next_event polls it until it is due)
+        self._offset = 0
+        self._pending = None
+        self._next_offset = 0
         self._base_time = None
         self._replay_start = None
         self._load()
 
     def _load(self):
+        file_path = self.path
+        if file_path.is_dir():
+            binary_path = file_path / f"session{telemetry_binary.SUFFIX}"
+            if binary_path.exists():
+                file_path = binary_path
+        if file_path.suffix == telemetry_binary.SUFFIX:
+            self._load_binary(file_path)
+        else:
+            self._load_jsonl()
+
+    def _load_binary(self, file_path):
+        try:
+            self._reader = telemetry_binary.TelemetryReader(file_path)
+        except ValueError as e:
+            # Surfaced like a missing file: TelemetryManager reports OSError
+            raise OSError(str(e)) from e
+        self.header = self._reader.header
+        self._offset = self._reader.start
+        first, _ = self._reader.read(self._offset)
+        if first is not None:
+            self._base_time = first["t"]
+        logger.info("Opened telemetry: %d events from %s", len(self._reader), file_path)
+
+    def _load_jsonl(self):
         """Load all events from the JSONL file.
 
         Tolerates corrupt lines (e.g. a truncated tail from a power cut
@@ -439,10 +483,55 @@ class TelemetryPlayer:
             self._base_time = self.events[0]["t"]
         logger.info("Loaded telemetry: %d events from %s", len(self.events), file_path)
 
+    def iter_events(self):
+        """Every event in recorded order, without replay timing."""
+        if self._reader is not None:
+            return iter(self._reader)
+        return iter(self.events)
+
     def reset(self):
         """Reset replay to the beginning."""
         self._index = 0
         self._replay_start = None
+        if self._reader is not None:
+            self._offset = self._reader.start
+            self._pending = None
+
+    def seek(self, t):
+        """Continue replay from the first event at or after epoch ``t``.
+
+        Replay timing carries on from there: that event is due at once
+        and later ones follow at their recorded spacing.
+        """
+        if self._reader is not None:
+            self._index, self._offset = self._reader.seek(t)
+            self._pending = None
+        else:
+            self._index = next(
+                (i for i, e in enumerate(self.events) if e["t"] >= t),
+                len(self.events),
+            )
+        event = self._peek()
+        if event is None:
+            self._replay_start = None
+            return
+        self._replay_start = time.time() - (event["t"] - self._base_time)
+
+    def _peek(self):
+        """The next event to replay, or None at the end."""
+        if self._reader is None:
+            if self._index >= len(self.events):
+                return None
+            return self.events[self._index]
+        if self._pending is None:
+            self._pending, self._next_offset = self._reader.read(self._offset)
+        return self._pending
+
+    def _advance(self):
+        self._index += 1
+        if self._reader is not None:
+            self._offset = self._next_offset
+            self._pending = None
 
     def get_next_event(self):
         """
@@ -451,31 +540,33 @@ class TelemetryPlayer:
 
         Returns (event_dict, done_bool).
         """
-        if self._index >= len(self.events):
+        event = self._peek()
+        if event is None:
             return None, True
 
         if self._replay_start is None:
             self._replay_start = time.time()
 
-        event = self.events[self._index]
         event_offset = event["t"] - self._base_time
         elapsed = time.time() - self._replay_start
 
         if elapsed >= event_offset:
-            self._index += 1
-            return event, self._index >= len(self.events)
+            self._advance()
+            return event, self._index >= self.total_events
 
         return None, False
 
     @property
     def progress(self):
         """Return replay progress as a fraction 0.0-1.0."""
-        if not self.events:
+        if not self.total_events:
             return 1.0
-        return self._index / len(self.events)
+        return self._index / self.total_events
 
     @property
     def total_events(self):
+        if self._reader is not None:
+            return len(self._reader)
         return len(self.events)
 
     @property
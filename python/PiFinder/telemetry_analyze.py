@@ -0,0 +1,310 @@
+"""
+Offline analysis of recorded telemetry sessions.
+
+Each recorded solve carries the integrator's IMU-predicted pointing just
+before the solve was applied (``pred_ra`` / ``pred_dec``), the frame's
+exposure end (``lsa``) and the time the integrator applied it (``t``).
+Radiometer events carry the exposure in use. Across many sessions that is
+enough to tune dead reckoning and auto exposure from field data:
+
+* Prediction error versus the time since the previous successful solve,
+  and the IMU drift rate it implies, split by whether the IMU reported
+  movement in between.
+* Solve success rate per exposure.
+* Solve latency, from the end of the exposure to the integrator applying
+  the result.
+
+Sessions (JSONL or binary) are loaded in a process pool, one per session,
+and reduced to a per-solve table; the statistics are computed over the
+combined table. Run with::
+
+    python -m PiFinder.telemetry_analyze [SESSION_OR_DIR ...] [--output DIR]
+
+which prints the JSON report and, with ``--output``, also writes
+``report.json`` and the ``solves``, ``prediction_error`` and
+``success_by_exposure`` tables as CSV. Without paths, every session under
+the telemetry directory is analysed.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from PiFinder.telemetry import TELEMETRY_DIR, TelemetryPlayer
+from PiFinder.telemetry_binary import SUFFIX as BINARY_SUFFIX
+
+logger = logging.getLogger("Telemetry.Analyze")
+
+SESSION_FILES = (f"session{BINARY_SUFFIX}", "session.jsonl")
+
+# Upper edges [s] of the time-since-solve bins for prediction error
+SINCE_SOLVE_BINS = (1.0, 2.0, 5.0, 10.0, 30.0, 60.0, np.inf)
+
+SOLVE_COLUMNS = {
+    "session": object,
+    "t": float,
+    "success": bool,
+    "frame_time": float,
+    "since_solve": float,
+    "moving": bool,
+    "exposure": float,
+    "matches": float,
+    "rmse": float,
+    "latency": float,
+    "pred_error": float,
+}
+
+
+def find_sessions(paths: Iterable[Path]) -> List[Path]:
+    """Session files under ``paths``: session files themselves, session
+    directories, or directories of sessions (searched recursively)."""
+    sessions = []
+    for path in paths:
+        path = Path(path)
+        if path.is_file():
+            sessions.append(path)
+            continue
+        for directory in sorted([path, *(p for p in path.rglob("*") if p.is_dir())]):
+            for name in SESSION_FILES:
+                if (directory / name).exists():
+                    sessions.append(directory / name)
+                    break
+    return sessions
+
+
+def _column(events: List[dict], key: str) -> np.ndarray:
+    """``key`` of every event as floats; missing values are NaN."""
+    return np.array([e.get(key) for e in events], dtype=float)
+
+
+def angular_separation(ra1, dec1, ra2, dec2) -> np.ndarray:
+    """Great-circle separation in degrees (haversine, stable for small
+    angles) between arrays of RA/Dec in degrees."""
+    ra1, dec1, ra2, dec2 = (np.deg2rad(a) for a in (ra1, dec1, ra2, dec2))
+    h = (
+        np.sin((dec2 - dec1) / 2) ** 2
+        + np.cos(dec1) * np.cos(dec2) * np.sin((ra2 - ra1) / 2) ** 2
+    )
+    return np.rad2deg(2 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0))))
+
+
+def solve_table(events: List[dict], session: str = "") -> pd.DataFrame:
+    """One row per recorded solve attempt of a session.
+
+    ``since_solve`` is the time [s] from the previous successful solve's
+    frame to this one; ``moving`` is whether any IMU sample in between
+    was flagged as moving; ``exposure`` is the one last reported by the
+    radiometer at the frame time; ``latency`` [s] runs from the end of the
+    exposure to the integrator applying the result; ``pred_error`` is the
+    separation [arcmin] between the IMU-predicted and solved pointing.
+    """
+    solves = [e for e in events if e.get("e") == "solve"]
+    if not solves:
+        return _empty_table()
+    solves.sort(key=lambda e: e["t"])
+    t = _column(solves, "t")
+    ra = _column(solves, "ra")
+    frame_time = _column(solves, "lsa")
+    frame_time = np.where(np.isnan(frame_time), t, frame_time)
+    success = ~np.isnan(ra)
+
+    # Frame time of the latest successful solve before each attempt
+    previous = (
+        pd.Series(np.where(success, frame_time, np.nan)).ffill().shift(1).to_numpy()
+    )
+
+    imu = [e for e in events if e.get("e") == "imu" and e.get("mv")]
+    moving_times = np.sort(_column(imu, "t"))
+    moves = np.searchsorted(moving_times, frame_time) - np.searchsorted(
+        moving_times, np.nan_to_num(previous, nan=-np.inf)
+    )
+
+    radio = sorted(
+        (e for e in events if e.get("e") == "radio" and e.get("exp") is not None),
+        key=lambda e: e["t"],
+    )
+    exposure = np.full(len(solves), np.nan)
+    if radio:
+        index = np.searchsorted(_column(radio, "t"), frame_time, side="right") - 1
+        exposure = np.where(index >= 0, _column(radio, "exp")[index], np.nan)
+
+    pred_error = 60 * angular_separation(
+        _column(solves, "pred_ra"),
+        _column(solves, "pred_dec"),
+        ra,
+        _column(solves, "dec"),
+    )
+    return pd.DataFrame(
+        {
+            "session": session,
+            "t": t,
+            "success": success,
+            "frame_time": frame_time,
+            "since_solve": frame_time - previous,
+            "moving": moves > 0,
+            "exposure": exposure,
+            "matches": _column(solves, "matches"),
+            "rmse": _column(solves, "rmse"),
+            "latency": t - frame_time,
+            "pred_error": pred_error,
+        },
+        columns=list(SOLVE_COLUMNS),
+    )
+
+
+def _empty_table() -> pd.DataFrame:
+    return pd.DataFrame(
+        {column: pd.Series(dtype=dtype) for column, dtype in SOLVE_COLUMNS.items()}
+    )
+
+
+def load_session(path: Path) -> pd.DataFrame:
+    """The solve table of one session file; empty if it can't be read."""
+    path = Path(path)
+    try:
+        events = list(TelemetryPlayer(path).iter_events())
+    except (OSError, ValueError) as e:
+        logger.warning("Skipping unreadable session %s: %s", path, e)
+        events = []
+    return solve_table(events, session=path.parent.name)
+
+
+def load_sessions(paths: List[Path], jobs: Optional[int] = None) -> pd.DataFrame:
+    """The combined solve table of ``paths``, loaded by ``jobs`` processes
+    (all cores by default; 1 loads in this process).
+
+    Workers are spawned rather than forked: the caller may already run
+    threads holding queue or logging locks, which a forked child would
+    inherit locked."""
+    if jobs == 1 or len(paths) <= 1:
+        tables = [load_session(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            tables = list(pool.map(load_session, paths))
+    tables = [table for table in tables if not table.empty]
+    if not tables:
+        return _empty_table()
+    return pd.concat(tables, ignore_index=True)
+
+
+def _percentiles(values: np.ndarray, scale: float = 1.0) -> dict:
+    values = values[~np.isnan(values)] * scale
+    if not len(values):
+        return {"count": 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "median": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def _drift(rows: pd.DataFrame) -> dict:
+    """Drift rate [arcmin/s] from prediction error over time since solve:
+    the median per-solve rate, and a least-squares line through them."""
+    if not len(rows):
+        return {"count": 0}
+    since = rows["since_solve"].to_numpy()
+    error = rows["pred_error"].to_numpy()
+    drift = {"count": int(len(rows)), "median_rate": float(np.median(error / since))}
+    if len(rows) >= 2 and np.ptp(since) > 0:
+        slope, intercept = np.polyfit(since, error, 1)
+        drift.update(fit_rate=float(slope), fit_offset=float(intercept))
+    return drift
+
+
+def prediction_error(solves: pd.DataFrame) -> pd.DataFrame:
+    """Prediction error [arcmin] per time-since-solve bin."""
+    rows = solves[solves["pred_error"].notna() & solves["since_solve"].notna()]
+    edges = (0.0,) + SINCE_SOLVE_BINS
+    bins = pd.cut(rows["since_solve"], edges, right=False)
+    grouped = rows.groupby(bins, observed=True)["pred_error"]
+    table = grouped.agg(["count", "median", "mean"])
+    table["p90"] = grouped.quantile(0.9)
+    table.index = pd.Index(
+        [f"{b.left:g}-{b.right:g}s" for b in table.index], name="since_solve"
+    )
+    return table.reset_index()
+
+
+def success_by_exposure(solves: pd.DataFrame) -> pd.DataFrame:
+    """Solve attempts, successes and success rate per exposure [s]."""
+    rows = solves[solves["exposure"].notna()]
+    table = rows.groupby("exposure")["success"].agg(["count", "sum"])
+    table.columns = pd.Index(["attempts", "successes"])
+    table["successes"] = table["successes"].astype(int)
+    table["rate"] = table["successes"] / table["attempts"]
+    return table.reset_index()
+
+
+def report(solves: pd.DataFrame) -> dict:
+    """Summary statistics over a combined solve table."""
+    predicted = solves[
+        solves["pred_error"].notna()
+        & solves["since_solve"].notna()
+        & (solves["since_solve"] > 0)
+    ]
+    return {
+        "sessions": int(solves["session"].nunique()),
+        "solves": int(len(solves)),
+        "successes": int(solves["success"].sum()),
+        "drift_arcmin_per_s": {
+            "stationary": _drift(predicted[~predicted["moving"].astype(bool)]),
+            "moving": _drift(predicted[predicted["moving"].astype(bool)]),
+        },
+        "prediction_error_arcmin": prediction_error(solves).to_dict(orient="records"),
+        "success_by_exposure": success_by_exposure(solves).to_dict(orient="records"),
+        "latency_ms": _percentiles(solves["latency"].to_numpy(dtype=float), 1000),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Drift, solve success and latency statistics over "
+        "recorded telemetry sessions"
+    )
+    parser.add_argument(
+        "paths",
+        type=Path,
+        nargs="*",
+        help=f"session files or directories (default: {TELEMETRY_DIR})",
+    )
+    parser.add_argument("--output", type=Path, help="directory for JSON/CSV reports")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count(), help="loader processes"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    sessions = find_sessions(args.paths or [TELEMETRY_DIR])
+    solves = load_sessions(sessions, jobs=args.jobs)
+    summary = report(solves)
+    rendered = json.dumps(summary, indent=2)
+    if args.output:
+        args.output.mkdir(parents=True, exist_ok=True)
+        (args.output / "report.json").write_text(rendered + "\n")
+        solves.to_csv(args.output / "solves.csv", index=False)
+        prediction_error(solves).to_csv(
+            args.output / "prediction_error.csv", index=False
+        )
+        success_by_exposure(solves).to_csv(
+            args.output / "success_by_exposure.csv", index=False
+        )
+    print(rendered)
+
+
+if __name__ == "__main__":
+    main()
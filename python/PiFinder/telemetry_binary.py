@@ -0,0 +1,480 @@
+"""
+Binary container for telemetry sessions (``session.pftl``).
+
+A JSONL session costs one ``json.dumps`` per IMU, solve and radiometer
+event while recording, and replay parses the whole file into a list of
+dicts before the first event plays. A long session is tens of MB of text
+and seconds of parsing on the Pi.
+
+The binary container holds the same events:
+
+* An 8-byte magic, then one record per event: a type byte and the event
+  time (``<Bd``), followed by a fixed-size struct for ``imu``, ``solve``
+  and ``radio`` events. Headers, targets and any event that does not fit
+  its struct exactly (a missing field, an unexpected value) are stored
+  as length-prefixed JSON, so conversion is lossless either way.
+* On close, a footer with the event count, the offset of the last header
+  and an index of (time, offset) every ``INDEX_STRIDE`` events.
+
+``TelemetryReader`` memory-maps a container and decodes one record at a
+time, so replay starts immediately and seeking to a timestamp only scans
+from the nearest index entry. A session cut short by a power cut has no
+footer; the reader then rebuilds the index with one pass over the record
+prefixes and drops a truncated last record, as the JSONL player skips a
+truncated last line.
+
+Sessions are recorded in this format when ``telemetry_format`` is
+``"binary"``. Convert either way with::
+
+    python -m PiFinder.telemetry_binary to-binary session.jsonl
+    python -m PiFinder.telemetry_binary to-jsonl session.pftl
+"""
+
+import bisect
+import json
+import logging
+import math
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("Telemetry")
+
+MAGIC = b"PFTEL1\0\0"
+FOOTER_MAGIC = b"PFTIDX1\0"
+SUFFIX = ".pftl"
+INDEX_STRIDE = 256
+
+# Record types
+_JSON, _HDR, _IMU, _SOLVE, _RADIO = range(5)
+
+# type, event time
+_RECORD = struct.Struct("<Bd")
+# q (w, x, y, z), gyro, accel, status, moving
+_IMU_FIELDS = struct.Struct("<4d3d3dBB")
+# ra, dec, roll, pred_ra, pred_dec, cam_ra, cam_dec, cam_roll, iq (w, x, y,
+# z), rmse, lsa, lss, matches, src
+_SOLVE_FIELDS = struct.Struct("<8d4d3diB")
+# seq, exp, bg, mad, grad
+_RADIO_FIELDS = struct.Struct("<q4d")
+_JSON_LENGTH = struct.Struct("<I")
+# time, offset, event number
+_INDEX_ENTRY = struct.Struct("<dQQ")
+# index offset, index entries, events, last header offset (0: none), magic
+_FOOTER = struct.Struct("<QQQQ8s")
+
+_FIXED_SIZE = {
+    _IMU: _IMU_FIELDS.size,
+    _SOLVE: _SOLVE_FIELDS.size,
+    _RADIO: _RADIO_FIELDS.size,
+}
+
+_IMU_KEYS = {"t", "e", "q", "mv", "st", "gyro", "accel"}
+_SOLVE_POINTING = ("ra", "dec", "roll", "pred_ra", "pred_dec")
+_SOLVE_CAMERA = ("cam_ra", "cam_dec", "cam_roll")
+_SOLVE_KEYS = {
+    "t",
+    "e",
+    *_SOLVE_POINTING,
+    *_SOLVE_CAMERA,
+    "iq",
+    "matches",
+    "rmse",
+    "lsa",
+    "lss",
+    "src",
+}
+_SOLVE_SOURCES = ("CAM", "CAM_FAILED")
+_RADIO_KEYS = {"t", "e", "seq", "exp", "bg", "mad", "grad"}
+
+_NAN = float("nan")
+
+
+class _Unpackable(Exception):
+    """The event does not fit its fixed-size struct."""
+
+
+def _number(v) -> float:
+    """A float field; None is stored as NaN."""
+    if v is None:
+        return _NAN
+    if isinstance(v, bool) or not isinstance(v, (int, float)) or math.isnan(v):
+        raise _Unpackable
+    return float(v)
+
+
+def _vector(v, length: int) -> List[float]:
+    if v is None:
+        return [_NAN] * length
+    if not isinstance(v, list) or len(v) != length or None in v:
+        raise _Unpackable
+    return [_number(x) for x in v]
+
+
+def _integer(v, low: int, high: int) -> int:
+    if isinstance(v, bool) or not isinstance(v, int) or not low <= v <= high:
+        raise _Unpackable
+    return v
+
+
+def _value(v: float) -> Optional[float]:
+    return None if math.isnan(v) else v
+
+
+def _list(values) -> Optional[List[float]]:
+    return None if math.isnan(values[0]) else list(values)
+
+
+def _pack_fields(event: dict) -> Tuple[int, bytes]:
+    """The record type and fixed-size fields for ``event``."""
+    kind = event.get("e")
+    keys = set(event)
+    if kind == "imu" and keys == _IMU_KEYS:
+        if not isinstance(event["mv"], bool):
+            raise _Unpackable
+        return _IMU, _IMU_FIELDS.pack(
+            *_vector(event["q"], 4),
+            *_vector(event["gyro"], 3),
+            *_vector(event["accel"], 3),
+            _integer(event["st"], 0, 255),
+            event["mv"],
+        )
+    if kind == "solve" and keys == _SOLVE_KEYS:
+        if event["src"] not in _SOLVE_SOURCES:
+            raise _Unpackable
+        return _SOLVE, _SOLVE_FIELDS.pack(
+            *(_number(event[k]) for k in _SOLVE_POINTING + _SOLVE_CAMERA),
+            *_vector(event["iq"], 4),
+            _number(event["rmse"]),
+            _number(event["lsa"]),
+            _number(event["lss"]),
+            _integer(event["matches"], -(2**31), 2**31 - 1),
+            _SOLVE_SOURCES.index(event["src"]),
+        )
+    if kind == "radio" and keys == _RADIO_KEYS:
+        return _RADIO, _RADIO_FIELDS.pack(
+            _integer(event["seq"], -(2**63), 2**63 - 1),
+            _number(event["exp"]),
+            _number(event["bg"]),
+            _number(event["mad"]),
+            _number(event["grad"]),
+        )
+    raise _Unpackable
+
+
+def encode_event(event: dict) -> bytes:
+    """One record for a telemetry event dict (which must have ``t``)."""
+    t = float(event["t"])
+    try:
+        kind, fields = _pack_fields(event)
+    except _Unpackable:
+        kind = _HDR if event.get("e") == "hdr" else _JSON
+        payload = json.dumps(event).encode()
+        fields = _JSON_LENGTH.pack(len(payload)) + payload
+    return _RECORD.pack(kind, t) + fields
+
+
+def _decode_fields(kind: int, t: float, data, offset: int) -> dict:
+    if kind == _IMU:
+        fields = _IMU_FIELDS.unpack_from(data, offset)
+        return {
+            "t": t,
+            "e": "imu",
+            "q": _list(fields[0:4]),
+            "mv": bool(fields[11]),
+            "st": fields[10],
+            "gyro": _list(fields[4:7]),
+            "accel": _list(fields[7:10]),
+        }
+    if kind == _SOLVE:
+        fields = _SOLVE_FIELDS.unpack_from(data, offset)
+        event = {"t": t, "e": "solve"}
+        for key, value in zip(_SOLVE_POINTING + _SOLVE_CAMERA, fields):
+            event[key] = _value(value)
+        event["iq"] = _list(fields[8:12])
+        event["matches"] = fields[15]
+        event["rmse"] = _value(fields[12])
+        event["lsa"] = _value(fields[13])
+        event["lss"] = _value(fields[14])
+        event["src"] = _SOLVE_SOURCES[fields[16]]
+        return event
+    seq, exp, bg, mad, grad = _RADIO_FIELDS.unpack_from(data, offset)
+    return {
+        "t": t,
+        "e": "radio",
+        "seq": seq,
+        "exp": _value(exp),
+        "bg": _value(bg),
+        "mad": _value(mad),
+        "grad": _value(grad),
+    }
+
+
+class BinaryWriter:
+    """Appends encoded records to a container and writes its footer.
+
+    Has the ``writelines`` / ``flush`` / ``close`` subset of a file that
+    ``TelemetryRecorder`` uses, so the recorder flushes either format the
+    same way.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._events = 0
+        self._header_offset = 0
+        self._index: List[bytes] = []
+
+    def write(self, record: bytes) -> None:
+        kind, t = _RECORD.unpack_from(record)
+        if kind == _HDR:
+            self._header_offset = self._offset
+        else:
+            if self._events % INDEX_STRIDE == 0:
+                self._index.append(_INDEX_ENTRY.pack(t, self._offset, self._events))
+            self._events += 1
+        self._file.write(record)
+        self._offset += len(record)
+
+    def writelines(self, records) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.write(b"".join(self._index))
+        self._file.write(
+            _FOOTER.pack(
+                self._offset,
+                len(self._index),
+                self._events,
+                self._header_offset,
+                FOOTER_MAGIC,
+            )
+        )
+        self._file.close()
+
+
+class TelemetryReader:
+    """Streaming read access to a container through a memory map."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = f.seek(0, 2)
+            if size <= len(MAGIC):
+                self._data = f.read() if size else b""
+            else:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a PiFinder telemetry container")
+        # (time, offset, event number) every INDEX_STRIDE events
+        self._index_times: List[float] = []
+        self._index: List[Tuple[int, int]] = []
+        if not self._read_footer():
+            self._scan()
+        self.header = (
+            self._decode(self._header_offset)[0] if self._header_offset else None
+        )
+
+    def __len__(self) -> int:
+        return self._events
+
+    @property
+    def start(self) -> int:
+        """Offset of the first record."""
+        return len(MAGIC)
+
+    def _read_footer(self) -> bool:
+        if len(self._data) < len(MAGIC) + _FOOTER.size:
+            return False
+        index_start, entries, events, header, magic = _FOOTER.unpack_from(
+            self._data, len(self._data) - _FOOTER.size
+        )
+        if magic != FOOTER_MAGIC:
+            return False
+        for n in range(entries):
+            t, offset, number = _INDEX_ENTRY.unpack_from(
+                self._data, index_start + n * _INDEX_ENTRY.size
+            )
+            self._index_times.append(t)
+            self._index.append((offset, number))
+        self._end = index_start
+        self._events = events
+        self._header_offset = header
+        return True
+
+    def _record_size(self, offset: int) -> Optional[int]:
+        """Size of the record at ``offset``; None if cut short or unknown."""
+        end = len(self._data)
+        if offset + _RECORD.size > end:
+            return None
+        kind = self._data[offset]
+        if kind in _FIXED_SIZE:
+            size = _RECORD.size + _FIXED_SIZE[kind]
+        elif kind in (_JSON, _HDR):
+            if offset + _RECORD.size + _JSON_LENGTH.size > end:
+                return None
+            (length,) = _JSON_LENGTH.unpack_from(self._data, offset + _RECORD.size)
+            size = _RECORD.size + _JSON_LENGTH.size + length
+        else:
+            return None
+        return size if offset + size <= end else None
+
+    def _indexed_record_size(self, offset: int) -> int:
+        """Size of a record before the end of the session, which must be
+        readable."""
+        size = self._record_size(offset)
+        if size is None:
+            raise ValueError(f"Corrupt telemetry record at offset {offset}")
+        return size
+
+    def _scan(self) -> None:
+        """Rebuild the index of a container that has no footer."""
+        offset = self.start
+        self._events = 0
+        self._header_offset = 0
+        while True:
+            size = self._record_size(offset)
+            if size is None:
+                break
+            kind, t = _RECORD.unpack_from(self._data, offset)
+            if kind == _HDR:
+                self._header_offset = offset
+            else:
+                if self._events % INDEX_STRIDE == 0:
+                    self._index_times.append(t)
+                    self._index.append((offset, self._events))
+                self._events += 1
+            offset += size
+        if offset < len(self._data):
+            logger.warning(
+                "Ignoring %d bytes of truncated telemetry in %s",
+                len(self._data) - offset,
+                self.path,
+            )
+        self._end = offset
+
+    def _decode(self, offset: int) -> Tuple[dict, int]:
+        """The event at ``offset`` and the offset of the next record."""
+        kind, t = _RECORD.unpack_from(self._data, offset)
+        body = offset + _RECORD.size
+        if kind in _FIXED_SIZE:
+            return _decode_fields(kind, t, self._data, body), body + _FIXED_SIZE[kind]
+        (length,) = _JSON_LENGTH.unpack_from(self._data, body)
+        body += _JSON_LENGTH.size
+        return json.loads(self._data[body : body + length]), body + length
+
+    def read(self, offset: int) -> Tuple[Optional[dict], int]:
+        """The next event (headers skipped) at or after ``offset`` and the
+        offset after it; (None, offset) at the end of the session."""
+        while offset < self._end:
+            if self._data[offset] == _HDR:
+                offset = self._decode(offset)[1]
+                continue
+            return self._decode(offset)
+        return None, offset
+
+    def _skip(self, offset: int) -> Tuple[int, float]:
+        """Offset of the next event record at or after ``offset``, and its
+        time; (end, inf) past the last one."""
+        while offset < self._end:
+            kind, t = _RECORD.unpack_from(self._data, offset)
+            if kind != _HDR:
+                return offset, t
+            offset += self._indexed_record_size(offset)
+        return self._end, math.inf
+
+    def seek(self, t: float) -> Tuple[int, int]:
+        """(event number, offset) of the first event at or after ``t``,
+        scanning forward from the closest index entry before it."""
+        entry = bisect.bisect_right(self._index_times, t) - 1
+        if entry < 0:
+            offset, number = self.start, 0
+        else:
+            offset, number = self._index[entry]
+        while True:
+            offset, event_t = self._skip(offset)
+            if event_t >= t:
+                return number, offset
+            offset += self._indexed_record_size(offset)
+            number += 1
+
+    def __iter__(self):
+        offset = self.start
+        while True:
+            event, offset = self.read(offset)
+            if event is None:
+                return
+            yield event
+
+    def records(self):
+        """Every event, headers included, in file order."""
+        offset = self.start
+        while offset < self._end:
+            event, offset = self._decode(offset)
+            yield event
+
+
+def jsonl_to_binary(src, dst) -> int:
+    """Convert a JSONL session to a container; returns the event count.
+
+    Lines the player would skip (corrupt, or without a timestamp) are
+    dropped.
+    """
+    writer = BinaryWriter(dst)
+    try:
+        with open(src) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict) and "t" in event:
+                    writer.write(encode_event(event))
+    finally:
+        writer.close()
+    return writer._events
+
+
+def binary_to_jsonl(src, dst) -> int:
+    """Convert a container to a JSONL session; returns the event count."""
+    reader = TelemetryReader(src)
+    with open(dst, "w") as f:
+        for event in reader.records():
+            f.write(json.dumps(event) + "\n")
+    return len(reader)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert PiFinder telemetry sessions between JSONL and binary"
+    )
+    parser.add_argument("direction", choices=["to-binary", "to-jsonl"])
+    parser.add_argument("src", type=Path)
+    parser.add_argument(
+        "dst", type=Path, nargs="?", help="defaults to src with the new suffix"
+    )
+    args = parser.parse_args(argv)
+
+    if args.direction == "to-binary":
+        dst = args.dst or args.src.with_suffix(SUFFIX)
+        count = jsonl_to_binary(args.src, dst)
+    else:
+        dst = args.dst or args.src.with_suffix(".jsonl")
+        count = binary_to_jsonl(args.src, dst)
+    print(f"Wrote {count} events to {dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,15 +59,26 @@ Design notes
   quaternion field (:class:`ImuSample`, :class:`PointingEstimate`,
   :class:`SuccessfulSolve`) override ``__getstate__``/``__setstate__`` to
   pickle it as 4 floats; the in-process attribute stays a quaternion.
+
+* The hot-loop messages (:class:`PointingEstimate`, :class:`SuccessfulSolve`,
+  :class:`FailedSolve`) pickle their scalar fields as one fixed-layout
+  ``struct`` record instead of a nested ``__dict__`` tree, which is both
+  smaller and much cheaper to (un)pickle. Optional floats travel as NaN
+  for ``None``. The bulky tetra3 match arrays are not part of the
+  published estimate at all: they ride :class:`SolveMatches`, published
+  once per successful solve through ``shared_state.set_solve_matches()``.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import math
+import struct
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Tuple, Union
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import quaternion
 
 from PiFinder.types.coordinates import RaDecRoll
@@ -103,6 +114,61 @@ def _floats_to_quat(v):
     return quaternion.quaternion(*v) if isinstance(v, tuple) else v
 
 
+# =====================================================================
+# Fixed-layout records for the hot-loop messages
+# =====================================================================
+#
+# ``None`` in an optional float field is carried as NaN, so a genuine NaN
+# value comes back as ``None``. No field here legitimately holds NaN.
+
+_NAN = float("nan")
+_NAN_QUAT = (_NAN, _NAN, _NAN, _NAN)
+
+
+def _opt_float(v) -> float:
+    return _NAN if v is None else float(v)
+
+
+def _float_or_none(v: float) -> Optional[float]:
+    return None if math.isnan(v) else v
+
+
+# SolveDiagnostics + AlignmentResult, shared by every record below:
+# Matches, RMSE, Prob, FOV, T_solve, T_extract, x_target, y_target.
+_DIAGNOSTICS_FORMAT = "i5d2d"
+
+
+def _pack_diagnostics(diagnostics, alignment) -> tuple:
+    return (
+        int(diagnostics.Matches),
+        _opt_float(diagnostics.RMSE),
+        _opt_float(diagnostics.Prob),
+        _opt_float(diagnostics.FOV),
+        _opt_float(diagnostics.T_solve),
+        _opt_float(diagnostics.T_extract),
+        _opt_float(alignment.x_target if alignment is not None else None),
+        _opt_float(alignment.y_target if alignment is not None else None),
+    )
+
+
+def _unpack_diagnostics(fields) -> tuple:
+    matches, *floats = fields
+    rmse, prob, fov, t_solve, t_extract, x_target, y_target = (
+        _float_or_none(v) for v in floats
+    )
+    return (
+        SolveDiagnostics(
+            Matches=matches,
+            RMSE=rmse,
+            Prob=prob,
+            FOV=fov,
+            T_solve=t_solve,
+            T_extract=t_extract,
+        ),
+        AlignmentResult(x_target=x_target, y_target=y_target),
+    )
+
+
 # =====================================================================
 # Enums
 # =====================================================================
@@ -126,7 +192,7 @@ class SolveSource(str, Enum):
 # =====================================================================
 
 
-@dataclass
+@dataclass(frozen=True)
 class Pointing:
     """A single equatorial pointing direction: RA, Dec, Roll in **degrees**.
 
@@ -143,7 +209,8 @@ class Pointing:
       downstream consumer ultimately reads.
 
     All three fields are required: a ``Pointing`` instance is always a
-    fully-defined direction. The "no value yet" state is expressed by
+    fully-defined direction. Instances are frozen, so a published
+    estimate can share them with the integrator's working copy. The "no value yet" state is expressed by
     ``Optional[Pointing]`` on the containing :class:`PointingAxis`.
 
     For the radian-based, quaternion-aware form used by
@@ -317,13 +384,12 @@ class PointingEstimate:
     camera frame's ``exposure_end`` (so the solver can dedupe stale
     frames precisely); "solve" there means plate-solve, never IMU.
 
-    :attr:`matched_centroids`, :attr:`matched_stars`, and
-    :attr:`matched_catID` carry raw
-    tetra3 matched-star outputs needed by the SQM calibration UI for
-    offline replay of SQM calculations against cached frames, and by the
-    Focus screen's stable star-identity slots. A failed solve
-    preserves the last successful set, so consumers must also match
-    ``last_solve_success`` to the frame timestamp.
+    The raw tetra3 matched-star outputs are deliberately not carried
+    here: this record is re-published on every IMU advance, so they ride
+    :class:`SolveMatches` on their own channel instead.
+
+    The integrator publishes :meth:`snapshot` copies; pickling goes
+    through one fixed-layout record (see ``_ESTIMATE_RECORD``).
     """
 
     # --- The 2 × 2 pointing matrix ---
@@ -358,17 +424,6 @@ class PointingEstimate:
     diagnostics: SolveDiagnostics = field(default_factory=SolveDiagnostics)
     alignment: AlignmentResult = field(default_factory=AlignmentResult)
 
-    # --- Raw tetra3 output kept for SQM replay ---
-    # ``matched_centroids``: list of (y, x) tuples for stars tetra3
-    # matched to known references.
-    # ``matched_stars``: parallel list of catalog star records, where
-    # index [2] is the catalog magnitude (consumed by SQM).
-    # Retained from the last successful solve across failed attempts; pair
-    # with ``last_solve_success`` before consuming.
-    matched_centroids: Optional[List[Tuple[float, float]]] = None
-    matched_stars: Optional[list] = None
-    matched_catID: Optional[list] = None
-
     # ----------------------------------------------------------------
     # Convenience predicates
     # ----------------------------------------------------------------
@@ -384,17 +439,175 @@ class PointingEstimate:
     def is_imu_solve(self) -> bool:
         return self.solve_source == SolveSource.IMU
 
-    # Pickle the ``imu_anchor`` quaternion as floats (see _quat_to_floats):
-    # the integrator publishes a deepcopy of this estimate across the proxy
-    # via ``set_solution`` on every cycle.
-    def __getstate__(self) -> dict:
-        state = self.__dict__.copy()
-        state["imu_anchor"] = _quat_to_floats(state["imu_anchor"])
-        return state
+    def snapshot(self) -> "PointingEstimate":
+        """Return a copy for publishing that later in-place updates of
+        this estimate can't reach.
 
-    def __setstate__(self, state: dict) -> None:
-        state["imu_anchor"] = _floats_to_quat(state.get("imu_anchor"))
-        self.__dict__.update(state)
+        Only the containers the integrator edits in place -- the matrix
+        and its two axes -- are copied. The leaves are shared: a
+        :class:`Pointing` is frozen, and the quaternion, diagnostics and
+        alignment are only ever replaced wholesale, never mutated.
+        """
+        return dataclasses.replace(
+            self,
+            pointing=PointingMatrix(
+                camera=dataclasses.replace(self.pointing.camera),
+                aligned=dataclasses.replace(self.pointing.aligned),
+            ),
+        )
+
+    # Pickle as one fixed-layout record: the integrator publishes this
+    # estimate across the proxy via ``set_solution`` on every cycle, and
+    # every UI poll of ``solution()`` pickles it back. The anchor travels
+    # as 4 floats, never as a bare quaternion (see _quat_to_floats).
+    def __getstate__(self) -> bytes:
+        cells = (
+            self.pointing.camera.solve,
+            self.pointing.camera.estimate,
+            self.pointing.aligned.solve,
+            self.pointing.aligned.estimate,
+        )
+        flags = 0
+        cell_values: list = []
+        for bit, cell in enumerate(cells):
+            if cell is None:
+                cell_values.extend((_NAN, _NAN, _NAN))
+            else:
+                flags |= 1 << bit
+                cell_values.extend((cell.RA, cell.Dec, cell.Roll))
+        anchor = _quat_to_floats(self.imu_anchor)
+        if anchor is not None:
+            flags |= _ANCHOR_FLAG
+        if self.constellation is not None:
+            flags |= _CONSTELLATION_FLAG
+        return _ESTIMATE_RECORD.pack(
+            flags,
+            _SOURCE_CODES.index(self.solve_source),
+            *cell_values,
+            *(anchor if anchor is not None else _NAN_QUAT),
+            _opt_float(self.Alt),
+            _opt_float(self.Az),
+            _opt_float(self.estimate_time),
+            float(self.last_solve_attempt),
+            _opt_float(self.last_solve_success),
+            (self.constellation or "").encode("utf-8"),
+            *_pack_diagnostics(self.diagnostics, self.alignment),
+        )
+
+    def __setstate__(self, state: bytes) -> None:
+        fields = _ESTIMATE_RECORD.unpack(state)
+        flags, source = fields[0], fields[1]
+        cells = []
+        for bit in range(4):
+            ra, dec, roll = fields[2 + 3 * bit : 5 + 3 * bit]
+            cells.append(
+                Pointing(RA=ra, Dec=dec, Roll=roll) if flags & (1 << bit) else None
+            )
+        anchor = tuple(fields[14:18]) if flags & _ANCHOR_FLAG else None
+        alt, az, estimate_time, last_attempt, last_success = fields[18:23]
+        constellation = (
+            fields[23].rstrip(b"\0").decode("utf-8")
+            if flags & _CONSTELLATION_FLAG
+            else None
+        )
+        diagnostics, alignment = _unpack_diagnostics(fields[24:])
+        self.__dict__.update(
+            pointing=PointingMatrix(
+                camera=PointingAxis(solve=cells[0], estimate=cells[1]),
+                aligned=PointingAxis(solve=cells[2], estimate=cells[3]),
+            ),
+            imu_anchor=_floats_to_quat(anchor),
+            Alt=_float_or_none(alt),
+            Az=_float_or_none(az),
+            solve_source=_SOURCE_CODES[source],
+            estimate_time=_float_or_none(estimate_time),
+            last_solve_attempt=last_attempt,
+            last_solve_success=_float_or_none(last_success),
+            constellation=constellation,
+            diagnostics=diagnostics,
+            alignment=alignment,
+        )
+
+
+# flags, solve_source, 4 cells x (RA, Dec, Roll), imu_anchor (w, x, y, z),
+# Alt, Az, estimate_time, last_solve_attempt, last_solve_success,
+# constellation (IAU abbreviation, UTF-8, at most 8 bytes), diagnostics.
+# The low four flag bits mark which cells are set, in the order
+# camera.solve, camera.estimate, aligned.solve, aligned.estimate.
+_ESTIMATE_RECORD = struct.Struct("<BB12d4d2d3d8s" + _DIAGNOSTICS_FORMAT)
+_ANCHOR_FLAG = 1 << 4
+_CONSTELLATION_FLAG = 1 << 5
+_SOURCE_CODES = (
+    None,
+    SolveSource.CAMERA,
+    SolveSource.CAMERA_FAILED,
+    SolveSource.IMU,
+)
+
+
+# =====================================================================
+# SolveMatches — tetra3 matched stars, published once per solve
+# =====================================================================
+
+
+@dataclass(eq=False)
+class SolveMatches:
+    """The raw tetra3 matched-star outputs of one successful plate-solve.
+
+    Needed by the SQM calibration UI for offline replay of SQM
+    calculations against cached frames, and by the Focus screen's stable
+    star-identity slots. Travels inside :class:`SuccessfulSolve` and is
+    published by the integrator through ``shared_state.set_solve_matches()``
+    once per solve -- not with every :class:`PointingEstimate` publish.
+
+    :attr:`solve_time` is the solved frame's ``exposure_end`` (the
+    ``last_solve_success`` of that solve). The last set survives failed
+    solves, so consumers must match it against the frame they care about.
+
+    * :attr:`centroids` -- ``(N, 2)`` float ``(y, x)`` solve-image pixels.
+    * :attr:`stars` -- ``(N, k)`` float catalog records; column 2 is the
+      catalog magnitude (consumed by SQM).
+    * :attr:`catIDs` -- ``(N,)`` catalog ids, or ``None``.
+
+    The arrays pickle as raw buffers, so this stays cheap even with many
+    matches.
+    """
+
+    solve_time: float
+    centroids: np.ndarray
+    stars: np.ndarray
+    catIDs: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_solution(cls, solve_time: float, solution: dict) -> "SolveMatches":
+        """Build from a tetra3 ``solution`` dict (``matched_centroids`` /
+        ``matched_stars`` / ``matched_catID``)."""
+        catIDs = solution.get("matched_catID")
+        return cls(
+            solve_time=solve_time,
+            centroids=np.asarray(
+                solution["matched_centroids"], dtype=np.float64
+            ).reshape(-1, 2),
+            stars=np.asarray(solution["matched_stars"], dtype=np.float64),
+            catIDs=np.asarray(catIDs) if catIDs is not None else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.centroids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SolveMatches):
+            return NotImplemented
+        if self.catIDs is None or other.catIDs is None:
+            cat_ids_equal = self.catIDs is None and other.catIDs is None
+        else:
+            cat_ids_equal = np.array_equal(self.catIDs, other.catIDs)
+        return (
+            cat_ids_equal
+            and self.solve_time == other.solve_time
+            and np.array_equal(self.centroids, other.centroids)
+            and np.array_equal(self.stars, other.stars)
+        )
 
 
 # =====================================================================
@@ -438,20 +651,49 @@ class SuccessfulSolve:
     last_solve_success: float
     diagnostics: SolveDiagnostics = field(default_factory=SolveDiagnostics)
     alignment: AlignmentResult = field(default_factory=AlignmentResult)
-    matched_centroids: Optional[List[Tuple[float, float]]] = None
-    matched_stars: Optional[list] = None
-    matched_catID: Optional[list] = None
+    # Matched-star outputs; ``None`` when the solution carried none.
+    matches: Optional[SolveMatches] = None
+
+    # Pickle the scalars as one fixed-layout record, with the anchor as
+    # floats (see _quat_to_floats): this message rides ``solver_queue``, a
+    # pickle boundary. ``matches`` pickles alongside as raw arrays.
+    def __getstate__(self) -> tuple:
+        anchor = _quat_to_floats(self.imu_anchor)
+        record = _SUCCESSFUL_SOLVE_RECORD.pack(
+            anchor is not None,
+            self.camera.RA,
+            self.camera.Dec,
+            self.camera.Roll,
+            self.aligned.RA,
+            self.aligned.Dec,
+            self.aligned.Roll,
+            *(anchor if anchor is not None else _NAN_QUAT),
+            float(self.last_solve_attempt),
+            float(self.last_solve_success),
+            *_pack_diagnostics(self.diagnostics, self.alignment),
+        )
+        return record, self.matches
+
+    def __setstate__(self, state: tuple) -> None:
+        record, matches = state
+        fields = _SUCCESSFUL_SOLVE_RECORD.unpack(record)
+        diagnostics, alignment = _unpack_diagnostics(fields[13:])
+        self.__dict__.update(
+            camera=Pointing(*fields[1:4]),
+            aligned=Pointing(*fields[4:7]),
+            imu_anchor=_floats_to_quat(tuple(fields[7:11]) if fields[0] else None),
+            last_solve_attempt=fields[11],
+            last_solve_success=fields[12],
+            diagnostics=diagnostics,
+            alignment=alignment,
+            matches=matches,
+        )
 
-    # Pickle the ``imu_anchor`` quaternion as floats (see _quat_to_floats):
-    # this message rides ``solver_queue``, a pickle boundary.
-    def __getstate__(self) -> dict:
-        state = self.__dict__.copy()
-        state["imu_anchor"] = _quat_to_floats(state["imu_anchor"])
-        return state
 
-    def __setstate__(self, state: dict) -> None:
-        state["imu_anchor"] = _floats_to_quat(state.get("imu_anchor"))
-        self.__dict__.update(state)
+# has_anchor, camera (RA, Dec, Roll), aligned (RA, Dec, Roll),
+# imu_anchor (w, x, y, z), last_solve_attempt, last_solve_success,
+# diagnostics.
+_SUCCESSFUL_SOLVE_RECORD = struct.Struct("<?6d4d2d" + _DIAGNOSTICS_FORMAT)
 
 
 @dataclass
@@ -470,6 +712,28 @@ class FailedSolve:
     last_solve_attempt: float = 0.0
     last_solve_success: Optional[float] = None
 
+    # One fixed-layout record, like SuccessfulSolve: rides ``solver_queue``
+    # on every unsolved frame.
+    def __getstate__(self) -> bytes:
+        return _FAILED_SOLVE_RECORD.pack(
+            float(self.last_solve_attempt),
+            _opt_float(self.last_solve_success),
+            *_pack_diagnostics(self.diagnostics, None),
+        )
+
+    def __setstate__(self, state: bytes) -> None:
+        fields = _FAILED_SOLVE_RECORD.unpack(state)
+        diagnostics, _alignment = _unpack_diagnostics(fields[2:])
+        self.__dict__.update(
+            diagnostics=diagnostics,
+            last_solve_attempt=fields[0],
+            last_solve_success=_float_or_none(fields[1]),
+        )
+
+
+# last_solve_attempt, last_solve_success, diagnostics (alignment unused).
+_FAILED_SOLVE_RECORD = struct.Struct("<2d" + _DIAGNOSTICS_FORMAT)
+
 
 SolveResult = Union[SuccessfulSolve, FailedSolve]
 """The message on ``solver_queue`` describing one plate-solve attempt.
@@ -657,6 +921,7 @@ __all__ = [
     "PointingMatrix",
     "ReloadSqmCalibration",
     "SolveDiagnostics",
+    "SolveMatches",
     "SolveResult",
     "SolveSource",
     "SolverCommand",
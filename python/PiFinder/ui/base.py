@@ -11,6 +11,8 @@ from itertools import cycle
 from typing import Type, Union
 
 from PIL import Image, ImageDraw
+from PiFinder import screen_mirror
+from PiFinder.render_profiler import profiler
 from PiFinder import utils
 from PiFinder.image_util import make_red
 from PiFinder.displays import DisplayBase
@@ -338,7 +340,7 @@ class UIModule:
 
         # Update shared state so web interface shows the popup message
         if self.shared_state:
-            self.shared_state.set_screen(screen_to_display)
+            screen_mirror.publish(self.shared_state, screen_to_display)
 
         self.ui_state.set_message_timeout(timeout + time.time())
 
@@ -425,6 +427,7 @@ class UIModule:
             inverted=True,
         )
 
+    @profiler.phase("overlay")
     def screen_update(self, title_bar=True, button_hints=True) -> None:
         """
         called to trigger UI updates
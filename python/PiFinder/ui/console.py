@@ -10,6 +10,7 @@ import os
 import time
 
 from PIL import Image
+from PiFinder import screen_mirror
 from PiFinder.ui.base import GPS_ANIM_RATE, UIModule
 from PiFinder import timez
 from PiFinder.ui.layout import rows_below_titlebar
@@ -217,6 +218,6 @@ class UIConsole(UIModule):
         self.display.display(screen_to_display)
 
         if self.shared_state:
-            self.shared_state.set_screen(screen_to_display)
+            screen_mirror.publish(self.shared_state, screen_to_display)
 
         return
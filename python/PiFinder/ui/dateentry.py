@@ -2,6 +2,7 @@ from typing import Any, TYPE_CHECKING
 
 from PIL import Image, ImageDraw
 
+from PiFinder import screen_mirror
 from PiFinder.ui.base import UIModule
 from PiFinder.ui.layout import center_box_row
 
@@ -256,5 +257,5 @@ class UIDateEntry(UIModule):
             self.draw_legend(separator_y)
 
         if self.shared_state:
-            self.shared_state.set_screen(self.screen)
+            screen_mirror.publish(self.shared_state, self.screen)
         return self.screen_update()
@@ -2,6 +2,8 @@ import time
 import os
 from typing import Union
 from PIL import Image
+from PiFinder import screen_mirror
+from PiFinder.render_profiler import profiler
 from PiFinder import utils
 from PiFinder.ui.base import UIModule
 from PiFinder.ui import menu_structure
@@ -150,9 +152,9 @@ class MenuManager:
 
     def screengrab(self):
         self.ss_count += 1
-        filename = f"{self.stack[-1].__uuid__}_{self.ss_count :0>3}_{self.stack[-1].title.replace('/','-')}"
+        filename = f"{self.stack[-1].__uuid__}_{self.ss_count:0>3}_{self.stack[-1].title.replace('/', '-')}"
         ss_imagepath = self.ss_path + f"/{filename}.png"
-        ss = self.shared_state.screen().copy()
+        ss = screen_mirror.latest_screen(self.shared_state).copy()
         ss.save(ss_imagepath)
         print(ss_imagepath)
 
@@ -290,7 +292,16 @@ class MenuManager:
             return
 
         # Business as usual, update the module at the top of the stack
-        self.stack[-1].update()  # type: ignore[call-arg]
+        profiler.begin_frame(type(self.stack[-1]).__name__)
+        try:
+            self._update_frame()
+        finally:
+            profiler.end_frame()
+        profiler.maybe_publish(self.shared_state)
+
+    def _update_frame(self) -> None:
+        with profiler.phase("update"):
+            self.stack[-1].update()  # type: ignore[call-arg]
 
         # are we animating?
         if self._stack_anim_counter > time.time():
@@ -328,7 +339,8 @@ class MenuManager:
         """
         Put an image on the display
         """
-        screen_to_display = screen_image.convert(self.display_class.device.mode)
+        with profiler.phase("convert"):
+            screen_to_display = screen_image.convert(self.display_class.device.mode)
 
         # Always update the logical UI state so the API reflects the current stack top,
         # even while a visual message popup is displayed.
@@ -338,10 +350,12 @@ class MenuManager:
         if time.time() < self.ui_state.message_timeout():
             return None
 
-        self.display_class.device.display(screen_to_display)
+        with profiler.phase("display"):
+            self.display_class.device.display(screen_to_display)
 
         if self.shared_state:
-            self.shared_state.set_screen(screen_to_display)
+            with profiler.phase("publish"):
+                screen_mirror.publish(self.shared_state, screen_to_display)
 
     def key_number(self, number):
         if self.help_images is not None:
@@ -20,6 +20,7 @@ from PiFinder.ui.obs_list import UIObsList
 from PiFinder.ui.locationentry import UILocationEntry
 from PiFinder.ui.radec_entry import UIRADecEntry
 from PiFinder.ui.telemetry_list import UITelemetryList
+from PiFinder.ui.render_perf import UIRenderPerf
 import PiFinder.ui.callbacks as callbacks
 
 
@@ -1286,6 +1287,10 @@ pifinder_menu = {
                                         },
                                     ],
                                 },
+                                {
+                                    "name": _("Render Perf"),
+                                    "class": UIRenderPerf,
+                                },
                             ],
                         },
                     ],
@@ -36,16 +36,16 @@ import pydeepskylog as pds
 
 # Read-only handle to the catalog DB, opened once and shared across detail
 # views. Used by _other_catalog_descriptions() to pull an object's listings in
-# its *other* catalogs (this always runs on the description view). Like the
-# per-instance ObservationsDatabase opened below, this read connection lives for
-# the life of the UI process and is closed when that process exits.
+# its *other* catalogs (this always runs on the description view). It shares
+# the UI thread's pooled read-only connection (PiFinder/db/db.py) with the
+# other catalog readers in this process.
 _objects_db = None
 
 
 def _catalog_db() -> ObjectsDatabase:
     global _objects_db
     if _objects_db is None:
-        _objects_db = ObjectsDatabase()
+        _objects_db = ObjectsDatabase(read_only=True)
     return _objects_db
 
 
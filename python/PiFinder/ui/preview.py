@@ -130,6 +130,12 @@ class UIPreview(UIModule):
         self._last_focus_catalog_time = 0.0
         self._last_focus_frame_time = 0.0
         self.focus_history: deque[tuple[float, float]] = deque()
+        # Measurement runs off the UI loop; see _collect_focus_result
+        self.focus_worker = focus.FocusWorker()
+        self._focus_seq = 0
+        # The newest camera frame, and the frame the adopted blobs came from
+        self._camera_np: Optional[np.ndarray] = None
+        self._focus_np: Optional[np.ndarray] = None
 
         # Exposure hold state. See _begin_exposure_hold for why the screen
         # takes the exposure away from auto-exposure while it is open.
@@ -167,7 +173,9 @@ class UIPreview(UIModule):
         self._focus_slot_catalog_ids = ()
         self._last_focus_catalog_time = 0.0
         self._last_focus_frame_time = 0.0
+        self._focus_np = None
         self.focus_history.clear()
+        self.focus_worker.reset()
         self._begin_exposure_hold()
 
     def inactive(self):
@@ -248,11 +256,31 @@ class UIPreview(UIModule):
         # the repaint just keeps the screen current with the key press.
         self.update(force=True)
 
-    def _measure_focus(
-        self, raw_np: np.ndarray, *, record_history: bool = True
-    ) -> None:
-        """Measure HFD and locate display blobs from one raw frame."""
-        self.last_focus_result = focus.focus_hfd(raw_np)
+    def _collect_focus_result(self) -> bool:
+        """Adopt the focus worker's newest measurement, if there is one.
+
+        Returns True when a new measurement was adopted and the screen
+        needs redrawing.
+        """
+        snapshot = self.focus_worker.latest()
+        if snapshot is None or snapshot.seq <= self._focus_seq:
+            return False
+        self._focus_seq = snapshot.seq
+        self._focus_np = snapshot.image
+        # A solve normally arrives after its image was first measured.
+        # Identify those retained previous-frame blobs before tracking
+        # their slots onto the newly measured frame.
+        self._adopt_solved_catalog_ids(self._last_focus_frame_time)
+        self._apply_focus_result(snapshot.result)
+        self._last_focus_frame_time = snapshot.frame_time
+        # Also handle the less common case where the solver won the
+        # race and published this exposure before the UI copied it.
+        self._adopt_solved_catalog_ids(snapshot.frame_time)
+        return True
+
+    def _apply_focus_result(self, result: focus.FocusResult) -> None:
+        """Track display blobs and record HFD from one frame's measurement."""
+        self.last_focus_result = result
         candidates = tuple(
             blob
             for blob in self.last_focus_result.blobs
@@ -272,20 +300,19 @@ class UIPreview(UIModule):
             else None
             for _blob, previous_index in tracked_slots
         )
-        if record_history:
-            self._record_focus_sample(self.last_focus_result.median_hfd)
+        self._record_focus_sample(self.last_focus_result.median_hfd)
 
     def _adopt_solved_catalog_ids(self, frame_time: float) -> None:
         """Attach HIP identities only to blobs from the solved exposure."""
         if frame_time <= 0 or frame_time == self._last_focus_catalog_time:
             return
-        solution = self.shared_state.solution()
-        if solution.last_solve_success != frame_time:
+        matches = self.shared_state.solve_matches()
+        if matches is None or matches.solve_time != frame_time:
             return
-        centroids = solution.matched_centroids
-        catalog_ids = solution.matched_catID
-        if not centroids or not catalog_ids:
+        if len(matches) == 0 or matches.catIDs is None or len(matches.catIDs) == 0:
             return
+        centroids = matches.centroids
+        catalog_ids = matches.catIDs.tolist()
 
         matched = focus.match_catalog_ids(
             self._tracked_focus_blobs, centroids, catalog_ids
@@ -785,49 +812,40 @@ class UIPreview(UIModule):
             self.draw.rectangle((x0, y, x1, plot_bottom), fill=medium)
 
     def update(self, force: bool = False):
-        if force:
-            self.last_update = 0
-
         metadata = self.shared_state.last_image_metadata()
         last_image_time = metadata["exposure_end"]
-        image_updated = False
-        if last_image_time > self.last_update:
-            image_updated = True
-            raw_image = self.camera_image.copy()
-
-            raw_np = np.asarray(raw_image.convert("L"))
-            if last_image_time != self._last_focus_frame_time:
-                # A solve normally arrives after its image was first rendered.
-                # Identify those retained previous-frame blobs before tracking
-                # their slots onto the newly arrived frame.
-                self._adopt_solved_catalog_ids(self._last_focus_frame_time)
-                self._measure_focus(raw_np)
-                self._last_focus_frame_time = last_image_time
-                # Also handle the less common case where the solver won the
-                # race and published this exposure before the UI copied it.
-                self._adopt_solved_catalog_ids(last_image_time)
-            elif force:
-                # A forced redraw can race the separately published camera
-                # metadata. Re-measure this exact display copy, but do not add
-                # a duplicate point to the time history.
-                self._measure_focus(raw_np, record_history=False)
+        image_updated = last_image_time > self.last_update
+        if image_updated:
+            self._camera_np = np.asarray(self.camera_image.copy().convert("L"))
+            # Measured on the focus worker and adopted on a later update
+            self.focus_worker.submit(last_image_time, self._camera_np)
+            self.last_update = last_image_time
+
+        focus_updated = self._collect_focus_result()
+
+        if self.display_mode in (DISPLAY_STARS, DISPLAY_SINGLE):
+            # Crop the tiles from the frame the blobs were measured on, not
+            # the newest one, so each tile stays centred on its star
+            frame = self._focus_np if self._focus_np is not None else self._camera_np
+            repaint = (
+                focus_updated or force or (image_updated and self._focus_np is None)
+            )
+        else:
+            frame = self._camera_np
+            repaint = image_updated or focus_updated or force
 
+        if repaint and frame is not None:
+            raw_image = Image.fromarray(frame)
             if self.display_mode == DISPLAY_STARS:
                 self.screen.paste(self._render_focus_tiles(raw_image))
+                self._draw_focus_overlay()
             elif self.display_mode == DISPLAY_IMAGE:
                 self.screen.paste(self._render_image_frame(raw_image))
             elif self.display_mode == DISPLAY_STATS:
-                self._draw_stats(raw_np, metadata)
+                self._draw_stats(frame, metadata)
             else:
                 self.screen.paste(self._render_brightest_star(raw_image))
-            self.last_update = last_image_time
-
-        if (image_updated or force) and self.display_mode == DISPLAY_STARS:
-            self._draw_focus_overlay()
-        elif (image_updated or force) and self.display_mode == DISPLAY_SINGLE:
-            self._draw_single_focus_overlay()
-
-        if image_updated or force:
+                self._draw_single_focus_overlay()
             self._draw_status_bar()
 
         return self.screen_update()
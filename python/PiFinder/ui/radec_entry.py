@@ -1,3 +1,4 @@
+from PiFinder import screen_mirror
 from PiFinder.ui.base import UIModule
 from PiFinder import calc_utils
 import time
@@ -1000,5 +1001,5 @@ class UIRADecEntry(UIModule):
         self.draw_bottom_bar()
 
         if self.shared_state:
-            self.shared_state.set_screen(self.screen)
+            screen_mirror.publish(self.shared_state, self.screen)
         return self.screen_update()
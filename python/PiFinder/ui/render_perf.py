@@ -0,0 +1,80 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+"""
+This module contains the UI Render Perf class
+
+"""
+
+import time
+
+from PiFinder.render_profiler import PHASES, profiler
+from PiFinder.ui.base import UIModule
+from PiFinder.ui.layout import rows_below_titlebar
+from PiFinder.ui.ui_utils import TextLayouter
+
+# Short phase names so a breakdown row fits the 128 panel
+_PHASE_ABBREV = {
+    "update": "upd",
+    "overlay": "ovl",
+    "convert": "cnv",
+    "display": "dsp",
+    "publish": "pub",
+}
+
+
+class UIRenderPerf(UIModule):
+    """
+    Shows the render budget profiler: p95/max frame time per screen module,
+    slowest first, each followed by its p95 phase breakdown. Includes this
+    screen's own frames.
+    """
+
+    __title__ = "RENDER"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._draw_pos = (0, self.display_class.titlebar_height)
+        self.text_layout = TextLayouter(
+            "",
+            draw=self.draw,
+            color=self.colors.get(255),
+            colors=self.colors,
+            font=self.fonts.base,
+            available_lines=rows_below_titlebar(self.display_class, gap=1).max_visible,
+        )
+        self._last_refresh = 0.0
+
+    def _lines(self) -> list[str]:
+        summary = profiler.summary()
+        lines = [f"Budget {summary['budget_ms']:.0f}ms p95/max"]
+        for module, stats in summary["modules"].items():
+            name = module[2:] if module.startswith("UI") else module
+            lines.append(f"{name[:9]:<9} {stats['p95_ms']:>4.0f}/{stats['max_ms']:.0f}")
+            lines.append(
+                " "
+                + " ".join(
+                    f"{_PHASE_ABBREV[phase]}{stats['phases'][phase]['p95_ms']:.0f}"
+                    for phase in PHASES
+                    if phase in stats["phases"]
+                )
+            )
+        return lines
+
+    def update(self, force=False):
+        # Percentiles once a second, not every frame this screen is timing
+        if force or time.time() - self._last_refresh > 1:
+            self._last_refresh = time.time()
+            self.text_layout.set_text("\n".join(self._lines()), reset_pointer=False)
+        self.clear_screen()
+        self.text_layout.draw(pos=self._draw_pos)
+        return self.screen_update()
+
+    def key_square(self):
+        profiler.reset()
+        self.update(force=True)
+
+    def key_up(self):
+        self.text_layout.previous()
+
+    def key_down(self):
+        self.text_layout.next()
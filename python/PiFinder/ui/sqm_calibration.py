@@ -16,14 +16,13 @@ defaults. Normal SQM operation requires no user calibration. The process:
 The wizard guides the user through lens cap placement and displays progress.
 """
 
-import copy
 import json
 import time
 import os
 import logging
 import numpy as np
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from PiFinder.solver import (
     _derotate_centroids,
@@ -31,7 +30,11 @@ from PiFinder.solver import (
     _scale_solution_centroids,
     _scaled_photometry_radii,
 )
-from PiFinder.types.positioning import PointingEstimate, ReloadSqmCalibration
+from PiFinder.types.positioning import (
+    PointingEstimate,
+    ReloadSqmCalibration,
+    SolveMatches,
+)
 from PiFinder.ui.base import UIModule
 from PiFinder.ui.marking_menus import MarkingMenuOption, MarkingMenu
 from PiFinder import timez, utils
@@ -92,8 +95,10 @@ class UISQMCalibration(UIModule):
         self.report_dark_frames: List[dict] = []
         self.sky_frames_raw: List[np.ndarray] = []
 
-        # Store solution for each sky frame (needed for SQM calculation)
+        # Store solution and matched stars for each sky frame (needed for
+        # SQM calculation)
         self.sky_solutions: List[PointingEstimate] = []
+        self.sky_matches: List[SolveMatches] = []
 
         # Calibration results - RAW (16-bit)
         self.bias_offset_raw: Optional[float] = None
@@ -131,6 +136,7 @@ class UISQMCalibration(UIModule):
         self.report_dark_frames = []
         self.sky_frames_raw = []
         self.sky_solutions = []
+        self.sky_matches = []
         self.bias_offset_raw = None
         self.read_noise_raw = None
         self.dark_current_rate_raw = None
@@ -560,8 +566,11 @@ class UISQMCalibration(UIModule):
                 logger.warning("%s", exc)
                 return
 
-    def _wait_for_solution_at(self, exposure_end: float) -> PointingEstimate:
-        """Return the successful plate solution for an identified frame."""
+    def _wait_for_solution_at(
+        self, exposure_end: float
+    ) -> Tuple[PointingEstimate, SolveMatches]:
+        """Return the successful plate solution and its matched stars for an
+        identified frame."""
         deadline = time.time() + self.sky_capture_timeout
         while time.time() < deadline:
             solution = self.shared_state.solution()
@@ -570,10 +579,10 @@ class UISQMCalibration(UIModule):
                 and solution.has_pointing()
                 and solution.last_solve_attempt == exposure_end
                 and solution.last_solve_success == exposure_end
-                and solution.matched_centroids is not None
-                and solution.matched_stars is not None
             ):
-                return copy.deepcopy(solution)
+                matches = self.shared_state.solve_matches()
+                if matches is not None and matches.solve_time == exposure_end:
+                    return solution, matches
             time.sleep(0.05)
         raise TimeoutError("Timed out waiting for matching sky-frame solution")
 
@@ -684,6 +693,7 @@ class UISQMCalibration(UIModule):
         if self.current_frame == 0:
             self.sky_frames_raw = []
             self.sky_solutions = []
+            self.sky_matches = []
             # Start timeout timer
             if self.sky_capture_start_time is None:
                 self.sky_capture_start_time = time.time()
@@ -718,7 +728,7 @@ class UISQMCalibration(UIModule):
         # alongside so the two lists stay index-aligned.
         raw_array = self.shared_state.cam_raw()
         try:
-            solution = self._wait_for_solution_at(exposure_end)
+            solution, matches = self._wait_for_solution_at(exposure_end)
         except TimeoutError as exc:
             logger.warning("%s", exc)
             if self.current_frame == 0:
@@ -728,6 +738,7 @@ class UISQMCalibration(UIModule):
         if raw_array is not None:
             self.sky_frames_raw.append(raw_array.copy())
             self.sky_solutions.append(solution)
+            self.sky_matches.append(matches)
 
         self.current_frame += 1
 
@@ -876,8 +887,8 @@ class UISQMCalibration(UIModule):
             wing_estimator = WingEstimator()
 
             # Calculate SQM for each raw sky frame using its stored solution
-            for i, (sky_frame, solution) in enumerate(
-                zip(self.sky_frames_raw, self.sky_solutions)
+            for i, (sky_frame, solution, matches) in enumerate(
+                zip(self.sky_frames_raw, self.sky_solutions, self.sky_matches)
             ):
                 if solution is None or not solution.has_pointing():
                     # No valid solve - skip SQM calculation
@@ -887,13 +898,13 @@ class UISQMCalibration(UIModule):
                 altitude_deg = solution.Alt
 
                 # Check if we have matched centroids (needed for SQM calculation)
-                if solution.matched_centroids is None or solution.matched_stars is None:
+                if matches is None:
                     logger.warning(
                         f"No matched centroids/stars for sky frame {i}, skipping SQM"
                     )
                     continue
 
-                centroids = solution.matched_centroids
+                centroids = matches.centroids
 
                 if len(centroids) == 0:
                     logger.warning(f"Empty centroids for sky frame {i}, skipping SQM")
@@ -911,11 +922,11 @@ class UISQMCalibration(UIModule):
                 scale = green.shape[0] / 512.0
                 raw_solution = {
                     "FOV": solution.diagnostics.FOV,
-                    "matched_centroids": solution.matched_centroids,
-                    "matched_stars": solution.matched_stars,
+                    "matched_centroids": matches.centroids,
+                    "matched_stars": matches.stars,
                 }
-                if solution.matched_catID is not None:
-                    raw_solution["matched_catID"] = solution.matched_catID
+                if matches.catIDs is not None:
+                    raw_solution["matched_catID"] = matches.catIDs
                 sqm_solution = _scale_solution_centroids(raw_solution, scale)
                 calc_centroids = np.asarray(centroids, dtype=np.float64) * scale
 
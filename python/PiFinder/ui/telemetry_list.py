@@ -1,7 +1,8 @@
 """
 UI screen for listing and loading telemetry recording sessions.
 
-Lists .jsonl files from ~/PiFinder_data/telemetry/ with filename and size.
+Lists sessions (JSONL or binary .pftl) from ~/PiFinder_data/telemetry/ with
+filename and size.
 Selecting a file triggers replay via the integrator command queue.
 """
 
@@ -9,6 +10,7 @@ import logging
 
 from PiFinder.ui.text_menu import UITextMenu
 from PiFinder.telemetry import TELEMETRY_DIR
+from PiFinder.telemetry_binary import SUFFIX as BINARY_SUFFIX
 
 from typing import Any, TYPE_CHECKING
 
@@ -37,18 +39,21 @@ class UITelemetryList(UITextMenu):
         if not TELEMETRY_DIR.exists():
             return sessions
 
-        # Look for session dirs (contain session.jsonl) and standalone .jsonl files
+        # Look for session dirs (contain session.jsonl or session.pftl) and
+        # standalone session files
         for entry in sorted(TELEMETRY_DIR.iterdir(), reverse=True):
-            jsonl_path = None
+            session_path = None
             if entry.is_dir():
-                candidate = entry / "session.jsonl"
-                if candidate.exists():
-                    jsonl_path = candidate
-            elif entry.suffix == ".jsonl":
-                jsonl_path = entry
-
-            if jsonl_path:
-                size_kb = jsonl_path.stat().st_size / 1024
+                for name in (f"session{BINARY_SUFFIX}", "session.jsonl"):
+                    candidate = entry / name
+                    if candidate.exists():
+                        session_path = candidate
+                        break
+            elif entry.suffix in (".jsonl", BINARY_SUFFIX):
+                session_path = entry
+
+            if session_path:
+                size_kb = session_path.stat().st_size / 1024
                 label = entry.name
                 if size_kb >= 1024:
                     size_str = f"{size_kb / 1024:.1f}MB"
@@ -102,7 +102,7 @@ class UITextEntry(UIModule):
 
         # Only initialize database if we're in search mode
         if not self.text_entry_mode:
-            self.db: ObjectsDatabase = ObjectsDatabase()
+            self.db: ObjectsDatabase = ObjectsDatabase(read_only=True)
             self.marking_menu = MarkingMenu(
                 left=MarkingMenuOption(),
                 down=MarkingMenuOption(),
@@ -2,6 +2,7 @@ from typing import Any, TYPE_CHECKING
 
 from PIL import Image, ImageDraw
 
+from PiFinder import screen_mirror
 import PiFinder.ui.callbacks as callbacks
 from PiFinder.ui.base import UIModule
 from PiFinder.ui.dateentry import UIDateEntry
@@ -283,7 +284,7 @@ class UITimeEntry(UIModule):
             self.draw_legend(separator_y)
 
         if self.shared_state:
-            self.shared_state.set_screen(self.screen)
+            screen_mirror.publish(self.shared_state, self.screen)
         return self.screen_update()
 
     def serialize_ui_state(self) -> dict:
@@ -0,0 +1,117 @@
+"""
+Unit tests for the /api/visible_stars Starfield cache: the per-resolution
+LRU, zoom changes reusing an entry, concurrent renders, and the
+process-wide star catalog shared by every Starfield.
+
+No catalog files are needed: ``plot.Starfield`` and ``plot.StarCatalog``
+are replaced by recording fakes.
+"""
+
+import threading
+import time
+
+import pytest
+
+from PiFinder import api_extensions, plot
+from PiFinder.api_extensions import _StarfieldCache
+
+pytestmark = pytest.mark.unit
+
+
+class FakeStarfield:
+    built = []
+    active = 0
+    overlap = False
+
+    def __init__(self, colors, resolution, fov):
+        self.resolution = resolution
+        self.fov = fov
+        FakeStarfield.built.append(resolution)
+
+    def set_fov(self, fov):
+        self.fov = fov
+
+    def plot_starfield(self, ra, dec, roll, *args, **kwargs):
+        FakeStarfield.active += 1
+        if FakeStarfield.active > 1:
+            FakeStarfield.overlap = True
+        time.sleep(0.02)
+        FakeStarfield.active -= 1
+        return self.resolution, self.fov
+
+
+@pytest.fixture
+def fake_starfield(monkeypatch):
+    FakeStarfield.built = []
+    FakeStarfield.active = 0
+    FakeStarfield.overlap = False
+    monkeypatch.setattr(plot, "Starfield", FakeStarfield)
+    return FakeStarfield
+
+
+def test_zoom_changes_reuse_the_resolution_entry(fake_starfield):
+    cache = _StarfieldCache(maxsize=2)
+    assert cache.render((256, 256), 10.0, 0, 0, 0) == ((256, 256), 10.0)
+    assert cache.render((256, 256), 20.0, 0, 0, 0) == ((256, 256), 20.0)
+    assert cache.render((256, 256), 10.0, 0, 0, 0) == ((256, 256), 10.0)
+    assert fake_starfield.built == [(256, 256)]
+
+
+def test_least_recently_used_resolution_is_evicted(fake_starfield):
+    cache = _StarfieldCache(maxsize=2)
+    cache.render((128, 128), 10.0, 0, 0, 0)
+    cache.render((256, 256), 10.0, 0, 0, 0)
+    cache.render((128, 128), 10.0, 0, 0, 0)
+    cache.render((512, 512), 10.0, 0, 0, 0)  # evicts 256
+    cache.render((128, 128), 10.0, 0, 0, 0)
+    cache.render((256, 256), 10.0, 0, 0, 0)
+    assert fake_starfield.built == [(128, 128), (256, 256), (512, 512), (256, 256)]
+
+
+def test_same_resolution_renders_take_turns(fake_starfield):
+    cache = _StarfieldCache()
+    results = []
+
+    def render(fov):
+        results.append(cache.render((256, 256), fov, 0, 0, 0))
+
+    threads = [threading.Thread(target=render, args=(fov,)) for fov in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not fake_starfield.overlap
+    assert fake_starfield.built == [(256, 256)]
+    # every render saw its own zoom, not another request's
+    assert sorted(fov for _, fov in results) == list(range(8))
+
+
+def test_module_cache_is_used_by_the_endpoint_helper(fake_starfield, monkeypatch):
+    monkeypatch.setattr(api_extensions, "_API_STARFIELDS", _StarfieldCache())
+    api_extensions._render_api_starfield((64, 64), 5.0, 0, 0, 0)
+    api_extensions._render_api_starfield((64, 64), 15.0, 0, 0, 0)
+    assert fake_starfield.built == [(64, 64)]
+
+
+def test_star_catalog_is_built_once_per_process(monkeypatch):
+    built = []
+
+    class FakeCatalog:
+        def __init__(self):
+            time.sleep(0.02)
+            built.append(self)
+
+    monkeypatch.setattr(plot, "StarCatalog", FakeCatalog)
+    monkeypatch.setattr(plot, "_STAR_CATALOG", None)
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(plot.star_catalog()))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert all(catalog is built[0] for catalog in seen)
@@ -220,7 +220,7 @@ _TEST_RADECS = [
 def _skyfield_altaz_direct(ra_deg, dec_deg, dt, atmos=True):
     """Compute apparent alt/az using skyfield's native chain.
 
-    Used as the reference for the pyerfa-backed Skyfield_utils.radec_to_altaz.
+    Used as the reference for Skyfield_utils.radec_to_altaz.
     The Skyfield_utils singleton's location must already be set.
     """
     sf = calc_utils.sf_utils
@@ -313,7 +313,8 @@ class TestFastAltAz:
 
 @pytest.mark.unit
 class TestSkyfieldUtilsRadecToAltaz:
-    """Skyfield_utils.radec_to_altaz: pyerfa-backed (erfa.atco13).
+    """Skyfield_utils.radec_to_altaz: the cached TopocentricFrame (the
+    erfa.atco13 chain, evaluated in Python).
 
     Should track skyfield's native observe()/apparent()/altaz() chain to
     within arcsec-scale, since both run essentially the same SOFA/ERFA
@@ -369,3 +370,169 @@ class TestSkyfieldUtilsRadecToAltaz:
             )
             # Az unchanged by refraction (atmosphere is symmetric in az).
             assert az_app == pytest.approx(az_geo, abs=1e-6)
+
+
+@pytest.mark.unit
+class TestPrecessionMatrix:
+    """
+    The cached ERFA rotation path must agree with Skyfield's per-call
+    precession (position_of_radec(...).radec(epoch=...)).
+    """
+
+    DT = datetime.datetime(2026, 3, 1, 12, 0, 30, tzinfo=datetime.timezone.utc)
+    POINTS = [(83.82, -5.39), (10.0, 89.5), (359.9, -60.0), (180.0, 0.0)]
+
+    def _skyfield_jnow(self, ra_deg, dec_deg, dt):
+        ts = calc_utils.sf_utils.ts
+        p = calc_utils.position_of_radec(
+            ra_hours=ra_deg / 15.0, dec_degrees=dec_deg, epoch=ts.J2000
+        )
+        ra, dec, _ = p.radec(epoch=ts.from_datetime(dt))
+        return ra._degrees, dec.degrees
+
+    def test_j2000_to_jnow_matches_skyfield(self):
+        for ra, dec in self.POINTS:
+            exp_ra, exp_dec = self._skyfield_jnow(ra, dec, self.DT)
+            got_ra, got_dec = calc_utils.j2000_to_jnow(ra, dec, self.DT)
+            sep = _angular_sep_arcsec(got_dec, got_ra, exp_dec, exp_ra)
+            assert sep < 0.01, f"{ra}, {dec}: {sep} arcsec"
+
+    def test_round_trip(self):
+        for ra, dec in self.POINTS:
+            now = calc_utils.j2000_to_jnow(ra, dec, self.DT)
+            back = calc_utils.jnow_to_j2000(*now, self.DT)
+            assert back == pytest.approx((ra, dec), abs=1e-9)
+
+    def test_arrays(self):
+        ras = np.array([p[0] for p in self.POINTS])
+        decs = np.array([p[1] for p in self.POINTS])
+        got_ra, got_dec = calc_utils.j2000_to_jnow(ras, decs, self.DT)
+        for i, (ra, dec) in enumerate(self.POINTS):
+            assert (got_ra[i], got_dec[i]) == pytest.approx(
+                calc_utils.j2000_to_jnow(ra, dec, self.DT), abs=1e-9
+            )
+
+    def test_rotation_cached_per_refresh_interval(self):
+        later = self.DT + datetime.timedelta(seconds=20)
+        assert calc_utils.jnow_rotation(self.DT) is calc_utils.jnow_rotation(later)
+        next_bucket = self.DT + datetime.timedelta(
+            seconds=calc_utils.PRECESSION_REFRESH_SECONDS
+        )
+        assert calc_utils.jnow_rotation(next_bucket) is not calc_utils.jnow_rotation(
+            self.DT
+        )
+
+    def test_epoch_rotation_matches_epoch_to_epoch(self):
+        for ra, dec in self.POINTS:
+            exp_ra, exp_dec = calc_utils.epoch_to_epoch(
+                calc_utils.B1950, calc_utils.J2000, ra / 15.0, dec
+            )
+            got_ra, got_dec = calc_utils.rotate_radec(
+                calc_utils.epoch_rotation(calc_utils.B1950, calc_utils.J2000), ra, dec
+            )
+            sep = _angular_sep_arcsec(got_dec, got_ra, exp_dec.degrees, exp_ra._degrees)
+            assert sep < 0.05, f"{ra}, {dec}: {sep} arcsec"
+
+
+@pytest.mark.unit
+class TestConstellations:
+    """radec_to_constellations() against Skyfield's constellation map."""
+
+    @pytest.fixture(scope="class")
+    def positions(self):
+        rng = np.random.default_rng(7)
+        ra = rng.uniform(0.0, 360.0, 5000)
+        dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, 5000)))
+        return ra, dec
+
+    def test_matches_skyfield(self, positions):
+        from skyfield.api import load_constellation_map, position_of_radec
+
+        ra, dec = positions
+        expected = load_constellation_map()(position_of_radec(ra / 15.0, dec))
+        got = calc_utils.sf_utils.radec_to_constellations(ra, dec)
+        assert list(got) == list(expected)
+
+    def test_scalar_matches_arrays(self, positions):
+        ra, dec = positions
+        got = calc_utils.sf_utils.radec_to_constellations(ra, dec)
+        for i in range(0, len(ra), 10):
+            assert calc_utils.sf_utils.radec_to_constellation(ra[i], dec[i]) == got[i]
+
+    def test_known_objects(self):
+        sf = calc_utils.sf_utils
+        assert sf.radec_to_constellation(10.68, 41.27) == "And"  # M 31
+        assert sf.radec_to_constellation(0.0, 90.0) == "UMi"
+        assert sf.radec_to_constellation(0.0, -90.0) == "Oct"
+        got = sf.radec_to_constellations(
+            np.array([[83.82], [279.23]]), [[-5.39], [38.78]]
+        )
+        assert got.shape == (2, 1)
+        assert list(got[:, 0]) == ["Ori", "Lyr"]
+
+
+@pytest.mark.unit
+class TestTopocentricFrame:
+    """TopocentricFrame against erfa.atco13, and its reuse by Skyfield_utils."""
+
+    TIMESTAMP = _TEST_DT.timestamp()
+
+    def _atco13(self, ra, dec, timestamp, atmos):
+        import erfa
+
+        azimuth, zenith, *_ = erfa.atco13(
+            np.radians(ra),
+            np.radians(dec),
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            2440587.5,
+            timestamp / 86400.0,
+            0.0,
+            np.radians(_TEST_LON),
+            np.radians(_TEST_LAT),
+            _TEST_ALT_M,
+            0.0,
+            0.0,
+            1010.0 if atmos else 0.0,
+            10.0,
+            0.5,
+            0.55,
+        )
+        return 90.0 - np.degrees(zenith), np.degrees(azimuth) % 360.0
+
+    @pytest.mark.parametrize("atmos", [True, False])
+    def test_matches_atco13(self, atmos):
+        frame = calc_utils.TopocentricFrame(
+            _TEST_LAT, _TEST_LON, _TEST_ALT_M, self.TIMESTAMP
+        )
+        rng = np.random.default_rng(3)
+        timestamp = self.TIMESTAMP + 0.6
+        for _ in range(500):
+            ra = rng.uniform(0.0, 360.0)
+            dec = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0)))
+            alt, az = frame.radec_to_altaz(ra, dec, timestamp, atmos)
+            e_alt, e_az = self._atco13(ra, dec, timestamp, atmos)
+            if e_alt > 1.0:
+                assert _angular_sep_arcsec(alt, az, e_alt, e_az) < 0.5
+
+    def test_defaults_to_frame_epoch(self):
+        frame = calc_utils.TopocentricFrame(
+            _TEST_LAT, _TEST_LON, _TEST_ALT_M, self.TIMESTAMP
+        )
+        assert frame.radec_to_altaz(152.09, 11.97) == frame.radec_to_altaz(
+            152.09, 11.97, self.TIMESTAMP
+        )
+
+    def test_skyfield_utils_reuses_frame_per_second(self):
+        sf = Skyfield_utils()
+        sf.set_location(_TEST_LAT, _TEST_LON, _TEST_ALT_M)
+        frame = sf.altaz_frame(_TEST_DT)
+        assert sf.altaz_frame(_TEST_DT + datetime.timedelta(seconds=0.9)) is frame
+        later = sf.altaz_frame(_TEST_DT + datetime.timedelta(seconds=1))
+        assert later is not frame
+        sf.set_location(_TEST_LAT, _TEST_LON + 1.0, _TEST_ALT_M)
+        moved = sf.altaz_frame(_TEST_DT + datetime.timedelta(seconds=1))
+        assert moved is not later
+        assert moved.lon == _TEST_LON + 1.0
@@ -3,7 +3,8 @@
 """
 Unit tests for CameraInterface._capture_with_timeout - the hot-path capture
 guard that keeps a wedged V4L2 capture from freezing the camera process
-without ever overlapping two captures on a non-thread-safe camera.
+without ever overlapping two captures on a non-thread-safe camera - and for
+the IMU samples bracketing an exposure.
 """
 
 import threading
@@ -12,7 +13,7 @@ from typing import Optional
 import pytest
 from PIL import Image
 
-from PiFinder.camera_interface import CameraInterface
+from PiFinder.camera_interface import CameraInterface, _imu_at, _imu_fallback
 
 
 class _ScriptedCamera(CameraInterface):
@@ -120,3 +121,48 @@ class TestCaptureWithTimeout:
         assert cam.capture_calls == 2
         assert cam._capture_thread is not wedged_thread
         assert cam._capture_thread is None
+
+
+class _NoRing:
+    """An IMU ring reader whose segment doesn't exist."""
+
+    def count(self):
+        return 0
+
+    def sample_at(self, t):
+        return None
+
+
+class _MovingImu:
+    """Shared state whose IMU sample changes on every read."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def imu(self):
+        self.reads += 1
+        return self.reads
+
+
+@pytest.mark.unit
+class TestExposureImu:
+    def test_start_sample_is_read_before_the_exposure(self):
+        ring, shared_state = _NoRing(), _MovingImu()
+        fallback = _imu_fallback(ring, shared_state)
+        # ... exposure; the IMU moves on meanwhile
+        start = _imu_at(ring, shared_state, 0.0, fallback)
+        end = _imu_at(ring, shared_state, 1.0)
+        assert (start, end) == (1, 2)
+
+    def test_ring_needs_no_fallback(self):
+        class Ring(_NoRing):
+            def count(self):
+                return 10
+
+            def sample_at(self, t):
+                return f"sample at {t}"
+
+        shared_state = _MovingImu()
+        assert _imu_fallback(Ring(), shared_state) is None
+        assert _imu_at(Ring(), shared_state, 0.5) == "sample at 0.5"
+        assert shared_state.reads == 0
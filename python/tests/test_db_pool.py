@@ -0,0 +1,165 @@
+"""Tests for the pooled SQLite layer and the batch listing lookup.
+
+Read-only Database handles share one connection per file per thread, so
+the UI's several ObjectsDatabase handles stop reopening the catalog.
+Writable handles each get their own connection; only the observations
+database switches its file to WAL.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from PiFinder.db import objects_db as objects_db_module
+from PiFinder.db.db import close_pooled_connections, pooled_connection
+from PiFinder.db.objects_db import ObjectsDatabase
+from PiFinder.db.observations_db import ObservationsDatabase
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def objects_path(tmp_path):
+    path = tmp_path / "objects.db"
+    db = ObjectsDatabase(db_path=path)
+    db.create_tables()
+    for object_id in range(1, 8):
+        db.insert_object("Gx", object_id * 10.0, 0.0, "And", "", "")
+    db.insert_name(1, "Andromeda Galaxy ")
+    db.insert_name(1, "Andromeda Galaxy")
+    db.insert_name(1, "Great Nebula")
+    db.insert_name(3, "Pinwheel")
+    db.insert_catalog("M", 110, "Messier")
+    db.insert_catalog("NGC", 7840, "NGC")
+    db.insert_catalog_object(1, "M", 31, "")
+    db.insert_catalog_object(1, "NGC", 224, "")
+    db.insert_catalog_object(3, "M", 33, "")
+    yield path
+    close_pooled_connections()
+
+
+class TestPool:
+    def test_handles_share_a_connection_per_thread(self, objects_path):
+        first = ObjectsDatabase(db_path=objects_path, read_only=True)
+        second = ObjectsDatabase(db_path=objects_path, read_only=True)
+        assert first.conn is second.conn
+        assert first.cursor is not second.cursor
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(pooled_connection(objects_path))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not first.conn
+
+    def test_read_only_connection(self, objects_path):
+        db = ObjectsDatabase(db_path=objects_path, read_only=True)
+        assert db.conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            db.conn.execute("DELETE FROM objects")
+        assert db.get_object_by_id(7)["id"] == 7
+
+    def test_observations_use_wal(self, tmp_path):
+        db = ObservationsDatabase(tmp_path / "observations.db")
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_objects_db_keeps_its_journal_mode(self, objects_path):
+        db = ObjectsDatabase(db_path=objects_path)
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    def test_writers_do_not_share_transactions(self, objects_path):
+        first = ObjectsDatabase(db_path=objects_path)
+        second = ObjectsDatabase(db_path=objects_path)
+        assert first.conn is not second.conn
+
+        # One import's rollback must not discard another's pending insert
+        first.bulk_mode = True
+        first.insert_object("OC", 1.0, 2.0, "Ori", "", "")
+        second.conn.rollback()
+        first.conn.commit()
+
+        reader = pooled_connection(objects_path)
+        assert reader.execute("SELECT count(*) FROM objects").fetchone()[0] == 8
+
+    def test_read_only_index_backfill_leaves_journal_mode(self, objects_path):
+        conn = sqlite3.connect(objects_path)
+        conn.execute("DROP INDEX idx_catalog_objects_object_id")
+        conn.close()
+
+        db = ObjectsDatabase(db_path=objects_path, read_only=True)
+        names = {
+            row["name"] for row in db.conn.execute("SELECT name FROM sqlite_master")
+        }
+        assert "idx_catalog_objects_object_id" in names
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert not objects_path.with_name("objects.db-wal").exists()
+
+    def test_replaced_file_is_reopened(self, objects_path):
+        # e.g. Names.db or object_details' handle, held for the process life
+        long_lived = ObjectsDatabase(db_path=objects_path, read_only=True)
+        replacement = objects_path.with_name("new.db")
+        db = ObjectsDatabase(db_path=replacement)
+        db.create_tables()
+        db.insert_object("OC", 1.0, 2.0, "Ori", "", "")
+        db.close()
+        replacement.replace(objects_path)
+
+        reader = pooled_connection(objects_path)
+        assert reader is not long_lived.conn
+        assert reader.execute("SELECT count(*) FROM objects").fetchone()[0] == 1
+        # The old handle still answers, from the file it opened
+        assert long_lived.get_object_by_id(7)["id"] == 7
+
+    def test_close_closes_a_writable_connection(self, objects_path):
+        db = ObjectsDatabase(db_path=objects_path)
+        db.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.conn.execute("SELECT 1")
+
+    def test_close_keeps_the_pooled_connection(self, objects_path):
+        db = ObjectsDatabase(db_path=objects_path, read_only=True)
+        db.close()
+        reopened = ObjectsDatabase(db_path=objects_path, read_only=True)
+        assert reopened.conn is db.conn
+        assert reopened.get_object_by_id(1)["id"] == 1
+
+
+class TestBatchLookups:
+    def test_object_ids_by_listings(self, objects_path):
+        db = ObjectsDatabase(db_path=objects_path, read_only=True)
+        assert db.get_object_ids_by_listings(
+            [("M", 31), ("NGC", 224), ("M", 33), ("M", 1), ("PL", 3)]
+        ) == {("M", 31): 1, ("NGC", 224): 1, ("M", 33): 3}
+
+    def test_lookups_are_split_into_batches(self, objects_path, monkeypatch):
+        monkeypatch.setattr(objects_db_module, "BATCH_SIZE", 2)
+        db = ObjectsDatabase(db_path=objects_path, read_only=True)
+        assert len(db.get_object_ids_by_listings([("M", 31), ("M", 33), ("M", 1)])) == 2
+
+
+def test_observed_cache_resolves_listings_in_one_batch(objects_path, tmp_path):
+    calls = []
+
+    class CountingObjectsDatabase(ObjectsDatabase):
+        def get_catalog_object_by_sequence(self, *args):
+            calls.append("single")
+            return super().get_catalog_object_by_sequence(*args)
+
+        def get_object_ids_by_listings(self, listings):
+            calls.append("batch")
+            return super().get_object_ids_by_listings(listings)
+
+    class ObsDB(ObservationsDatabase):
+        def _get_objects_db(self):
+            return CountingObjectsDatabase(db_path=objects_path, read_only=True)
+
+    obs_db = ObsDB(tmp_path / "observations.db")
+    for catalog, sequence in [("M", 31), ("M", 33), ("PL", 1)]:
+        obs_db.log_object("s1", 1234567890, catalog, sequence, None, {})
+    calls.clear()
+
+    obs_db.load_observed_objects_cache()
+    assert calls == ["batch"]
+    assert obs_db.observed_object_ids == {1, 3}
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 from PIL import Image
 
-from PiFinder import cat_images
+from PiFinder import image_pyramid
 from PiFinder.equipment import Equipment, Telescope
 
 
@@ -45,11 +46,22 @@ class TestActiveTelescopeOrientation:
         assert equipment.active_telescope_image_orientation() == (False, True)
 
 
-def _marker_image() -> Image.Image:
+@pytest.fixture
+def marker_path(tmp_path):
     """A small asymmetric image so every mirror actually moves a pixel."""
-    img = Image.new("RGB", (4, 4), (0, 0, 0))
-    img.putpixel((0, 0), (255, 255, 255))
-    return img
+    pixels = np.zeros((64, 64), dtype=np.uint8)
+    pixels[4:16, 4:12] = 255
+    path = tmp_path / "marker.png"
+    Image.fromarray(pixels).save(path)
+    image_pyramid.build_pyramid(str(path))
+    yield str(path)
+    image_pyramid.tile_cache.clear()
+    image_pyramid._PYRAMIDS.clear()
+
+
+def _view(path, flip, flop):
+    # The baseline 180 rotate of cat_images, no roll, at full size
+    return image_pyramid.oriented_view(path, 1.0, 180, flip, flop, 64)
 
 
 def _data(img: Image.Image):
@@ -58,16 +70,20 @@ def _data(img: Image.Image):
 
 @pytest.mark.unit
 class TestOrientImage:
-    """cat_images._orient_image applies flip/flop after the baseline rotate."""
+    """image_pyramid.oriented_view applies flip/flop after the baseline rotate."""
 
-    def test_flags_apply_the_right_transposes_after_baseline(self):
-        src = _marker_image()
+    def test_flags_apply_the_right_transposes_after_baseline(self, marker_path):
         # Baseline: 180 rotate only (no roll, no mirrors)
-        base = cat_images._orient_image(src, 0, False, False)
+        base = _view(marker_path, False, False)
+        # The marker at rows 4-15, columns 4-11 lands in the opposite corner
+        # (the pyramid tiles are lossy, so compare regions, not pixels)
+        pixels = np.asarray(base, dtype=float)
+        assert pixels[48:60, 52:60].mean() > 200
+        assert pixels[4:16, 4:12].mean() < 20
 
-        flipped = cat_images._orient_image(src, 0, True, False)
-        flopped = cat_images._orient_image(src, 0, False, True)
-        both = cat_images._orient_image(src, 0, True, True)
+        flipped = _view(marker_path, True, False)
+        flopped = _view(marker_path, False, True)
+        both = _view(marker_path, True, True)
 
         # flip == top-to-bottom mirror of the baseline
         assert _data(flipped) == _data(base.transpose(Image.FLIP_TOP_BOTTOM))
@@ -78,10 +94,9 @@ class TestOrientImage:
             base.transpose(Image.FLIP_TOP_BOTTOM).transpose(Image.FLIP_LEFT_RIGHT)
         )
 
-    def test_each_combo_is_distinct(self):
-        src = _marker_image()
+    def test_each_combo_is_distinct(self, marker_path):
         results = [
-            _data(cat_images._orient_image(src, 0, flip, flop))
+            _data(_view(marker_path, flip, flop))
             for flip in (False, True)
             for flop in (False, True)
         ]
@@ -3,6 +3,8 @@
 See docs/adr/0005-focus-hfd-self-contained-in-ui.md for the design rationale.
 """
 
+import threading
+
 import numpy as np
 import pytest
 
@@ -273,3 +275,67 @@ class TestFocusHfd:
         peaks = [blob.peak for blob in result.blobs]
         assert len(peaks) == 4
         assert peaks == sorted(peaks, reverse=True)
+
+    def test_uint8_frame_matches_float_frame(self):
+        """8-bit frames take the histogram path for the background statistics."""
+        img = _gaussian_frame(4.0, amplitude=200.0, background=20.0, noise=3.0)
+        frame = np.round(img).astype(np.uint8)
+        assert focus.focus_hfd(frame) == focus.focus_hfd(frame.astype(np.float32))
+
+
+@pytest.mark.unit
+class TestFocusWorker:
+    def test_measures_off_the_calling_thread(self):
+        threads = []
+
+        def measure(np_image):
+            threads.append(threading.current_thread())
+            return focus.focus_hfd(np_image)
+
+        worker = focus.FocusWorker(measure)
+        seq = worker.submit(12.5, _gaussian_frame(4.0))
+        assert worker.wait(seq, timeout=5)
+        snapshot = worker.latest()
+        assert (snapshot.seq, snapshot.frame_time) == (seq, 12.5)
+        assert snapshot.result.median_hfd is not None
+        assert threads == [worker._thread] != [threading.current_thread()]
+
+    def test_stale_frames_are_dropped(self):
+        started = threading.Event()
+        release = threading.Event()
+        measured = []
+
+        def measure(np_image):
+            started.set()
+            release.wait(5)
+            measured.append(int(np_image[0, 0]))
+            return focus.focus_hfd(np_image)
+
+        worker = focus.FocusWorker(measure)
+        worker.submit(1.0, np.full((64, 64), 1, dtype=np.uint8))
+        started.wait(5)
+        # Two frames arrive while the first is measured; only the newest runs
+        worker.submit(2.0, np.full((64, 64), 2, dtype=np.uint8))
+        last = worker.submit(3.0, np.full((64, 64), 3, dtype=np.uint8))
+        release.set()
+        assert worker.wait(last, timeout=5)
+        assert measured == [1, 3]
+        assert worker.latest().frame_time == 3.0
+
+    def test_reset_discards_a_measurement_in_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def measure(np_image):
+            started.set()
+            release.wait(5)
+            return focus.focus_hfd(np_image)
+
+        worker = focus.FocusWorker(measure)
+        worker.submit(1.0, np.zeros((64, 64), dtype=np.uint8))
+        started.wait(5)
+        worker.reset()
+        release.set()
+        seq = worker.submit(2.0, np.zeros((64, 64), dtype=np.uint8))
+        assert worker.wait(seq, timeout=5)
+        assert worker.latest().frame_time == 2.0
@@ -18,7 +18,8 @@ from PiFinder.displays import (
     Layout176,
     Layout320,
 )
-from PiFinder.focus import Blob, FocusResult
+from PiFinder.focus import Blob, FocusResult, FocusSnapshot
+from PiFinder.types.positioning import SolveMatches
 from PiFinder.ui.preview import (
     DISPLAY_IMAGE,
     DISPLAY_SINGLE,
@@ -99,12 +100,13 @@ def test_solved_hip_ids_restore_stars_to_their_existing_slots():
     preview._tracked_focus_blobs = (hip_b_blob, hip_a_blob)
     preview._focus_slot_catalog_ids = (32349, 71683)
     preview._last_focus_catalog_time = 0.0
-    solution = SimpleNamespace(
-        last_solve_success=42.0,
-        matched_centroids=[(300.0, 400.0), (80.0, 100.0)],
-        matched_catID=[71683, 32349],
+    matches = SolveMatches(
+        solve_time=42.0,
+        centroids=np.array([(300.0, 400.0), (80.0, 100.0)]),
+        stars=np.zeros((2, 3)),
+        catIDs=np.array([71683, 32349]),
     )
-    preview.shared_state = SimpleNamespace(solution=lambda: solution)
+    preview.shared_state = SimpleNamespace(solve_matches=lambda: matches)
 
     preview._adopt_solved_catalog_ids(42.0)
 
@@ -113,7 +115,7 @@ def test_solved_hip_ids_restore_stars_to_their_existing_slots():
 
 
 @pytest.mark.unit
-def test_replacement_star_does_not_inherit_departed_hip_id(monkeypatch):
+def test_replacement_star_does_not_inherit_departed_hip_id():
     preview = object.__new__(UIPreview)
     preview._tracked_focus_blobs = (
         _blob(x=80, y=90),
@@ -137,13 +139,115 @@ def test_replacement_star_does_not_inherit_departed_hip_id(monkeypatch):
             replacement,
         ),
     )
-    monkeypatch.setattr(preview_module.focus, "focus_hfd", lambda _image: result)
-
-    preview._measure_focus(np.zeros((512, 512), dtype=np.uint8), record_history=False)
+    preview._apply_focus_result(result)
 
     assert preview._focus_slot_catalog_ids == (1, 2, None, 4)
 
 
+def _worker_preview():
+    preview = object.__new__(UIPreview)
+    preview._tracked_focus_blobs = ()
+    preview._focus_slot_catalog_ids = ()
+    preview._last_focus_catalog_time = 0.0
+    preview._last_focus_frame_time = 0.0
+    preview._focus_seq = 0
+    preview._camera_np = None
+    preview._focus_np = None
+    preview.focus_history = deque()
+    preview.shared_state = SimpleNamespace(solve_matches=lambda: None)
+    return preview
+
+
+def _focus_result() -> FocusResult:
+    return FocusResult(
+        median_hfd=5.0,
+        n_used=1,
+        background=10.0,
+        peak=200.0,
+        too_defocused=False,
+        blobs=(_blob(),),
+    )
+
+
+@pytest.mark.unit
+def test_worker_measurements_are_adopted_once_and_recorded_once_per_frame():
+    preview = _worker_preview()
+    result = _focus_result()
+    frame = np.zeros((8, 8), dtype=np.uint8)
+    snapshots = iter(
+        (
+            None,
+            FocusSnapshot(1, 42.0, frame, result),
+            FocusSnapshot(1, 42.0, frame, result),
+            FocusSnapshot(2, 43.0, frame, result),
+        )
+    )
+    preview.focus_worker = SimpleNamespace(latest=lambda: next(snapshots))
+
+    assert not preview._collect_focus_result()
+    assert preview._collect_focus_result()
+    assert preview.last_focus_result is result
+    assert preview._tracked_focus_blobs == (_blob(),)
+    assert preview._focus_np is frame
+    assert len(preview.focus_history) == 1
+    assert not preview._collect_focus_result()
+    assert len(preview.focus_history) == 1
+    assert preview._collect_focus_result()
+    assert len(preview.focus_history) == 2
+
+
+@pytest.mark.unit
+def test_star_tiles_are_cut_from_the_measured_frame():
+    preview = _worker_preview()
+    preview.display_mode = DISPLAY_STARS
+    preview.last_update = 0.0
+    preview.screen = Image.new("RGB", (128, 128))
+    preview.screen_update = lambda: None
+    preview._draw_focus_overlay = lambda: None
+    preview._draw_status_bar = lambda: None
+    rendered = []
+
+    def render(raw_image):
+        rendered.append(int(np.asarray(raw_image)[0, 0]))
+        return Image.new("RGB", (128, 128))
+
+    preview._render_focus_tiles = render
+
+    metadata = {"exposure_end": 1.0}
+    preview.shared_state.last_image_metadata = lambda: metadata
+    preview.camera_image = Image.new("L", (16, 16), 1)
+    submitted = []
+    latest = [None]
+    preview.focus_worker = SimpleNamespace(
+        submit=lambda frame_time, np_image: submitted.append(frame_time)
+        or len(submitted),
+        latest=lambda: latest[0],
+    )
+
+    # Nothing measured yet: the new frame is shown, with no blobs to crop
+    preview.update()
+    assert rendered == [1]
+    first_frame = preview._camera_np
+
+    # The first frame's blobs arrive after the camera moved on
+    latest[0] = FocusSnapshot(1, 1.0, first_frame, _focus_result())
+    metadata["exposure_end"] = 2.0
+    preview.camera_image = Image.new("L", (16, 16), 2)
+    preview.update()
+    assert rendered == [1, 1]
+
+    # A forced redraw repaints from the same measured frame, re-measuring
+    # nothing
+    preview.update(force=True)
+    assert rendered == [1, 1, 1]
+    assert submitted == [1.0, 2.0]
+
+    # The second frame's measurement brings its own pixels
+    latest[0] = FocusSnapshot(2, 2.0, preview._camera_np, _focus_result())
+    preview.update()
+    assert rendered == [1, 1, 1, 2]
+
+
 @pytest.mark.unit
 @pytest.mark.parametrize("layout", (DisplayBase, Layout176, Layout320))
 def test_quadrants_are_centered_below_title_bar_on_every_layout(layout):
@@ -0,0 +1,194 @@
+"""
+Unit tests for web image encoding: the selectable formats, 16-bit camera
+frames, the single-flight encode cache, and /api/camera/raw sharing one
+encode per camera frame across clients.
+"""
+
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+from PIL import Image
+
+from PiFinder import api_extensions
+from PiFinder.api_extensions import register_api_routes
+from PiFinder.image_encoding import EncodedImageCache, encode, parse_format
+
+pytestmark = pytest.mark.unit
+
+
+def _screen():
+    image = Image.new("RGB", (128, 128))
+    image.paste((200, 0, 0), (10, 10, 60, 60))
+    return image
+
+
+def _camera_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 1024, (64, 96), dtype=np.uint16)  # 10-bit sensor
+
+
+class TestFormats:
+    def test_parse(self):
+        assert parse_format(None) == "png"
+        assert parse_format("JPG") == "jpeg"
+        with pytest.raises(ValueError):
+            parse_format("gif")
+
+    @pytest.mark.parametrize("fmt", ["png", "png1"])
+    def test_png_levels_are_lossless(self, fmt):
+        encoded = encode(_screen(), fmt)
+        assert encoded.content_type == "image/png"
+        assert Image.open(io.BytesIO(encoded.data)).tobytes() == _screen().tobytes()
+
+    def test_jpeg(self):
+        encoded = encode(_screen(), "jpeg")
+        assert encoded.content_type == "image/jpeg"
+        assert Image.open(io.BytesIO(encoded.data)).size == (128, 128)
+
+    def test_raw_image_headers(self):
+        encoded = encode(_screen(), "raw")
+        assert encoded.headers == {"X-Width": "128", "X-Height": "128", "X-Mode": "RGB"}
+        assert encoded.data == _screen().tobytes()
+
+    def test_camera_png_keeps_16_bits(self):
+        frame = _camera_frame()
+        decoded = Image.open(io.BytesIO(encode(frame, "png").data))
+        np.testing.assert_array_equal(np.asarray(decoded), frame)
+
+    def test_camera_jpeg_uses_top_8_bits(self):
+        decoded = Image.open(io.BytesIO(encode(_camera_frame(), "jpeg").data))
+        assert decoded.mode == "L"
+        assert np.asarray(decoded).max() > 200
+
+    def test_camera_raw_is_native(self):
+        frame = _camera_frame()
+        encoded = encode(frame, "raw")
+        assert encoded.headers["X-Dtype"] == "<u2"
+        assert encoded.data == frame.tobytes()
+
+
+class TestCache:
+    def test_concurrent_requests_share_one_encode(self):
+        cache = EncodedImageCache()
+        calls = []
+
+        def source():
+            calls.append(1)
+            time.sleep(0.05)
+            return _screen()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get(7, "png", source)))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_formats_and_frames_are_separate(self):
+        cache = EncodedImageCache(maxsize=2)
+        calls = []
+
+        def source():
+            calls.append(1)
+            return _screen()
+
+        cache.get(1, "png", source)
+        cache.get(1, "jpeg", source)
+        cache.get(1, "png", source)
+        cache.get(2, "png", source)  # evicts (1, jpeg)
+        cache.get(1, "jpeg", source)
+        assert len(calls) == 4
+
+    def test_failures_are_not_cached(self):
+        cache = EncodedImageCache()
+
+        def missing():
+            raise LookupError("no frame")
+
+        with pytest.raises(LookupError):
+            cache.get(1, "png", missing)
+        assert cache.get(1, "png", _screen).content_type == "image/png"
+
+    def test_latest_fetches_only_on_a_miss(self):
+        cache = EncodedImageCache()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return 1, _screen()
+
+        assert cache.latest(lambda: 1, "png", fetch)[0] == 1
+        assert cache.latest(lambda: 1, "png", fetch)[0] == 1
+        assert len(fetches) == 1
+
+    def test_latest_keys_on_the_fetched_frame(self):
+        cache = EncodedImageCache()
+        # The source moved on from frame 1 to 2 between the two reads
+        key, encoded = cache.latest(lambda: 1, "png", lambda: (2, _screen()))
+        assert key == 2
+        assert cache.latest(lambda: 2, "png", pytest.fail) == (2, encoded)
+        assert cache.latest(lambda: 1, "png", lambda: None) is None
+
+
+class _SharedState:
+    def __init__(self):
+        self.raw = _camera_frame()
+        self.sequence = 1
+        self.raw_reads = 0
+
+    def cam_raw_sequence(self):
+        return self.sequence
+
+    def cam_raw_frame(self):
+        self.raw_reads += 1
+        return self.sequence, self.raw
+
+
+class _Server:
+    def __init__(self):
+        self.shared_state = _SharedState()
+
+
+class TestCameraRaw:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(
+            api_extensions, "_CAMERA_RAW_ENCODES", EncodedImageCache(maxsize=4)
+        )
+        server = _Server()
+        app = Flask(__name__)
+        register_api_routes(app, server)
+        return app.test_client(), server.shared_state
+
+    def test_one_fetch_and_encode_per_frame(self, client):
+        client, shared_state = client
+        first = client.get("/api/camera/raw")
+        second = client.get("/api/camera/raw")
+        assert first.status_code == 200
+        assert first.data == second.data
+        assert shared_state.raw_reads == 1
+
+        shared_state.sequence = 2
+        client.get("/api/camera/raw")
+        assert shared_state.raw_reads == 2
+
+    def test_format_parameter(self, client):
+        client, shared_state = client
+        response = client.get("/api/camera/raw?format=raw")
+        assert response.headers["X-Width"] == "96"
+        assert response.data == shared_state.raw.tobytes()
+        assert client.get("/api/camera/raw?format=gif").status_code == 400
+
+    def test_no_frame_yet(self, client):
+        client, shared_state = client
+        shared_state.raw = None
+        assert client.get("/api/camera/raw").status_code == 503
@@ -0,0 +1,201 @@
+"""
+Unit tests for the tiled POSS image pyramids: container round trip, region
+reads at the image edge, the decoded-tile LRU, level selection, and the
+oriented view against the full-image pipeline it replaces.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from PiFinder import image_pyramid
+from PiFinder.image_pyramid import (
+    TILE,
+    Pyramid,
+    TileCache,
+    build_missing,
+    build_pyramid,
+    encode_pyramid,
+    oriented_view,
+    pyramid_path,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    rng = np.random.default_rng(1)
+    pixels = rng.normal(40, 10, (1024, 1024)).clip(0, 255)
+    for x, y in rng.integers(2, 1022, (300, 2)):
+        pixels[y - 2 : y + 3, x - 2 : x + 3] = 255
+    pixels[500:524, 300:700] = 200
+    path = tmp_path / "M31_POSS.jpg"
+    Image.fromarray(pixels.astype(np.uint8)).save(path, quality=90)
+    yield str(path)
+    image_pyramid.tile_cache.clear()
+    image_pyramid._PYRAMIDS.clear()
+
+
+def _full_image_view(path, fov, rotate, flip, flop, resolution):
+    image = Image.open(path).rotate(rotate)
+    if flip:
+        image = image.transpose(Image.FLIP_TOP_BOTTOM)
+    if flop:
+        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+    half = int(image.size[0] * fov / 2)
+    center = image.size[0] // 2
+    image = image.crop((center - half, center - half, center + half, center + half))
+    return image.resize((resolution, resolution), Image.LANCZOS)
+
+
+def test_levels_round_trip(image_path):
+    pyramid = Pyramid.open(build_pyramid(image_path))
+    assert pyramid.sizes == [(1024, 1024), (512, 512), (256, 256), (128, 128)]
+
+    source = np.asarray(Image.open(image_path), dtype=float)
+    full = pyramid.region(0, 0, 0, 1024).astype(float)
+    assert np.abs(full - source).mean() < 3
+
+
+def test_region_pads_outside_the_image(image_path):
+    pyramid = Pyramid(encode_pyramid(Image.open(image_path)), "mem")
+    block = pyramid.region(3, -10, 100, 40)
+    assert block.shape == (40, 40)
+    assert not block[:, :10].any()
+    assert not block[28:, :].any()
+    assert block[:28, 10:].any()
+    assert not pyramid.region(0, 2000, 2000, 16).any()
+
+
+def test_decoded_tiles_are_reused(image_path, monkeypatch):
+    pyramid = Pyramid.open(build_pyramid(image_path))
+    cache = TileCache(maxsize=2)
+    monkeypatch.setattr(image_pyramid, "tile_cache", cache)
+    reads = []
+    tile_bytes = pyramid.tile_bytes
+
+    def counting(*args):
+        reads.append(args)
+        return tile_bytes(*args)
+
+    monkeypatch.setattr(pyramid, "tile_bytes", counting)
+    pyramid.region(0, 0, 0, TILE)
+    pyramid.region(0, 0, 0, TILE)
+    assert len(reads) == 1
+
+    # Two more tiles push the first one out of the two-tile cache
+    pyramid.region(0, TILE, 0, TILE)
+    pyramid.region(0, 2 * TILE, 0, TILE)
+    assert len(cache._tiles) == 2
+    pyramid.region(0, 0, 0, TILE)
+    assert len(reads) == 4
+
+
+@pytest.mark.parametrize(
+    "fov,rotate,flip,flop",
+    [
+        (1.0, 180, False, False),
+        (0.5, 200, True, False),
+        (0.125, 237, False, True),
+        (0.3, 90, True, True),
+    ],
+)
+def test_matches_full_image_pipeline(image_path, fov, rotate, flip, flop):
+    build_pyramid(image_path)
+    view = oriented_view(image_path, fov, rotate, flip, flop, 128)
+    expected = _full_image_view(image_path, fov, rotate, flip, flop, 128)
+    assert view.size == (128, 128)
+    assert view.mode == "L"
+    view, expected = np.asarray(view, float), np.asarray(expected, float)
+    assert np.corrcoef(view.ravel(), expected.ravel())[0, 1] > 0.95
+
+
+def test_wide_fields_use_a_coarser_level(image_path, monkeypatch):
+    levels = []
+    region = Pyramid.region
+
+    def recording(self, level, *args):
+        levels.append(level)
+        return region(self, level, *args)
+
+    monkeypatch.setattr(Pyramid, "region", recording)
+    build_pyramid(image_path)
+    oriented_view(image_path, 1.0, 0, False, False, 128)
+    oriented_view(image_path, 0.5, 0, False, False, 128)
+    oriented_view(image_path, 0.1, 0, False, False, 128)
+    assert levels == [3, 2, 0]
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """The background build threads started by the views under test."""
+    threads = []
+    start = image_pyramid.build_in_background
+
+    def recording(path):
+        thread = start(path)
+        if thread is not None:
+            threads.append(thread)
+        return thread
+
+    monkeypatch.setattr(image_pyramid, "build_in_background", recording)
+    return threads
+
+
+def test_first_view_uses_the_full_image_while_building(image_path, builds, monkeypatch):
+    regions = []
+    monkeypatch.setattr(Pyramid, "region", lambda *args: regions.append(args))
+    view = oriented_view(image_path, 0.5, 0, False, False, 64)
+    assert view.size == (64, 64)
+    assert view.mode == "L"
+    assert regions == []
+
+    assert len(builds) == 1
+    builds[0].join()
+    assert os.path.exists(pyramid_path(image_path))
+    assert build_missing(os.path.dirname(image_path)) == 0
+
+
+def test_fallback_matches_full_image_pipeline(image_path, builds):
+    view = oriented_view(image_path, 0.3, 90, True, True, 128)
+    expected = _full_image_view(image_path, 0.3, 90, True, True, 128)
+    assert np.array_equal(np.asarray(view), np.asarray(expected.convert("L")))
+    builds[0].join()
+
+
+def test_one_build_per_image(image_path, builds, monkeypatch):
+    started = []
+    monkeypatch.setattr(image_pyramid, "_build", started.append)
+    oriented_view(image_path, 0.5, 0, False, False, 64)
+    builds[0].join()
+    # The first build never finished, so a second view doesn't start another
+    oriented_view(image_path, 0.5, 0, False, False, 64)
+    assert started == [image_path]
+    assert len(builds) == 1
+    image_pyramid._BUILDING.clear()
+
+
+def test_read_only_directory_falls_back_to_memory(image_path, builds, monkeypatch):
+    def read_only(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(image_pyramid, "build_pyramid", read_only)
+    oriented_view(image_path, 0.5, 45, False, False, 64)
+    builds[0].join()
+
+    regions = []
+    region = Pyramid.region
+
+    def recording(self, *args):
+        regions.append(args)
+        return region(self, *args)
+
+    monkeypatch.setattr(Pyramid, "region", recording)
+    view = oriented_view(image_path, 0.5, 45, False, False, 64)
+    assert view.size == (64, 64)
+    assert regions
+    assert len(builds) == 1
+    assert not os.path.exists(pyramid_path(image_path))
@@ -0,0 +1,163 @@
+"""
+Unit tests for the shared-memory IMU ring: round trip, cursors, overwrite
+of old samples, interpolation at exact times, and the integrator's
+fallback to shared state.
+
+Each test gets its own segment name so a running PiFinder (or a parallel
+test) is never touched.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+import quaternion
+
+from PiFinder import imu_ring
+from PiFinder.imu_ring import ImuRingReader, ImuRingWriter, interpolate
+from PiFinder.integrator import _read_imu
+from PiFinder.pointing_model.quaternion_transforms import get_quat_angular_diff
+from PiFinder.types.positioning import ImuSample
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    monkeypatch.setattr(
+        imu_ring, "IMU_RING_SHMEM_NAME", f"pifinder_test_{uuid.uuid4().hex[:8]}"
+    )
+    ring = ImuRingWriter()
+    yield ring
+    ring.close()
+
+
+def _about_z(degrees):
+    """Rotation about z by ``degrees``, as a unit quaternion."""
+    half = np.deg2rad(degrees) / 2
+    return quaternion.quaternion(np.cos(half), 0.0, 0.0, np.sin(half))
+
+
+def _sample(t, degrees=0.0, **kwargs):
+    return ImuSample(quat=_about_z(degrees), timestamp=t, status=3, **kwargs)
+
+
+def test_round_trip(writer):
+    assert writer.append(
+        _sample(10.0, 30.0, moving=True, gyro=(0.1, 0.2, 0.3), accel=(1, 2, 3))
+    )
+    assert writer.append(_sample(10.1, 31.0))
+    reader = ImuRingReader()
+    assert reader.count() == 2
+
+    first = reader.samples_since(0)[0][0]
+    assert first.timestamp == 10.0
+    assert first.quat == _about_z(30.0)
+    assert (first.status, first.moving) == (3, True)
+    assert first.gyro == (0.1, 0.2, 0.3)
+    assert first.accel == (1.0, 2.0, 3.0)
+
+    latest = reader.latest()
+    assert latest.timestamp == 10.1
+    assert (latest.moving, latest.gyro, latest.accel) == (False, None, None)
+
+
+def test_samples_since_cursor(writer):
+    reader = ImuRingReader()
+    assert reader.samples_since(0) == ([], 0)
+    for i in range(3):
+        writer.append(_sample(float(i)))
+    samples, cursor = reader.samples_since(0)
+    assert [s.timestamp for s in samples] == [0.0, 1.0, 2.0]
+    assert reader.samples_since(cursor) == ([], 3)
+
+    writer.append(_sample(3.0))
+    samples, cursor = reader.samples_since(cursor)
+    assert [s.timestamp for s in samples] == [3.0]
+    assert cursor == 4
+
+
+def test_overwritten_samples_are_skipped(writer):
+    reader = ImuRingReader()
+    for i in range(imu_ring.CAPACITY + 10):
+        writer.append(_sample(float(i)))
+    samples, cursor = reader.samples_since(0)
+    assert len(samples) == imu_ring.CAPACITY
+    assert samples[0].timestamp == 10.0
+    assert cursor == imu_ring.CAPACITY + 10
+
+
+def test_writer_restart_resets_cursor(writer):
+    reader = ImuRingReader()
+    for i in range(5):
+        writer.append(_sample(float(i)))
+    _, cursor = reader.samples_since(0)
+    writer.close()
+
+    restarted = ImuRingWriter()
+    try:
+        restarted.append(_sample(100.0))
+        samples, cursor = reader.samples_since(cursor)
+        assert [s.timestamp for s in samples] == [100.0]
+        assert cursor == 1
+    finally:
+        restarted.close()
+
+
+class TestSampleAt:
+    def test_interpolates_between_samples(self, writer):
+        for t, degrees in [(1.0, 0.0), (1.1, 10.0), (1.2, 20.0)]:
+            writer.append(_sample(t, degrees))
+        sample = ImuRingReader().sample_at(1.125)
+        assert sample.timestamp == 1.125
+        assert np.rad2deg(
+            get_quat_angular_diff(sample.quat, _about_z(12.5))
+        ) == pytest.approx(0, abs=1e-6)
+
+    def test_clamps_outside_the_ring(self, writer):
+        writer.append(_sample(1.0, 0.0))
+        writer.append(_sample(2.0, 10.0))
+        reader = ImuRingReader()
+        assert reader.sample_at(0.5).timestamp == 1.0
+        assert reader.sample_at(5.0).timestamp == 2.0
+        assert reader.sample_at(2.0).quat == _about_z(10.0)
+
+    def test_unavailable_ring(self, writer):
+        assert ImuRingReader().sample_at(1.0) is None
+
+    def test_takes_the_short_way_round(self):
+        earlier = _sample(0.0, 10.0)
+        later = _sample(1.0, 20.0)
+        later.quat = -later.quat
+        mid = interpolate(earlier, later, 0.5)
+        assert np.rad2deg(
+            get_quat_angular_diff(mid.quat, _about_z(15.0))
+        ) == pytest.approx(0, abs=1e-6)
+
+    def test_placeholder_quaternion(self):
+        earlier = ImuSample(quat=quaternion.quaternion(0, 0, 0, 0), timestamp=0.0)
+        later = _sample(1.0, 20.0, moving=True)
+        mid = interpolate(earlier, later, 0.5)
+        assert mid.quat == later.quat
+        assert mid.moving
+
+
+class _SharedState:
+    def __init__(self, sample):
+        self.sample = sample
+
+    def imu(self):
+        return self.sample
+
+
+def test_integrator_falls_back_to_shared_state(writer):
+    reader = ImuRingReader()
+    fallback = _sample(5.0)
+    assert _read_imu(reader, 0, _SharedState(fallback)) == ([fallback], 0)
+    assert _read_imu(reader, 0, _SharedState(None)) == ([], 0)
+
+    writer.append(_sample(6.0))
+    writer.append(_sample(6.1))
+    samples, cursor = _read_imu(reader, 0, _SharedState(fallback))
+    assert [s.timestamp for s in samples] == [6.0, 6.1]
+    assert cursor == 2
@@ -0,0 +1,203 @@
+"""
+Unit tests for the shared log follower behind /logs/stream and
+/logs/events: tail seeding, partial lines, rotation, cursors, server-side
+filters, and the long-poll and event-stream responses.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from PiFinder.log_follower import (
+    LogFollower,
+    log_events_response,
+    log_stream_response,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _record(level, name, message, process="MainProcess"):
+    return f"2026-01-01 12:00:00,000 {process}-{name}:{level}:{message}\n"
+
+
+def _write(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "pifinder.log"
+    path.write_text("")
+    return str(path)
+
+
+def test_seeds_only_the_tail_of_a_large_file(log_path):
+    _write(log_path, "".join(f"line {i:04d}\n" for i in range(1000)))
+    follower = LogFollower(log_path, tail_bytes=100)
+    follower.read_available()
+    logs, cursor = follower.lines_after(0)
+    assert logs[-1] == "line 0999"
+    assert "line 0000" not in logs
+    assert all(line.startswith("line ") for line in logs)  # no torn first line
+    assert cursor == len(logs)
+
+
+def test_appended_lines_and_partial_line(log_path):
+    follower = LogFollower(log_path)
+    follower.read_available()
+    _write(log_path, "one\ntw")
+    follower.read_available()
+    logs, cursor = follower.lines_after(0)
+    assert logs == ["one"]
+
+    _write(log_path, "o\nthree\n")
+    follower.read_available()
+    logs, cursor = follower.lines_after(cursor)
+    assert logs == ["two", "three"]
+    assert follower.lines_after(cursor) == ([], cursor)
+
+
+def test_rotation_reopens_from_the_start(log_path):
+    follower = LogFollower(log_path)
+    _write(log_path, "before\n")
+    follower.read_available()
+    _, cursor = follower.lines_after(0)
+
+    os.rename(log_path, log_path + ".1")
+    _write(log_path, "after\n")
+    follower.read_available()
+    assert follower.lines_after(cursor) == (["after"], cursor + 1)
+
+
+def test_missing_file_is_reported_and_picked_up(tmp_path):
+    path = str(tmp_path / "pifinder.log")
+    follower = LogFollower(path)
+    follower.read_available()
+    assert not follower.file_found
+    _write(path, "hello\n")
+    follower.read_available()
+    assert follower.file_found
+    assert follower.lines_after(0)[0] == ["hello"]
+
+
+def test_level_and_logger_filters(log_path):
+    _write(
+        log_path,
+        _record("DEBUG", "Solver", "tick")
+        + _record("ERROR", "Solver", "failed")
+        + "Traceback (most recent call last):\n"
+        + "ValueError: boom\n"
+        + _record("WARNING", "Server.Logs", "slow")
+        + _record("ERROR", "SolverX", "other"),
+    )
+    follower = LogFollower(log_path)
+    follower.read_available()
+
+    logs, _ = follower.lines_after(0, level="error", logger_name="Solver")
+    assert logs[0].endswith("failed")
+    assert logs[1:] == ["Traceback (most recent call last):", "ValueError: boom"]
+
+    logs, _ = follower.lines_after(0, level="WARNING", logger_name="Server")
+    assert len(logs) == 1 and logs[0].endswith("slow")
+
+
+def test_filtered_requests_still_advance_the_cursor(log_path):
+    follower = LogFollower(log_path)
+    _write(log_path, _record("DEBUG", "Solver", "tick"))
+    follower.read_available()
+    assert follower.lines_after(0, level="INFO") == ([], 1)
+
+
+def test_stale_cursor_restarts_from_the_ring(log_path):
+    follower = LogFollower(log_path)
+    _write(log_path, "a\nb\n")
+    follower.read_available()
+    # A cursor handed out before a server restart
+    assert follower.lines_after(500) == (["a", "b"], 2)
+
+
+def test_ring_is_bounded(log_path):
+    follower = LogFollower(log_path, capacity=3)
+    _write(log_path, "".join(f"{i}\n" for i in range(10)))
+    follower.read_available()
+    assert follower.lines_after(0) == (["7", "8", "9"], 10)
+
+
+def test_wait_wakes_on_new_lines(log_path):
+    follower = LogFollower(log_path)
+    _write(log_path, "first\n")
+    follower.read_available()
+
+    def append_later():
+        time.sleep(0.05)
+        _write(log_path, "second\n")
+        follower.read_available()
+
+    threading.Thread(target=append_later).start()
+    start = time.monotonic()
+    assert follower.wait(follower.cursor, timeout=2)
+    assert time.monotonic() - start < 1
+    assert not follower.wait(follower.cursor, timeout=0.01)
+
+
+class TestResponses:
+    @pytest.fixture
+    def client(self, log_path):
+        follower = LogFollower(log_path, poll_interval=0.02)
+        app = Flask(__name__)
+        app.add_url_rule(
+            "/logs/stream", "stream", lambda: log_stream_response(follower)
+        )
+        app.add_url_rule(
+            "/logs/events", "events", lambda: log_events_response(follower)
+        )
+        return app.test_client(), log_path
+
+    def test_long_poll(self, client):
+        client, log_path = client
+        _write(log_path, _record("INFO", "Main", "up"))
+        data = client.get("/logs/stream").get_json()
+        assert len(data["logs"]) == 1 and data["cursor"] == 1
+        assert "file_not_found" not in data
+
+        threading.Timer(0.1, _write, (log_path, "next\n")).start()
+        start = time.monotonic()
+        data = client.get("/logs/stream?cursor=1&wait=5").get_json()
+        assert data == {"logs": ["next"], "cursor": 2, "position": 2}
+        assert time.monotonic() - start < 2
+
+    def test_position_is_an_alias_for_cursor(self, client):
+        client, log_path = client
+        _write(log_path, "a\nb\n")
+        data = client.get("/logs/stream?position=1").get_json()
+        assert data == {"logs": ["b"], "cursor": 2, "position": 2}
+        # A byte offset from the old endpoint restarts from the tail
+        data = client.get("/logs/stream?position=4096").get_json()
+        assert data["logs"] == ["a", "b"]
+
+    def test_event_stream(self, client):
+        client, log_path = client
+        _write(log_path, "a\nb\n")
+        response = client.get("/logs/events")
+        assert response.mimetype == "text/event-stream"
+        chunks = response.response
+        assert next(chunks) == f"id: 2\ndata: {json.dumps(['a', 'b'])}\n\n".encode()
+
+        _write(log_path, "c\n")
+        assert next(chunks) == f"id: 3\ndata: {json.dumps(['c'])}\n\n".encode()
+        response.close()
+
+    def test_event_stream_resumes_from_last_event_id(self, client):
+        client, log_path = client
+        _write(log_path, "a\nb\nc\n")
+        response = client.get("/logs/events", headers={"Last-Event-ID": "2"})
+        assert (
+            next(response.response) == f"id: 3\ndata: {json.dumps(['c'])}\n\n".encode()
+        )
+        response.close()
@@ -1,5 +1,6 @@
 import pytest
 import tempfile
+import time
 import os
 import logging
 import PiFinder.multiproclogging as mpl
@@ -155,3 +156,74 @@ def test_beforestart():
         assert "Another msg" in str
         # print(str)
         # assert False
+
+
+SINK_CONFIG = """
+{
+    "version": 1,
+    "disable_existing_loggers": false,
+    "loggers": {"": {"handlers": []}, "Quiet": {"level": "WARNING"}}
+}
+"""
+
+
+def log_burst(q: Queue):
+    mpl.MultiprocLogging.configurer(q)
+    logging.getLogger().setLevel(logging.DEBUG)
+    logging.getLogger("Quiet").info("filtered by the parsed config")
+    for i in range(2000):
+        logging.getLogger("Burst").info("record %d", i)
+    logging.getLogger("Burst").error("last one")
+
+
+def _wait_for(path, text, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path) and text in open(path).read():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_children_use_the_parsed_config(tmp_path, monkeypatch):
+    # No pifinder_logconf.json here: children must not need to read it
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mpl.MultiprocLogging, "_config", None)
+    logging.getLogger().setLevel(logging.DEBUG)
+    log_file = str(tmp_path / "test.log")
+    Mpl = mpl.MultiprocLogging(out_file=log_file)
+    Mpl.read_config(StringIO(SINK_CONFIG))
+    q = Mpl.get_queue()
+    Mpl.start()
+    try:
+        logProc = Process(name="Burst", target=log_burst, args=(q,))
+        logProc.start()
+        logProc.join()
+        assert logProc.exitcode == 0
+        # An ERROR record is written without waiting for the flush interval
+        assert _wait_for(log_file, "last one", timeout=mpl.FLUSH_INTERVAL / 2)
+    finally:
+        Mpl.join()
+    lines = open(log_file).read().splitlines()
+    burst = [line for line in lines if "Burst-Burst" in line]
+    assert len(burst) == 2001
+    assert burst[0].endswith("record 0") and burst[1999].endswith("record 1999")
+    assert "filtered by the parsed config" not in "\n".join(lines)
+
+
+def test_buffered_records_are_flushed_periodically(tmp_path, monkeypatch):
+    monkeypatch.setattr(mpl.MultiprocLogging, "_config", None)
+    logging.getLogger().setLevel(logging.DEBUG)
+    log_file = str(tmp_path / "test.log")
+    Mpl = mpl.MultiprocLogging(out_file=log_file)
+    Mpl.read_config(StringIO(SINK_CONFIG))
+    q = Mpl.get_queue()
+    Mpl.start()
+    try:
+        logProc = Process(name="Proc1", target=log_a_thing, args=(q,))
+        logProc.start()
+        logProc.join()
+        # Written before join() stops the sink
+        assert _wait_for(log_file, "A thing", timeout=mpl.FLUSH_INTERVAL + 1.0)
+    finally:
+        Mpl.join()
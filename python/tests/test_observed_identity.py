@@ -25,6 +25,13 @@ class MappedObservationsDatabase(ObservationsDatabase):
     def _resolve_object_id(self, catalog, sequence):
         return LISTING_TO_OBJECT_ID.get((catalog, sequence))
 
+    def _resolve_object_ids(self, listings):
+        return {
+            listing: LISTING_TO_OBJECT_ID[listing]
+            for listing in listings
+            if listing in LISTING_TO_OBJECT_ID
+        }
+
     def _resolve_listings(self, object_id):
         return [
             listing for listing, oid in LISTING_TO_OBJECT_ID.items() if oid == object_id
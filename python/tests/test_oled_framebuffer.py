@@ -0,0 +1,149 @@
+"""
+Unit tests for dirty-rectangle OLED updates: the NumPy frame diff, the
+RGB565 packing (checked against luma's own per-pixel loop) and what the
+SSD1333 driver actually sends over a recording serial interface.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from PiFinder.oled_framebuffer import changed_windows, rgb565
+from PiFinder.ssd1333_device import ssd1333
+
+pytestmark = pytest.mark.unit
+
+
+class RecordingSerial:
+    """Stand-in SPI interface: records the windows and bytes sent, and
+    writes them into a model of the controller's display RAM."""
+
+    def __init__(self, width=176, height=176):
+        self.ram = np.zeros((height, width, 2), dtype=np.uint8)
+        self.windows = []
+        self.sent = 0
+        self._columns = None
+
+    def command(self, *cmd):
+        self._last = cmd[0]
+
+    def data(self, data):
+        if self._last == 0x15:
+            self._columns = tuple(data)
+        elif self._last == 0x75:
+            self.windows.append(self._columns + tuple(data))
+        elif self._last == 0x5C:
+            left, right, top, bottom = self.windows[-1]
+            self.ram[top : bottom + 1, left : right + 1] = np.array(
+                data, dtype=np.uint8
+            ).reshape(bottom - top + 1, right - left + 1, 2)
+            self.sent += len(data)
+
+    def reset(self):
+        self.windows = []
+        self.sent = 0
+
+
+def _luma_rgb565(image):
+    # luma.oled color_device.display()'s packing loop
+    buf = bytearray(image.width * image.height * 2)
+    i = 0
+    for r, g, b in image.getdata():
+        if not r == g == b == 0:
+            buf[i] = r & 0xF8 | g >> 5
+            buf[i + 1] = g << 3 & 0xE0 | b >> 3
+        i += 2
+    return bytes(buf)
+
+
+def _screen(fps="12.0"):
+    image = Image.new("RGB", (176, 176))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 175, 16), fill=(64, 0, 0))
+    draw.text((140, 2), fps, fill=(255, 0, 0))
+    draw.text((10, 80), "M 57 Ring Nebula", fill=(192, 0, 0))
+    return image
+
+
+def test_rgb565_matches_luma():
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (16, 24, 3), dtype=np.uint8)
+    pixels[3, 4] = 0
+    image = Image.fromarray(pixels, "RGB")
+    assert rgb565(pixels).tobytes() == _luma_rgb565(image)
+
+
+def test_no_change_no_windows():
+    frame = np.asarray(_screen())
+    assert changed_windows(frame, frame.copy()) == []
+
+
+def test_windows_bound_changes():
+    previous = np.zeros((176, 176, 3), dtype=np.uint8)
+    current = previous.copy()
+    current[2:10, 140:160] = 255
+    current[12, 150] = 255  # within the merge gap: same window
+    current[100:104, 20:30] = 255
+    assert changed_windows(previous, current) == [
+        (140, 2, 160, 13),
+        (20, 100, 30, 104),
+    ]
+
+
+@pytest.fixture
+def device():
+    serial = RecordingSerial()
+    oled = ssd1333(serial, width=176, height=176, rotate=3, bgr=True)
+    serial.reset()
+    return oled, serial
+
+
+def test_first_frame_is_sent_whole(device):
+    oled, serial = device
+    oled.invalidate()
+    oled.display(_screen())
+    assert serial.windows == [(0, 175, 0, 175)]
+    assert serial.sent == 176 * 176 * 2
+
+
+def test_title_bar_tick_sends_only_its_window(device):
+    oled, serial = device
+    oled.display(_screen("12.0"))
+    serial.reset()
+
+    oled.display(_screen("12.0"))
+    assert serial.windows == [] and serial.sent == 0
+
+    oled.display(_screen("12.5"))
+    assert len(serial.windows) == 1
+    assert 0 < serial.sent < 176 * 176 * 2 // 10
+
+
+def test_partial_updates_leave_panel_as_full_redraw(device):
+    oled, serial = device
+    for fps in ("12.0", "12.5", "99.9", "8.1"):
+        oled.display(_screen(fps))
+    expected = _luma_rgb565(oled.preprocess(_screen("8.1")))
+    assert serial.ram.tobytes() == expected
+
+
+def test_controller_init_resends_whole_frame(device):
+    oled, serial = device
+    oled.display(_screen())
+    serial.reset()
+
+    oled._init_sequence()
+    serial.reset()
+    oled.display(_screen())
+    assert serial.windows == [(0, 175, 0, 175)]
+    assert serial.sent == 176 * 176 * 2
+
+
+def test_ssd1351_init_invalidates():
+    from PiFinder.displays import _ssd1351
+
+    oled = _ssd1351(RecordingSerial(128, 128), width=128, height=128)
+    oled.display(Image.new("RGB", (128, 128), (255, 0, 0)))
+    assert oled._sent_frame is not None
+    oled._init_sequence()
+    assert oled._sent_frame is None
@@ -0,0 +1,91 @@
+"""
+Unit tests for the batched planet positions: agreement with per-body
+Skyfield, the accuracy of a Chebyshev track, and how Skyfield_utils keeps
+its track for "now".
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+from skyfield.magnitudelib import planetary_magnitude
+
+from PiFinder.calc_utils import Skyfield_utils
+from PiFinder.telemetry_analyze import angular_separation
+
+pytestmark = pytest.mark.unit
+
+DT = datetime.datetime(2025, 3, 1, 21, 0, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def sf():
+    sf = Skyfield_utils()
+    sf.set_location(50.0, 5.0, 100.0)
+    return sf
+
+
+def test_positions_match_skyfield(sf):
+    t = sf.ts.from_datetime(DT)
+    positions = sf._planet_ephemeris.positions(t)
+    observer = sf.observer_loc.at(t)
+    for i, body in enumerate(sf.planets):
+        apparent = observer.observe(body).apparent()
+        ra, dec, _ = apparent.radec()
+        alt, az, _ = apparent.altaz()
+        assert positions.ra[i] == pytest.approx(ra._degrees, abs=1e-9)
+        assert positions.dec[i] == pytest.approx(dec.degrees, abs=1e-9)
+        assert positions.alt[i] == pytest.approx(alt.degrees, abs=1e-9)
+        assert positions.az[i] == pytest.approx(az.degrees, abs=1e-9)
+        try:
+            assert positions.mag[i] == pytest.approx(planetary_magnitude(apparent))
+        except ValueError:
+            assert np.isnan(positions.mag[i])
+
+
+def test_track_matches_direct_evaluation(sf):
+    start = sf.ts.from_datetime(DT)
+    track = sf._planet_ephemeris.track(start, hours=4.0)
+    times = sf.ts.tt_jd(start.tt + np.linspace(0, 4 / 24, 50))
+    assert track.covers(times)
+    assert not track.covers(sf.ts.tt_jd(start.tt + 5 / 24))
+
+    direct = sf._planet_ephemeris.positions(times)
+    fitted = track.positions(times)
+    assert fitted.ra.shape == (len(sf.planets), 50)
+    error = angular_separation(direct.ra, direct.dec, fitted.ra, fitted.dec)
+    assert error.max() * 3600 < 0.001
+    assert np.abs(direct.alt - fitted.alt).max() * 3600 < 0.001
+    np.testing.assert_allclose(fitted.mag, direct.mag, atol=1e-6)
+
+
+def test_track_is_kept_until_it_runs_out(sf):
+    sf.planet_positions(DT)
+    track = sf._planet_track
+    sf.planet_positions(DT + datetime.timedelta(hours=1))
+    assert sf._planet_track is track
+    sf.planet_positions(DT + datetime.timedelta(hours=5))
+    assert sf._planet_track is not track
+
+
+def test_location_change_refits():
+    sf = Skyfield_utils()
+    assert sf.planet_positions(DT) is None
+    assert sf.calc_planets(DT) == {}
+    sf.set_location(50.0, 5.0, 100.0)
+    north = sf.calc_planets(DT)["MOON"]["altaz"]
+    sf.set_location(-30.0, 5.0, 100.0)
+    south = sf.calc_planets(DT)["MOON"]["altaz"]
+    assert north != south
+
+
+def test_calc_planets_format(sf):
+    planets = sf.calc_planets(DT)
+    assert list(planets) == sf.planet_names
+    assert planets["SUN"]["mag"] == "?"
+    jupiter = planets["JUPITER"]
+    assert float(jupiter["mag"]) < -1.5
+    ra, dec = jupiter["radec"]
+    assert isinstance(ra, float) and isinstance(dec, float)
+    assert jupiter["radec_pretty"][0][0] == int(ra / 15)
+    assert jupiter["const"] == sf.radec_to_constellation(ra, dec)
@@ -2,6 +2,7 @@
 solver/integrator merge semantics that travel through it."""
 
 import copy
+import dataclasses
 import math
 
 import numpy as np
@@ -21,6 +22,7 @@ from PiFinder.types.positioning import (
     PointingMatrix,
     ReloadSqmCalibration,
     SolveDiagnostics,
+    SolveMatches,
     SolveSource,
     SuccessfulSolve,
 )
@@ -45,8 +47,6 @@ class TestPointingEstimateDefaults:
         assert est.diagnostics.Matches == 0
         assert est.solve_source is None
         assert est.imu_anchor is None
-        assert est.matched_centroids is None
-        assert est.matched_stars is None
 
     def test_has_pointing_only_tracks_aligned_estimate(self):
         est = PointingEstimate()
@@ -160,9 +160,7 @@ class TestPicklability:
             estimate_time=12345.6789,
             diagnostics=SolveDiagnostics(Matches=42, RMSE=0.5, FOV=10.2),
             alignment=AlignmentResult(x_target=128.0, y_target=256.0),
-            matched_centroids=[(100.0, 200.0), (110.0, 210.0)],
-            matched_stars=[[1.0, 2.0, 5.5], [3.0, 4.0, 6.5]],
-            matched_catID=[32349, 71683],
+            constellation="UMa",
         )
         roundtripped = pickle.loads(pickle.dumps(original))
         assert roundtripped == original
@@ -191,9 +189,12 @@ class TestPicklability:
             last_solve_success=12345.0,
             diagnostics=SolveDiagnostics(Matches=9, RMSE=0.3),
             alignment=AlignmentResult(x_target=128.0, y_target=256.0),
-            matched_centroids=[(1.0, 2.0)],
-            matched_stars=[[1.0, 2.0, 5.5]],
-            matched_catID=[32349],
+            matches=SolveMatches(
+                solve_time=12345.0,
+                centroids=np.array([[1.0, 2.0]]),
+                stars=np.array([[1.0, 2.0, 5.5]]),
+                catIDs=np.array([32349]),
+            ),
         )
         failure = FailedSolve(
             diagnostics=SolveDiagnostics(Matches=0, T_extract=40.0),
@@ -297,9 +298,10 @@ class TestSolverBuilders:
         assert result.diagnostics.RMSE == pytest.approx(0.4)
         assert result.diagnostics.FOV == pytest.approx(10.2)
         assert result.alignment.is_set()
-        assert result.matched_centroids == [(1.0, 2.0)]
-        assert result.matched_stars == [[1.0, 2.0, 5.5]]
-        assert result.matched_catID == [123]
+        assert result.matches.solve_time == pytest.approx(999.0)
+        np.testing.assert_array_equal(result.matches.centroids, [[1.0, 2.0]])
+        np.testing.assert_array_equal(result.matches.stars, [[1.0, 2.0, 5.5]])
+        np.testing.assert_array_equal(result.matches.catIDs, [123])
         # The solved frame's epoch is last_solve_success (no separate
         # solve_time); the integrator promotes it to estimate_time.
         assert result.last_solve_success == pytest.approx(999.0)
@@ -316,6 +318,7 @@ class TestSolverBuilders:
             last_solve_success=999.0,
         )
         assert result.imu_anchor is None
+        assert result.matches is None
         # Aligned falls back to the camera RA/Dec when no target offset.
         assert result.camera == Pointing(RA=1.0, Dec=2.0, Roll=3.0)
         assert result.aligned == Pointing(RA=1.0, Dec=2.0, Roll=3.0)
@@ -375,9 +378,12 @@ class TestIntegratorApplySuccess:
             last_solve_success=499.5,
             diagnostics=SolveDiagnostics(Matches=7),
             alignment=AlignmentResult(),
-            matched_centroids=[(0.0, 1.0)],
-            matched_stars=[[1.0, 2.0, 5.5]],
-            matched_catID=[123],
+            matches=SolveMatches(
+                solve_time=499.5,
+                centroids=np.array([[0.0, 1.0]]),
+                stars=np.array([[1.0, 2.0, 5.5]]),
+                catIDs=np.array([123]),
+            ),
         )
 
     def test_successful_solve_fans_into_both_cells_and_reseeds_idr(self):
@@ -395,9 +401,6 @@ class TestIntegratorApplySuccess:
         assert merged.pointing.aligned.solve == result.aligned
         assert merged.pointing.aligned.estimate == result.aligned
         assert merged.imu_anchor == result.imu_anchor
-        assert merged.matched_centroids == result.matched_centroids
-        assert merged.matched_stars == result.matched_stars
-        assert merged.matched_catID == result.matched_catID
         assert merged.solve_source == SolveSource.CAMERA
         # The solved frame's epoch (last_solve_success) becomes estimate_time.
         assert merged.estimate_time == pytest.approx(499.5)
@@ -524,13 +527,13 @@ class TestAlignmentQueueDispatch:
 
 
 # ---------------------------------------------------------------------
-# Deep copy — integrator publishes deepcopies into shared_state so
-# downstream readers can't mutate the integrator's working estimate.
+# Snapshots — the integrator publishes snapshots into shared_state so
+# its later in-place updates can't reach an already-published estimate.
 # ---------------------------------------------------------------------
 
 
-class TestPublishDeepCopy:
-    def test_deepcopy_isolates_published_state(self):
+class TestPublishSnapshot:
+    def test_snapshot_isolates_published_state(self):
         original = PointingEstimate(
             pointing=PointingMatrix(
                 aligned=PointingAxis(
@@ -538,7 +541,82 @@ class TestPublishDeepCopy:
                 ),
             ),
         )
-        published = copy.deepcopy(original)
-        original.pointing.aligned.estimate.RA = 999.0
+        published = original.snapshot()
+        # The integrator's IMU advance replaces the estimate cell in place.
+        original.pointing.aligned.estimate = Pointing(RA=999.0, Dec=2.0, Roll=3.0)
+        original.pointing.camera = PointingAxis()
+        original.Alt = 45.0
         # Published copy unaffected.
         assert published.pointing.aligned.estimate.RA == pytest.approx(1.0)
+        assert published.Alt is None
+
+    def test_pointing_is_immutable(self):
+        # Leaves are shared between snapshots, so they must not be editable.
+        cell = Pointing(RA=1.0, Dec=2.0, Roll=3.0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cell.RA = 999.0
+
+
+# ---------------------------------------------------------------------
+# Fixed-layout records
+# ---------------------------------------------------------------------
+
+
+class TestCompactRecords:
+    def test_optional_fields_round_trip_as_none(self):
+        import pickle
+
+        est = PointingEstimate(
+            pointing=PointingMatrix(
+                camera=PointingAxis(solve=Pointing(RA=1.0, Dec=2.0, Roll=3.0)),
+            ),
+            solve_source=SolveSource.CAMERA_FAILED,
+            last_solve_attempt=5.0,
+        )
+        roundtripped = pickle.loads(pickle.dumps(est))
+        assert roundtripped == est
+        assert roundtripped.pointing.camera.estimate is None
+        assert roundtripped.pointing.aligned.solve is None
+        assert roundtripped.Alt is None
+        assert roundtripped.last_solve_success is None
+        assert roundtripped.constellation is None
+        assert roundtripped.diagnostics.RMSE is None
+        assert roundtripped.solve_source is SolveSource.CAMERA_FAILED
+
+    def test_estimate_pickle_is_smaller_than_field_tree(self):
+        import pickle
+
+        est = PointingEstimate(
+            pointing=PointingMatrix(
+                camera=PointingAxis(
+                    solve=Pointing(RA=1.1, Dec=2.2, Roll=3.3),
+                    estimate=Pointing(RA=1.1, Dec=2.2, Roll=3.3),
+                ),
+                aligned=PointingAxis(
+                    solve=Pointing(RA=4.4, Dec=5.5, Roll=6.6),
+                    estimate=Pointing(RA=4.4, Dec=5.5, Roll=6.6),
+                ),
+            ),
+            imu_anchor=quaternion.quaternion(1, 0, 0, 0),
+            solve_source=SolveSource.IMU,
+            estimate_time=12345.6789,
+            constellation="Ori",
+        )
+        field_tree = {k: v for k, v in est.__dict__.items() if k != "imu_anchor"}
+        assert len(pickle.dumps(est)) < len(pickle.dumps(field_tree))
+
+    def test_solve_matches_round_trip_as_arrays(self):
+        import pickle
+
+        matches = SolveMatches.from_solution(
+            7.0,
+            {
+                "matched_centroids": [(1.0, 2.0), (3.0, 4.0)],
+                "matched_stars": [[1.0, 2.0, 5.5], [3.0, 4.0, 6.5]],
+                "matched_catID": [32349, 71683],
+            },
+        )
+        assert matches.centroids.shape == (2, 2)
+        assert len(matches) == 2
+        assert pickle.loads(pickle.dumps(matches)) == matches
+        assert copy.copy(matches) == matches
@@ -0,0 +1,177 @@
+"""
+Unit tests for the LX200 position server: command framing across reads,
+per-connection protocol state, the shared JNow position cache, and
+several clients served at once.
+"""
+
+import asyncio
+import datetime
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from PiFinder import pos_server
+from PiFinder.pos_server import ClientSession, JNowPosition, respond, split_commands
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSolution:
+    def __init__(self, ra, dec, estimate_time):
+        estimate = SimpleNamespace(RA=ra, Dec=dec)
+        self.pointing = SimpleNamespace(aligned=SimpleNamespace(estimate=estimate))
+        self.estimate_time = estimate_time
+
+    def has_pointing(self):
+        return True
+
+
+class FakeSharedState:
+    def __init__(self):
+        self.current = FakeSolution(83.82, -5.39, 1.0)
+        self.solution_calls = 0
+
+    def solution(self):
+        self.solution_calls += 1
+        return self.current
+
+    def datetime(self):
+        return datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def shared_state(monkeypatch):
+    monkeypatch.setattr(pos_server, "jnow_position", JNowPosition(max_age=0))
+    return FakeSharedState()
+
+
+class TestSplitCommands:
+    def test_complete_and_partial(self):
+        assert split_commands(":GR#:GD#:G") == ([":GR#", ":GD#"], ":G")
+        assert split_commands(":G" + "R#") == ([":GR#"], "")
+
+    def test_stellarium_framing(self):
+        assert split_commands("\x06#:GR##:GD#") == (["\x06", ":GR#", ":GD#"], "")
+
+    def test_goto_coordinates_keep_their_colons(self):
+        commands, rest = split_commands(":Sr05:35:17#:Sd-05*23:")
+        assert commands == [":Sr05:35:17#"]
+        assert rest == ":Sd-05*23:"
+
+    def test_noise_is_dropped(self):
+        assert split_commands("garbage") == ([], "")
+
+
+class TestResponses:
+    def test_position_replies(self, shared_state):
+        session = ClientSession(shared_state)
+        ra = respond(session, ":GR#")
+        dec = respond(session, ":GD#")
+        assert ra.startswith("05:") and ra.endswith("#")
+        assert dec.startswith("-05*") and dec.endswith("#")
+
+    def test_no_pointing(self, shared_state):
+        shared_state.current = None
+        assert respond(ClientSession(shared_state), ":GR#") == "+00*00'01#"
+
+    def test_ack_marks_only_its_own_connection(self, shared_state):
+        stellarium = ClientSession(shared_state)
+        skysafari = ClientSession(shared_state)
+        assert respond(stellarium, "\x06") == "A"
+        assert stellarium.is_stellarium
+        assert not skysafari.is_stellarium
+
+    def test_goto_ra_is_per_connection(self, shared_state):
+        first = ClientSession(shared_state)
+        second = ClientSession(shared_state)
+        assert respond(first, ":Sr05:35:17#") == "1"
+        assert first.sr_result == (5, 35, 17)
+        # The other client has not sent an RA yet
+        assert respond(second, ":Sd-05*23:28#") == "0"
+
+
+class TestJNowPosition:
+    def test_precessed_once_per_solution(self, monkeypatch):
+        calls = []
+        real = pos_server.j2000_to_jnow
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(pos_server, "j2000_to_jnow", counting)
+        shared_state = FakeSharedState()
+        position = JNowPosition(max_age=0)
+        first = position.get(shared_state)
+        assert position.get(shared_state) == first
+        assert len(calls) == 1
+
+        shared_state.current = FakeSolution(83.82, -5.39, 2.0)
+        position.get(shared_state)
+        assert len(calls) == 2
+
+    def test_proxy_read_shared_within_max_age(self):
+        shared_state = FakeSharedState()
+        position = JNowPosition(max_age=60)
+        for _ in range(5):
+            position.get(shared_state)
+        assert shared_state.solution_calls == 1
+
+
+def test_concurrent_clients(shared_state):
+    async def exchange(port, chunks):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for chunk in chunks:
+            writer.write(chunk.encode())
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        reply = await asyncio.wait_for(reader.readuntil(b"#"), 2)
+        writer.close()
+        return reply.decode()
+
+    async def scenario():
+        server = await asyncio.start_server(
+            lambda r, w: pos_server.handle_client(r, w, shared_state), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        # An idle client stays connected while the others are served
+        idle_reader, idle_writer = await asyncio.open_connection("127.0.0.1", port)
+        async with server:
+            replies = await asyncio.gather(
+                exchange(port, [":G", "R#"]),
+                exchange(port, ["#:GVP#"]),
+            )
+        assert not idle_reader.at_eof()
+        idle_writer.close()
+        return replies
+
+    ra, product = asyncio.run(scenario())
+    assert ra.startswith("05:")
+    assert product == "PiFinder#"
+
+
+def test_proxy_calls_run_off_the_event_loop(shared_state, monkeypatch):
+    threads = []
+    solution = shared_state.solution
+
+    def recording():
+        threads.append(threading.current_thread())
+        return solution()
+
+    monkeypatch.setattr(shared_state, "solution", recording)
+
+    async def scenario():
+        server = await asyncio.start_server(
+            lambda r, w: pos_server.handle_client(r, w, shared_state), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b":GR#")
+            reply = await asyncio.wait_for(reader.readuntil(b"#"), 2)
+            writer.close()
+        return reply
+
+    assert asyncio.run(scenario()).startswith(b"05:")
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,119 @@
+"""
+Unit tests for the render budget profiler: exclusive timing of nested
+phases, the per-module ring buffer, the summary and its publish throttle.
+
+Time comes from a fake ``perf_counter`` so durations are exact.
+"""
+
+import pytest
+
+from PiFinder import render_profiler
+from PiFinder.render_profiler import RenderProfiler
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(render_profiler.time, "perf_counter", fake)
+    return fake
+
+
+def _frame(profiler, clock, module="UIChart", update=10, overlay=2, display=5):
+    profiler.begin_frame(module)
+    with profiler.phase("update"):
+        clock.advance(update)
+        with profiler.phase("overlay"):
+            clock.advance(overlay)
+    with profiler.phase("display"):
+        clock.advance(display)
+    clock.advance(1)  # unattributed
+    profiler.end_frame()
+
+
+def test_nested_phases_are_exclusive(clock):
+    profiler = RenderProfiler()
+    _frame(profiler, clock)
+    stats = profiler.summary()["modules"]["UIChart"]
+    assert stats["phases"]["update"]["max_ms"] == pytest.approx(10)
+    assert stats["phases"]["overlay"]["max_ms"] == pytest.approx(2)
+    assert stats["phases"]["display"]["max_ms"] == pytest.approx(5)
+    assert stats["max_ms"] == pytest.approx(18)
+    assert "publish" not in stats["phases"]
+
+
+def test_percentiles_and_budget_per_module(clock):
+    profiler = RenderProfiler(window=100)
+    for update in range(1, 101):
+        _frame(profiler, clock, update=update, overlay=0, display=0)
+    _frame(profiler, clock, module="UIStatus", update=1, overlay=0, display=0)
+
+    summary = profiler.summary()
+    assert list(summary["modules"]) == ["UIChart", "UIStatus"]
+    chart = summary["modules"]["UIChart"]
+    assert chart["frames"] == 100
+    assert chart["p50_ms"] == pytest.approx(51.5)
+    assert chart["max_ms"] == pytest.approx(101)
+    # totals are update + 1 ms; 33 of them fit the 33.3 ms budget
+    assert chart["over_budget"] == 68
+
+
+def test_ring_buffer_keeps_last_frames(clock):
+    profiler = RenderProfiler(window=3)
+    for update in (100, 1, 1, 1):
+        _frame(profiler, clock, update=update, overlay=0, display=0)
+    chart = profiler.summary()["modules"]["UIChart"]
+    assert chart["frames"] == 3
+    assert chart["max_ms"] == pytest.approx(2)
+
+
+def test_phases_outside_a_frame_are_ignored(clock):
+    profiler = RenderProfiler()
+    with profiler.phase("display"):
+        clock.advance(5)
+    assert profiler.summary()["modules"] == {}
+
+
+def test_decorated_phase(clock):
+    profiler = RenderProfiler()
+
+    @profiler.phase("overlay")
+    def screen_update():
+        clock.advance(3)
+
+    profiler.begin_frame("UIStatus")
+    with profiler.phase("update"):
+        screen_update()
+    profiler.end_frame()
+    stats = profiler.summary()["modules"]["UIStatus"]
+    assert stats["phases"]["overlay"]["max_ms"] == pytest.approx(3)
+    assert "update" not in stats["phases"]
+
+
+def test_publish_is_throttled(clock):
+    class SharedState:
+        published = []
+
+        def set_render_perf(self, v):
+            self.published.append(v)
+
+    profiler = RenderProfiler()
+    shared_state = SharedState()
+    _frame(profiler, clock)
+    profiler.maybe_publish(shared_state, now=10.0)
+    profiler.maybe_publish(shared_state, now=10.5)
+    profiler.maybe_publish(shared_state, now=11.1)
+    assert len(shared_state.published) == 2
+    assert "UIChart" in shared_state.published[0]["modules"]
@@ -0,0 +1,104 @@
+"""
+Unit tests for ROI centroiding: windowed centroids on a synthetic star
+field and the full-frame/ROI decision driven by the IMU quaternion.
+"""
+
+import numpy as np
+import pytest
+import quaternion
+
+from PiFinder.roi_centroiding import RoiCentroider, window_centroids
+
+# (y, x) in tetra3 convention, brightest first
+STARS = np.array([[100.3, 200.7], [300.5, 50.2], [256.0, 400.9], [420.8, 310.4]])
+FLUXES = [4000.0, 3000.0, 2000.0, 1000.0]
+
+
+def _star_field(stars=STARS, shift=(0.0, 0.0), seed=1):
+    rng = np.random.default_rng(seed)
+    image = rng.normal(20.0, 2.0, (512, 512))
+    yy, xx = np.mgrid[0:512, 0:512] + 0.5
+    for (y, x), flux in zip(stars + shift, FLUXES):
+        image += flux / (2 * np.pi) * np.exp(-((yy - y) ** 2 + (xx - x) ** 2) / 2)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def _quat_about_x(degrees):
+    half = np.deg2rad(degrees) / 2
+    return quaternion.quaternion(np.cos(half), np.sin(half), 0, 0)
+
+
+@pytest.mark.unit
+class TestWindowCentroids:
+    def test_recovers_stars_brightest_first(self):
+        found = window_centroids(_star_field(), STARS, half=4)
+        assert found.shape == (4, 2)
+        np.testing.assert_allclose(found, STARS, atol=0.2)
+
+    def test_follows_shift_inside_window(self):
+        found = window_centroids(_star_field(shift=(3.0, -2.0)), STARS, half=8)
+        np.testing.assert_allclose(found, STARS + (3.0, -2.0), atol=0.2)
+
+    def test_empty_windows_and_edges_are_dropped(self):
+        centers = np.vstack([STARS[:1], [[30.5, 30.5]], [[2.0, 2.0]]])
+        found = window_centroids(_star_field(), centers, half=4)
+        assert found.shape == (1, 2)
+
+    def test_neighbour_in_window_does_not_pull_centroid(self):
+        image = _star_field().astype(np.float64)
+        yy, xx = np.mgrid[0:512, 0:512] + 0.5
+        image += (
+            3000.0 / (2 * np.pi) * np.exp(-((yy - 110.5) ** 2 + (xx - 208.5) ** 2) / 2)
+        )
+        image[94, 194] = 255  # hot pixel
+        image = np.clip(image, 0, 255).astype(np.uint8)
+        found = window_centroids(image, STARS[:1], half=12)
+        np.testing.assert_allclose(found, STARS[:1], atol=0.2)
+
+    def test_no_centers(self):
+        assert window_centroids(_star_field(), np.empty((0, 2)), 4).shape == (0, 2)
+
+
+@pytest.mark.unit
+class TestRoiCentroider:
+    def _tracking(self, **kwargs):
+        roi = RoiCentroider(min_stars=3, **kwargs)
+        roi.set_reference(STARS, _quat_about_x(0.0), fov_degrees=10.24, width_px=512)
+        return roi
+
+    def test_no_reference_means_full_frame(self):
+        assert RoiCentroider().window_for(_quat_about_x(0.0)) is None
+
+    def test_window_grows_with_imu_rotation(self):
+        roi = self._tracking()
+        still = roi.window_for(_quat_about_x(0.0))
+        # 0.1 deg at 0.02 deg/px is 5 px of possible shift
+        moved = roi.window_for(_quat_about_x(0.1))
+        assert still == roi.star_half
+        assert moved == roi.star_half + 5
+
+    def test_large_rotation_means_full_frame(self):
+        roi = self._tracking(max_shift_px=24)
+        assert roi.window_for(_quat_about_x(1.0)) is None
+
+    def test_periodic_full_frame(self):
+        roi = self._tracking(full_frame_every=4)
+        plan = [roi.window_for(_quat_about_x(0.0)) for _ in range(8)]
+        assert plan.count(None) == 2
+        assert plan[3] is None and plan[7] is None
+
+    def test_missing_imu_means_full_frame(self):
+        roi = self._tracking()
+        assert roi.window_for(None) is None
+        roi.set_reference(STARS, None, fov_degrees=10.24, width_px=512)
+        assert roi.window_for(_quat_about_x(0.0)) is None
+
+    def test_too_few_reference_stars_disables_roi(self):
+        roi = RoiCentroider(min_stars=6)
+        roi.set_reference(STARS, _quat_about_x(0.0), fov_degrees=10.0, width_px=512)
+        assert roi.window_for(_quat_about_x(0.0)) is None
+
+    def test_extract_uses_reference(self):
+        roi = self._tracking()
+        half = roi.window_for(_quat_about_x(0.0))
+        np.testing.assert_allclose(roi.extract(_star_field(), half), STARS, atol=0.2)
@@ -0,0 +1,206 @@
+"""
+Unit tests for the change-driven screen mirror: the shared-memory writer
+and reader, and the ETag / stream responses the web server builds on it.
+
+Each test gets its own segment name so a running PiFinder (or a parallel
+test) is never touched.
+"""
+
+import uuid
+
+import pytest
+from flask import Flask
+from PIL import Image, ImageDraw
+
+from PiFinder import api_extensions, screen_mirror
+from PiFinder.api_extensions import (
+    StreamLimiter,
+    screen_image_response,
+    screen_stream_response,
+)
+from PiFinder.screen_mirror import ScreenMirror, ScreenMirrorReader
+
+
+@pytest.fixture
+def mirror(monkeypatch):
+    monkeypatch.setattr(
+        screen_mirror, "SCREEN_SHMEM_NAME", f"pifinder_test_{uuid.uuid4().hex[:8]}"
+    )
+    writer = ScreenMirror()
+    yield writer
+    writer.close()
+
+
+class _SharedState:
+    def __init__(self):
+        self.published = []
+
+    def set_screen(self, image):
+        self.published.append(image)
+
+    def screen(self):
+        return self.published[-1] if self.published else None
+
+
+def _screen(text="M31"):
+    image = Image.new("RGB", (128, 128))
+    ImageDraw.Draw(image).text((10, 10), text, fill=(255, 0, 0))
+    return image
+
+
+@pytest.mark.unit
+class TestScreenMirror:
+    def test_round_trip(self, mirror):
+        image = _screen()
+        assert mirror.publish(image)
+        frame, read = ScreenMirrorReader().read()
+        assert frame == ScreenMirrorReader().frame() != 0
+        assert read.tobytes() == image.tobytes()
+        assert read.mode == "RGB"
+
+    def test_unchanged_frame_is_not_republished(self, mirror):
+        reader = ScreenMirrorReader()
+        assert mirror.publish(_screen())
+        first = reader.frame()
+        assert not mirror.publish(_screen())
+        assert reader.frame() == first
+        assert mirror.publish(_screen("M42"))
+        assert reader.frame() == first + 1
+
+    def test_png_is_encoded_once_per_frame(self, mirror):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        frame, png = reader.png()
+        assert frame == reader.frame()
+        assert png.startswith(b"\x89PNG")
+        assert reader.png()[1] is png
+
+    def test_encoded_frame_is_not_read_again(self, mirror, monkeypatch):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        first = reader.encoded()
+        monkeypatch.setattr(reader, "read", pytest.fail)
+        assert reader.encoded() == first
+
+    def test_other_modes(self, mirror):
+        image = _screen().convert("L")
+        mirror.publish(image)
+        assert ScreenMirrorReader().read()[1].tobytes() == image.tobytes()
+
+    def test_no_segment_falls_back_to_shared_state(self, mirror, monkeypatch):
+        monkeypatch.setattr(mirror, "_ensure_segment", lambda: False)
+        shared_state = _SharedState()
+        image = _screen()
+        assert mirror.publish(image, shared_state)
+        assert not mirror.publish(image, shared_state)
+        assert shared_state.published == [image]
+        assert ScreenMirrorReader(shared_state).read() == (0, image)
+
+
+@pytest.mark.unit
+class TestScreenResponses:
+    def test_etag_and_not_modified(self, mirror):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        app = Flask(__name__)
+        with app.test_request_context("/image"):
+            response = screen_image_response(reader)
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+        with app.test_request_context("/image", headers={"If-None-Match": etag}):
+            assert screen_image_response(reader).status_code == 304
+
+        mirror.publish(_screen("M42"))
+        with app.test_request_context("/image", headers={"If-None-Match": etag}):
+            response = screen_image_response(reader)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_stream_sends_a_part_per_change(self, mirror):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        app = Flask(__name__)
+        with app.test_request_context("/image/stream"):
+            response = screen_stream_response(reader)
+        assert response.mimetype == "multipart/x-mixed-replace"
+        parts = iter(response.response)
+        first = next(parts)
+        assert b"Content-Type: image/png" in first
+        mirror.publish(_screen("M42"))
+        second = next(parts)
+        assert second != first
+
+    def test_stream_waits_until_something_is_published(self, mirror, monkeypatch):
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 3:
+                mirror.publish(_screen())
+
+        monkeypatch.setattr(api_extensions.time, "sleep", fake_sleep)
+        app = Flask(__name__)
+        with app.test_request_context("/image/stream"):
+            response = screen_stream_response(ScreenMirrorReader())
+        assert b"Content-Type: image/png" in next(iter(response.response))
+        assert len(sleeps) == 3 and all(s > 0 for s in sleeps)
+
+    def test_shared_state_stream_sends_changed_content(self, mirror, monkeypatch):
+        shared_state = _SharedState()
+        shared_state.set_screen(_screen())
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 1:
+                shared_state.set_screen(_screen("M42"))
+            elif len(sleeps) > 3:
+                raise TimeoutError
+
+        # No segment: the reader falls back to shared_state.screen()
+        monkeypatch.setattr(api_extensions.time, "sleep", fake_sleep)
+        app = Flask(__name__)
+        with app.test_request_context("/image/stream"):
+            response = screen_stream_response(ScreenMirrorReader(shared_state))
+        parts = iter(response.response)
+        first = next(parts)
+        assert next(parts) != first
+        # Unchanged content is not resent before the keepalive
+        with pytest.raises(TimeoutError):
+            next(parts)
+
+    def test_open_streams_are_capped(self, mirror):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        limiter = StreamLimiter(1)
+        app = Flask(__name__)
+        with app.test_request_context("/image/stream"):
+            first = limiter.open(lambda: screen_stream_response(reader))
+            assert first.status_code == 200
+            assert (
+                limiter.open(lambda: screen_stream_response(reader)).status_code == 503
+            )
+            first.close()
+            second = limiter.open(lambda: screen_stream_response(reader))
+            assert second.status_code == 200
+            second.close()
+        with app.test_request_context("/image/stream?format=raw"):
+            assert (
+                limiter.open(lambda: screen_stream_response(reader)).status_code == 400
+            )
+            assert (
+                limiter.open(lambda: screen_stream_response(reader)).status_code == 400
+            )
+
+    def test_format_parameter(self, mirror):
+        reader = ScreenMirrorReader()
+        mirror.publish(_screen())
+        app = Flask(__name__)
+        with app.test_request_context("/image"):
+            png = screen_image_response(reader)
+        with app.test_request_context("/image?format=jpeg"):
+            jpeg = screen_image_response(reader)
+        assert jpeg.mimetype == "image/jpeg"
+        assert jpeg.headers["ETag"] != png.headers["ETag"]
+        with app.test_request_context("/image?format=bmp"):
+            assert screen_image_response(reader).status_code == 400
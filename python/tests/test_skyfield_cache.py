@@ -0,0 +1,65 @@
+"""
+Unit tests for the shared Skyfield tables: the cached timescale agrees
+with Skyfield's own, the cache is memory-mapped once written, and a cache
+that can't be written or was raced by another process doesn't get in the
+way.
+"""
+
+import numpy as np
+import pytest
+from skyfield.api import load
+
+from PiFinder import skyfield_cache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(skyfield_cache, "CACHE_DIR", tmp_path / "skyfield")
+    return tmp_path / "skyfield"
+
+
+def test_timescale_matches_skyfield(cache_dir):
+    ours = skyfield_cache.timescale.__wrapped__()
+    theirs = load.timescale()
+    # Across a leap second, the recent daily table and the far future
+    for args in [(2016, 12, 31, 23, 59, 60.5), (2025, 6, 1, 3), (2150, 1, 1)]:
+        assert ours.utc(*args).tt == theirs.utc(*args).tt
+        assert ours.utc(*args).delta_t == theirs.utc(*args).delta_t
+    assert isinstance(ours.delta_t_table[0], np.memmap)
+
+
+def test_cache_is_written_once_and_mapped(cache_dir):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"a": np.arange(3.0), "b": np.array(["And", "Ant"])}
+
+    first = skyfield_cache._cached_arrays("test", build)
+    second = skyfield_cache._cached_arrays("test", build)
+    assert len(calls) == 1
+    assert isinstance(second["a"], np.memmap)
+    assert list(second["a"]) == list(first["a"]) == [0.0, 1.0, 2.0]
+    assert list(second["b"]) == ["And", "Ant"]
+    # No staging directories are left behind
+    assert [p.name for p in cache_dir.iterdir()] == [
+        f"test-{skyfield_cache.skyfield.__version__}-{skyfield_cache.CACHE_VERSION}"
+    ]
+
+
+def test_unwritable_cache_uses_the_built_tables(tmp_path, monkeypatch):
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(skyfield_cache, "CACHE_DIR", tmp_path / "file" / "skyfield")
+    arrays = skyfield_cache._cached_arrays("test", lambda: {"a": np.arange(2)})
+    assert list(arrays["a"]) == [0, 1]
+
+
+def test_losing_the_race_keeps_the_other_copy(cache_dir):
+    target = cache_dir / "test"
+    target.mkdir(parents=True)
+    (target / "a.npy").write_bytes(b"theirs")
+    skyfield_cache._write_arrays(target, {"a": np.arange(2)})
+    assert (target / "a.npy").read_bytes() == b"theirs"
+    assert [p.name for p in cache_dir.iterdir()] == ["test"]
@@ -0,0 +1,120 @@
+"""
+Unit tests for the adaptive solve scheduler.
+
+Frames are fed at 10 Hz on a synthetic clock; the scheduler only ever sees
+the frame ``exposure_end`` times the solver passes it.
+"""
+
+import pytest
+
+from PiFinder.solve_scheduler import (
+    SKIP_BLURRED,
+    SKIP_IDLE,
+    SOLVE,
+    SolveScheduler,
+)
+
+FRAME = 0.1
+
+
+def _settle(scheduler, start=0.0, frames=10):
+    """Solve ``frames`` agreeing frames; returns the next frame time."""
+    t = start
+    for _ in range(frames):
+        if scheduler.decide(t, imu_delta=0.0) == SOLVE:
+            scheduler.record_result(t, 150.0, 40.0)
+        t += FRAME
+    return t
+
+
+@pytest.mark.unit
+class TestSolveScheduler:
+    def test_solves_every_frame_until_settled(self):
+        scheduler = SolveScheduler(settle_solves=3)
+        decisions = []
+        t = 0.0
+        for _ in range(4):
+            decisions.append(scheduler.decide(t, imu_delta=0.0))
+            scheduler.record_result(t, 150.0, 40.0)
+            t += FRAME
+        assert decisions == [SOLVE] * 4
+        assert scheduler.idle
+
+    def test_settled_scope_is_rate_limited(self):
+        scheduler = SolveScheduler(idle_interval=2.0, burst_seconds=0.0)
+        t = _settle(scheduler)
+        decisions = [scheduler.decide(t + i * FRAME, imu_delta=0.0) for i in range(30)]
+        # One solve per idle_interval once settled
+        assert decisions.count(SOLVE) == 1
+        assert decisions.count(SKIP_IDLE) == 29
+        assert scheduler.counters.idle
+
+    def test_motion_bursts_back_to_full_rate(self):
+        scheduler = SolveScheduler(burst_seconds=1.0)
+        t = _settle(scheduler)
+        assert scheduler.idle
+        bursts = scheduler.counters.bursts
+        assert scheduler.decide(t, imu_delta=0.0, moving=True) == SOLVE
+        assert not scheduler.idle
+        assert scheduler.counters.bursts == bursts + 1
+        for i in range(1, 5):
+            assert scheduler.decide(t + i * FRAME, imu_delta=0.0) == SOLVE
+
+    def test_target_change_bursts(self):
+        scheduler = SolveScheduler()
+        t = _settle(scheduler)
+        assert scheduler.decide(t, imu_delta=0.0) == SKIP_IDLE
+        assert scheduler.decide(t + FRAME, imu_delta=0.0, target_key=42) == SOLVE
+        assert not scheduler.idle
+
+    def test_disagreeing_solve_resets_agreement(self):
+        scheduler = SolveScheduler(settle_solves=2, agree_deg=0.1)
+        scheduler.record_result(0.0, 150.0, 40.0)
+        scheduler.record_result(0.1, 150.0, 40.01)
+        scheduler.record_result(0.2, 150.0, 40.02)
+        assert scheduler.idle
+        scheduler.record_result(0.3, 151.0, 40.0)
+        assert not scheduler.idle
+
+    def test_failed_solve_resets_agreement(self):
+        scheduler = SolveScheduler()
+        _settle(scheduler)
+        scheduler.record_result(5.0)
+        assert not scheduler.idle
+
+    def test_blurred_frames_are_skipped(self):
+        scheduler = SolveScheduler(max_imu_ang_during_exposure=1.0)
+        assert scheduler.decide(0.0, imu_delta=0.0) == SOLVE
+        assert scheduler.decide(0.1, imu_delta=2.5) == SKIP_BLURRED
+        assert scheduler.decide(0.2, imu_delta=-2.5) == SKIP_BLURRED
+        assert scheduler.counters.skipped_blurred == 2
+
+    def test_blurred_frames_never_starve_solving(self):
+        scheduler = SolveScheduler(max_skip_interval=1.0)
+        decisions = [scheduler.decide(i * FRAME, imu_delta=5.0) for i in range(25)]
+        # The first frame and one per max_skip_interval after it
+        assert decisions.count(SOLVE) == 3
+
+    def test_missing_imu_is_not_blur(self):
+        scheduler = SolveScheduler()
+        assert scheduler.decide(0.0, imu_delta=None) == SOLVE
+        assert scheduler.decide(0.1, imu_delta=None) == SOLVE
+
+    def test_requested_frames_are_always_solved(self):
+        scheduler = SolveScheduler()
+        t = _settle(scheduler)
+        assert scheduler.decide(t, imu_delta=0.0, requested=True) == SOLVE
+        assert scheduler.decide(t + FRAME, imu_delta=5.0, requested=True) == SOLVE
+
+    def test_counters_serialize(self):
+        scheduler = SolveScheduler()
+        scheduler.decide(0.0, imu_delta=0.0)
+        counters = scheduler.counters.to_dict()
+        assert counters["solved"] == 1
+        assert set(counters) == {
+            "solved",
+            "skipped_blurred",
+            "skipped_idle",
+            "bursts",
+            "idle",
+        }
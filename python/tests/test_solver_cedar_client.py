@@ -32,9 +32,12 @@ def _bare_client():
     """A PFCedarDetectClient without __init__ (no server, no subprocess)."""
     client = PFCedarDetectClient.__new__(PFCedarDetectClient)
     client._subprocess = None
+    client._channel = None
     client._stub = None
     client._shmem = None
     client._shmem_size = 0
+    client._frame = None
+    client._retired_shmem = None
     client._use_shmem = True
     return client
 
@@ -114,7 +117,7 @@ def test_extract_centroids_falls_back_when_segment_vanishes(caplog):
         except Exception:
             pass
 
-    assert centroids == []
+    assert centroids.shape == (0, 2)
     assert client._use_shmem is False
     assert client._shmem is None
     # First call went over shmem and failed; the retry carried the pixels.
@@ -131,3 +134,118 @@ def test_extract_centroids_falls_back_when_segment_vanishes(caplog):
     assert len(warnings) == 1
     assert "shared-memory handoff failed" in warnings[0].getMessage()
     assert _CEDAR_DETECT_SHMEM_NAME in warnings[0].getMessage()
+
+
+def _candidates(points):
+    """Fake ``star_candidates`` carrying (y, x) centroid positions."""
+    return [
+        types.SimpleNamespace(
+            centroid_position=types.SimpleNamespace(y=float(y), x=float(x))
+        )
+        for y, x in points
+    ]
+
+
+@pytest.mark.unit
+def test_extract_centroids_returns_yx_array():
+    """Candidates come back as one (N, 2) float array of (y, x), ready for
+    tetra3 and SQM without a list conversion."""
+    client = _bare_client()
+    client._stub = types.SimpleNamespace(
+        ExtractCentroids=lambda req: types.SimpleNamespace(
+            star_candidates=_candidates([(1.5, 2.5), (10.0, 20.0)])
+        )
+    )
+    try:
+        centroids = client.extract_centroids(
+            np.zeros((32, 32), dtype=np.uint8), sigma=8, max_size=10, use_binned=True
+        )
+    finally:
+        client._del_shmem()
+
+    assert isinstance(centroids, np.ndarray)
+    assert centroids.dtype == np.float64
+    np.testing.assert_array_equal(centroids, [[1.5, 2.5], [10.0, 20.0]])
+
+
+@pytest.mark.unit
+def test_frame_buffer_is_the_segment_and_is_reused():
+    """A frame written into frame_buffer() is what the server reads, and the
+    segment is not re-created from one frame to the next."""
+    client = _bare_client()
+    seen = []
+
+    def fake_extract(req):
+        peer = shared_memory.SharedMemory(req.input_image.shmem_name)
+        seen.append(bytes(peer.buf[: req.input_image.width * req.input_image.height]))
+        peer.close()
+        return types.SimpleNamespace(star_candidates=[])
+
+    client._stub = types.SimpleNamespace(ExtractCentroids=fake_extract)
+    try:
+        frame = client.frame_buffer(16, 16)
+        segment = client._shmem
+        frame[...] = 7
+        client.extract_centroids(frame, sigma=8, max_size=10, use_binned=True)
+        assert client.frame_buffer(16, 16) is frame
+        frame[...] = 9
+        client.extract_centroids(frame, sigma=8, max_size=10, use_binned=True)
+        assert client._shmem is segment
+    finally:
+        del frame
+        client._del_shmem()
+
+    assert seen == [bytes([7]) * 256, bytes([9]) * 256]
+
+
+@pytest.mark.unit
+def test_fallback_releases_segment_while_frame_view_is_held():
+    """The INTERNAL fallback must not wedge when the caller's frame is the
+    shared-memory view itself: the name is released without unmapping the
+    caller's pixels, they still go inline, and frame_buffer() stops handing
+    out views."""
+    client = _bare_client()
+    calls = []
+
+    def fake_extract(req):
+        calls.append(req)
+        if len(calls) == 1:
+            raise _InternalRpcError()
+        return types.SimpleNamespace(star_candidates=[])
+
+    client._stub = types.SimpleNamespace(ExtractCentroids=fake_extract)
+    frame = client.frame_buffer(8, 8)
+    frame[...] = 3
+
+    client.extract_centroids(frame, sigma=8, max_size=10, use_binned=True)
+
+    assert client._use_shmem is False
+    assert client._shmem is None
+    assert client.frame_buffer(8, 8) is None
+    assert calls[1].input_image.image_data == bytes([3]) * 64
+    assert int(frame.sum()) == 3 * 64
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(_CEDAR_DETECT_SHMEM_NAME)
+
+
+@pytest.mark.unit
+def test_solve_frame_is_decoded_into_the_segment():
+    """_load_solve_frame writes the frame's pixels into the segment itself and
+    hands back the frame_buffer() view, not a copy of it."""
+    from PIL import Image
+
+    from PiFinder.solver import _load_solve_frame
+
+    client = _bare_client()
+    pixels = np.arange(16 * 24, dtype=np.uint16).reshape(16, 24).astype(np.uint8)
+    try:
+        frame = _load_solve_frame(Image.fromarray(pixels, "L"), client)
+        assert frame is client.frame_buffer(16, 24)
+        np.testing.assert_array_equal(frame, pixels)
+        assert bytes(client._shmem.buf[: pixels.size]) == pixels.tobytes()
+    finally:
+        del frame
+        client._del_shmem()
+
+    frame = _load_solve_frame(Image.fromarray(pixels, "L"), None)
+    np.testing.assert_array_equal(frame, pixels)
@@ -0,0 +1,150 @@
+"""
+Unit tests for solver pattern-database selection and memory-mapped loading.
+
+The databases are tiny synthetic files in tetra3's on-disk layout: enough
+for ``Tetra3.load_database`` to read, nowhere near enough to solve.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from PiFinder import solver_database
+from PiFinder.solver_database import (
+    SolverDatabase,
+    SolverDatabaseLoader,
+    discover_databases,
+    load_tetra3,
+    select_database,
+)
+
+
+def _write_database(path, min_fov, max_fov, magnitude=7.0, patterns=64):
+    props = {
+        "pattern_mode": "edge_ratio",
+        "pattern_size": 4,
+        "pattern_bins": 50,
+        "pattern_max_error": 0.005,
+        "max_fov": max_fov,
+        "min_fov": min_fov,
+        "star_catalog": "hip_main",
+        "epoch_equinox": 2000,
+        "epoch_proper_motion": 2025.0,
+        "lattice_field_oversampling": 100,
+        "patterns_per_lattice_field": 50,
+        "verification_stars_per_fov": 150,
+        "star_max_magnitude": magnitude,
+        "presort_patterns": True,
+        "num_patterns": patterns // 2,
+    }
+    props_packed = np.array(
+        tuple(props.values()),
+        dtype=[
+            (key, "U16" if isinstance(value, str) else type(value))
+            for key, value in props.items()
+        ],
+    )
+    rng = np.random.default_rng(0)
+    np.savez_compressed(
+        path,
+        pattern_catalog=rng.integers(0, 100, (patterns, 4), dtype=np.uint16),
+        pattern_largest_edge=rng.random(patterns).astype(np.float16),
+        star_table=rng.random((20, 6)).astype(np.float32),
+        star_catalog_IDs=np.arange(20),
+        props_packed=props_packed,
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_database(data / "default_database.npz", 10.0, 30.0)
+    _write_database(data / "narrow.npz", 2.0, 5.0, magnitude=9.0)
+    (data / "notes.npz").write_bytes(b"not a database")
+    return data
+
+
+@pytest.mark.unit
+class TestSelection:
+    def test_discover_reads_ranges_and_skips_junk(self, data_dir):
+        databases = discover_databases(data_dir)
+        assert [db.name for db in databases] == ["default_database", "narrow"]
+        assert databases[1].min_fov == 2.0
+        assert databases[1].star_max_magnitude == 9.0
+
+    def test_narrowest_covering_range_wins(self, tmp_path):
+        wide = SolverDatabase(tmp_path / "wide.npz", 1.0, 30.0)
+        tuned = SolverDatabase(tmp_path / "tuned.npz", 8.0, 12.0)
+        assert select_database([wide, tuned], 10.0) is tuned
+        assert select_database([wide, tuned], 20.0) is wide
+
+    def test_deeper_magnitude_breaks_ties(self, tmp_path):
+        shallow = SolverDatabase(tmp_path / "a.npz", 8.0, 12.0, 6.0)
+        deep = SolverDatabase(tmp_path / "b.npz", 8.0, 12.0, 8.0)
+        assert select_database([shallow, deep], 10.0) is deep
+
+    def test_nothing_covering_falls_back_to_nearest(self, tmp_path):
+        near = SolverDatabase(tmp_path / "near.npz", 10.0, 30.0)
+        far = SolverDatabase(tmp_path / "far.npz", 40.0, 60.0)
+        assert select_database([far, near], 8.0) is near
+        assert select_database([], 8.0) is None
+
+
+@pytest.mark.unit
+class TestMappedLoad:
+    def test_pattern_catalog_is_memory_mapped(self, data_dir, tmp_path):
+        db = discover_databases(data_dir)[0]
+        t3 = load_tetra3(db, tmp_path / "cache")
+        assert isinstance(t3._pattern_catalog, np.memmap)
+        with np.load(db.path) as original:
+            np.testing.assert_array_equal(
+                t3._pattern_catalog, original["pattern_catalog"]
+            )
+        assert t3.database_properties["max_fov"] == 30.0
+        assert t3.database_properties["num_patterns"] == 32
+
+    def test_unmappable_tetra3_loads_in_memory(self, data_dir, tmp_path, monkeypatch):
+        monkeypatch.setattr(solver_database, "_mappable", lambda t3: False)
+        db = discover_databases(data_dir)[0]
+        t3 = load_tetra3(db, tmp_path / "cache")
+        assert not isinstance(t3._pattern_catalog, np.memmap)
+        assert len(t3._pattern_catalog) == 64
+
+    def test_expansion_is_reused(self, data_dir, tmp_path):
+        db = discover_databases(data_dir)[0]
+        load_tetra3(db, tmp_path / "cache")
+        mapped = tmp_path / "cache" / db.name / "pattern_catalog.npy"
+        first = mapped.stat().st_mtime_ns
+        load_tetra3(db, tmp_path / "cache")
+        assert mapped.stat().st_mtime_ns == first
+
+
+@pytest.mark.unit
+class TestLoader:
+    def _wait_for(self, loader):
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            t3 = loader.poll()
+            if t3 is not None:
+                return t3
+            time.sleep(0.01)
+        raise AssertionError("background load never finished")
+
+    def test_lens_change_swaps_in_background(self, data_dir, tmp_path):
+        loader = SolverDatabaseLoader(data_dir, tmp_path / "cache")
+        loader.load_now(20.0)
+        assert loader.current.name == "default_database"
+
+        loader.request(3.0)
+        t3 = self._wait_for(loader)
+        assert loader.current.name == "narrow"
+        assert t3.database_properties["max_fov"] == 5.0
+
+    def test_same_database_is_not_reloaded(self, data_dir, tmp_path):
+        loader = SolverDatabaseLoader(data_dir, tmp_path / "cache")
+        loader.load_now(20.0)
+        loader.request(15.0)
+        time.sleep(0.05)
+        assert loader.poll() is None
@@ -71,6 +71,19 @@ class TestScaledPhotometryRadii:
         assert 1 <= aperture < inner < outer
 
 
+@pytest.mark.unit
+class TestStellarDiagnosticDue:
+    def test_full_frame_after_interval(self):
+        interval = solver.SQM_STELLAR_DIAGNOSTIC_INTERVAL_SECONDS
+        assert solver._stellar_diagnostic_due(100.0 + interval, 100.0, None)
+        assert not solver._stellar_diagnostic_due(100.0 + interval / 2, 100.0, None)
+
+    def test_roi_frame_waits_for_full_frame(self):
+        # ROI centroids only cover the reference-star windows, so the
+        # annulus star mask would miss every other star in the field.
+        assert not solver._stellar_diagnostic_due(1000.0, 0.0, 12)
+
+
 @pytest.mark.unit
 class TestUpdateSqmWiring:
     """update_sqm threads the pedestal override and cloud/dew guard inputs."""
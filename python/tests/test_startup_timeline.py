@@ -0,0 +1,122 @@
+"""
+Unit tests for the start-up timeline: phases tile the main process's
+start-up, imports are timed with their self time, concurrent work is
+recorded against its thread, nothing happens unless enabled, and forked
+children leave the timeline behind.
+"""
+
+import importlib._bootstrap
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from PiFinder import startup_timeline
+from PiFinder.startup_timeline import StartupTimeline
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def timeline():
+    tl = StartupTimeline()
+    yield tl
+    tl.remove_import_timer()
+
+
+def test_phases_tile_startup(timeline):
+    timeline.mark("one")
+    time.sleep(0.01)
+    timeline.mark("two")
+    result = timeline.finish()
+    one, two = result["phases"]
+    assert (one["name"], two["name"]) == ("one", "two")
+    assert one["duration_ms"] >= 10
+    assert two["start_ms"] == pytest.approx(
+        one["start_ms"] + one["duration_ms"], abs=0.1
+    )
+    assert result["total_ms"] >= two["start_ms"]
+
+
+def test_imports_are_timed(timeline, tmp_path, monkeypatch):
+    (tmp_path / "tl_outer.py").write_text(
+        "import time\ntime.sleep(0.02)\nimport tl_inner\n"
+    )
+    (tmp_path / "tl_inner.py").write_text("import time\ntime.sleep(0.03)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "tl_outer", raising=False)
+    monkeypatch.delitem(sys.modules, "tl_inner", raising=False)
+
+    timeline.install_import_timer()
+    import tl_outer  # noqa: F401
+
+    timeline.remove_import_timer()
+    import tl_inner  # noqa: F401  (cached, and the timer is off)
+
+    imports = {i["module"]: i for i in timeline.finish()["imports"]}
+    assert set(imports) == {"tl_outer", "tl_inner"}
+    outer, inner = imports["tl_outer"], imports["tl_inner"]
+    assert (outer["depth"], inner["depth"]) == (0, 1)
+    assert inner["self_ms"] >= 30
+    assert outer["total_ms"] >= 50
+    assert 20 <= outer["self_ms"] < outer["total_ms"] - 25
+
+
+def test_concurrent_phase_records_its_thread(monkeypatch):
+    monkeypatch.setattr(startup_timeline, "_timeline", StartupTimeline())
+    startup_timeline.run_concurrently("Preload", lambda: time.sleep(0.01)).join()
+    [phase] = startup_timeline._timeline.finish()["phases"]
+    assert (phase["name"], phase["thread"]) == ("Preload", "Preload")
+    assert phase["duration_ms"] >= 10
+
+
+def test_failed_concurrent_task_is_logged(caplog):
+    def fail():
+        raise RuntimeError("boom")
+
+    startup_timeline.run_concurrently("Broken", fail).join()
+    assert "Broken failed" in caplog.text
+
+
+def test_disabled_is_a_no_op(tmp_path):
+    assert not startup_timeline.enabled()
+    startup_timeline.mark("anything")
+    with startup_timeline.phase("anything"):
+        pass
+    assert startup_timeline.finish(tmp_path) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_finish_writes_reports(tmp_path):
+    startup_timeline.enable()
+    startup_timeline.mark("Setup")
+    result = startup_timeline.finish(tmp_path)
+    assert not startup_timeline.enabled()
+    assert json.loads((tmp_path / "startup_timeline.json").read_text()) == result
+    text = (tmp_path / "startup_timeline.txt").read_text()
+    assert text.startswith("=== STARTUP TIMELINE")
+    assert "Setup" in text
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_drops_the_timeline():
+    timeline = startup_timeline.enable()
+    real_find_and_load = timeline._find_and_load
+    try:
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            restored = importlib._bootstrap._find_and_load is real_find_and_load
+            dropped = not startup_timeline.enabled()
+            os.write(write, b"1" if restored and dropped else b"0")
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read, 1) == b"1"
+        # The parent keeps timing
+        assert startup_timeline.enabled()
+        assert importlib._bootstrap._find_and_load is not real_find_and_load
+    finally:
+        timeline.remove_import_timer()
+        startup_timeline._timeline = None
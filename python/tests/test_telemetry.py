@@ -100,6 +100,7 @@ def _make_cfg(
     telemetry_images=False,
     screen_direction="flat",
     mount_type="Alt/Az",
+    telemetry_format="jsonl",
 ):
     cfg = MagicMock()
 
@@ -109,6 +110,7 @@ def _make_cfg(
             "telemetry_images": telemetry_images,
             "screen_direction": screen_direction,
             "mount_type": mount_type,
+            "telemetry_format": telemetry_format,
         }.get(key)
 
     cfg.get_option = get_option
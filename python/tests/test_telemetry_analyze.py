@@ -0,0 +1,147 @@
+"""
+Unit tests for the offline telemetry analysis: the per-solve table built
+from one session, the report over several sessions (JSONL and binary),
+and the command line.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from PiFinder import telemetry_analyze
+from PiFinder.telemetry_analyze import (
+    angular_separation,
+    find_sessions,
+    load_sessions,
+    report,
+    solve_table,
+)
+from PiFinder.telemetry_binary import BinaryWriter, encode_event
+
+pytestmark = pytest.mark.unit
+
+
+def _solve(t, ra=None, dec=45.0, pred_ra=None, latency=0.2):
+    return {
+        "t": t + latency,
+        "e": "solve",
+        "ra": ra,
+        "dec": dec if ra is not None else None,
+        "pred_ra": pred_ra,
+        "pred_dec": 45.0 if pred_ra is not None else None,
+        "matches": 12 if ra is not None else 0,
+        "rmse": 1.0,
+        "lsa": t,
+        "lss": t if ra is not None else None,
+    }
+
+
+def _session_events():
+    """Solves at 1000, 1002 (failed), 1004 and 1010 s; the IMU reports
+    movement only between the last two."""
+    ra_per_arcmin = 1 / 60 / np.cos(np.deg2rad(45.0))
+    return [
+        {"t": 990.0, "e": "hdr"},
+        {"t": 999.0, "e": "radio", "seq": 1, "exp": 0.4},
+        _solve(1000.0, ra=180.0),
+        {"t": 1001.0, "e": "imu", "q": [1, 0, 0, 0], "mv": False},
+        {"t": 1001.5, "e": "radio", "seq": 2, "exp": 0.2},
+        _solve(1002.0),
+        # 2 arcmin off after 4 s
+        _solve(1004.0, ra=180.0, pred_ra=180.0 + 2 * ra_per_arcmin),
+        {"t": 1006.0, "e": "imu", "q": [1, 0, 0, 0], "mv": True},
+        # 12 arcmin off after 6 s
+        _solve(1010.0, ra=180.0, pred_ra=180.0 + 12 * ra_per_arcmin, latency=0.4),
+    ]
+
+
+def _write_jsonl(path, events):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(e) + "\n" for e in events))
+    return path
+
+
+def _write_binary(path, events):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = BinaryWriter(path)
+    writer.writelines(encode_event(e) for e in events)
+    writer.close()
+    return path
+
+
+def test_angular_separation():
+    assert angular_separation(10.0, 0.0, 11.0, 0.0) == pytest.approx(1.0)
+    assert angular_separation(359.5, 89.0, 0.5, 89.0) == pytest.approx(
+        1.0 * np.cos(np.deg2rad(89.0)), rel=1e-3
+    )
+    assert angular_separation(np.nan, 0.0, 1.0, 0.0) != angular_separation(
+        np.nan, 0.0, 1.0, 0.0
+    )
+
+
+def test_solve_table():
+    table = solve_table(_session_events(), session="s1")
+    assert list(table["success"]) == [True, False, True, True]
+    assert list(table["exposure"]) == [0.4, 0.2, 0.2, 0.2]
+    assert np.isnan(table["since_solve"][0])
+    assert list(table["since_solve"][1:]) == [2.0, 4.0, 6.0]
+    assert list(table["moving"][2:]) == [False, True]
+    assert table["latency"].to_numpy() == pytest.approx([0.2, 0.2, 0.2, 0.4])
+    assert table["pred_error"][2:].to_numpy() == pytest.approx([2.0, 12.0], rel=1e-4)
+    assert table["pred_error"][:2].isna().all()
+
+
+def test_report_over_sessions(tmp_path):
+    _write_jsonl(tmp_path / "a" / "session.jsonl", _session_events())
+    _write_binary(tmp_path / "b" / "session.pftl", _session_events())
+    sessions = find_sessions([tmp_path])
+    assert [p.name for p in sessions] == ["session.jsonl", "session.pftl"]
+
+    summary = report(load_sessions(sessions, jobs=1))
+    assert (summary["sessions"], summary["solves"], summary["successes"]) == (
+        2,
+        8,
+        6,
+    )
+    drift = summary["drift_arcmin_per_s"]
+    assert drift["stationary"]["median_rate"] == pytest.approx(0.5, rel=1e-4)
+    assert drift["moving"]["median_rate"] == pytest.approx(2.0, rel=1e-4)
+    assert [row["since_solve"] for row in summary["prediction_error_arcmin"]] == [
+        "2-5s",
+        "5-10s",
+    ]
+    assert summary["success_by_exposure"] == [
+        {"exposure": 0.2, "attempts": 6, "successes": 4, "rate": 4 / 6},
+        {"exposure": 0.4, "attempts": 2, "successes": 2, "rate": 1.0},
+    ]
+    assert summary["latency_ms"]["median"] == pytest.approx(200.0)
+    assert summary["latency_ms"]["max"] == pytest.approx(400.0)
+
+
+def test_load_sessions_in_pool(tmp_path):
+    _write_jsonl(tmp_path / "a" / "session.jsonl", _session_events())
+    _write_binary(tmp_path / "b" / "session.pftl", _session_events())
+    sessions = find_sessions([tmp_path])
+    pooled = load_sessions(sessions, jobs=2)
+    serial = load_sessions(sessions, jobs=1)
+    assert pooled.equals(serial)
+
+
+def test_no_sessions():
+    summary = report(load_sessions([]))
+    assert (summary["sessions"], summary["solves"]) == (0, 0)
+    assert summary["latency_ms"] == {"count": 0}
+
+
+def test_command_line(tmp_path, capsys):
+    _write_jsonl(tmp_path / "a" / "session.jsonl", _session_events())
+    telemetry_analyze.main([str(tmp_path), "--output", str(tmp_path / "out")])
+    assert json.loads(capsys.readouterr().out)["solves"] == 4
+    for name in [
+        "report.json",
+        "solves.csv",
+        "prediction_error.csv",
+        "success_by_exposure.csv",
+    ]:
+        assert (tmp_path / "out" / name).exists()
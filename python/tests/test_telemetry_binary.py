@@ -0,0 +1,247 @@
+"""
+Unit tests for the binary telemetry container: record round trip, the
+JSON fallback, conversion to and from JSONL, recovery of a session without
+footer, seeking, and replay through TelemetryPlayer.
+"""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from PiFinder import telemetry_binary
+from PiFinder.telemetry import TelemetryPlayer, TelemetryRecorder
+from PiFinder.telemetry_binary import (
+    BinaryWriter,
+    TelemetryReader,
+    binary_to_jsonl,
+    encode_event,
+    jsonl_to_binary,
+)
+from PiFinder.types.positioning import ImuSample
+
+pytestmark = pytest.mark.unit
+
+HEADER = {"t": 999.0, "e": "hdr", "dt": None, "cfg": {"mount_type": "Alt/Az"}}
+IMU = {
+    "t": 1000.0,
+    "e": "imu",
+    "q": [1.0, 0.0, 0.0, 0.0],
+    "mv": True,
+    "st": 3,
+    "gyro": None,
+    "accel": [0.1, 0.2, 9.8],
+}
+SOLVE = {
+    "t": 1000.5,
+    "e": "solve",
+    "ra": 180.0,
+    "dec": 45.0,
+    "roll": 10.0,
+    "pred_ra": None,
+    "pred_dec": None,
+    "cam_ra": 180.1,
+    "cam_dec": 44.9,
+    "cam_roll": 10.0,
+    "iq": [1.0, 0.0, 0.0, 0.0],
+    "matches": 15,
+    "rmse": 0.5,
+    "lsa": 1000.4,
+    "lss": 1000.5,
+    "src": "CAM",
+}
+RADIO = {
+    "t": 1001.0,
+    "e": "radio",
+    "seq": 42,
+    "exp": 0.4,
+    "bg": 512.5,
+    "mad": None,
+    "grad": 1.5,
+}
+TARGET = {"t": 1002.0, "e": "tgt", "name": "M 31", "ra": 10.7, "dec": 41.3}
+
+
+def _write(path, events, close=True):
+    writer = BinaryWriter(path)
+    writer.writelines(encode_event(e) for e in events)
+    if close:
+        writer.close()
+    else:
+        writer.flush()
+    return path
+
+
+def _imu_events(count, start=1000.0, step=0.1):
+    return [dict(IMU, t=start + n * step) for n in range(count)]
+
+
+class TestRecords:
+    @pytest.mark.parametrize("event", [IMU, SOLVE, RADIO])
+    def test_fixed_records_round_trip(self, tmp_path, event):
+        reader = TelemetryReader(_write(tmp_path / "s.pftl", [event]))
+        assert list(reader) == [event]
+
+    @pytest.mark.parametrize(
+        "event",
+        [
+            TARGET,
+            {"t": 1.0, "e": "imu", "q": [1, 0, 0, 0]},  # partial fields
+            dict(SOLVE, src="OTHER"),
+            dict(IMU, st=None),
+            dict(IMU, q=[1.0, None, 0.0, 0.0]),
+            {"t": 1.0, "e": "unknown", "x": [1, "a"]},
+        ],
+    )
+    def test_other_events_fall_back_to_json(self, tmp_path, event):
+        reader = TelemetryReader(_write(tmp_path / "s.pftl", [event]))
+        assert list(reader) == [event]
+
+    def test_headers_are_kept_apart(self, tmp_path):
+        late_header = dict(HEADER, t=1000.2, dt="2025-01-01T00:00:00")
+        path = _write(tmp_path / "s.pftl", [HEADER, IMU, late_header, SOLVE])
+        reader = TelemetryReader(path)
+        assert len(reader) == 2
+        assert list(reader) == [IMU, SOLVE]
+        # The last header wins, as in the JSONL player
+        assert reader.header == late_header
+        assert list(reader.records()) == [HEADER, IMU, late_header, SOLVE]
+
+
+class TestConversion:
+    def test_jsonl_round_trip(self, tmp_path):
+        events = [HEADER, IMU, SOLVE, RADIO, TARGET]
+        src = tmp_path / "session.jsonl"
+        src.write_text("".join(json.dumps(e) + "\n" for e in events) + '{"t": 1')
+
+        assert jsonl_to_binary(src, tmp_path / "session.pftl") == 4
+        assert binary_to_jsonl(tmp_path / "session.pftl", tmp_path / "back.jsonl") == 4
+        lines = (tmp_path / "back.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == events
+
+    def test_command_line(self, tmp_path, capsys):
+        src = tmp_path / "session.jsonl"
+        src.write_text(json.dumps(IMU) + "\n")
+        assert telemetry_binary.main(["to-binary", str(src)]) == 0
+        assert list(TelemetryReader(tmp_path / "session.pftl")) == [IMU]
+        assert "Wrote 1 events" in capsys.readouterr().out
+
+
+class TestRecovery:
+    def test_session_without_footer_is_rescanned(self, tmp_path):
+        path = _write(tmp_path / "s.pftl", [HEADER] + _imu_events(600), close=False)
+        reader = TelemetryReader(path)
+        assert len(reader) == 600
+        assert reader.header == HEADER
+        assert reader.seek(1030.0)[0] == 300
+
+    def test_truncated_last_record_is_dropped(self, tmp_path):
+        path = _write(tmp_path / "s.pftl", _imu_events(3), close=False)
+        path.write_bytes(path.read_bytes()[:-5])
+        reader = TelemetryReader(path)
+        assert len(reader) == 2
+        assert [e["t"] for e in reader] == [1000.0, 1000.1]
+
+    def test_not_a_container(self, tmp_path):
+        path = tmp_path / "s.pftl"
+        path.write_bytes(b"{}\n")
+        with pytest.raises(ValueError):
+            TelemetryReader(path)
+
+
+class TestSeek:
+    def test_seek_uses_the_index(self, tmp_path):
+        path = _write(tmp_path / "s.pftl", _imu_events(1000))
+        reader = TelemetryReader(path)
+        assert len(reader._index) == 4
+        assert reader.seek(0.0)[0] == 0
+        number, offset = reader.seek(1055.55)
+        assert number == 556
+        assert reader.read(offset)[0]["t"] == pytest.approx(1055.6)
+        assert reader.seek(2000.0)[0] == 1000
+        assert reader.read(reader.seek(2000.0)[1])[0] is None
+
+    def test_seek_over_a_corrupt_record_raises(self, tmp_path):
+        path = _write(tmp_path / "s.pftl", _imu_events(1000))
+        reader = TelemetryReader(path)
+        offset = reader.seek(1000.5)[1]
+        data = bytearray(path.read_bytes())
+        data[offset] = 0xEE
+        path.write_bytes(bytes(data))
+        reader = TelemetryReader(path)
+        with pytest.raises(ValueError):
+            reader.seek(1001.0)
+
+
+class TestPlayer:
+    def test_replays_with_original_timing(self, tmp_path):
+        now = time.time()
+        events = [dict(IMU, t=now), dict(SOLVE, t=now + 100.0)]
+        _write(tmp_path / "session.pftl", [HEADER] + events)
+        player = TelemetryPlayer(tmp_path)
+        assert player.header == HEADER
+        assert player.total_events == 2
+        assert player.events == []
+
+        event, done = player.get_next_event()
+        assert event == events[0]
+        assert not done
+        assert player.get_next_event() == (None, False)
+        assert player.progress == 0.5
+
+        player.reset()
+        assert player.get_next_event() == (events[0], False)
+
+    def test_seek(self, tmp_path):
+        now = time.time()
+        events = _imu_events(5, start=now, step=100.0)
+        _write(tmp_path / "session.pftl", events)
+        player = TelemetryPlayer(tmp_path / "session.pftl")
+        player.seek(now + 250.0)
+        assert player.current_index == 3
+        assert player.get_next_event() == (events[3], False)
+        assert player.get_next_event() == (None, False)
+
+    def test_seek_jsonl(self, tmp_path):
+        now = time.time()
+        events = _imu_events(5, start=now, step=100.0)
+        (tmp_path / "session.jsonl").write_text(
+            "".join(json.dumps(e) + "\n" for e in events)
+        )
+        player = TelemetryPlayer(tmp_path)
+        player.seek(now + 250.0)
+        assert player.get_next_event() == (events[3], False)
+
+    def test_invalid_container_surfaces_as_os_error(self, tmp_path):
+        (tmp_path / "session.pftl").write_bytes(b"garbage")
+        with pytest.raises(OSError):
+            TelemetryPlayer(tmp_path)
+
+
+def test_recorder_writes_binary_sessions(tmp_path):
+    cfg = MagicMock()
+    cfg.get_option = {"telemetry_format": "binary"}.get
+    shared_state = MagicMock()
+    shared_state.datetime.return_value = None
+    shared_state.location.return_value = None
+    with patch("PiFinder.telemetry.TELEMETRY_DIR", tmp_path):
+        rec = TelemetryRecorder()
+        rec.start(cfg, shared_state)
+        session_dir = rec.get_session_dir()
+        rec.record_imu(
+            ImuSample(
+                quat=TelemetryPlayer.event_to_imu_sample(IMU).quat,
+                timestamp=1000.0,
+                status=3,
+                moving=True,
+            )
+        )
+        rec.stop()
+
+    reader = TelemetryReader(session_dir / "session.pftl")
+    assert reader.header["e"] == "hdr"
+    [event] = list(reader)
+    assert event["q"] == [1.0, 0.0, 0.0, 0.0]
+    assert event["gyro"] is None
+    assert not (session_dir / "session.jsonl").exists()